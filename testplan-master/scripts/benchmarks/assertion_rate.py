@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Measure how many ``result.equal`` assertions per second a testcase result
+records, with each way of capturing the caller location of entries.
+
+Usage::
+
+    python scripts/benchmarks/assertion_rate.py --assertions 50000
+"""
+import sys
+import time
+import argparse
+
+
+def assertion_rate(num_assertions, mode):
+    """Return assertions per second for the given capture mode."""
+    from testplan.report.testing.styles import Style, StyleEnum
+    from testplan.testing.multitest import result as result_mod
+
+    getframe = result_mod._getframe
+    if mode == "inspect":
+        # Falls back to inspect.stack(), as before the frame lookup.
+        result_mod._getframe = None
+    try:
+        result = result_mod.Result(
+            stdout_style=Style(StyleEnum.RESULT, StyleEnum.RESULT),
+            capture_location=mode != "disabled",
+        )
+        start = time.time()
+        for idx in range(num_assertions):
+            result.equal(idx, idx)
+        elapsed = time.time() - start
+    finally:
+        result_mod._getframe = getframe
+    return num_assertions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--assertions", type=int, default=20000)
+    args = parser.parse_args()
+
+    for mode in ("inspect", "getframe", "disabled"):
+        rate = assertion_rate(args.assertions, mode)
+        print(
+            "{:<9} assertions={:<7} {:>12.1f} assertions/s".format(
+                mode, args.assertions, rate
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
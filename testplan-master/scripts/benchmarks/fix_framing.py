@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Measure how many FIX messages per second are received from a socket, with
+the former byte by byte reads and with the buffered FIX framer.
+
+Usage::
+
+    python scripts/benchmarks/fix_framing.py --messages 50000
+"""
+import sys
+import time
+import socket
+import argparse
+import threading
+
+
+def messages(num_messages):
+    """Execution report like messages, around 150 bytes each."""
+    from testplan.common.utils.sockets.fix.framer import frame
+
+    return [
+        frame(
+            "35=8\x0149=SERVER\x0156=CLIENT\x0134={}\x01"
+            "52=20200101-00:00:00.000000\x0111=order-{}\x01"
+            "17=exec-{}\x0138=100\x0144=12.5\x0155=AAA\x0139=2\x01".format(
+                idx, idx, idx
+            ).encode("ascii")
+        )
+        for idx in range(num_messages)
+    ]
+
+
+def recv_bytewise(sock):
+    """Receive a message the way the FIX client did before framing."""
+    buffer = sock.recv(8)
+    while 1:
+        data = sock.recv(1)
+        if not data:
+            break
+        buffer += data
+        if buffer.endswith(b"\x01"):
+            if buffer[-8:].startswith(b"\x0110="):
+                break
+    return buffer
+
+
+def receive_rate(msgs, mode):
+    """Return messages per second received with the given mode."""
+    from testplan.common.utils.sockets.fix.framer import FixFramer
+
+    reader, writer = socket.socketpair()
+    sender = threading.Thread(target=writer.sendall, args=(b"".join(msgs),))
+    try:
+        start = time.time()
+        sender.start()
+        if mode == "bytewise":
+            for _ in msgs:
+                recv_bytewise(reader)
+        else:
+            framer = FixFramer()
+            received = 0
+            while received < len(msgs):
+                framer.recv_from(reader)
+                received += sum(1 for _ in framer)
+        elapsed = time.time() - start
+        sender.join()
+    finally:
+        reader.close()
+        writer.close()
+    return len(msgs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    msgs = messages(args.messages)
+    for mode in ("bytewise", "framer"):
+        rate = receive_rate(msgs, mode)
+        print(
+            "{:<9} messages={:<7} {:>12.1f} messages/s".format(
+                mode, args.messages, rate
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Measure LogMatcher on a large log file: matching the last line forwards,
+waiting for several patterns in one pass and searching back from the end.
+
+Usage::
+
+    python scripts/benchmarks/log_matcher.py --lines 1000000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+
+def write_log(num_lines):
+    """Write a gateway like log and return its path."""
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as log:
+        log.writelines(
+            "2020-01-01 00:00:00,000 INFO gateway heartbeat seq={}\n".format(
+                idx
+            )
+            for idx in range(num_lines)
+        )
+        log.write("2020-01-01 00:00:01,000 INFO gateway stopped\n")
+    return log.name
+
+
+def timed(func):
+    """Return the wall time of a call in milliseconds."""
+    start = time.time()
+    func()
+    return (time.time() - start) * 1000
+
+
+def main():
+    from testplan.common.utils.match import LogMatcher
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lines", type=int, default=1000000)
+    args = parser.parse_args()
+
+    log_path = write_log(args.lines)
+    try:
+        cases = (
+            ("match str", lambda m: m.match(r".*stopped$", timeout=10)),
+            ("match bytes", lambda m: m.match(b".*stopped$", timeout=10)),
+            (
+                "match_all x3",
+                lambda m: m.match_all(
+                    [r".*seq=1\b", r".*seq=9+$", r".*stopped"], timeout=10
+                ),
+            ),
+            ("find_all", lambda m: m.find_all(r".*seq=\d*77$")),
+            ("find_last", lambda m: m.find_last(r".*seq=(\d+)")),
+        )
+        for name, case in cases:
+            matcher = LogMatcher(log_path)
+            print(
+                "{:<13} lines={:<8} {:>9.1f} ms".format(
+                    name, args.lines, timed(lambda: case(matcher))
+                )
+            )
+    finally:
+        os.remove(log_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Measure how many tasks per second a pool dispatches to its workers, with
+the fixed-interval polling loop and with the event driven transports.
+
+Usage::
+
+    python scripts/benchmarks/pool_dispatch.py --tasks 2000 --size 4
+    python scripts/benchmarks/pool_dispatch.py --pool process --tasks 500
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class NoopRunnable(object):
+    """Task target that does no work, so only dispatch cost is measured."""
+
+    def run(self):
+        return None
+
+
+def make_pool(pool_type, size, event_driven, runpath):
+    from testplan.runners.pools.base import Pool
+    from testplan.runners.pools.process import ProcessPool
+
+    pool_class = ProcessPool if pool_type == "process" else Pool
+    return pool_class(
+        name="Bench{}".format("Events" if event_driven else "Polling"),
+        size=size,
+        event_driven=event_driven,
+        runpath=runpath,
+    )
+
+
+def dispatch_rate(pool_type, size, num_tasks, event_driven):
+    """Return tasks completed per second for the given pool settings."""
+    from testplan.runners.pools.tasks import Task
+
+    runpath = tempfile.mkdtemp(prefix="pool_dispatch_")
+    pool = make_pool(pool_type, size, event_driven, runpath)
+    with pool:
+        start = time.time()
+        for _ in range(num_tasks):
+            task = Task(
+                target="NoopRunnable", module="pool_dispatch", path=THIS_DIR,
+            )
+            pool.add(task, uid=task.uid())
+        while pool.ongoing:
+            time.sleep(0.001)
+        elapsed = time.time() - start
+    return num_tasks / elapsed
+
+
+def main():
+    from testplan.common.utils.logger import TESTPLAN_LOGGER, WARNING
+
+    # Per-task scheduling messages would dominate the measurement.
+    TESTPLAN_LOGGER.setLevel(WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pool", choices=("thread", "process"))
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=1000)
+    args = parser.parse_args()
+
+    pool_types = [args.pool] if args.pool else ["thread", "process"]
+    for pool_type in pool_types:
+        for event_driven in (False, True):
+            rate = dispatch_rate(
+                pool_type, args.size, args.tasks, event_driven
+            )
+            print(
+                "{:<8} {:<8} workers={:<3} tasks={:<6} {:>10.1f} tasks/s".format(
+                    pool_type,
+                    "events" if event_driven else "polling",
+                    args.size,
+                    args.tasks,
+                    rate,
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Measure the assignment solver behind unordered dict / FIX matching, pure
+Python and SciPy backed, and full unordered_compare calls on shuffled
+messages.
+
+Usage::
+
+    python scripts/benchmarks/unordered_match.py
+    python scripts/benchmarks/unordered_match.py --sizes 5 50 500 --repeat 3
+"""
+import sys
+import time
+import random
+import argparse
+
+DEFAULT_SIZES = (5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def best_time(func, repeat):
+    """Return the best wall time of ``repeat`` calls in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times) * 1000
+
+
+def error_grid(size, rng):
+    """Errors in the same ranges as the ones unordered_compare produces."""
+    return [
+        [rng.choice((0, rng.randint(1, 10000), 100000)) for _ in range(size)]
+        for _ in range(size)
+    ]
+
+
+def messages(size, rng):
+    """FIX like execution reports, the values are a shuffled copy."""
+    expected = [
+        {
+            35: "8",
+            11: "order-{}".format(idx),
+            38: rng.randint(1, 1000),
+            44: rng.randint(1, 100),
+            55: rng.choice(("AAA", "BBB", "CCC")),
+        }
+        for idx in range(size)
+    ]
+    values = [dict(msg) for msg in expected]
+    rng.shuffle(values)
+    return expected, values
+
+
+def main():
+    from testplan.common.utils import comparison
+
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        linear_sum_assignment = None
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--python-max-size",
+        type=int,
+        default=500,
+        help="Largest size for the pure Python solver.",
+    )
+    parser.add_argument(
+        "--compare-max-size",
+        type=int,
+        default=200,
+        help="Largest size for full unordered_compare calls, which also"
+        " run size^2 dict comparisons.",
+    )
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(
+        "{:>6} {:>12} {:>12} {:>16}".format(
+            "size", "python ms", "scipy ms", "unordered ms"
+        )
+    )
+    for size in args.sizes:
+        grid = error_grid(size, rng)
+        if size <= args.python_max_size:
+            python_ms = "{:>12.2f}".format(
+                best_time(lambda: comparison._assignment(grid), args.repeat)
+            )
+        else:
+            python_ms = "{:>12}".format("-")
+        if linear_sum_assignment is not None:
+            scipy_ms = "{:>12.2f}".format(
+                best_time(lambda: linear_sum_assignment(grid), args.repeat)
+            )
+        else:
+            scipy_ms = "{:>12}".format("n/a")
+
+        if size <= args.compare_max_size:
+            expected, values = messages(size, rng)
+            comparisons = [comparison.Expected(msg) for msg in expected]
+            compare_ms = "{:>16.2f}".format(
+                best_time(
+                    lambda: comparison.unordered_compare(
+                        "fixmatch", values, comparisons
+                    ),
+                    1,
+                )
+            )
+        else:
+            compare_ms = "{:>16}".format("-")
+
+        print("{:>6} {} {} {}".format(size, python_ms, scipy_ms, compare_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
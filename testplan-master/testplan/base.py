@@ -109,6 +109,9 @@ class Testplan(entity.RunnableManager):
     :type shuffle_seed: ``float``
     :param exporters: Exporters for reports creation.
     :type exporters: ``list``
+    :param exporter_workers: Number of threads exporters run on after the
+        tests, exporters run one after another if it is 1.
+    :type exporter_workers: ``int``
     :param stdout_style: Styling output options.
     :type stdout_style:
         :py:class:`Style <testplan.report.testing.styles.Style>`
@@ -130,8 +133,12 @@ class Testplan(entity.RunnableManager):
     :param report_tags_all: Match tests marked with all of the given tags.
     :type report_tags_all: ``list``
     :param merge_scheduled_parts: Merge reports of scheduled MultiTest
-        parts.
+        parts and GTest shards.
     :type merge_scheduled_parts: ``bool``
+    :param runtime_history: Record the runtimes of tasks and testcases of
+        this run into the given runtime history, or path to its file.
+    :type runtime_history: ``NoneType`` or ``str`` or
+        :py:class:`~testplan.report.testing.history.RuntimeHistory`
     :param browse: Open web browser to display the test report.
     :type browse: ``bool`` or ``NoneType``
     :param ui_port: Port of web server for displaying test report.
@@ -159,6 +166,9 @@ class Testplan(entity.RunnableManager):
         `TestRunnerIHandler <testplan.runnable.interactive.TestRunnerIHandler>`
     :param extra_deps: Extra module dependencies for interactive reload.
     :type extra_deps: ``list`` of ``module``
+    :param interactive_parallel: Number of tests run, or whose environments
+        are started, concurrently in interactive mode.
+    :type interactive_parallel: ``int``
     """
 
     CONFIG = TestplanConfig
@@ -181,6 +191,7 @@ class Testplan(entity.RunnableManager):
         shuffle=None,
         shuffle_seed=float(random.randint(1, 9999)),
         exporters=None,
+        exporter_workers=1,
         stdout_style=defaults.STDOUT_STYLE,
         report_dir=defaults.REPORT_DIR,
         xml_dir=None,
@@ -191,6 +202,7 @@ class Testplan(entity.RunnableManager):
         report_tags=None,
         report_tags_all=None,
         merge_scheduled_parts=False,
+        runtime_history=None,
         browse=False,
         ui_port=None,
         web_server_startup_timeout=defaults.WEB_SERVER_TIMEOUT,
@@ -202,6 +214,7 @@ class Testplan(entity.RunnableManager):
         timeout=defaults.TESTPLAN_TIMEOUT,
         interactive_handler=TestRunnerIHandler,
         extra_deps=None,
+        interactive_parallel=1,
         **options
     ):
 
@@ -231,6 +244,7 @@ class Testplan(entity.RunnableManager):
             shuffle=shuffle,
             shuffle_seed=shuffle_seed,
             exporters=exporters,
+            exporter_workers=exporter_workers,
             stdout_style=stdout_style,
             report_dir=report_dir,
             xml_dir=xml_dir,
@@ -241,6 +255,7 @@ class Testplan(entity.RunnableManager):
             report_tags=report_tags,
             report_tags_all=report_tags_all,
             merge_scheduled_parts=merge_scheduled_parts,
+            runtime_history=runtime_history,
             browse=browse,
             ui_port=ui_port,
             web_server_startup_timeout=web_server_startup_timeout,
@@ -252,6 +267,7 @@ class Testplan(entity.RunnableManager):
             timeout=timeout,
             interactive_handler=interactive_handler,
             extra_deps=extra_deps,
+            interactive_parallel=interactive_parallel,
             **options
         )
         for resource in self._cfg.resources:
@@ -336,6 +352,7 @@ class Testplan(entity.RunnableManager):
         shuffle=None,
         shuffle_seed=float(random.randint(1, 9999)),
         exporters=None,
+        exporter_workers=1,
         stdout_style=defaults.STDOUT_STYLE,
         report_dir=defaults.REPORT_DIR,
         xml_dir=None,
@@ -346,6 +363,7 @@ class Testplan(entity.RunnableManager):
         report_tags=None,
         report_tags_all=None,
         merge_scheduled_parts=False,
+        runtime_history=None,
         browse=False,
         ui_port=None,
         web_server_startup_timeout=defaults.WEB_SERVER_TIMEOUT,
@@ -357,6 +375,7 @@ class Testplan(entity.RunnableManager):
         timeout=defaults.TESTPLAN_TIMEOUT,
         interactive_handler=TestRunnerIHandler,
         extra_deps=None,
+        interactive_parallel=1,
         **options
     ):
         """
@@ -390,6 +409,7 @@ class Testplan(entity.RunnableManager):
                     shuffle=shuffle,
                     shuffle_seed=shuffle_seed,
                     exporters=exporters,
+                    exporter_workers=exporter_workers,
                     stdout_style=stdout_style,
                     report_dir=report_dir,
                     xml_dir=xml_dir,
@@ -400,6 +420,7 @@ class Testplan(entity.RunnableManager):
                     report_tags=report_tags,
                     report_tags_all=report_tags_all,
                     merge_scheduled_parts=merge_scheduled_parts,
+                    runtime_history=runtime_history,
                     browse=browse,
                     ui_port=ui_port,
                     web_server_startup_timeout=web_server_startup_timeout,
@@ -411,6 +432,7 @@ class Testplan(entity.RunnableManager):
                     timeout=timeout,
                     interactive_handler=interactive_handler,
                     extra_deps=extra_deps,
+                    interactive_parallel=interactive_parallel,
                     **options
                 )
                 try:
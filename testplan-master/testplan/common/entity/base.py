@@ -13,12 +13,13 @@ import psutil
 import functools
 from collections import deque, OrderedDict
 import traceback
+from concurrent import futures
 
 from schema import Or, And, Use
 
 from testplan.common.config import Config, ConfigOption
 from testplan.common.utils.thread import execute_as_thread
-from testplan.common.utils.timing import wait
+from testplan.common.utils.timing import wait, Interval, utcnow
 from testplan.common.utils.path import makeemptydirs, makedirs, default_runpath
 from testplan.common.utils import logger
 from testplan.common.utils.strings import slugify
@@ -28,6 +29,11 @@ class Environment(object):
     """
     A collection of resources that can be started/stopped.
 
+    Resources are started one after the other in the order they were added,
+    unless any of them declares its ``depends_on`` resources. Then resources
+    are started concurrently in waves, each resource once all the resources
+    it depends on are started, and stopped in the reverse waves.
+
     :param parent: Reference to parent object.
     :type parent: :py:class:`Entity <testplan.common.entity.base.Entity>`
     """
@@ -37,6 +43,8 @@ class Environment(object):
         self.parent = parent
         self.start_exceptions = OrderedDict()
         self.stop_exceptions = OrderedDict()
+        self.start_timings = OrderedDict()
+        self.stop_timings = OrderedDict()
         self._logger = None
 
     @property
@@ -55,7 +63,7 @@ class Environment(object):
             if self.parent is not None:
                 self._logger = self.parent.logger
             else:
-                self._logger = Entity.logger
+                self._logger = logger.TESTPLAN_LOGGER
         return self._logger
 
     def add(self, item, uid=None):
@@ -133,16 +141,124 @@ class Environment(object):
             for resource in self._resources
         )
 
+    def waves(self):
+        """
+        Group the resources in waves that can be started concurrently, each
+        resource is in a later wave than the resources it depends on.
+
+        :return: Lists of resources, or None if no resource declares its
+            dependencies.
+        :rtype: ``list`` of ``list`` or ``NoneType``
+        """
+        uids = {resource: uid for uid, resource in self._resources.items()}
+        dependencies = OrderedDict()
+        declared = False
+        for uid, resource in self._resources.items():
+            dependencies[uid] = set()
+            if resource.cfg.depends_on is None:
+                continue
+            declared = True
+            for dependency in resource.cfg.depends_on:
+                dependency = uids.get(dependency, dependency)
+                if dependency not in self._resources:
+                    raise RuntimeError(
+                        "Resource {} depends on {}, which is not in the"
+                        " environment.".format(uid, dependency)
+                    )
+                dependencies[uid].add(dependency)
+
+        if not declared:
+            return None
+
+        waves = []
+        started = set()
+        while dependencies:
+            wave = [
+                uid
+                for uid, required in dependencies.items()
+                if required <= started
+            ]
+            if not wave:
+                raise RuntimeError(
+                    "Circular dependencies between resources: {}".format(
+                        ", ".join(dependencies)
+                    )
+                )
+            for uid in wave:
+                del dependencies[uid]
+            started.update(wave)
+            waves.append([self._resources[uid] for uid in wave])
+        return waves
+
+    def _run_wave(self, func, wave):
+        """Call ``func`` for each resource of a wave concurrently."""
+        if len(wave) == 1:
+            func(wave[0])
+            return
+        with futures.ThreadPoolExecutor(max_workers=len(wave)) as pool:
+            for _ in pool.map(func, wave):
+                pass
+
+    def _start_resource(self, resource):
+        """Start a resource and wait until it is started."""
+        start = utcnow()
+        try:
+            resource.start()
+            resource.wait(resource.STATUS.STARTED)
+        except Exception:
+            msg = "While starting resource [{}]\n{}".format(
+                resource.cfg.name, traceback.format_exc()
+            )
+            self.logger.error(msg)
+            self.start_exceptions[resource] = msg
+        finally:
+            self.start_timings[resource] = Interval(start, utcnow())
+
+    def _stop_resource(self, resource):
+        """Stop a resource and wait until it is stopped."""
+        if (resource.status.tag is None) or (
+            resource.status.tag == resource.STATUS.STOPPED
+        ):
+            # Skip resources not even triggered to start.
+            return
+        start = utcnow()
+        try:
+            resource.stop()
+            resource.wait(resource.STATUS.STOPPED)
+        except Exception:
+            msg = "While stopping resource [{}]\n{}".format(
+                resource.cfg.name, traceback.format_exc()
+            )
+            self.stop_exceptions[resource] = msg
+        finally:
+            self.stop_timings[resource] = Interval(start, utcnow())
+
     def start(self):
         """
-        Start all resources sequentially and log errors.
+        Start all resources sequentially and log errors. Resources that
+        declare dependencies are started in concurrent waves instead, see
+        :py:meth:`waves`.
         """
+        waves = self.waves()
+        if waves is not None:
+            for wave in waves:
+                self._run_wave(self._start_resource, wave)
+                if self.start_exceptions:
+                    # Environment start failure. Won't start the rest.
+                    break
+            return
+
         # Trigger start all resources
+        starts = {}
         for resource in self._resources.values():
+            starts[resource] = utcnow()
             try:
                 resource.start()
                 if not resource.cfg.async_start:
                     resource.wait(resource.STATUS.STARTED)
+                    self.start_timings[resource] = Interval(
+                        starts[resource], utcnow()
+                    )
             except Exception:
                 msg = "While starting resource [{}]\n{}".format(
                     resource.cfg.name, traceback.format_exc()
@@ -160,6 +276,9 @@ class Environment(object):
                 continue
             else:
                 resource.wait(resource.STATUS.STARTED)
+                self.start_timings[resource] = Interval(
+                    starts[resource], utcnow()
+                )
 
     def _log_exception(self, resource, func):
         def wrapper(*args, **kargs):
@@ -176,7 +295,8 @@ class Environment(object):
 
     def start_in_pool(self, pool):
         """
-        Start all resources concurrently in thread pool.
+        Start all resources concurrently in thread pool. Resources that
+        declare dependencies are started in waves, see :py:meth:`waves`.
         """
 
         for resource in self._resources.values():
@@ -186,28 +306,39 @@ class Environment(object):
                     "its async_start attr is set to False".format(resource)
                 )
 
-        for resource in self._resources.values():
-            pool.apply_async(self._log_exception(resource, resource.start))
+        for wave in self.waves() or [list(self._resources.values())]:
+            for resource in wave:
+                pool.apply_async(self._log_exception(resource, resource.start))
 
-        # Wait resources status to be STARTED.
-        for resource in self._resources.values():
-            resource.wait(resource.STATUS.STARTED)
+            # Wait resources status to be STARTED.
+            for resource in wave:
+                resource.wait(resource.STATUS.STARTED)
 
     def stop(self, reversed=False):
         """
-        Stop all resources in reverse order and log exceptions.
+        Stop all resources in reverse order and log exceptions. Resources
+        that declare dependencies are always stopped in the reverse waves
+        they were started in, see :py:meth:`waves`.
         """
+        waves = self.waves()
+        if waves is not None:
+            for wave in waves[::-1]:
+                self._run_wave(self._stop_resource, wave)
+            return
+
         resources = list(self._resources.values())
         if reversed is True:
             resources = resources[::-1]
 
         # Stop all resources
+        starts = {}
         for resource in resources:
             if (resource.status.tag is None) or (
                 resource.status.tag == resource.STATUS.STOPPED
             ):
                 # Skip resources not even triggered to start.
                 continue
+            starts[resource] = utcnow()
             try:
                 resource.stop()
             except Exception:
@@ -225,32 +356,44 @@ class Environment(object):
                 continue
             else:
                 resource.wait(resource.STATUS.STOPPED)
+                if resource in starts:
+                    self.stop_timings[resource] = Interval(
+                        starts[resource], utcnow()
+                    )
 
     def stop_in_pool(self, pool, reversed=False):
         """
-        Stop all resources in reverse order and log exceptions.
+        Stop all resources in reverse order and log exceptions. Resources
+        that declare dependencies are stopped in the reverse waves they were
+        started in, see :py:meth:`waves`.
         """
-        resources = list(self._resources.values())
-        if reversed is True:
-            resources = resources[::-1]
+        waves = self.waves()
+        if waves is None:
+            resources = list(self._resources.values())
+            if reversed is True:
+                resources = resources[::-1]
+            waves = [resources]
+        else:
+            waves = waves[::-1]
 
-        # Stop all resources
-        for resource in resources:
-            # Skip resources not even triggered to start.
-            if (resource.status.tag is None) or (
-                resource.status.tag == resource.STATUS.STOPPED
-            ):
-                continue
+        for resources in waves:
+            # Stop all resources
+            for resource in resources:
+                # Skip resources not even triggered to start.
+                if (resource.status.tag is None) or (
+                    resource.status.tag == resource.STATUS.STOPPED
+                ):
+                    continue
 
-            pool.apply_async(self._log_exception(resource, resource.stop))
+                pool.apply_async(self._log_exception(resource, resource.stop))
 
-        # Wait resources status to be STOPPED.
-        for resource in resources:
-            # Skip resources not even triggered to start.
-            if resource.status.tag is None:
-                continue
-            else:
-                resource.wait(resource.STATUS.STOPPED)
+            # Wait resources status to be STOPPED.
+            for resource in resources:
+                # Skip resources not even triggered to start.
+                if resource.status.tag is None:
+                    continue
+                else:
+                    resource.wait(resource.STATUS.STOPPED)
 
     def __enter__(self):
         self.start()
@@ -921,7 +1064,12 @@ class ResourceConfig(EntityConfig):
     @classmethod
     def get_options(cls):
         """Resource specific config options."""
-        return {ConfigOption("async_start", default=True): bool}
+        return {
+            ConfigOption("async_start", default=True): bool,
+            ConfigOption("depends_on", default=None): Or(
+                None, [Or(str, Resource)]
+            ),
+        }
 
 
 class ResourceStatus(EntityStatus):
@@ -967,6 +1115,9 @@ class Resource(Entity):
 
     :param async_start: Resource can start asynchronously.
     :type async_start: ``bool``
+    :param depends_on: Resources, or their uids, of the same environment
+        that have to be started before this one.
+    :type depends_on: ``list`` or ``NoneType``
 
     Also inherits all
     :py:class:`~testplan.common.entity.base.Entity` options.
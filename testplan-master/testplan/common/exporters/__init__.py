@@ -1,27 +1,45 @@
 """TODO."""
+import time
 import traceback
 
 from testplan.common.config import Config, Configurable
 
 
 class ExporterResult(object):
+    """
+    Outcome of an export operation, with the traceback of the exception it
+    raised (if any) and the wall clock interval (seconds since epoch) it took.
+    """
+
     def __init__(self, exporter, type):
         self.exporter = exporter
         self.type = type
         self.traceback = None
+        self.start_time = None
+        self.end_time = None
 
     @property
     def success(self):
         return not self.traceback
 
+    @property
+    def elapsed(self):
+        """Seconds taken by the export, ``None`` if it has not finished."""
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
     @classmethod
     def run_exporter(cls, exporter, source, type):
         result = ExporterResult(exporter=exporter, type=type)
 
+        result.start_time = time.time()
         try:
             exporter.export(source)
         except Exception:
             result.traceback = traceback.format_exc()
+        finally:
+            result.end_time = time.time()
         return result
 
 
@@ -47,9 +47,14 @@ class Report(object):
 
     exception_logger = ExceptionLogger
 
+    # Report group this report has been added to, values derived from the
+    # entries of a report (e.g. status) are invalidated up to the root.
+    _parent = None
+
     def __init__(
         self, name, description=None, uid=None, entries=None, parent_uids=None
     ):
+        self._cache = {}
         self.name = name
         self.description = description
 
@@ -92,9 +97,47 @@ class Report(object):
     def __getitem__(self, key):
         return self.entries[key]
 
+    @property
+    def entries(self):
+        """Child entries of the report."""
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = entries
+        self._adopt(entries)
+        self._invalidate_cache()
+
+    def _adopt(self, entries):
+        """Link child reports in ``entries`` to this report."""
+
+    def _cached(self, key, compute):
+        """
+        Return the value cached under ``key``, calling ``compute`` to get it
+        if it has been invalidated since it was last computed.
+        """
+        cache = self._cache
+        if key not in cache:
+            # Stored into the dict captured above, a concurrent invalidation
+            # replaces that dict so a stale value is never kept.
+            cache[key] = compute()
+        return cache[key]
+
+    def _invalidate_cache(self):
+        """Drop cached values of this report and all of its parents."""
+        report = self
+        while report is not None:
+            report._cache = {}
+            report = report._parent
+
     def __getstate__(self):
-        # Omitting logger as it is not compatible with deep copy.
-        return {k: v for k, v in self.__dict__.items() if k != "logger"}
+        # Omitting logger as it is not compatible with deep copy, and parent
+        # so that copying a subtree does not copy the whole tree.
+        return {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in ("logger", "_parent")
+        }
 
     def _get_comparison_attrs(self):  # pylint: disable=no-self-use
         return ["name", "description", "uid", "entries", "logs"]
@@ -166,10 +209,12 @@ class Report(object):
     def append(self, item):
         """Append ``item`` to ``self.entries``, no restrictions."""
         self.entries.append(item)
+        self._invalidate_cache()
 
     def extend(self, items):
         """Extend ``self.entries`` with ``items``, no restrictions."""
         self.entries.extend(items)
+        self._invalidate_cache()
 
     def filter(self, *functions, **kwargs):
         """
@@ -225,6 +270,14 @@ class ReportGroup(Report):
         for child in self.entries:
             self.set_parent_uids(child)
 
+    def __setstate__(self, data):
+        super(ReportGroup, self).__setstate__(data)
+        self._adopt(self.entries)
+
+    def _adopt(self, entries):
+        for entry in entries:
+            entry._parent = self
+
     def build_index(self, recursive=False):
         """
         Build (refresh) indexes for this report and
@@ -290,6 +343,7 @@ class ReportGroup(Report):
             entry_ix = self._index[uid]
             self.entries[entry_ix] = item
             self.set_parent_uids(item)
+            self._invalidate_cache()
         else:
             self.append(item)
 
@@ -349,6 +403,7 @@ class ReportGroup(Report):
         after it has been added into this report group.
         """
         item.parent_uids = self.parent_uids + [self.uid]
+        item._parent = self
         if isinstance(item, ReportGroup):
             for child in item.entries:
                 item.set_parent_uids(child)
@@ -305,9 +305,9 @@ class Custom(Callable):
 ########################################################################
 
 
-# Do not change unless you know what you are doing
-# Making this larger will considerably slow down the comparison
-MAX_UNORDERED_COMPARE = 16
+# Every value is compared with every expected value, so the comparisons
+# grow quadratically and the matching itself is O(n^3).
+MAX_UNORDERED_COMPARE = 1000
 
 
 def compare_with_callable(callable_obj, value):
@@ -824,69 +824,95 @@ def _best_permutation(grid):
     value vs. expected value, finds the permutation which
     associates actual vs expected with the least error.
 
-    Be careful running this on of large grids, as the
-    runtime is expotential O(a^n). Sample run times on desktop hardware::
+    This is the assignment problem, solved in O(n^3) by the NumPy based
+    ``scipy.optimize.linear_sum_assignment`` if SciPy is installed, or else
+    by the pure Python Hungarian algorithm below. Both find a permutation
+    with the least total error, but may pick a different one on ties.
+    Sample run times on desktop hardware (``scripts/benchmarks``)::
 
-      size:  0, ms:    0.002  size:  1, ms:    0.010  size:  2, ms:    0.022
-      size:  3, ms:    0.046  size:  4, ms:    0.105  size:  5, ms:    0.207
-      size:  6, ms:    0.434  size:  7, ms:    0.540  size:  8, ms:    1.351
-      size:  9, ms:    2.338  size: 10, ms:    5.470  size: 11, ms:    9.398
-      size: 12, ms:   21.651  size: 13, ms:   36.114  size: 14, ms:   79.871
-      size: 15, ms:  166.488  size: 16, ms:  363.120  size: 17, ms:  943.494
-      size: 18, ms: 1818.761  size: 19, ms: 2370.988  size: 20, ms: 9989.508
+      size:    5, python ms:     0.02, scipy ms:   0.01
+      size:   50, python ms:    25.54, scipy ms:   0.16
+      size:  200, python ms:  1523.33, scipy ms:   2.42
+      size: 1000,                      scipy ms:  97.77
 
     e.g. for the grid::
 
       >>> grid = [[1000, 2000, 2000],
       ...         [1000, 2000, 2000],
       ...         [   0, 2000, 2000]]
-      [1, 2, 0]
+      [2, 1, 0]
 
-    Where [1, 2, 0] is a list of indices mapping::
+    Where [2, 1, 0] is a list of indices mapping::
 
-      - row 0 to col 1
-      - row 1 to col 2
+      - row 0 to col 2
+      - row 1 to col 1
       - row 2 to col 0
 
     """
+    if not grid:
+        return []
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        return _assignment(grid)
+    return linear_sum_assignment(grid)[1].tolist()
 
-    def bp_loop(outstanding, level, grid, grid_len, cache):
-        """
-            Recursively finds a solution by
-            progressively excluding poor permutations "paths"
-        """
-        if not outstanding:
-            return 0, []
 
-        # [(cost:int, indx:int)]
-        level_permutations = [
-            (grid[level][indx], indx) for indx in outstanding
-        ]
-        level_permutations.sort()
-        min_cost = None
-        min_path = None
-        for cost, indx in level_permutations:
-            remaining = outstanding - frozenset([indx])
-            # memoise calls, for large grids
-            # this cuts down the amount of calls significantly
-            pair = cache.get(remaining, None)
-            if pair is None:
-                pair = bp_loop(remaining, level + 1, grid, grid_len, cache)
-                cache[remaining] = pair
-            sub_cost, sub_path = pair
-            this_cost = cost + sub_cost
-            this_path = [indx] + sub_path
-            if (min_cost is None) or (this_cost < min_cost):
-                min_cost = this_cost
-                min_path = this_path
-        return min_cost, min_path
-
-    grid_len = len(grid)
-
-    cache = {}
-
-    # list of int indices
-    return bp_loop(frozenset(range(grid_len)), 0, grid, grid_len, cache)[1]
+def _assignment(grid):
+    """
+    Hungarian algorithm (shortest augmenting paths with row and column
+    potentials) in pure Python. Rows are added one at a time, ``match[col]``
+    holds the 1-based row assigned to a column and index 0 is the virtual
+    column a new row starts its augmenting path from.
+    """
+    size = len(grid)
+    inf = float("inf")
+    row_pot = [0] * (size + 1)
+    col_pot = [0] * (size + 1)
+    match = [0] * (size + 1)
+    way = [0] * (size + 1)
+
+    for row in range(1, size + 1):
+        match[0] = row
+        col = 0
+        min_slack = [inf] * (size + 1)
+        used = [False] * (size + 1)
+        while True:
+            used[col] = True
+            cur_row = match[col]
+            costs = grid[cur_row - 1]
+            cur_pot = row_pot[cur_row]
+            delta = inf
+            next_col = 0
+            for idx in range(1, size + 1):
+                if used[idx]:
+                    continue
+                slack = costs[idx - 1] - cur_pot - col_pot[idx]
+                if slack < min_slack[idx]:
+                    min_slack[idx] = slack
+                    way[idx] = col
+                if min_slack[idx] < delta:
+                    delta = min_slack[idx]
+                    next_col = idx
+            for idx in range(size + 1):
+                if used[idx]:
+                    row_pot[match[idx]] += delta
+                    col_pot[idx] -= delta
+                else:
+                    min_slack[idx] -= delta
+            col = next_col
+            if match[col] == 0:
+                break
+        # flip the augmenting path
+        while col:
+            prev_col = way[col]
+            match[col] = match[prev_col]
+            col = prev_col
+
+    permutation = [0] * size
+    for col in range(1, size + 1):
+        permutation[match[col] - 1] = col - 1
+    return permutation
 
 
 # helper func, used to generate errors matrix
@@ -998,7 +1024,7 @@ def unordered_compare(
     .. note::
 
       It is possible to specify up to a maximum of
-      16 values or expected comparisons.
+      1000 values or expected comparisons.
 
     .. note::
 
@@ -1034,13 +1060,14 @@ def unordered_compare(
     list_cmps = list(comparisons)
 
     # if either the values or expected comparisons
-    # exceed 16, then raise an exception:
+    # exceed MAX_UNORDERED_COMPARE, then raise an exception:
     # it would take too long to process
-    #  (expotential complexity algorithm involved)
     if max(len(list_msgs), len(list_cmps)) > MAX_UNORDERED_COMPARE:
         raise Exception(
             "Too many values being compared. "
-            + "Unordered matching supports up to 16 comparisons"
+            + "Unordered matching supports up to {} comparisons".format(
+                MAX_UNORDERED_COMPARE
+            )
         )
 
     # Generate fake comparisons or values in case that the number of values
@@ -4,12 +4,39 @@ Module of utility types and functions that perform matching.
 import os
 import time
 import re
+import mmap
+import errno
+import ctypes
+import itertools
+import select
+import struct
+import ctypes.util
 import six
 
 from . import timing
 from . import logger
 
 LOG_MATCHER_INTERVAL = 0.25
+LOG_TAILER_CHUNK_SIZE = 1024 * 1024
+LOG_MATCHER_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_regexps(log_extracts):
+    """
+    Return the read mode and regexps to match the lines of a file with. If
+    log_extracts contain bytes regex, all of them are converted to bytes.
+    """
+    if not six.PY2 and not all(
+        [isinstance(x.pattern, six.text_type) for x in log_extracts]
+    ):
+        _log_extracts = []
+        for regex in log_extracts:
+            if not six.PY2 and not isinstance(regex.pattern, six.binary_type):
+                _log_extracts.append(re.compile(regex.pattern.encode("utf_8")))
+            else:
+                _log_extracts.append(regex)
+        return "rb", _log_extracts
+    return "r", log_extracts
 
 
 def match_regexps_in_file(logpath, log_extracts, return_unmatched=False):
@@ -36,21 +63,7 @@ def match_regexps_in_file(logpath, log_extracts, return_unmatched=False):
 
     extracts_status = [False for _ in log_extracts]
 
-    # If log_extracts contain bytes regex, will convert all log_extracts to
-    # bytes regex.
-    if not six.PY2 and not all(
-        [isinstance(x.pattern, six.text_type) for x in log_extracts]
-    ):
-        read_mode = "rb"
-        _log_extracts = []
-        for regex in log_extracts:
-            if not six.PY2 and not isinstance(regex.pattern, six.binary_type):
-                _log_extracts.append(re.compile(regex.pattern.encode("utf_8")))
-            else:
-                _log_extracts.append(regex)
-    else:
-        read_mode = "r"
-        _log_extracts = log_extracts
+    read_mode, _log_extracts = _file_regexps(log_extracts)
 
     with open(logpath, read_mode) as log:
         for line in log:
@@ -70,20 +83,348 @@ def match_regexps_in_file(logpath, log_extracts, return_unmatched=False):
     return all(extracts_status), extracted_values
 
 
+class LogTailer(object):
+    """
+    Incremental :py:func:`match_regexps_in_file`, for files that are checked
+    repeatedly while they grow. The file offset that has been read and the
+    regexps that have matched are remembered, so each call only reads the
+    bytes appended since the previous one.
+
+    Regexps that matched are not checked again, unless they have named
+    groups, as later matching lines update the extracted values. The file is
+    read again from the start if it shrinks (e.g. it was recreated).
+
+    :param logpath: Log file path.
+    :type logpath: ``str``
+    :param log_extracts: Regex list.
+    :type log_extracts: ``Union[bytes, str]``
+    """
+
+    def __init__(self, logpath, log_extracts):
+        self.logpath = logpath
+        self.log_extracts = log_extracts
+        read_mode, self._regexps = _file_regexps(log_extracts)
+        self._decode = read_mode == "r" and not six.PY2
+        self.position = 0
+        self._partial = b""
+        self._status = [False for _ in log_extracts]
+        self._extracted = {}
+
+    def reset(self):
+        """Forget what has been read and matched."""
+        self.position = 0
+        self._partial = b""
+        self._status = [False for _ in self.log_extracts]
+        self._extracted = {}
+
+    def _match_line(self, line, status, extracted):
+        if line.endswith(b"\r\n"):
+            # Same lines as when reading with universal newlines.
+            line = line[:-2] + b"\n"
+        elif line.endswith(b"\r"):
+            line = line[:-1] + b"\n"
+        if self._decode:
+            line = line.decode("utf_8", "replace")
+
+        for pos, regexp in enumerate(self._regexps):
+            if status[pos] and not regexp.groupindex:
+                continue
+            match = regexp.match(line)
+            if match:
+                extracted.update(match.groupdict())
+                status[pos] = True
+
+    def _read(self):
+        """Match the complete lines appended since the previous call."""
+        with open(self.logpath, "rb") as log:
+            log.seek(0, os.SEEK_END)
+            if log.tell() < self.position:
+                self.reset()
+            log.seek(self.position)
+
+            while True:
+                chunk = log.read(LOG_TAILER_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = (self._partial + chunk).splitlines(True)
+                if lines[-1].endswith((b"\n", b"\r")):
+                    self._partial = b""
+                else:
+                    self._partial = lines.pop()
+                for line in lines:
+                    self._match_line(line, self._status, self._extracted)
+            self.position = log.tell()
+
+    def match(self, return_unmatched=False):
+        """
+        Return whether all regexps have matched so far, with the same result
+        as :py:func:`match_regexps_in_file` on the whole file.
+
+        :param return_unmatched: Flag for return unmatched regex.
+        :type return_unmatched: ``bool``
+        :return: Match result.
+        :rtype: ``tuple``
+        """
+        if os.path.exists(self.logpath):
+            self._read()
+        else:
+            self.reset()
+
+        status, extracted = self._status, self._extracted
+        if self._partial:
+            # The last line may still be written to, it is matched again
+            # once it is complete.
+            status, extracted = list(status), dict(extracted)
+            self._match_line(self._partial, status, extracted)
+
+        if return_unmatched:
+            unmatched = [
+                exc
+                for idx, exc in enumerate(self.log_extracts)
+                if not status[idx]
+            ]
+            return all(status), dict(extracted), unmatched
+        return all(status), dict(extracted)
+
+
+def _inotify_libc():
+    """Return libc if it provides inotify, None otherwise."""
+    if not hasattr(os, "O_NONBLOCK"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+    return libc
+
+
+class FileWatcher(object):
+    """
+    Sleeps until files are changed, using inotify where it is available and
+    plain sleeps otherwise. Directories of the files are watched, so files
+    that do not exist yet can be waited for.
+
+    :param paths: Paths of the files to watch.
+    :type paths: ``list`` of ``str``
+    :param events: Mask of the inotify events to watch.
+    :type events: ``int``
+    """
+
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    EVENTS = 0x2 | 0x8 | 0x80 | 0x100
+    # Metadata changes, such as the modification time set by touch.
+    IN_ATTRIB = 0x4
+    IN_Q_OVERFLOW = 0x4000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, paths, events=EVENTS):
+        self._fd = None
+        self._directories = {}
+        libc = _inotify_libc()
+        if libc is None:
+            return
+
+        fd = libc.inotify_init1(os.O_NONBLOCK)
+        if fd < 0:
+            return
+        directories = set(
+            os.path.dirname(os.path.abspath(path)) for path in paths
+        )
+        watched = {
+            libc.inotify_add_watch(fd, directory.encode("utf_8"), events): (
+                directory
+            )
+            for directory in directories
+        }
+        if watched and all(watch >= 0 for watch in watched):
+            self._fd = fd
+            self._directories = watched
+        else:
+            os.close(fd)
+
+    @property
+    def inotify(self):
+        """Whether file changes are watched with inotify."""
+        return self._fd is not None
+
+    def sleep(self, timeout):
+        """
+        Sleep until a watched file changes, or ``timeout`` seconds.
+
+        :param timeout: Maximum time to sleep.
+        :type timeout: ``float``
+        """
+        if self._fd is None:
+            time.sleep(timeout)
+            return
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            self._read_events()
+
+    def _read_events(self):
+        """Read all pending events, return them as ``(wd, mask, name)``."""
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as exc:
+                if exc.errno == errno.EAGAIN:
+                    return events
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, name))
+
+    def changes(self):
+        """
+        Return the paths of the files of the watched directories changed
+        since the previous call.
+
+        :return: Changed paths, or None if changes are not watched with
+            inotify or if events were lost.
+        :rtype: ``set`` of ``str``
+        """
+        if self._fd is None:
+            return None
+
+        paths = set()
+        for wd, mask, name in self._read_events():
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            if wd in self._directories and name:
+                paths.add(
+                    os.path.join(
+                        self._directories[wd], name.decode("utf_8", "replace")
+                    )
+                )
+        return paths
+
+    def close(self):
+        """Stop watching."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _map_file(log):
+    """
+    Map the current content of an open file in memory, empty files (which
+    cannot be mapped) and files that do not support mapping are read.
+    """
+    size = os.fstat(log.fileno()).st_size
+    if size == 0:
+        return b""
+    try:
+        return mmap.mmap(log.fileno(), size, access=mmap.ACCESS_READ)
+    except (mmap.error, ValueError, OSError):
+        log.seek(0)
+        return log.read(size)
+
+
+_LINE = re.compile(b"[^\n]*\n|[^\n]+")
+_TEXT_LINE = re.compile("[^\n]*\n|[^\n]+")
+
+
+def _split_lines(chunk, decode):
+    """
+    Split a chunk of bytes into lines that keep their newline, as well as
+    into the lines decoded with universal newlines if ``decode`` is set.
+    """
+    # splitlines is faster, if the only line boundaries are newlines.
+    carriage_returns = b"\r" in chunk
+    if carriage_returns:
+        lines = _LINE.findall(chunk)
+    else:
+        lines = chunk.splitlines(True)
+    if not decode:
+        return lines, None
+
+    text = chunk.decode("utf_8", "replace")
+    if not carriage_returns:
+        texts = text.splitlines(True)
+        # Other line boundaries of str.splitlines add lines.
+        if len(texts) == len(lines):
+            return lines, texts
+    return lines, _TEXT_LINE.findall(text.replace("\r\n", "\n"))
+
+
+def _line_chunks(view, start, end, chunk_size, decode):
+    """
+    Yield ``(start, stop, lines, texts)`` for chunks of about ``chunk_size``
+    bytes of whole lines of ``view``, between the ``start`` and ``end``
+    offsets.
+    See :py:func:`_split_lines` for ``lines`` and ``texts``. The last line
+    may not be terminated by a newline yet.
+    """
+    while start < end:
+        stop = min(start + chunk_size, end)
+        if stop < end:
+            newline = view.rfind(b"\n", start, stop)
+            if newline == -1:
+                # A line longer than the chunk size.
+                newline = view.find(b"\n", stop, end)
+            stop = end if newline == -1 else newline + 1
+        lines, texts = _split_lines(view[start:stop], decode)
+        yield start, stop, lines, texts
+        start = stop
+
+
+def _line_chunks_backward(view, start, end, chunk_size, decode):
+    """Same as :py:func:`_line_chunks`, from ``end`` back to ``start``."""
+    while start < end:
+        begin = max(start, end - chunk_size)
+        if begin > start:
+            # Start the chunk after the end of a line, the last byte is
+            # skipped as it ends the last line of the chunk.
+            newline = view.find(b"\n", begin - 1, end - 1)
+            if newline == -1:
+                newline = view.rfind(b"\n", start, begin - 1)
+            begin = start if newline == -1 else newline + 1
+        lines, texts = _split_lines(view[begin:end], decode)
+        yield begin, end, lines, texts
+        end = begin
+
+
+def _first_match(regex, lines, limit=None):
+    """Index of the first of ``lines`` matched by ``regex``, or None."""
+    if limit is not None:
+        lines = itertools.islice(lines, limit)
+    matched = itertools.compress(
+        itertools.count(), six.moves.map(regex.match, lines)
+    )
+    return next(matched, None)
+
+
 class LogMatcher(logger.Loggable):
     """
     Single line matcher for text files (usually log files). Once matched, it
     remembers the line number of the match and subsequent matches are scanned
     from the current line number. This can be useful when matched lines are not
     unique for the entire log file.
+
+    Positions are byte offsets in the file. The file is memory mapped and
+    scanned in chunks of whole lines, several regexps can be matched in a
+    single pass with :py:meth:`match_any` and :py:meth:`match_all`, the
+    matches of a range are returned by :py:meth:`find_all` and the file is
+    searched backwards from its end by :py:meth:`find_last`.
     """
 
-    def __init__(self, log_path):
+    def __init__(self, log_path, chunk_size=LOG_MATCHER_CHUNK_SIZE):
         """
         :param log_path: Path to the log file.
         :type log_path: ``str``
+        :param chunk_size: Number of bytes scanned at a time.
+        :type chunk_size: ``int``
         """
         self.log_path = log_path
+        self.chunk_size = chunk_size
         self.position = 0
         self.marks = {}
         super(LogMatcher, self).__init__()
@@ -103,9 +444,7 @@ class LogMatcher(logger.Loggable):
 
     def seek_eof(self):
         """Sets current file position to the current end of file."""
-        with open(self.log_path, "r") as log:
-            log.seek(0, os.SEEK_END)
-            self.position = log.tell()
+        self.position = os.path.getsize(self.log_path)
 
     def seek_sof(self):
         """Sets current file position to the start of file."""
@@ -121,6 +460,115 @@ class LogMatcher(logger.Loggable):
         """
         self.marks[name] = self.position
 
+    def _offset(self, mark, default):
+        """File position of a mark, ``default`` if it is None."""
+        return default if mark is None else self.marks[mark]
+
+    def _chunks(self, start, end=None, backward=False, decode=False):
+        """
+        Yield chunks of lines of the file between two positions, see
+        :py:func:`_line_chunks`. The end defaults to the end of file.
+        """
+        with open(self.log_path, "rb") as log:
+            view = _map_file(log)
+            try:
+                end = len(view) if end is None else min(end, len(view))
+                chunks = _line_chunks_backward if backward else _line_chunks
+                for chunk in chunks(view, start, end, self.chunk_size, decode):
+                    yield chunk
+            finally:
+                if isinstance(view, mmap.mmap):
+                    view.close()
+
+    @staticmethod
+    def _regexps(regexps):
+        """
+        Compile regex strings and return ``(regex, text)`` pairs, ``text`` is
+        set for regexps matched against decoded lines.
+        """
+        if hasattr(regexps, "match") or isinstance(
+            regexps, (six.text_type, six.binary_type)
+        ):
+            regexps = [regexps]
+        compiled = []
+        for regex in regexps:
+            # As a convenience, we create the compiled regex if a string was
+            # passed.
+            if not hasattr(regex, "match"):
+                regex = re.compile(regex)
+            compiled.append(
+                (
+                    regex,
+                    not six.PY2 and isinstance(regex.pattern, six.text_type),
+                )
+            )
+        return compiled
+
+    def _wait(self, regexps, timeout, match_all):
+        """
+        Scan the lines from the current position until any or all regexps
+        are matched, waiting for more lines to be written up to ``timeout``
+        seconds. The position is moved after the last scanned line.
+        """
+        regexps = self._regexps(regexps)
+        decode = any(is_text for _, is_text in regexps)
+        matches = [None for _ in regexps]
+        required = len(regexps) if match_all else 1
+        matched = 0
+        start_time = time.time()
+        end_time = start_time + timeout
+
+        while True:
+            for start, stop, lines, texts in self._chunks(
+                self.position, decode=decode
+            ):
+                found = []
+                limit = None
+                for pos, (regex, is_text) in enumerate(regexps):
+                    if matches[pos] is not None:
+                        continue
+                    idx = _first_match(
+                        regex, texts if is_text else lines, limit
+                    )
+                    if idx is not None:
+                        found.append((idx, pos))
+                        if not match_all:
+                            # Later regexps only match if on an earlier line.
+                            limit = idx
+                if found and not match_all:
+                    found = [min(found)]
+
+                if matched + len(found) >= required:
+                    last = max(idx for idx, _ in found) + 1
+                    stop = start + sum(six.moves.map(len, lines[:last]))
+                elif not lines[-1].endswith(b"\n"):
+                    # The last line is matched again once it is complete.
+                    stop -= len(lines[-1])
+                    found = [
+                        item for item in found if item[0] < len(lines) - 1
+                    ]
+
+                for idx, pos in found:
+                    regex, is_text = regexps[pos]
+                    matches[pos] = regex.match(
+                        (texts if is_text else lines)[idx]
+                    )
+                matched += len(found)
+                self.position = stop
+                if matched >= required:
+                    self.logger.debug(
+                        "Match found in %.2fs", time.time() - start_time
+                    )
+                    return matches
+
+            if time.time() > end_time:
+                break
+            time.sleep(LOG_MATCHER_INTERVAL)
+
+        raise timing.TimeoutException(
+            "No matches found in {}s".format(timeout)
+        )
+
     def match(self, regex, timeout=5):
         """
         Matches each line in the log file from the current line number to the
@@ -134,38 +582,107 @@ class LogMatcher(logger.Loggable):
         :return: The regex match or raise an Exception if no match is found.
         :rtype: ``re.Match``
         """
-        match = None
-        start_time = time.time()
-        end_time = start_time + timeout
-        read_mode = "rb"
+        return self._wait([regex], timeout, match_all=False)[0]
 
-        # As a convenience, we create the compiled regex if a string was
-        # passed.
-        if not hasattr(regex, "match"):
-            regex = re.compile(regex)
-        if isinstance(regex.pattern, str):
-            read_mode = "r"
+    def match_any(self, regexps, timeout=5):
+        """
+        Same as :py:meth:`match`, for the first line that matches any of the
+        regexps. The regexp that matched is the ``re`` attribute of the
+        returned match.
 
-        with open(self.log_path, read_mode) as log:
-            log.seek(self.position)
+        :param regexps: regex strings or compiled regular expressions.
+        :type regexps: ``list`` of ``Union[str, re.Pattern, bytes]``
+        :param timeout: Seconds to wait for a match.
+        :type timeout: ``float``
+        :return: The first match.
+        :rtype: ``re.Match``
+        """
+        matches = self._wait(regexps, timeout, match_all=False)
+        return next(match for match in matches if match is not None)
 
-            while match is None:
-                line = log.readline()
-                if line:
-                    match = regex.match(line)
-                    if match:
-                        break
-                else:
-                    time.sleep(LOG_MATCHER_INTERVAL)
-                    if time.time() > end_time:
-                        break
+    def match_all(self, regexps, timeout=5):
+        """
+        Same as :py:meth:`match`, for the first line matched by each regexp,
+        the file is scanned once for all of them. The position is stored
+        after the line of the last match.
 
-            self.position = log.tell()
+        :param regexps: regex strings or compiled regular expressions.
+        :type regexps: ``list`` of ``Union[str, re.Pattern, bytes]``
+        :param timeout: Seconds to wait for all matches.
+        :type timeout: ``float``
+        :return: Matches, in the order of the regexps.
+        :rtype: ``list`` of ``re.Match``
+        """
+        return self._wait(regexps, timeout, match_all=True)
 
-        if match is None:
-            raise timing.TimeoutException(
-                "No matches found in {}s".format(timeout)
-            )
-        else:
-            self.logger.debug("Match found in %.2fs", time.time() - start_time)
-        return match
+    def find_all(self, regexps, start_mark=None, end_mark=None):
+        """
+        Return all the matches of the lines between two marks, without
+        waiting for more lines or changing the current position.
+
+        :param regexps: regex string, compiled regular expression or a list
+            of them.
+        :type regexps: ``Union[str, re.Pattern, bytes, list]``
+        :param start_mark: Mark to search from, the current position if None.
+        :type start_mark: ``str`` or ``NoneType``
+        :param end_mark: Mark to search to, the end of file if None.
+        :type end_mark: ``str`` or ``NoneType``
+        :return: Matches in the order of the lines, a line matched by several
+            regexps has a match for each of them.
+        :rtype: ``list`` of ``re.Match``
+        """
+        regexps = self._regexps(regexps)
+        decode = any(is_text for _, is_text in regexps)
+        found = []
+        for _, _, lines, texts in self._chunks(
+            self._offset(start_mark, self.position),
+            self._offset(end_mark, None),
+            decode=decode,
+        ):
+            chunk_found = []
+            for pos, (regex, is_text) in enumerate(regexps):
+                results = list(
+                    six.moves.map(regex.match, texts if is_text else lines)
+                )
+                chunk_found.extend(
+                    (idx, pos, results[idx])
+                    for idx in itertools.compress(itertools.count(), results)
+                )
+            chunk_found.sort(key=lambda item: item[:2])
+            found.extend(match for _, _, match in chunk_found)
+        return found
+
+    def find_last(self, regexps, start_mark=None):
+        """
+        Search the file backwards from its end for the last line matched by
+        any of the regexps, without waiting for more lines or changing the
+        current position.
+
+        :param regexps: regex string, compiled regular expression or a list
+            of them.
+        :type regexps: ``Union[str, re.Pattern, bytes, list]``
+        :param start_mark: Mark to search back to, the current position if
+            None.
+        :type start_mark: ``str`` or ``NoneType``
+        :return: The last match, None if no line matches.
+        :rtype: ``re.Match`` or ``NoneType``
+        """
+        regexps = self._regexps(regexps)
+        decode = any(is_text for _, is_text in regexps)
+        for _, _, lines, texts in self._chunks(
+            self._offset(start_mark, self.position),
+            backward=True,
+            decode=decode,
+        ):
+            found = []
+            for pos, (regex, is_text) in enumerate(regexps):
+                candidates = texts if is_text else lines
+                idx = _first_match(regex, reversed(candidates))
+                if idx is not None:
+                    found.append((idx, pos))
+            if found:
+                idx, pos = min(found)
+                regex, is_text = regexps[pos]
+                candidates = texts if is_text else lines
+                return regex.match(candidates[len(candidates) - 1 - idx])
+        return None
@@ -2,9 +2,14 @@
 
 import os
 import sys
+import uuid
 import getpass
+import threading
 import subprocess
 
+from testplan.common.utils.logger import TESTPLAN_LOGGER
+from testplan.common.utils.timing import wait
+
 
 def ssh_cmd(ssh_cfg, command):
     """Returns ssh command."""
@@ -74,3 +79,193 @@ def link_cmd(path, link):
 def remote_filepath_exists(ssh_cmd, ssh_cfg, path):
     """Checks if filepath exists."""
     return ssh_cmd(ssh_cfg, "test -e {}".format(path))
+
+
+class RemoteShell(object):
+    """
+    Long-lived shell on a remote host, reached through a single ssh
+    connection. Commands are written to the standard input of the shell and
+    their output and exit code are read back from its standard output, so
+    that no connection is made per command.
+
+    .. code-block:: python
+
+      shell = RemoteShell(ssh_cmd, {"host": host})
+      shell.open()
+      shell.execute("mkdir -p /var/tmp/user/testplan")
+      shell.batch(["test -e /path/one", "test -e /path/two"], check=False)
+      shell.close()
+
+    :param ssh_cmd: Creates the command that executes a command remotely.
+    :type ssh_cmd: ``callable`` taking ssh config and a command string.
+    :param ssh_cfg: Remote host ssh configuration.
+    :type ssh_cfg: ``dict``
+    :param shell: Shell executable on the remote host.
+    :type shell: ``str``
+    :param logger: Logger of the executed commands.
+    :type logger: ``logging.Logger``
+    """
+
+    def __init__(self, ssh_cmd, ssh_cfg, shell="/bin/sh", logger=None):
+        self.ssh_cmd = ssh_cmd
+        self.ssh_cfg = ssh_cfg
+        self.shell = shell
+        self.logger = logger or TESTPLAN_LOGGER
+        self._marker = "__testplan_{}__".format(uuid.uuid4().hex).encode()
+        self._lock = threading.Lock()
+        self._proc = None
+        self._devnull = None
+
+    @property
+    def active(self):
+        """Whether the remote shell is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def open(self):
+        """Connect to the remote host and start the shell."""
+        if self.active:
+            return
+        self._devnull = open(os.devnull, "w")
+        self._proc = subprocess.Popen(
+            self.ssh_cmd(self.ssh_cfg, self.shell),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._devnull,
+        )
+
+    def close(self, timeout=5):
+        """
+        Exit the shell, killing the connection if it does not terminate.
+
+        :param timeout: Seconds to wait for the shell to exit.
+        :type timeout: ``int``
+        """
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+            except (IOError, OSError):
+                pass
+            if not wait(
+                lambda: self._proc.poll() is not None,
+                timeout,
+                raise_on_timeout=False,
+            ):
+                self._proc.kill()
+                self._proc.wait()
+            self._proc.stdout.close()
+            self._devnull.close()
+            self._proc = None
+
+    def _terminate(self):
+        """Make sure the shell has exited after losing the connection."""
+        try:
+            self._proc.kill()
+        except OSError:
+            pass
+        self._proc.wait()
+
+    def _script(self, command):
+        """
+        Run the command in a subshell, so that it cannot change the state
+        of the shell, then print the marker and its exit code.
+        """
+        return (
+            "( {command}\n) </dev/null 2>&1; "
+            "printf '\\n%s %d\\n' {marker} $?\n".format(
+                command=command, marker=self._marker.decode()
+            )
+        ).encode()
+
+    def _read_result(self):
+        """Read the output and exit code of a command."""
+        lines = []
+        while True:
+            line = self._proc.stdout.readline()
+            if not line:
+                self._terminate()
+                raise RuntimeError(
+                    "Remote shell on {} exited unexpectedly".format(
+                        self.ssh_cfg.get("host")
+                    )
+                )
+            if line.startswith(self._marker):
+                # Remove the line break printed before the marker.
+                output = b"".join(lines)[:-1]
+                return int(line.split()[-1]), output
+            lines.append(line)
+
+    def execute_many(self, commands):
+        """
+        Send all commands at once, then read their results in order.
+
+        :param commands: Shell commands.
+        :type commands: ``list`` of ``str``
+        :return: Exit code and output of each command.
+        :rtype: ``list`` of ``tuple``
+        """
+        with self._lock:
+            if not self.active:
+                raise RuntimeError(
+                    "Remote shell on {} is not running".format(
+                        self.ssh_cfg.get("host")
+                    )
+                )
+            try:
+                self._proc.stdin.write(
+                    b"".join(self._script(command) for command in commands)
+                )
+                self._proc.stdin.flush()
+            except (IOError, OSError) as exc:
+                self._terminate()
+                raise RuntimeError(
+                    "Cannot write to remote shell on {}: {}".format(
+                        self.ssh_cfg.get("host"), exc
+                    )
+                )
+            return [self._read_result() for _ in commands]
+
+    def batch(self, commands, label=None, check=True):
+        """
+        Execute commands in a single round trip.
+
+        :param commands: Shell commands.
+        :type commands: ``list`` of ``str``
+        :param label: Optional label for debugging.
+        :type label: ``str``
+        :param check: Raise a ``RuntimeError`` if a command fails.
+        :type check: ``bool``
+        :return: Exit code of each command.
+        :rtype: ``list`` of ``int``
+        """
+        label = label or "remote shell"
+        for command in commands:
+            self.logger.debug("Executing command [%s]: '%s'", label, command)
+
+        returncodes = []
+        for command, (returncode, output) in zip(
+            commands, self.execute_many(commands)
+        ):
+            if returncode != 0:
+                self.logger.debug(
+                    "Failed executing command [%s]: '%s'", label, command
+                )
+                if output:
+                    self.logger.debug("Output:\n%s", output)
+                if check:
+                    raise RuntimeError(
+                        "Command '{}' returned with non-zero exit code"
+                        " {}".format(command, returncode)
+                    )
+            returncodes.append(returncode)
+        return returncodes
+
+    def execute(self, command, label=None, check=True):
+        """
+        Execute a command, see :py:meth:`batch`.
+
+        :return: Exit code of the command.
+        :rtype: ``int``
+        """
+        return self.batch([command], label=label, check=check)[0]
@@ -5,6 +5,7 @@ import socket
 
 from testplan.common.utils.sockets.fix.utils import utc_timestamp
 
+from .framer import FixFramer
 from .parser import tagsoverride
 
 
@@ -26,6 +27,7 @@ class Client(object):
         sendersub=None,
         interface=None,
         logger=None,
+        validate_checksum=False,
     ):
         """
         Create a new FIX client.
@@ -61,6 +63,9 @@ class Client(object):
         :type interface: (``str``, ``str`` or ``int``) tuple
         :param logger: Logger instance.
         :type logger: ``logging.Logger``
+        :param validate_checksum: Raise ``FixFramingError`` when receiving a
+          message whose CheckSum (10) does not match its bytes.
+        :type validate_checksum: ``bool``
         """
         self.host = host
         self.port = int(port)
@@ -78,6 +83,7 @@ class Client(object):
         self.msgclass = msgclass
         self.log_callback = logger.debug if logger else lambda msg: None
         self.codec = codec
+        self.framer = FixFramer(validate_checksum=validate_checksum)
         self.connection_name = "{}:{}:{}_{}{}".format(
             self.sender, self.target, self.sendersub, self.host, self.port
         )
@@ -150,23 +156,26 @@ class Client(object):
 
     def receive(self, timeout=30):
         """
-        Receive a FIX message.
+        Receive a FIX message. Bytes received after the end of the message
+        are kept for the next calls.
+
+        :param timeout: Timeout in seconds of each read from the socket.
+        :type timeout: ``int`` or ``float``
+        :raises socket.error: if the server closed the connection before a
+            complete message was received.
         """
         self.socket.settimeout(float(timeout))
 
-        buffer = self.socket.recv(8)  # 7 + 1 delimiter + checksum tag
-        while 1:
-            data = self.socket.recv(1)
-            if not data:
-                break
-            buffer += data
-            if buffer.endswith(b"\x01"):
-                if buffer[-8:].startswith(
-                    b"\x0110="
-                ):  # If received checksum tag
-                    break
+        data = self.framer.pop()
+        while data is None:
+            if not self.framer.recv_from(self.socket):
+                raise socket.error(
+                    "Connection closed with {} bytes of an incomplete"
+                    " message received".format(len(self.framer))
+                )
+            data = self.framer.pop()
         self.in_seqno += 1
-        return self.msgclass.from_buffer(buffer, self.codec)
+        return self.msgclass.from_buffer(data, self.codec)
 
     def sendlogoff(self, custom_tags=None):
         """
@@ -0,0 +1,189 @@
+"""
+Incremental framing of FIX messages received on a stream socket.
+
+A FIX message starts with the BeginString (8) and BodyLength (9) fields,
+BodyLength counts the bytes up to the CheckSum (10) field that ends it::
+
+  8=FIX.4.2|9=65|35=A|...|10=123|
+
+Bytes are received into a reusable buffer and complete messages are sliced
+from it, a read may hold several messages or only part of one.
+"""
+
+SOH = b"\x01"
+CHECKSUM_LENGTH = len(b"10=000\x01")
+
+
+class FixFramingError(ValueError):
+    """Raised when the received bytes cannot be framed as FIX messages."""
+
+
+class FixFramer(object):
+    """
+    Splits a stream of bytes into FIX messages.
+
+    .. code-block:: python
+
+      framer = FixFramer()
+      while framer.recv_from(sock):
+          for data in framer:
+              msg = msgclass.from_buffer(data, codec)
+
+    :param buffer_size: Initial size of the receive buffer, it grows to fit
+        messages that are larger.
+    :type buffer_size: ``int``
+    :param validate_checksum: Raise ``FixFramingError`` if the CheckSum (10)
+        of a message does not match its bytes.
+    :type validate_checksum: ``bool``
+    :param read_size: Minimum free space in the buffer for each read.
+    :type read_size: ``int``
+    """
+
+    def __init__(
+        self, buffer_size=65536, validate_checksum=True, read_size=4096
+    ):
+        self._buffer = bytearray(buffer_size)
+        self._start = 0  # First byte that is not framed yet
+        self._end = 0  # End of received bytes
+        self.validate_checksum = validate_checksum
+        self.read_size = read_size
+
+    def __len__(self):
+        """Number of received bytes that are not framed yet."""
+        return self._end - self._start
+
+    def __iter__(self):
+        """Pop all complete messages."""
+        while True:
+            data = self.pop()
+            if data is None:
+                return
+            yield data
+
+    def _reserve(self, size):
+        """Make room for ``size`` more bytes at the end of the buffer."""
+        if len(self._buffer) - self._end >= size:
+            return
+
+        pending = self._end - self._start
+        if self._start:
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._start, self._end = 0, pending
+
+        missing = size - (len(self._buffer) - self._end)
+        if missing > 0:
+            self._buffer.extend(bytearray(max(missing, len(self._buffer))))
+
+    def feed(self, data):
+        """
+        Add received bytes to the buffer.
+
+        :param data: Received bytes.
+        :type data: ``bytes``
+        """
+        self._reserve(len(data))
+        self._buffer[self._end : self._end + len(data)] = data
+        self._end += len(data)
+
+    def recv_from(self, sock):
+        """
+        Receive available bytes from a socket straight into the buffer.
+
+        :param sock: Connected socket, its timeout applies.
+        :type sock: ``socket.socket``
+        :return: Number of bytes received, 0 if the peer closed the socket.
+        :rtype: ``int``
+        """
+        self._reserve(self.read_size)
+        view = memoryview(self._buffer)[self._end :]
+        try:
+            received = sock.recv_into(view)
+        finally:
+            # Release the view, the buffer cannot be resized while exported.
+            del view
+        self._end += received
+        return received
+
+    def _field_end(self, start, tag):
+        """End of the ``tag=value`` field at ``start``, None if incomplete."""
+        end = self._buffer.find(SOH, start, self._end)
+        if end == -1:
+            return None
+        if not self._buffer.startswith(tag, start, end):
+            raise FixFramingError(
+                "Expected tag {!r} at offset {}, got {!r}".format(
+                    tag, start, bytes(self._buffer[start:end])
+                )
+            )
+        return end
+
+    def pop(self):
+        """
+        Remove the next complete message from the buffer.
+
+        :return: Bytes of the message, or None if no complete message has
+            been received yet.
+        :rtype: ``bytes`` or ``NoneType``
+        :raises FixFramingError: if the bytes are not a FIX message.
+        """
+        start = self._start
+        begin_end = self._field_end(start, b"8=")
+        if begin_end is None:
+            return None
+        length_end = self._field_end(begin_end + 1, b"9=")
+        if length_end is None:
+            return None
+
+        try:
+            body_length = int(bytes(self._buffer[begin_end + 3 : length_end]))
+        except ValueError:
+            raise FixFramingError(
+                "Invalid BodyLength {!r}".format(
+                    bytes(self._buffer[begin_end + 1 : length_end])
+                )
+            )
+
+        checksum_start = length_end + 1 + body_length
+        msg_end = checksum_start + CHECKSUM_LENGTH
+        if msg_end > self._end:
+            return None
+
+        trailer = bytes(self._buffer[checksum_start:msg_end])
+        if not (trailer.startswith(b"10=") and trailer.endswith(SOH)):
+            raise FixFramingError(
+                "Expected CheckSum after BodyLength {}, got {!r}".format(
+                    body_length, trailer
+                )
+            )
+        if self.validate_checksum:
+            expected = sum(self._buffer[start:checksum_start]) % 256
+            if trailer[3:-1] != "{:03d}".format(expected).encode("ascii"):
+                raise FixFramingError(
+                    "CheckSum {!r} does not match {:03d}".format(
+                        trailer[3:-1], expected
+                    )
+                )
+
+        data = bytes(self._buffer[start:msg_end])
+        self._start = msg_end
+        if self._start == self._end:
+            self._start = self._end = 0
+        return data
+
+
+def frame(body, version="FIX.4.2"):
+    """
+    Build the bytes of a FIX message from its body fields, adding
+    BeginString, BodyLength and CheckSum.
+
+    :param body: Fields between BodyLength and CheckSum, each one terminated
+        by SOH, e.g. ``b"35=0\\x0149=A\\x01"``.
+    :type body: ``bytes``
+    :param version: BeginString of the message.
+    :type version: ``str``
+    :return: Framed message.
+    :rtype: ``bytes``
+    """
+    head = "8={}\x019={}\x01".format(version, len(body)).encode("ascii")
+    checksum = sum(bytearray(head + body)) % 256
+    return head + body + "10={:03d}\x01".format(checksum).encode("ascii")
@@ -13,6 +13,8 @@ from testplan.common.utils.timing import (
 )
 from testplan.common.utils.sockets.fix.utils import utc_timestamp
 
+from .framer import FixFramer, FixFramingError
+
 
 class ConnectionDetails(object):
     """
@@ -20,7 +22,13 @@ class ConnectionDetails(object):
     """
 
     def __init__(
-        self, connection, name=None, queue=None, in_seqno=1, out_seqno=1
+        self,
+        connection,
+        name=None,
+        queue=None,
+        in_seqno=1,
+        out_seqno=1,
+        validate_checksum=False,
     ):
         """
         Create a new ConnectionDetails. Only the connection is required
@@ -36,12 +44,16 @@ class ConnectionDetails(object):
         :type in_seqno: ``int``
         :param out_seqno: Output messages sequence number
         :type out_seqno: ``int``
+        :param validate_checksum: Validate the CheckSum (10) of received
+            messages.
+        :type validate_checksum: ``bool``
         """
         self.connection = connection
         self.name = name
         self.queue = queue
         self.in_seqno = in_seqno
         self.out_seqno = out_seqno
+        self.framer = FixFramer(validate_checksum=validate_checksum)
 
 
 def _has_logon_tag(msg):
@@ -113,6 +125,7 @@ class Server(object):
         port=0,
         version="FIX.4.2",
         logger=None,
+        validate_checksum=False,
     ):
         """
         Create a new FIX server.
@@ -135,6 +148,9 @@ class Server(object):
 
         :param logger: Logger instance to be used.
         :type logger: ``logging.Logger``
+        :param validate_checksum: Close connections that send a message whose
+          CheckSum (10) does not match its bytes.
+        :type validate_checksum: ``bool``
         """
         self._input_host = host
         self._input_port = port
@@ -143,6 +159,7 @@ class Server(object):
         self.version = version
         self.msgclass = msgclass
         self.codec = codec
+        self.validate_checksum = validate_checksum
         self.log_callback = logger.debug if logger else lambda msg: None
 
         self._listening = False
@@ -247,7 +264,9 @@ class Server(object):
         Accept new inbound connection from socket.
         """
         connection, _ = self._socket.accept()
-        conn_details = ConnectionDetails(connection)
+        conn_details = ConnectionDetails(
+            connection, validate_checksum=self.validate_checksum
+        )
         self._conndetails_by_fd[connection.fileno()] = conn_details
         self._pobj.register(
             connection.fileno(),
@@ -301,20 +320,33 @@ class Server(object):
         :param event: Event received from connection.
         :type event: ``.int``
         """
-        connection = self._conndetails_by_fd[fdesc].connection
+        conndetails = self._conndetails_by_fd[fdesc]
+        connection = conndetails.connection
         if event == select.POLLIN:
             with self._lock:
-                data = connection.recv(4096)
-                if not data:
+                if not conndetails.framer.recv_from(connection):
                     self.log_callback(
                         "Closing connection {} since no data available".format(
-                            self._conndetails_by_fd[fdesc].name
+                            conndetails.name
+                        )
+                    )
+                    self._remove_connection(fdesc)
+                    return
+
+                # A read may hold several messages, or only part of one.
+                try:
+                    for data in conndetails.framer:
+                        msg = self.msgclass.from_buffer(data, self.codec)
+                        self._process_message(fdesc, msg)
+                        if fdesc not in self._conndetails_by_fd:
+                            break  # Logged out
+                except FixFramingError as exc:
+                    self.log_callback(
+                        "Closing connection {} on invalid data: {}".format(
+                            conndetails.name, exc
                         )
                     )
                     self._remove_connection(fdesc)
-                else:
-                    msg = self.msgclass.from_buffer(data, self.codec)
-                    self._process_message(fdesc, msg)
         elif event in [select.POLLNVAL, select.POLLHUP]:
             self.log_callback(
                 "Closing connection {} event received".format(connection.name)
@@ -0,0 +1,404 @@
+"""
+Incremental transfer of local files and directories to a remote host.
+
+The content hash of every transferred file is recorded in a manifest that is
+kept on the remote host. On the next transfer only files whose hash differs
+from the manifest are sent, bundled in a single archive that is extracted
+remotely, and the files that were transferred before but no longer exist
+locally are removed.
+
+Files changed on the remote host by other means are not detected, the
+manifest has to be removed to transfer everything again.
+"""
+
+import io
+import os
+import json
+import stat
+import fnmatch
+import hashlib
+import shutil
+import tarfile
+import tempfile
+import threading
+
+from six.moves import shlex_quote
+
+from testplan.common.utils.path import hash_file
+from testplan.common.utils.process import execute_cmd
+
+MANIFEST_VERSION = 1
+
+
+def excluded(relpath, exclude):
+    """
+    Whether a path matches any of the exclude patterns, which follow rsync
+    conventions: patterns without a slash match the name of any path
+    component, other patterns match the path relative to the root.
+
+    :param relpath: POSIX path relative to the transferred directory.
+    :type relpath: ``str``
+    :param exclude: Shell style patterns.
+    :type exclude: ``list`` of ``str``
+    :rtype: ``bool``
+    """
+    parts = relpath.split("/")
+    for pattern in exclude or ():
+        pattern = pattern.rstrip("/")
+        if "/" in pattern:
+            pattern = pattern.lstrip("/")
+            if any(
+                fnmatch.fnmatch("/".join(parts[: idx + 1]), pattern)
+                for idx in range(len(parts))
+            ):
+                return True
+        elif any(fnmatch.fnmatch(part, pattern) for part in parts):
+            return True
+    return False
+
+
+class SyncCache(object):
+    """
+    State shared by the transfers of a process to several hosts: hashes of
+    local files, recomputed only when their size or modification time
+    change, and archives built for a set of changes, as hosts that are in
+    the same state receive the same archive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._bundles = {}
+        self._bundle_locks = {}
+        self.directory = None
+
+    def hash(self, path, deref_links=False):
+        """
+        Return the content hash of a local file, symbolic links that are not
+        dereferenced are hashed by their target path.
+
+        :param path: Local file path.
+        :type path: ``str``
+        :param deref_links: Hash the file that a symbolic link points to.
+        :type deref_links: ``bool``
+        :rtype: ``str``
+        """
+        stats = os.stat(path) if deref_links else os.lstat(path)
+        if stat.S_ISLNK(stats.st_mode):
+            return "link:{}".format(os.readlink(path))
+
+        key = (path, stats.st_size, stats.st_mtime)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            digest = hash_file(path)
+            with self._lock:
+                self._hashes[key] = digest
+        return digest
+
+    def bundle(self, key, build):
+        """
+        Return the path of the archive built for ``key``, calling
+        ``build(path)`` to write it the first time.
+
+        :param key: Identifier of the archive content.
+        :type key: ``str``
+        :param build: Writes the archive to the given path.
+        :type build: ``callable``
+        :rtype: ``str``
+        """
+        with self._lock:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix="testplan_sync_")
+            lock = self._bundle_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._bundles:
+                path = os.path.join(self.directory, "{}.tar.gz".format(key))
+                build(path)
+                self._bundles[key] = path
+            return self._bundles[key]
+
+    def close(self):
+        """Remove the archives."""
+        with self._lock:
+            if self.directory is not None:
+                shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+            self._bundles = {}
+            self._bundle_locks = {}
+
+
+class RemoteSync(object):
+    """
+    Transfers local files and directories to a remote host, only sending
+    what changed since the previous transfer. Remote paths must be absolute.
+
+    .. code-block:: python
+
+      sync = RemoteSync(
+          ssh_cmd, {"host": host}, copy_cmd,
+          lambda path: "{}:{}".format(host, path),
+          manifest="/var/tmp/user/testplan/sync_manifest.json",
+      )
+      sync.add("/local/workspace", "/var/tmp/user/workspace", exclude=[".git"])
+      sync.add("/local/file.cfg", "/var/tmp/user/file.cfg")
+      sync.sync()
+
+    :param ssh_cmd: Creates the command that executes a command remotely.
+    :type ssh_cmd: ``callable`` taking ssh config and a command string.
+    :param ssh_cfg: Remote host ssh configuration.
+    :type ssh_cfg: ``dict``
+    :param copy_cmd: Creates the command that copies a file to or from the
+        remote host.
+    :type copy_cmd: ``callable`` taking source and target paths.
+    :param remote_copy_path: Returns the path of a remote file in the format
+        of the copy command, e.g. ``user@host:path``.
+    :type remote_copy_path: ``callable``
+    :param manifest: Remote path of the manifest.
+    :type manifest: ``str``
+    :param cache: Hashes and archives shared with other transfers.
+    :type cache: :py:class:`SyncCache`
+    :param logger: Logger of the executed commands.
+    :type logger: ``logging.Logger``
+    """
+
+    def __init__(
+        self,
+        ssh_cmd,
+        ssh_cfg,
+        copy_cmd,
+        remote_copy_path,
+        manifest,
+        cache=None,
+        logger=None,
+    ):
+        if not manifest.startswith("/"):
+            raise ValueError(
+                "Remote manifest path must be absolute: {}".format(manifest)
+            )
+        self.ssh_cmd = ssh_cmd
+        self.ssh_cfg = ssh_cfg
+        self.copy_cmd = copy_cmd
+        self.remote_copy_path = remote_copy_path
+        self.manifest = manifest
+        self.cache = cache or SyncCache()
+        self.logger = logger
+        self._entries = []
+
+    def add(self, local, remote, exclude=None, deref_links=False):
+        """
+        Add a local file or directory to transfer.
+
+        :param local: Local file or directory path.
+        :type local: ``str``
+        :param remote: Absolute remote path of the file, or of the directory
+            that receives the content of the local directory.
+        :type remote: ``str``
+        :param exclude: Patterns of the files to skip, see
+            :py:func:`excluded`.
+        :type exclude: ``list`` of ``str``
+        :param deref_links: Transfer the files that symbolic links point to
+            instead of the links.
+        :type deref_links: ``bool``
+        """
+        if not remote.startswith("/"):
+            raise ValueError("Remote path must be absolute: {}".format(remote))
+        self._entries.append((local, remote.rstrip("/"), exclude, deref_links))
+
+    def _walk(self, local, remote, exclude, deref_links):
+        """Yield ``(remote path, local path, deref_links)`` of a directory."""
+        for root, dirs, files in os.walk(local, followlinks=deref_links):
+            relroot = os.path.relpath(root, local).replace(os.sep, "/")
+            relroot = "" if relroot == "." else relroot + "/"
+
+            names = list(files)
+            for name in sorted(dirs):
+                if excluded(relroot + name, exclude):
+                    dirs.remove(name)
+                elif not deref_links and os.path.islink(
+                    os.path.join(root, name)
+                ):
+                    # Links to directories are transferred as links.
+                    names.append(name)
+            dirs.sort()
+
+            for name in sorted(names):
+                relpath = relroot + name
+                if not excluded(relpath, exclude):
+                    yield (
+                        "{}/{}".format(remote, relpath),
+                        os.path.join(root, name),
+                        deref_links,
+                    )
+
+    def local_manifest(self):
+        """
+        Return the hashes of the local files to transfer.
+
+        :return: Remote path to ``(local path, deref_links, hash)``.
+        :rtype: ``dict``
+        """
+        files = {}
+        for local, remote, exclude, deref_links in self._entries:
+            if os.path.isdir(local):
+                items = self._walk(local, remote, exclude, deref_links)
+            elif os.path.lexists(local):
+                items = [(remote, local, deref_links)]
+            else:
+                raise IOError("Cannot transfer missing path {}".format(local))
+
+            for remote_path, local_path, deref in items:
+                try:
+                    digest = self.cache.hash(local_path, deref)
+                except (IOError, OSError):
+                    # Dangling links or files removed while walking.
+                    continue
+                files[remote_path] = (local_path, deref, digest)
+        return files
+
+    def _execute(self, cmd, label, check=True):
+        with open(os.devnull, "w") as devnull:
+            return execute_cmd(
+                cmd,
+                label=label,
+                check=check,
+                stdout=devnull,
+                logger=self.logger,
+            )
+
+    def remote_manifest(self):
+        """
+        Fetch the manifest from the remote host.
+
+        :return: Remote path to hash of the files transferred before, empty
+            if the manifest does not exist or cannot be read.
+        :rtype: ``dict``
+        """
+        directory = tempfile.mkdtemp(prefix="testplan_manifest_")
+        local_path = os.path.join(directory, "manifest.json")
+        try:
+            returncode = self._execute(
+                self.copy_cmd(
+                    self.remote_copy_path(self.manifest), local_path
+                ),
+                label="fetch sync manifest",
+                check=False,
+            )
+            if returncode != 0 or not os.path.exists(local_path):
+                return {}
+            with open(local_path) as manifest:
+                content = json.load(manifest)
+            if content.get("version") != MANIFEST_VERSION:
+                return {}
+            return content["files"]
+        except (ValueError, KeyError, AttributeError):
+            return {}
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _build_bundle(self, path, changed, deleted, manifest):
+        """Write the archive of changed files, deletions and manifest."""
+        with tarfile.open(path, "w:gz", compresslevel=6) as bundle:
+            for remote_path in sorted(changed):
+                local_path, deref, _ = changed[remote_path]
+                if deref:
+                    local_path = os.path.realpath(local_path)
+                bundle.add(
+                    local_path,
+                    arcname=remote_path.lstrip("/"),
+                    recursive=False,
+                )
+
+            for suffix, data in (
+                ("", json.dumps(manifest, sort_keys=True)),
+                (".deleted", "\0".join(sorted(deleted))),
+            ):
+                content = data.encode("utf-8")
+                info = tarfile.TarInfo((self.manifest + suffix).lstrip("/"))
+                info.size = len(content)
+                info.mtime = 0
+                bundle.addfile(info, io.BytesIO(content))
+
+    def sync(self):
+        """
+        Transfer the changed files to the remote host in a single archive,
+        remove the files that no longer exist locally and update the remote
+        manifest.
+
+        :return: Number of transferred and of removed files.
+        :rtype: ``tuple`` of ``int``
+        """
+        local = self.local_manifest()
+        remote = self.remote_manifest()
+
+        changed = {
+            remote_path: item
+            for remote_path, item in local.items()
+            if remote.get(remote_path) != item[2]
+        }
+        deleted = [
+            remote_path for remote_path in remote if remote_path not in local
+        ]
+        if not changed and not deleted:
+            if self.logger:
+                self.logger.debug("Remote files are up to date")
+            return 0, 0
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "files": {
+                remote_path: item[2] for remote_path, item in local.items()
+            },
+        }
+        key = hashlib.sha1(
+            json.dumps(
+                [
+                    self.manifest,
+                    sorted(
+                        (remote_path, item[0], item[2])
+                        for remote_path, item in changed.items()
+                    ),
+                    sorted(deleted),
+                    sorted(manifest["files"].items()),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+        bundle = self.cache.bundle(
+            key,
+            lambda path: self._build_bundle(path, changed, deleted, manifest),
+        )
+
+        remote_dir = self.manifest.rpartition("/")[0] or "/"
+        remote_bundle = "{}.{}.tar.gz".format(self.manifest, key[:12])
+        deletions = "{}.deleted".format(self.manifest)
+        self._execute(
+            self.ssh_cmd(
+                self.ssh_cfg, "mkdir -p {}".format(shlex_quote(remote_dir))
+            ),
+            label="create sync dir",
+        )
+        self._execute(
+            self.copy_cmd(bundle, self.remote_copy_path(remote_bundle)),
+            label="transfer sync bundle",
+        )
+        self._execute(
+            self.ssh_cmd(
+                self.ssh_cfg,
+                "tar -xzf {bundle} -C / && "
+                "if [ -s {deletions} ]; then "
+                "xargs -0 rm -f < {deletions}; fi; "
+                "rm -f {bundle} {deletions}".format(
+                    bundle=shlex_quote(remote_bundle),
+                    deletions=shlex_quote(deletions),
+                ),
+            ),
+            label="extract sync bundle",
+        )
+        if self.logger:
+            self.logger.debug(
+                "Transferred %d files, removed %d files",
+                len(changed),
+                len(deleted),
+            )
+        return len(changed), len(deleted)
@@ -32,7 +32,7 @@ class TableEntry(object):
     def __len__(self):
         if not self.table:
             return 0
-        elif isinstance(self.table[0], list):
+        elif isinstance(self.table[0], (list, tuple)):
             return len(self.table) - 1
         return len(self.table)
 
@@ -99,6 +99,30 @@ class TableEntry(object):
 
         return formatted_table
 
+    def as_columns(self):
+        """
+        Returns the table as columns, without building a row for each
+        ``list`` of the table.
+
+        :return: the values of each column, by column name
+        :rtype: ``OrderedDict`` of ``list``
+        """
+        table = self.table
+        columns = collections.OrderedDict()
+
+        if isinstance(table[0], (list, tuple)):
+            values = list(zip(*table[1:])) if len(table) > 1 else []
+            for col_idx, column in enumerate(table[0]):
+                columns[column] = (
+                    list(values[col_idx]) if col_idx < len(values) else []
+                )
+        else:
+            assert isinstance(table[0], dict)
+            for column in table[0].keys():
+                columns[column] = [row[column] for row in table]
+
+        return columns
+
     def as_list_of_dict(self, keep_column_order=False):
         """
         Returns the table as ``list`` of ``dict``
@@ -129,7 +129,7 @@ def timeout(seconds, err_msg="Timeout after {} seconds."):
     return timeout_decorator
 
 
-def wait(predicate, timeout, interval=0.05, raise_on_timeout=True):
+def wait(predicate, timeout, interval=0.05, raise_on_timeout=True, sleep=None):
     """
     Wait until a predicate evaluates to True.
 
@@ -141,9 +141,14 @@ def wait(predicate, timeout, interval=0.05, raise_on_timeout=True):
     :type interval: ``float``
     :param raise_on_timeout: Raise exception if hits timeout, defaults to True.
     :type raise_on_timeout: ``bool``
+    :param sleep: Called with ``interval`` between predicate checks, it may
+        return early (e.g. when a watched file changes). Defaults to
+        ``time.sleep``.
+    :type sleep: ``callable``
     :return: Predicate result.
     :rtype: ``bool``
     """
+    sleep = sleep or time.sleep
     start_time = time.time()
     end_time = start_time + timeout
     while True:
@@ -153,7 +158,7 @@ def wait(predicate, timeout, interval=0.05, raise_on_timeout=True):
             return res
         elif time.time() < end_time:
             # no timeout yet
-            time.sleep(interval)
+            sleep(interval)
         else:
             if raise_on_timeout:
                 msg = "Timeout after {} seconds.".format(timeout)
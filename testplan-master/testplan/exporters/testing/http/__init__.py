@@ -11,7 +11,6 @@ from schema import Or, And, Use
 from testplan.common.config import ConfigOption
 from testplan.common.utils.validation import is_valid_url
 from testplan.common.exporters import ExporterConfig
-from testplan.report.testing.schemas import TestReportSchema
 
 from ..base import Exporter
 
@@ -86,8 +85,7 @@ class HTTPExporter(Exporter):
     def export(self, source):
 
         http_url = self.cfg.http_url
-        test_plan_schema = TestReportSchema(strict=True)
-        data = test_plan_schema.dump(source).data
+        data = source.serialize()
         _, errmsg = self._upload_report(http_url, data)
 
         if errmsg:
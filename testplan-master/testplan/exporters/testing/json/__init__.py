@@ -7,19 +7,30 @@ from __future__ import absolute_import
 import os
 import json
 import copy
+import gzip
 import hashlib
 
+import six
+
 from testplan import defaults
 
 from testplan.common.config import ConfigOption
 from testplan.common.exporters import ExporterConfig
 from testplan.common.utils.path import makedirs
 
-from testplan.report import ReportCategories
-from testplan.report.testing.schemas import TestReportSchema
+from testplan.report import ReportCategories, TestCaseReport
+from testplan.report.testing.schemas import (
+    TestReportSchema,
+    TestGroupReportSchema,
+    TestCaseReportSchema,
+)
 
 from ..base import Exporter, save_attachments
 
+# Number of assertions of a testcase between two offsets in the index of the
+# assertions JSON report.
+ASSERTIONS_INDEX_STRIDE = 100
+
 
 def gen_attached_report_names(json_path):
     """
@@ -36,6 +47,240 @@ def gen_attached_report_names(json_path):
     )
 
 
+def gen_assertions_index_name(json_path):
+    """
+    Generate the file name of the index of the assertions JSON report.
+    """
+    basename, _ = os.path.splitext(os.path.basename(json_path))
+    digest = hashlib.md5(
+        os.path.realpath(json_path).encode("utf-8")
+    ).hexdigest()
+    return "{}-assertions-index-{}.json".format(basename, digest)
+
+
+def _json_array(items):
+    """JSON chunks of an array, ``items`` are iterables of JSON chunks."""
+    yield "["
+    for idx, chunks in enumerate(items):
+        if idx:
+            yield ", "
+        for chunk in chunks:
+            yield chunk
+    yield "]"
+
+
+def _json_mapping(items):
+    """
+    JSON chunks of an object, ``items`` are (key, iterable of JSON chunks)
+    pairs.
+    """
+    yield "{"
+    for idx, (key, chunks) in enumerate(items):
+        yield "{}{}: ".format(", " if idx else "", json.dumps(key))
+        for chunk in chunks:
+            yield chunk
+    yield "}"
+
+
+def _json_object(data, entries):
+    """
+    JSON chunks of the ``data`` dictionary, extended with an ``entries``
+    array that is streamed from the iterables of JSON chunks in ``entries``.
+    """
+    head = json.dumps(data)
+    yield '{}{}"entries": '.format(head[:-1], ", " if data else "")
+    for chunk in _json_array(entries):
+        yield chunk
+    yield "}"
+
+
+class ReportStreamer(object):
+    """
+    Serializes a test report into JSON chunks, one report node at a time,
+    so the serialized form of the whole report is never held in memory.
+
+    :param split: Leave the assertions of testcases out of the structure of
+        the report, they are streamed separately by :py:meth:`assertions`.
+    :type split: ``bool``
+    """
+
+    def __init__(self, split=False):
+        self.split = split
+        self._report_schema = TestReportSchema(
+            strict=True, exclude=("entries",)
+        )
+        self._group_schema = TestGroupReportSchema(
+            strict=True, exclude=("entries",)
+        )
+        self._testcase_schema = TestCaseReportSchema(
+            strict=True, exclude=("entries",)
+        )
+        self._entries_schema = TestCaseReportSchema(
+            strict=True, only=("entries",)
+        )
+
+    def report(self, source, **extra):
+        """
+        JSON chunks of the root report, equivalent to the dump of
+        :py:class:`~testplan.report.testing.schemas.TestReportSchema`
+        updated with ``extra``. Its entries are left empty if split.
+        """
+        data = self._report_schema.dump(source).data
+        data.update(extra)
+        if self.split:
+            data["entries"] = []
+            return iter([json.dumps(data)])
+        return _json_object(data, (self._node(entry) for entry in source))
+
+    def structure(self, source):
+        """JSON chunks of the entries of the root report."""
+        return _json_array(self._node(entry) for entry in source)
+
+    def assertions(self, source, index=None):
+        """
+        JSON chunks of the assertions of all testcases, nested in objects
+        keyed by the names of their parents.
+
+        :param index: Filled with the location of the assertions of each
+            testcase in the output, keyed by the UIDs of the testcase and its
+            parents joined with ``/``, see :py:func:`read_assertions`.
+        :type index: ``dict``
+        """
+        # Chunks only hold ASCII characters, as non ASCII characters are
+        # escaped by ``json.dumps``, so their length is their size in bytes.
+        position = [0]
+
+        def testcase(report, uids):
+            entries = self._entries_schema.dump(report).data["entries"]
+            start = position[0]
+            checkpoints = []
+            offset = start + 1
+            yield "["
+            for idx, entry in enumerate(entries):
+                if idx:
+                    yield ", "
+                    offset += 2
+                if idx % ASSERTIONS_INDEX_STRIDE == 0:
+                    checkpoints.append(offset)
+                chunk = json.dumps(entry)
+                offset += len(chunk)
+                yield chunk
+            yield "]"
+            if index is not None:
+                index["/".join(six.text_type(uid) for uid in uids)] = {
+                    "offset": start,
+                    "length": offset + 1 - start,
+                    "count": len(entries),
+                    "checkpoints": checkpoints,
+                }
+
+        def node(report, uids):
+            if isinstance(report, TestCaseReport):
+                return testcase(report, uids)
+            return _json_mapping(
+                (entry.name, node(entry, uids + [entry.uid]))
+                for entry in report
+            )
+
+        for chunk in _json_mapping(
+            [(source.name, node(source, [source.uid]))]
+        ):
+            yield chunk
+            position[0] += len(chunk)
+
+    def _node(self, report):
+        if isinstance(report, TestCaseReport):
+            if self.split:
+                data = self._testcase_schema.dump(report).data
+                data["entries"] = []
+            else:
+                data = self._entries_schema.dump(report).data
+                data.update(self._testcase_schema.dump(report).data)
+            return iter([json.dumps(data)])
+
+        data = self._group_schema.dump(report).data
+        return _json_object(data, (self._node(entry) for entry in report))
+
+
+def write_json(path, chunks, compress=False):
+    """
+    Write JSON chunks to a file, gzip compressed if ``compress`` is set.
+
+    :param path: Path of the output file.
+    :type path: ``str``
+    :param chunks: JSON chunks, e.g. from :py:class:`ReportStreamer`.
+    :type chunks: ``iterable`` of ``str``
+    :param compress: Write a gzip compressed file.
+    :type compress: ``bool``
+    """
+    opener = gzip.open if compress else open
+    with opener(path, "wb") as json_file:
+        for chunk in chunks:
+            json_file.write(chunk.encode("utf-8"))
+
+
+def load_json(path):
+    """
+    Load a JSON file written by :py:func:`write_json`, which may be gzip
+    compressed.
+
+    :param path: Path of the JSON file.
+    :type path: ``str``
+    :return: Loaded JSON data.
+    """
+    with open(path, "rb") as json_file:
+        compressed = json_file.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as json_file:
+        return json.loads(json_file.read().decode("utf-8"))
+
+
+def read_assertions(path, location, start=0, stop=None):
+    """
+    Read a range of the assertions of a testcase from an assertions JSON
+    report, without loading the rest of the file.
+
+    :param path: Path of the assertions JSON report, which may be gzip
+        compressed, though uncompressed files are read much faster.
+    :type path: ``str``
+    :param location: Index entry of the testcase, as built by
+        :py:meth:`ReportStreamer.assertions`.
+    :type location: ``dict``
+    :param start: Index of the first assertion to read.
+    :type start: ``int``
+    :param stop: Index after the last assertion to read, all remaining
+        assertions by default.
+    :type stop: ``int``
+    :return: Serialized assertions.
+    :rtype: ``list`` of ``dict``
+    """
+    count = location["count"]
+    stop = count if stop is None else min(stop, count)
+    if start >= stop:
+        return []
+
+    checkpoints = location["checkpoints"]
+    first = start // ASSERTIONS_INDEX_STRIDE
+    last = -(-stop // ASSERTIONS_INDEX_STRIDE)
+    begin = checkpoints[first]
+    if last < len(checkpoints):
+        end = checkpoints[last]
+    else:
+        # Up to the closing bracket of the testcase assertions.
+        end = location["offset"] + location["length"] - 1
+
+    with open(path, "rb") as json_file:
+        compressed = json_file.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as json_file:
+        json_file.seek(begin)
+        data = json_file.read(end - begin).decode("utf-8")
+
+    entries = json.loads("[{}]".format(data.rstrip().rstrip(",")))
+    skip = first * ASSERTIONS_INDEX_STRIDE
+    return entries[start - skip : stop - skip]
+
+
 class JSONExporterConfig(ExporterConfig):
     """
     Configuration object for
@@ -51,6 +296,9 @@ class JSONExporterConfig(ExporterConfig):
             # `split_json_report` enabled it generates a main JSON file with 2
             # attachments, this is useful when there's some limit on file size.
             ConfigOption("split_json_report", default=False): bool,
+            # Compress the JSON report (and its attachments, if split) with
+            # gzip, `json_path` is used as is for the compressed file.
+            ConfigOption("compress_json_report", default=False): bool,
         }
 
 
@@ -62,6 +310,8 @@ class JSONExporter(Exporter):
     :type json_path: ``str``
     :param split_json_report: Split a single json report into several parts.
     :type split_json_report: ``bool``
+    :param compress_json_report: Write gzip compressed json files.
+    :type compress_json_report: ``bool``
 
     Also inherits all
     :py:class:`~testplan.exporters.testing.base.Exporter` options.
@@ -70,12 +320,15 @@ class JSONExporter(Exporter):
     CONFIG = JSONExporterConfig
 
     def export(self, source):
-
+        """
+        Stream the report to ``json_path``, serializing one testcase at a
+        time instead of building the whole JSON document in memory.
+        """
         json_path = self.cfg.json_path
+        compress = self.cfg.compress_json_report
 
         if len(source):
-            test_plan_schema = TestReportSchema(strict=True)
-            data = test_plan_schema.dump(source).data
+            streamer = ReportStreamer(split=self.cfg.split_json_report)
             attachments_dir = os.path.join(
                 os.path.dirname(json_path), defaults.ATTACHMENTS
             )
@@ -86,6 +339,10 @@ class JSONExporter(Exporter):
                     structure_filename,
                     assertions_filename,
                 ) = gen_attached_report_names(json_path)
+                index_filename = gen_assertions_index_name(json_path)
+                if compress:
+                    structure_filename += ".gz"
+                    assertions_filename += ".gz"
                 structure_filepath = os.path.join(
                     attachments_dir, structure_filename
                 )
@@ -93,31 +350,44 @@ class JSONExporter(Exporter):
                     attachments_dir, assertions_filename
                 )
 
-                meta, structure, assertions = self.split_json_report(data)
                 makedirs(attachments_dir)
-
-                with open(structure_filepath, "w") as json_file:
-                    json.dump(structure, json_file)
-                with open(assertions_filepath, "w") as json_file:
-                    json.dump(assertions, json_file)
+                write_json(
+                    structure_filepath, streamer.structure(source), compress
+                )
+                testcases = {}
+                write_json(
+                    assertions_filepath,
+                    streamer.assertions(source, testcases),
+                    compress,
+                )
+                # The index is small and loaded whole, it is never compressed.
+                index_filepath = os.path.join(attachments_dir, index_filename)
+                index = {
+                    "assertions_file": assertions_filename,
+                    "testcases": testcases,
+                }
+                write_json(index_filepath, iter([json.dumps(index)]))
 
                 save_attachments(report=source, directory=attachments_dir)
-                meta["version"] = 2
                 # Modify dict ref may change the original `TestReport` object
-                meta["attachments"] = copy.deepcopy(meta["attachments"])
-                meta["attachments"][structure_filename] = structure_filepath
-                meta["attachments"][assertions_filename] = assertions_filepath
-                meta["structure_file"] = structure_filename
-                meta["assertions_file"] = assertions_filename
-
-                with open(json_path, "w") as json_file:
-                    json.dump(meta, json_file)
+                attachments = copy.deepcopy(source.attachments)
+                attachments[structure_filename] = structure_filepath
+                attachments[assertions_filename] = assertions_filepath
+                attachments[index_filename] = index_filepath
+                meta = streamer.report(
+                    source,
+                    version=2,
+                    attachments=attachments,
+                    structure_file=structure_filename,
+                    assertions_file=assertions_filename,
+                    assertions_index=index_filename,
+                )
+                write_json(json_path, meta, compress)
             else:
                 save_attachments(report=source, directory=attachments_dir)
-                data["version"] = 1
-
-                with open(json_path, "w") as json_file:
-                    json.dump(data, json_file)
+                write_json(
+                    json_path, streamer.report(source, version=1), compress
+                )
 
             self.logger.exporter_info(
                 "JSON generated at %s", os.path.abspath(json_path)
@@ -12,7 +12,6 @@ from testplan.common.utils.timing import wait
 from testplan.common.utils import networking
 from testplan.common.config import ConfigOption
 from testplan.common.exporters import ExporterConfig
-from testplan.report.testing.schemas import TestReportSchema
 from testplan.web_ui import web_app
 from ..base import Exporter, save_attachments
 
@@ -75,8 +74,7 @@ class WebServerExporter(Exporter):
             )
             return
 
-        test_plan_schema = TestReportSchema(strict=True)
-        data = test_plan_schema.dump(source).data
+        data = source.serialize()
 
         # Save the Testplan report as a JSON.
         with open(defaults.JSON_PATH, "w") as json_file:
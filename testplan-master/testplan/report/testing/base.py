@@ -50,7 +50,9 @@ import getpass
 import platform
 import hashlib
 import itertools
+import threading
 import traceback
+import contextlib
 
 from collections import Counter
 
@@ -226,6 +228,16 @@ class BaseReportGroup(ReportGroup):
             "timer",
         ]
 
+    @property
+    def status_override(self):
+        """Status that takes precedence over the one of the child entries."""
+        return self._status_override
+
+    @status_override.setter
+    def status_override(self, new_status):
+        self._status_override = new_status
+        self._invalidate_cache()
+
     @property
     def passed(self):
         """Shortcut for getting if report status should be considered passed."""
@@ -265,18 +277,25 @@ class BaseReportGroup(ReportGroup):
         otherwise we fall back to precedent status from `self.entries`.
 
         If a report group has no children, it is assumed to be passing.
+
+        The status derived from `self.entries` is cached until the report or
+        one of its descendants changes.
         """
         if self.status_override:
             return self.status_override
 
         if self.entries:
-            return Status.precedent([entry.status for entry in self])
+            return self._cached(
+                "status",
+                lambda: Status.precedent([entry.status for entry in self]),
+            )
 
         return self._status
 
     @status.setter
     def status(self, new_status):
         self._status = new_status
+        self._invalidate_cache()
 
     @property
     def running(self):
@@ -294,8 +313,11 @@ class BaseReportGroup(ReportGroup):
         A test group inherits its runtime status from its child entries.
         """
         if self.entries:
-            return RuntimeStatus.precedent(
-                [entry.runtime_status for entry in self]
+            return self._cached(
+                "runtime_status",
+                lambda: RuntimeStatus.precedent(
+                    [entry.runtime_status for entry in self]
+                ),
             )
 
         return self._runtime_status
@@ -306,6 +328,7 @@ class BaseReportGroup(ReportGroup):
         for entry in self:
             entry.runtime_status = new_status
         self._runtime_status = new_status
+        self._invalidate_cache()
 
     def merge_children(self, report, strict=True):
         """
@@ -342,8 +365,12 @@ class BaseReportGroup(ReportGroup):
     def counter(self):
         """
         Return counts for each status, will recursively get aggregates from
-        children and so on.
+        children and so on. Counts are cached until the report or one of its
+        descendants changes, a copy is returned.
         """
+        return self._cached("counter", self._count).copy()
+
+    def _count(self):
         counter = Counter({Status.PASSED: 0, Status.FAILED: 0, "total": 0})
 
         for child in self:
@@ -441,6 +468,9 @@ class TestReport(BaseReportGroup):
     Only contains TestGroupReports as children.
     """
 
+    # Serialized data shared while a snapshot is taken, see `snapshot()`.
+    _snapshot = None
+
     def __init__(
         self,
         meta=None,
@@ -535,6 +565,31 @@ class TestReport(BaseReportGroup):
             "meta",
         ]
 
+    def __getstate__(self):
+        # Snapshot lock cannot be copied, copies are not in the snapshot.
+        state = super(TestReport, self).__getstate__()
+        state.pop("_snapshot", None)
+        return state
+
+    @contextlib.contextmanager
+    def snapshot(self):
+        """
+        Context manager within which the report is serialized at most once,
+        the result of ``serialize()`` is shared by all of its (possibly
+        concurrent) callers, which must not modify it. The report itself
+        must not be modified within the context.
+
+        .. code-block:: python
+
+            with report.snapshot():
+                ...  # run exporters
+        """
+        self._snapshot = {"lock": threading.Lock()}
+        try:
+            yield self
+        finally:
+            self._snapshot = None
+
     def serialize(self):
         """
         Shortcut for serializing test report data
@@ -542,7 +597,16 @@ class TestReport(BaseReportGroup):
         """
         from .schemas import TestReportSchema
 
-        return TestReportSchema(strict=True).dump(self).data
+        snapshot = self._snapshot
+        if snapshot is None:
+            return TestReportSchema(strict=True).dump(self).data
+
+        with snapshot["lock"]:
+            if "data" not in snapshot:
+                snapshot["data"] = (
+                    TestReportSchema(strict=True).dump(self).data
+                )
+            return snapshot["data"]
 
     @classmethod
     def deserialize(cls, data):
@@ -804,6 +868,16 @@ class TestCaseReport(Report):
             "tags_index",
         ]
 
+    @property
+    def status_override(self):
+        """Status that takes precedence over the one of the entries."""
+        return self._status_override
+
+    @status_override.setter
+    def status_override(self, new_status):
+        self._status_override = new_status
+        self._invalidate_cache()
+
     @property
     def passed(self):
         """Shortcut for getting if report status should be considered passed."""
@@ -842,13 +916,14 @@ class TestCaseReport(Report):
             return self.status_override
 
         if self.entries:
-            return self._assertions_status()
+            return self._cached("status", self._assertions_status)
 
         return self._status
 
     @status.setter
     def status(self, new_status):
         self._status = new_status
+        self._invalidate_cache()
 
     @property
     def running(self):
@@ -877,6 +952,7 @@ class TestCaseReport(Report):
             self._status = Status.UNKNOWN
         if new_status == "finished":
             self._status = Status.PASSED
+        self._invalidate_cache()
 
     def _assertions_status(self):
         for entry in self:
@@ -988,3 +1064,4 @@ class TestCaseReport(Report):
         """Mark as PASSED if this testcase contains no entries."""
         if not self.entries:
             self._status = Status.PASSED
+            self._invalidate_cache()
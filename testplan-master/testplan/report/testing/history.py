@@ -0,0 +1,231 @@
+"""
+Runtime history of testcases, learned from the timers of previous reports.
+
+The history is stored in a small, append-only file where every line is a
+JSON encoded ``[uid, elapsed]`` pair. A testcase is identified by the names
+of its MultiTest, testsuite and itself, joined with ``/``, as report uids are
+reset to random values by default:
+
+.. code-block:: python
+
+  ["MyMultiTest/MySuite/test_method_x", 0.125]
+  ["MyMultiTest/MySuite/test_method_y <value=1>", 12.5]
+
+Recording the same uid again appends a new line, and the expected runtime is
+an exponentially weighted average of all the recorded values.
+"""
+import os
+import io
+import json
+
+from testplan.common.utils.path import makedirs
+
+from .base import TestCaseReport, ReportCategories
+
+
+def testcase_uid(test_name, suite_name, case_name):
+    """
+    Uid of a testcase in the runtime history.
+
+    :param test_name: Name of the test instance.
+    :type test_name: ``str``
+    :param suite_name: Name of the testsuite.
+    :type suite_name: ``str``
+    :param case_name: Name of the testcase, including the parameters of
+        parametrized testcases.
+    :type case_name: ``str``
+    :return: History uid of the testcase.
+    :rtype: ``str``
+    """
+    return "/".join((test_name, suite_name, case_name))
+
+
+def _elapsed(interval):
+    """Duration of a timer interval, or None if not finished."""
+    if interval is None:
+        return None
+    return interval.elapsed
+
+
+class RuntimeHistory(object):
+    """
+    Expected runtimes of testcases, keyed by their history uid.
+
+    :param path: Path of the history file, it is created when first
+        recording to it.
+    :type path: ``str``
+    :param weight: Weight of the most recent record in the expected runtime,
+        greater than 0 and up to 1 (only keep the latest record).
+    :type weight: ``float``
+    """
+
+    def __init__(self, path, weight=0.5):
+        if not 0 < weight <= 1:
+            raise ValueError(
+                "History weight must be in (0, 1], got {}".format(weight)
+            )
+        self.path = path
+        self.weight = weight
+        self._expected = {}
+        if os.path.exists(self.path):
+            self._load()
+
+    def __len__(self):
+        return len(self._expected)
+
+    def __contains__(self, uid):
+        return uid in self._expected
+
+    def _load(self):
+        with io.open(self.path, "r", encoding="utf-8") as history_file:
+            for line in history_file:
+                try:
+                    uid, elapsed = json.loads(line)
+                except ValueError:
+                    # Partially written line of an interrupted run.
+                    continue
+                self._update(uid, float(elapsed))
+
+    def _update(self, uid, elapsed):
+        previous = self._expected.get(uid)
+        if previous is None:
+            self._expected[uid] = elapsed
+        else:
+            self._expected[uid] = (
+                self.weight * elapsed + (1 - self.weight) * previous
+            )
+
+    def expected(self, uid, default=None):
+        """
+        Expected runtime of a testcase.
+
+        :param uid: History uid of the testcase.
+        :type uid: ``str``
+        :param default: Value returned for unknown testcases.
+        :type default: ``float``
+        :return: Expected runtime in seconds.
+        :rtype: ``float``
+        """
+        return self._expected.get(uid, default)
+
+    def items(self):
+        """(uid, expected runtime) pairs of all known testcases."""
+        return self._expected.items()
+
+    def record(self, durations):
+        """
+        Append runtimes to the history.
+
+        :param durations: (uid, elapsed seconds) pairs.
+        :type durations: ``iterable`` of ``tuple``
+        """
+        lines = []
+        for uid, elapsed in durations:
+            if elapsed is None:
+                continue
+            self._update(uid, float(elapsed))
+            lines.append(
+                json.dumps([uid, round(elapsed, 4)], ensure_ascii=False)
+            )
+
+        if not lines:
+            return
+
+        makedirs(os.path.dirname(os.path.abspath(self.path)))
+        with io.open(self.path, "a", encoding="utf-8") as history_file:
+            history_file.write(u"\n".join(lines) + u"\n")
+
+    def record_report(self, report):
+        """
+        Append the runtimes of all finished testcases of a report.
+
+        :param report: Test plan or test instance report.
+        :type report: :py:class:`~testplan.report.testing.base.TestReport`
+            or :py:class:`~testplan.report.testing.base.TestGroupReport`
+        """
+        self.record(report_durations(report))
+
+    def record_json_report(self, json_path):
+        """
+        Append the runtimes of all testcases of a JSON report file, as
+        generated by
+        :py:class:`~testplan.exporters.testing.json.JSONExporter`.
+
+        :param json_path: Path of the JSON report.
+        :type json_path: ``str``
+        """
+        self.record(json_report_durations(json_path))
+
+    def compact(self):
+        """Rewrite the history file with a single line per uid."""
+        tmp_path = "{}.tmp".format(self.path)
+        with io.open(tmp_path, "w", encoding="utf-8") as history_file:
+            for uid, elapsed in sorted(self._expected.items()):
+                history_file.write(
+                    json.dumps([uid, round(elapsed, 4)], ensure_ascii=False)
+                    + u"\n"
+                )
+        os.rename(tmp_path, self.path)
+
+
+def report_durations(report, test_name=None, suite_name=None):
+    """
+    Generate (history uid, elapsed seconds) pairs for the testcases of a
+    report tree.
+    """
+    if isinstance(report, TestCaseReport):
+        if test_name is not None and suite_name is not None:
+            yield (
+                testcase_uid(test_name, suite_name, report.name),
+                _elapsed(report.timer.get("run")),
+            )
+        return
+
+    category = getattr(report, "category", None)
+    if category == ReportCategories.TESTSUITE:
+        suite_name = report.name
+    elif category != ReportCategories.PARAMETRIZATION and category:
+        test_name, suite_name = report.name, None
+
+    for entry in report:
+        for item in report_durations(entry, test_name, suite_name):
+            yield item
+
+
+def json_report_durations(json_path):
+    """
+    Generate (history uid, elapsed seconds) pairs for the testcases of a
+    JSON report, which may be split into structure and assertions files and
+    gzip compressed.
+    """
+    from testplan.exporters.testing.json import load_json
+    from .schemas import IntervalSchema
+
+    data = load_json(json_path)
+    entries = data["entries"]
+    if data.get("structure_file"):
+        entries = load_json(data["attachments"][data["structure_file"]])
+
+    def walk(entries, test_name, suite_name):
+        for entry in entries:
+            category = entry.get("category")
+            if category == ReportCategories.TESTCASE:
+                run = entry.get("timer", {}).get("run")
+                if run and test_name is not None and suite_name is not None:
+                    yield (
+                        testcase_uid(test_name, suite_name, entry["name"]),
+                        _elapsed(IntervalSchema(strict=True).load(run).data),
+                    )
+                continue
+
+            if category == ReportCategories.TESTSUITE:
+                names = (test_name, entry["name"])
+            elif category == ReportCategories.PARAMETRIZATION:
+                names = (test_name, suite_name)
+            else:
+                names = (entry["name"], None)
+
+            for item in walk(entry.get("entries", []), *names):
+                yield item
+
+    return walk(entries, None, None)
@@ -8,6 +8,8 @@ import uuid
 import webbrowser
 from collections import OrderedDict
 
+from concurrent import futures
+
 import pytz
 from schema import Or, And, Use
 
@@ -31,9 +33,11 @@ from testplan.report import (
     Status,
     ReportCategories,
 )
+from testplan.report.testing import history
 from testplan.report.testing.styles import Style
 from testplan.runnable.interactive import TestRunnerIHandler
 from testplan.runners.base import Executor
+from testplan.runners.pools.scheduling import critical_path, task_history_uid
 from testplan.runners.pools.tasks import Task, TaskResult
 from testplan.testing import listing, filtering, ordering, tagging
 from testplan.testing.base import TestResult
@@ -114,6 +118,9 @@ class TestRunnerConfig(RunnableConfig):
                 "shuffle_seed", default=float(random.randint(1, 9999))
             ): float,
             ConfigOption("exporters", default=None): Use(get_exporters),
+            ConfigOption("exporter_workers", default=1): And(
+                int, lambda n: n > 0
+            ),
             ConfigOption("stdout_style", default=defaults.STDOUT_STYLE): Style,
             ConfigOption("report_dir", default=defaults.REPORT_DIR): Or(
                 str, None
@@ -130,6 +137,9 @@ class TestRunnerConfig(RunnableConfig):
                 Use(tagging.validate_tag_value)
             ],
             ConfigOption("merge_scheduled_parts", default=False): bool,
+            ConfigOption("runtime_history", default=None): Or(
+                None, str, history.RuntimeHistory
+            ),
             ConfigOption("browse", default=False): bool,
             ConfigOption("ui_port", default=None): Or(None, int),
             ConfigOption(
@@ -158,6 +168,9 @@ class TestRunnerConfig(RunnableConfig):
             ): object,
             ConfigOption("reset_report_uid", default=True): bool,
             ConfigOption("extra_deps", default=[]): list,
+            ConfigOption("interactive_parallel", default=1): And(
+                int, lambda n: n >= 1
+            ),
         }
 
 
@@ -225,6 +238,9 @@ class TestRunner(Runnable):
     :type shuffle_seed: ``float``
     :param exporters: Exporters for reports creation.
     :type exporters: ``list``
+    :param exporter_workers: Number of threads exporters run on after the
+        tests, exporters run one after another if it is 1.
+    :type exporter_workers: ``int``
     :param stdout_style: Styling output options.
     :type stdout_style:
         :py:class:`Style <testplan.report.testing.styles.Style>`
@@ -244,8 +260,13 @@ class TestRunner(Runnable):
     :type report_tags: ``list``
     :param report_tags_all: Match tests marked with all of the given tags.
     :type report_tags_all: ``list``
-    :param merge_scheduled_parts: Merge report of scheduled MultiTest parts.
+    :param merge_scheduled_parts: Merge report of scheduled MultiTest parts
+        and GTest shards.
     :type merge_scheduled_parts: ``bool``
+    :param runtime_history: Record the runtimes of tasks and testcases of
+        this run into the given runtime history, or path to its file.
+    :type runtime_history: ``NoneType`` or ``str`` or
+        :py:class:`~testplan.report.testing.history.RuntimeHistory`
     :param browse: Open web browser to display the test report.
     :type browse: ``bool`` or ``NoneType``
     :param ui_port: Port of web server for displaying test report.
@@ -274,6 +295,9 @@ class TestRunner(Runnable):
         `TestRunnerIHandler <testplan.runnable.interactive.TestRunnerIHandler>`
     :param extra_deps: Extra module dependencies for interactive reload.
     :type extra_deps: ``list`` of ``module``
+    :param interactive_parallel: Number of tests run, or whose environments
+        are started, concurrently in interactive mode.
+    :type interactive_parallel: ``int``
 
     Also inherits all
     :py:class:`~testplan.common.entity.base.Runnable` options.
@@ -383,7 +407,9 @@ class TestRunner(Runnable):
             resource, uid=uid or getattr(resource, "uid", uuid.uuid4)()
         )
 
-    def schedule(self, task=None, resource=None, uid=None, **options):
+    def schedule(
+        self, task=None, resource=None, uid=None, shards=None, **options
+    ):
         """
         Schedules a serializable
         :py:class:`~testplan.runners.pools.tasks.base.Task` in a task runner
@@ -395,14 +421,43 @@ class TestRunner(Runnable):
         :param resource: :py:class:`~testplan.runners.pools.base.Pool`
         :param uid: Optional uid for task.
         :param uid: ``str``
+        :param shards: Schedule this number of tasks built from the task
+            input options, the target of each receiving a ``part`` keyword
+            argument of (shard index, ``shards``), i.e. the ``part`` option
+            of a :py:class:`~testplan.testing.multitest.base.MultiTest` or
+            :py:class:`~testplan.testing.cpp.gtest.GTest`.
+        :param shards: ``int``
         :param options: Task input options.
         :param options: ``dict``
-        :return uid: Assigned uid for task.
-        :rtype: ``str``
+        :return uid: Assigned uid for task, or list of the uids of the shards.
+        :rtype: ``str`` or ``list`` of ``str``
         """
-        return self.add(
-            task or Task(uid=uid, **options), resource=resource, uid=uid
-        )
+        if shards is None:
+            return self.add(
+                task or Task(uid=uid, **options), resource=resource, uid=uid
+            )
+
+        if task is not None:
+            raise ValueError("Shards are built from task options, not a Task.")
+        if shards < 2:
+            raise ValueError(
+                "Number of shards must be at least 2: {}".format(shards)
+            )
+        uids = []
+        for idx in range(shards):
+            shard_options = dict(options)
+            shard_options["kwargs"] = dict(
+                options.get("kwargs") or {}, part=(idx, shards)
+            )
+            shard_uid = "{}_{}".format(uid, idx) if uid else None
+            uids.append(
+                self.add(
+                    Task(uid=shard_uid, **shard_options),
+                    resource=resource,
+                    uid=shard_uid,
+                )
+            )
+        return uids
 
     def add(self, runnable, resource=None, uid=None):
         """
@@ -521,7 +576,9 @@ class TestRunner(Runnable):
 
     def post_resource_steps(self):
         """Steps to be executed after resources stopped."""
+        self._add_step(self._record_runtime_history)
         self._add_step(self._create_result)
+        self._add_step(self._log_critical_path)
         self._add_step(self._log_test_status)
         self._add_step(self._record_end)  # needs to happen before export
         self._add_step(self._invoke_exporters)
@@ -577,23 +634,86 @@ class TestRunner(Runnable):
                 break
             time.sleep(self.cfg.active_loop_sleep)
 
+    def _executor_results(self):
+        """Generate (uid, executor, result) of all finished tests."""
+        for uid, resource in self._tests.items():
+            if not isinstance(self.resources[resource], Executor):
+                continue
+            resource_result = self.resources[resource].results.get(uid)
+            if resource_result:
+                yield uid, self.resources[resource], resource_result
+
+    def _record_runtime_history(self):
+        """
+        Append the runtimes of tasks and testcases to the runtime history,
+        before the report uids are changed while creating the result.
+        """
+        runtime_history = self.cfg.runtime_history
+        if runtime_history is None:
+            return
+        if not isinstance(runtime_history, history.RuntimeHistory):
+            runtime_history = history.RuntimeHistory(runtime_history)
+
+        durations = []
+        for uid, resource, result in self._executor_results():
+            if isinstance(result, TaskResult):
+                timing = getattr(resource, "task_timings", {}).get(uid)
+                if timing:
+                    durations.append(
+                        (
+                            task_history_uid(result.task),
+                            timing.end - timing.start,
+                        )
+                    )
+                result = result.result
+            report = getattr(result, "report", None)
+            if report is not None:
+                durations.extend(history.report_durations(report))
+
+        runtime_history.record(durations)
+
+    def _log_critical_path(self):
+        """
+        Add the tasks that held the run open to the report information,
+        i.e. the ones executed by the worker that finished last.
+        """
+        timings = {}
+        for resource in self.resources:
+            if isinstance(resource, Executor):
+                timings.update(getattr(resource, "task_timings", {}))
+
+        path = critical_path(timings)
+        if not path:
+            return
+
+        test_results = self._result.test_results
+        steps = []
+        for uid, timing in path:
+            result = test_results.get(uid)
+            name = result.report.name if result else uid
+            steps.append(
+                "{} ({:.2f}s)".format(name, timing.end - timing.start)
+            )
+
+        critical = "{}[{}]: {}".format(
+            path[-1][1].pool, path[-1][1].worker, " -> ".join(steps)
+        )
+        self.logger.info("%s critical path: %s", self, critical)
+        self._result.test_report.information.append(
+            ("critical_path", critical)
+        )
+
     def _create_result(self):
         step_result = True
         test_results = self._result.test_results
         test_report = self._result.test_report
         test_rep_lookup = {}
 
-        for uid, resource in self._tests.items():
-            if not isinstance(self.resources[resource], Executor):
-                continue
-
-            resource_result = self.resources[resource].results.get(uid)
-            # Tasks may not been executed (i.e. timeout), although the thread
-            # will wait for a buffer period until the follow up work finishes.
-            # But for insurance we assume that still some uids are missing.
-            if not resource_result:
-                continue
-            elif isinstance(resource_result, TaskResult):
+        # Tasks may not been executed (i.e. timeout), although the thread
+        # will wait for a buffer period until the follow up work finishes.
+        # But for insurance we assume that still some uids are missing.
+        for uid, _, resource_result in self._executor_results():
+            if isinstance(resource_result, TaskResult):
                 if resource_result.status is False:
                     test_results[uid] = result_for_failed_task(resource_result)
                 else:
@@ -613,11 +733,15 @@ class TestRunner(Runnable):
                 except KeyError:
                     # A report will be created and then append as a placeholder
                     if isinstance(resource_result, TaskResult):
-                        # 'target' should be an instance of MultiTest since the
+                        # 'target' should be a MultiTest or GTest since the
                         # corresponding report has 'part' defined. We can get
                         # a full structured report by dry_run(), thus the order
                         # of testcases can be retained in test report.
                         target = resource_result.task.materialize()
+                        if not target.parent:
+                            target.parent = self
+                        if not target.cfg.parent:
+                            target.cfg.parent = self.cfg
                         # TODO: Any idea to avoid accessing private members?
                         target.cfg._options["part"] = None
                         target._test_context = None
@@ -650,7 +774,8 @@ class TestRunner(Runnable):
 
     def _merge_reports(self, test_report_lookup):
         """
-        Merge report of MultiTest parts into test runner report.
+        Merge report of MultiTest parts or GTest shards into test runner
+        report.
         Return True if all parts are found and can be successfully merged.
 
         Format of test_report_lookup:
@@ -726,23 +851,39 @@ class TestRunner(Runnable):
             self._result.test_report.bubble_up_attachments()
 
         for exporter in self.exporters:
-            if isinstance(exporter, test_exporters.Exporter):
-                exp_result = ExporterResult.run_exporter(
-                    exporter=exporter,
-                    source=self._result.test_report,
-                    type="test",
-                )
-
-                if not exp_result.success:
-                    logger.TESTPLAN_LOGGER.error(exp_result.traceback)
-                self._result.exporter_results.append(exp_result)
-            else:
+            if not isinstance(exporter, test_exporters.Exporter):
                 raise NotImplementedError(
                     "Exporter logic not implemented for: {}".format(
                         type(exporter)
                     )
                 )
 
+        def run_exporter(exporter):
+            return ExporterResult.run_exporter(
+                exporter=exporter,
+                source=self._result.test_report,
+                type="test",
+            )
+
+        workers = min(self.cfg.exporter_workers, len(self.exporters))
+        # Exporters share a single serialization of the report.
+        with self._result.test_report.snapshot():
+            if workers > 1:
+                with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                    exp_results = list(pool.map(run_exporter, self.exporters))
+            else:
+                exp_results = [
+                    run_exporter(exporter) for exporter in self.exporters
+                ]
+
+        for exp_result in exp_results:
+            if not exp_result.success:
+                logger.TESTPLAN_LOGGER.error(exp_result.traceback)
+            self.logger.debug(
+                "%s finished in %.2fs", exp_result.exporter, exp_result.elapsed
+            )
+            self._result.exporter_results.append(exp_result)
+
     def _post_exporters(self):
         # View report in web browser if "--browse" specified
         report_urls = []
@@ -11,6 +11,8 @@ from future import standard_library
 standard_library.install_aliases()
 import re
 import six
+import time
+import uuid
 import numbers
 import threading
 from concurrent import futures
@@ -60,9 +62,16 @@ class TestRunnerIHandler(entity.Entity):
 
         self.report = self._initial_report()
         self.report_mutex = threading.Lock()
+        self.report_version = 0
+        self.report_epoch = uuid.uuid4().hex[:8]
+        self._report_changed = threading.Condition(self.report_mutex)
+        self._entry_versions = {}
         self._pool = None
         self._http_handler = None
 
+        self._test_locks = {}
+        self._test_locks_mutex = threading.Lock()
+
         self._created_environments = {}
         try:
             self._reloader = reloader.ModuleReloader(
@@ -95,7 +104,9 @@ class TestRunnerIHandler(entity.Entity):
             "Starting {} for {}".format(self.__class__.__name__, self.target)
         )
         self._http_handler = self._setup_http_handler()
-        self._pool = futures.ThreadPoolExecutor(max_workers=1)
+        self._pool = futures.ThreadPoolExecutor(
+            max_workers=self.cfg.interactive_parallel
+        )
         self.target.make_runpath_dirs()
 
     def run(self):
@@ -113,12 +124,14 @@ class TestRunnerIHandler(entity.Entity):
         self.status.change(entity.RunnableStatus.FINISHED)
 
     def teardown(self):
-        """Close the task pool."""
+        """Close the task pool and stop watching source files."""
         if self._pool is None or self._http_handler is None:
             raise RuntimeError("setup() not run")
 
         self._pool = None
         self._http_handler = None
+        if self._reloader is not None:
+            self._reloader.close()
 
     @property
     def http_handler_info(self):
@@ -159,10 +172,7 @@ class TestRunnerIHandler(entity.Entity):
         if not await_results:
             return self._run_async(self.run_all_tests)
 
-        all_tests = self.all_tests()
-
-        for test_uid in all_tests:
-            self.run_test(test_uid)
+        self._run_concurrently(self.run_test, self.all_tests())
 
     def run_test(self, test_uid, await_results=True):
         """
@@ -178,19 +188,21 @@ class TestRunnerIHandler(entity.Entity):
         if not await_results:
             return self._run_async(self.run_test, test_uid)
 
-        test = self.test(test_uid)
-
-        try:
-            self._auto_start_environment(test_uid)
-        except RuntimeError:
-            self.logger.exception("Failed to start environment for test.")
-            with self.report_mutex:
-                self.report[
-                    test_uid
-                ].runtime_status = testplan.report.RuntimeStatus.FINISHED
-            return
+        with self._test_lock(test_uid):
+            test = self.test(test_uid)
 
-        self._merge_testcase_reports(test.run_testcases_iter())
+            try:
+                self._auto_start_environment(test_uid)
+            except RuntimeError:
+                self.logger.exception("Failed to start environment for test.")
+                with self.report_mutex:
+                    self.report[
+                        test_uid
+                    ].runtime_status = testplan.report.RuntimeStatus.FINISHED
+                    self.record_change([test_uid])
+                return
+
+            self._merge_testcase_reports(test.run_testcases_iter())
 
     def run_test_suite(self, test_uid, suite_uid, await_results=True):
         """
@@ -207,21 +219,25 @@ class TestRunnerIHandler(entity.Entity):
         if not await_results:
             return self._run_async(self.run_test_suite, test_uid, suite_uid,)
 
-        test = self.test(test_uid)
-
-        try:
-            self._auto_start_environment(test_uid)
-        except RuntimeError:
-            self.logger.exception("Failed to start environment for testsuite.")
-            with self.report_mutex:
-                self.report[test_uid][
-                    suite_uid
-                ].runtime_status = testplan.report.RuntimeStatus.FINISHED
-            return
+        with self._test_lock(test_uid):
+            test = self.test(test_uid)
 
-        self._merge_testcase_reports(
-            test.run_testcases_iter(testsuite_pattern=suite_uid)
-        )
+            try:
+                self._auto_start_environment(test_uid)
+            except RuntimeError:
+                self.logger.exception(
+                    "Failed to start environment for testsuite."
+                )
+                with self.report_mutex:
+                    self.report[test_uid][
+                        suite_uid
+                    ].runtime_status = testplan.report.RuntimeStatus.FINISHED
+                    self.record_change([test_uid, suite_uid])
+                return
+
+            self._merge_testcase_reports(
+                test.run_testcases_iter(testsuite_pattern=suite_uid)
+            )
 
     def run_test_case(
         self, test_uid, suite_uid, case_uid, await_results=True,
@@ -243,23 +259,27 @@ class TestRunnerIHandler(entity.Entity):
                 self.run_test_case, test_uid, suite_uid, case_uid,
             )
 
-        test = self.test(test_uid)
-
-        try:
-            self._auto_start_environment(test_uid)
-        except RuntimeError:
-            self.logger.exception("Failed to start environment for testcase.")
-            with self.report_mutex:
-                self.report[test_uid][suite_uid][
-                    case_uid
-                ].runtime_status = testplan.report.RuntimeStatus.FINISHED
-            return
+        with self._test_lock(test_uid):
+            test = self.test(test_uid)
 
-        self._merge_testcase_reports(
-            test.run_testcases_iter(
-                testsuite_pattern=suite_uid, testcase_pattern=case_uid
+            try:
+                self._auto_start_environment(test_uid)
+            except RuntimeError:
+                self.logger.exception(
+                    "Failed to start environment for testcase."
+                )
+                with self.report_mutex:
+                    self.report[test_uid][suite_uid][
+                        case_uid
+                    ].runtime_status = testplan.report.RuntimeStatus.FINISHED
+                    self.record_change([test_uid, suite_uid, case_uid])
+                return
+
+            self._merge_testcase_reports(
+                test.run_testcases_iter(
+                    testsuite_pattern=suite_uid, testcase_pattern=case_uid
+                )
             )
-        )
 
     def run_test_case_param(
         self, test_uid, suite_uid, case_uid, param_uid, await_results=True,
@@ -286,23 +306,29 @@ class TestRunnerIHandler(entity.Entity):
                 param_uid,
             )
 
-        test = self.test(test_uid)
-
-        try:
-            self._auto_start_environment(test_uid)
-        except RuntimeError:
-            self.logger.exception("Failed to start environment for testcase.")
-            with self.report_mutex:
-                self.report[test_uid][suite_uid][case_uid][
-                    param_uid
-                ].runtime_status = testplan.report.RuntimeStatus.FINISHED
-            return
+        with self._test_lock(test_uid):
+            test = self.test(test_uid)
 
-        self._merge_testcase_reports(
-            test.run_testcases_iter(
-                testsuite_pattern=suite_uid, testcase_pattern=param_uid
+            try:
+                self._auto_start_environment(test_uid)
+            except RuntimeError:
+                self.logger.exception(
+                    "Failed to start environment for testcase."
+                )
+                with self.report_mutex:
+                    self.report[test_uid][suite_uid][case_uid][
+                        param_uid
+                    ].runtime_status = testplan.report.RuntimeStatus.FINISHED
+                    self.record_change(
+                        [test_uid, suite_uid, case_uid, param_uid]
+                    )
+                return
+
+            self._merge_testcase_reports(
+                test.run_testcases_iter(
+                    testsuite_pattern=suite_uid, testcase_pattern=param_uid
+                )
             )
-        )
 
     def test(self, test_uid):
         """
@@ -328,16 +354,23 @@ class TestRunnerIHandler(entity.Entity):
         if not await_results:
             return self._run_async(self.start_test_resources, test_uid,)
 
-        self.logger.debug("Starting test resources for %s", test_uid)
+        with self._test_lock(test_uid):
+            self.logger.debug("Starting test resources for %s", test_uid)
 
-        with self.report_mutex:
-            self.report[test_uid].env_status = entity.ResourceStatus.STARTING
+            with self.report_mutex:
+                self.report[
+                    test_uid
+                ].env_status = entity.ResourceStatus.STARTING
+                self.record_change([test_uid])
 
-        test = self.test(test_uid)
-        test.start_test_resources()
+            test = self.test(test_uid)
+            test.start_test_resources()
 
-        with self.report_mutex:
-            self.report[test_uid].env_status = entity.ResourceStatus.STARTED
+            with self.report_mutex:
+                self.report[
+                    test_uid
+                ].env_status = entity.ResourceStatus.STARTED
+                self.record_change([test_uid])
 
     def stop_test_resources(self, test_uid, await_results=True):
         """
@@ -353,16 +386,23 @@ class TestRunnerIHandler(entity.Entity):
         if not await_results:
             return self._run_async(self.stop_test_resources, test_uid,)
 
-        self.logger.debug("Stopping test resources for %s", test_uid)
+        with self._test_lock(test_uid):
+            self.logger.debug("Stopping test resources for %s", test_uid)
 
-        with self.report_mutex:
-            self.report[test_uid].env_status = entity.ResourceStatus.STOPPING
+            with self.report_mutex:
+                self.report[
+                    test_uid
+                ].env_status = entity.ResourceStatus.STOPPING
+                self.record_change([test_uid])
 
-        test = self.test(test_uid)
-        test.stop_test_resources()
+            test = self.test(test_uid)
+            test.stop_test_resources()
 
-        with self.report_mutex:
-            self.report[test_uid].env_status = entity.ResourceStatus.STOPPED
+            with self.report_mutex:
+                self.report[
+                    test_uid
+                ].env_status = entity.ResourceStatus.STOPPED
+                self.record_change([test_uid])
 
     def get_environment(self, env_uid):
         """Get an environment."""
@@ -543,11 +583,12 @@ class TestRunnerIHandler(entity.Entity):
 
     def all_tests_operation(self, operation, await_results=True):
         """Perform an operation in all tests."""
-        all_tests = self.all_tests()
+        if operation not in ("run", "start", "stop"):
+            raise ValueError("Unknown operation: {}".format(operation))
 
-        for test_uid in all_tests:
+        def test_operation(test_uid):
             if not (self.active and self.target.active):
-                break
+                return
             self.logger.debug(
                 "Operation {} for test: {}".format(operation, test_uid)
             )
@@ -557,10 +598,10 @@ class TestRunnerIHandler(entity.Entity):
                 )
             elif operation == "start":
                 self.start_test_resources(test_uid)
-            elif operation == "stop":
-                self.stop_test_resources(test_uid)
             else:
-                raise ValueError("Unknown operation: {}".format(operation))
+                self.stop_test_resources(test_uid)
+
+        self._run_concurrently(test_operation, self.all_tests())
 
     def create_new_environment(self, env_uid, env_type="local_environment"):
         """Dynamically create an environment maker object."""
@@ -627,6 +668,82 @@ class TestRunnerIHandler(entity.Entity):
         """Add an environment from the created environment maker instance."""
         self.target.add_environment(self._created_environments[env_uid])
 
+    def record_change(self, uids, recursive=False):
+        """
+        Record a change of the report entry at the given UID path. The entry
+        and its parents, whose status depends on it, get a new version and
+        clients waiting for changes are woken up. Must be called while
+        holding ``report_mutex``.
+
+        :param uids: UIDs of the entry and its parents, from the test down,
+            empty for the root report.
+        :type uids: ``list`` of ``str``
+        :param recursive: Also record a change of all descendants of the
+            entry, e.g. after it has been merged.
+        :type recursive: ``bool``
+        """
+        self.report_version += 1
+        uids = tuple(uids)
+        for idx in range(len(uids) + 1):
+            self._entry_versions[uids[:idx]] = self.report_version
+
+        if recursive:
+            entry = self.report
+            for uid in uids:
+                entry = entry[uid]
+            stack = [(uids, entry)]
+            while stack:
+                path, entry = stack.pop()
+                self._entry_versions[path] = self.report_version
+                if isinstance(entry, testplan.report.TestGroupReport):
+                    stack.extend(
+                        (path + (child.uid,), child) for child in entry
+                    )
+
+        self._report_changed.notify_all()
+
+    def entry_version(self, uids):
+        """
+        Return the version of the report entry at the given UID path, the
+        version of the report when the entry or one of its descendants last
+        changed. Must be called while holding ``report_mutex``.
+
+        :param uids: UIDs of the entry and its parents.
+        :type uids: ``list`` of ``str``
+        :rtype: ``int``
+        """
+        return self._entry_versions.get(tuple(uids), 0)
+
+    def report_changes(self, since, timeout=0):
+        """
+        Return the UID paths of the report entries changed after a version,
+        waiting up to ``timeout`` seconds for a change if there is none.
+        Must be called while holding ``report_mutex``, which is released
+        while waiting.
+
+        :param since: Report version already known by the caller.
+        :type since: ``int``
+        :param timeout: Seconds to wait for a change.
+        :type timeout: ``int`` or ``float``
+        :return: Sorted UID paths of the changed entries, parents first.
+        :rtype: ``list`` of ``tuple``
+        """
+        end = time.time() + timeout
+        while self.report_version <= since:
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            self._report_changed.wait(remaining)
+
+        return sorted(
+            (
+                uids
+                for uids, version in self._entry_versions.items()
+                if version > since
+            ),
+            key=lambda uids: (len(uids), uids),
+        )
+
     def reload(self, rebuild_dependencies=False):
         """Reload test suites."""
         if self._reloader is None:
@@ -699,6 +816,7 @@ class TestRunnerIHandler(entity.Entity):
             self.logger.debug("Merge test result: %s", result)
             with self.report_mutex:
                 self.report[result.uid].merge(result)
+                self.record_change([result.uid], recursive=True)
         elif result is not None:
             self.logger.debug(
                 "Discarding result from test operation: %s", result
@@ -725,6 +843,34 @@ class TestRunnerIHandler(entity.Entity):
                 "Setting env status of %s to %s", test_uid, new_status
             )
             self.report[test_uid].env_status = new_status
+            self.record_change([test_uid])
+
+    def _test_lock(self, test_uid):
+        """
+        Lock held while running a test or starting and stopping its
+        environment, so that operations on different tests can run
+        concurrently but operations on the same test cannot.
+        """
+        with self._test_locks_mutex:
+            return self._test_locks.setdefault(test_uid, threading.RLock())
+
+    def _run_concurrently(self, func, test_uids):
+        """
+        Call ``func(test_uid)`` for each test, for up to
+        ``interactive_parallel`` tests at a time, then raise the first
+        exception raised by a call, if any.
+        """
+        test_uids = list(test_uids)
+        parallel = min(self.cfg.interactive_parallel, len(test_uids))
+        if parallel <= 1:
+            for test_uid in test_uids:
+                func(test_uid)
+            return
+
+        with futures.ThreadPoolExecutor(max_workers=parallel) as pool:
+            results = [pool.submit(func, test_uid) for test_uid in test_uids]
+        for result in results:
+            result.result()
 
     def _run_async(self, func, *args, **kwargs):
         """
@@ -763,3 +909,6 @@ class TestRunnerIHandler(entity.Entity):
                     ] = attachment.source_path
 
                 parent_entry[report.uid] = report
+                self.record_change(
+                    list(parent_uids) + [report.uid], recursive=True
+                )
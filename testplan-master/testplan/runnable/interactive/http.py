@@ -17,6 +17,7 @@ import flask
 import flask_restplus
 from cheroot import wsgi
 import werkzeug.exceptions
+import werkzeug.http
 import marshmallow.exceptions
 
 import testplan
@@ -26,6 +27,9 @@ from testplan import defaults
 from testplan import report
 
 
+REPORT_CHANGES_MAX_TIMEOUT = 60
+
+
 def generate_interactive_api(ihandler):
     """Generates the interactive API using Flask."""
     build_directory = os.path.join(
@@ -76,7 +80,9 @@ def generate_interactive_api(ihandler):
         def get(self):
             """Get the state of the root interactive report."""
             with ihandler.report_mutex:
-                return ihandler.report.shallow_serialize()
+                return _conditional_get(
+                    ihandler, [], ihandler.report.shallow_serialize
+                )
 
         def put(self):
             """Update the state of the root interactive report."""
@@ -100,6 +106,7 @@ def generate_interactive_api(ihandler):
                     ihandler.run_all_tests(await_results=False)
 
                 ihandler.report = new_report
+                ihandler.record_change([])
                 return ihandler.report.shallow_serialize()
 
     @api.route("/report/tests")
@@ -111,7 +118,13 @@ def generate_interactive_api(ihandler):
         def get(self):
             """Get the UIDs of all tests defined in the testplan."""
             with ihandler.report_mutex:
-                return [test.shallow_serialize() for test in ihandler.report]
+                return _conditional_get(
+                    ihandler,
+                    [],
+                    lambda: [
+                        test.shallow_serialize() for test in ihandler.report
+                    ],
+                )
 
     @api.route("/report/tests/<string:test_uid>")
     class SingleTest(flask_restplus.Resource):
@@ -135,10 +148,14 @@ def generate_interactive_api(ihandler):
             """Get the state of a specific test from the testplan."""
             with ihandler.report_mutex:
                 try:
-                    return ihandler.report[test_uid].shallow_serialize()
+                    test = ihandler.report[test_uid]
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
+                return _conditional_get(
+                    ihandler, [test_uid], test.shallow_serialize
+                )
+
         def put(self, test_uid):
             """Update the state of a specific test."""
             if flask.request.json is None:
@@ -182,6 +199,7 @@ def generate_interactive_api(ihandler):
                         env_action(test_uid, await_results=False)
 
                 ihandler.report[test_uid] = new_test
+                ihandler.record_change([test_uid])
                 return ihandler.report[test_uid].shallow_serialize()
 
         def _check_env_transition(self, current_state, new_state):
@@ -215,13 +233,17 @@ def generate_interactive_api(ihandler):
 
         def get(self, test_uid):
             """Get the UIDs of all test suites owned by a specific test."""
-            try:
-                return [
-                    entry.shallow_serialize()
-                    for entry in ihandler.report[test_uid]
-                ]
-            except KeyError:
-                raise werkzeug.exceptions.NotFound
+            with ihandler.report_mutex:
+                try:
+                    test = ihandler.report[test_uid]
+                except KeyError:
+                    raise werkzeug.exceptions.NotFound
+
+                return _conditional_get(
+                    ihandler,
+                    [test_uid],
+                    lambda: [entry.shallow_serialize() for entry in test],
+                )
 
     @api.route("/report/tests/<string:test_uid>/suites/<string:suite_uid>")
     class SingleSuite(flask_restplus.Resource):
@@ -234,12 +256,14 @@ def generate_interactive_api(ihandler):
             """Get the state of a specific test suite."""
             with ihandler.report_mutex:
                 try:
-                    return ihandler.report[test_uid][
-                        suite_uid
-                    ].shallow_serialize()
+                    suite = ihandler.report[test_uid][suite_uid]
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
+                return _conditional_get(
+                    ihandler, [test_uid, suite_uid], suite.shallow_serialize
+                )
+
         def put(self, test_uid, suite_uid):
             """Update the state of a specific test suite."""
             if flask.request.json is None:
@@ -269,6 +293,7 @@ def generate_interactive_api(ihandler):
                     )
 
                 ihandler.report[test_uid][suite_uid] = new_suite
+                ihandler.record_change([test_uid, suite_uid])
                 return ihandler.report[test_uid][suite_uid].shallow_serialize()
 
     @api.route(
@@ -284,13 +309,16 @@ def generate_interactive_api(ihandler):
             """Get the UIDs of all testcases defined on a suite."""
             with ihandler.report_mutex:
                 try:
-                    return [
-                        _serialize_testcase(entry)
-                        for entry in ihandler.report[test_uid][suite_uid]
-                    ]
+                    suite = ihandler.report[test_uid][suite_uid]
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
+                return _conditional_get(
+                    ihandler,
+                    [test_uid, suite_uid],
+                    lambda: [_serialize_testcase(entry) for entry in suite],
+                )
+
     @api.route(
         "/report/tests/<string:test_uid>/suites/<string:suite_uid>/testcases"
         "/<string:testcase_uid>"
@@ -312,7 +340,11 @@ def generate_interactive_api(ihandler):
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
-                return _serialize_testcase(report_entry)
+                return _conditional_get(
+                    ihandler,
+                    [test_uid, suite_uid, testcase_uid],
+                    lambda: _serialize_testcase(report_entry),
+                )
 
         def put(self, test_uid, suite_uid, testcase_uid):
             """Update the state of a specific testcase."""
@@ -344,6 +376,7 @@ def generate_interactive_api(ihandler):
                     )
 
                 suite[testcase_uid] = new_testcase
+                ihandler.record_change([test_uid, suite_uid, testcase_uid])
                 return _serialize_testcase(suite[testcase_uid])
 
     @api.route(
@@ -360,15 +393,18 @@ def generate_interactive_api(ihandler):
             """Get the state of all parametrizations of a testcase."""
             with ihandler.report_mutex:
                 try:
-                    return [
-                        entry.serialize()
-                        for entry in ihandler.report[test_uid][suite_uid][
-                            testcase_uid
-                        ]
+                    testcase = ihandler.report[test_uid][suite_uid][
+                        testcase_uid
                     ]
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
+                return _conditional_get(
+                    ihandler,
+                    [test_uid, suite_uid, testcase_uid],
+                    lambda: [entry.serialize() for entry in testcase],
+                )
+
     @api.route(
         "/report/tests/<string:test_uid>/suites/<string:suite_uid>/testcases"
         "/<string:testcase_uid>/parametrizations/<string:param_uid>"
@@ -389,7 +425,11 @@ def generate_interactive_api(ihandler):
                 except KeyError:
                     raise werkzeug.exceptions.NotFound
 
-                return report_entry.serialize()
+                return _conditional_get(
+                    ihandler,
+                    [test_uid, suite_uid, testcase_uid, param_uid],
+                    report_entry.serialize,
+                )
 
         def put(self, test_uid, suite_uid, testcase_uid, param_uid):
             """Update the state of a specific parametrized testcase."""
@@ -427,8 +467,52 @@ def generate_interactive_api(ihandler):
                     )
 
                 param_group[param_uid] = new_testcase
+                ihandler.record_change(
+                    [test_uid, suite_uid, testcase_uid, param_uid]
+                )
                 return param_group[param_uid].serialize()
 
+    @api.route("/report/changes")
+    class ReportChanges(flask_restplus.Resource):
+        """
+        Report changes endpoint. Returns the report entries that changed
+        after the version given by the ``since`` query parameter, serialized
+        as by their own endpoints. If nothing changed, waits up to
+        ``timeout`` seconds (at most 60) for a change before returning, so
+        that clients can long-poll instead of fetching the whole report.
+
+        Clients should get the current version, with no ``since`` parameter,
+        before fetching the report. A change of ``epoch`` means the server
+        restarted and the report has to be fetched again.
+        """
+
+        def get(self):
+            """Get the report entries changed since a version."""
+            try:
+                since = int(flask.request.args.get("since", -1))
+                timeout = float(flask.request.args.get("timeout", 0))
+            except ValueError as exc:
+                raise werkzeug.exceptions.BadRequest(str(exc))
+            timeout = max(0, min(timeout, REPORT_CHANGES_MAX_TIMEOUT))
+
+            with ihandler.report_mutex:
+                if since < 0 or since > ihandler.report_version:
+                    changed = []
+                else:
+                    changed = ihandler.report_changes(since, timeout)
+
+                return {
+                    "epoch": ihandler.report_epoch,
+                    "version": ihandler.report_version,
+                    "changes": [
+                        {
+                            "uids": list(uids),
+                            "entry": _serialize_entry(ihandler.report, uids),
+                        }
+                        for uids in changed
+                    ],
+                }
+
     @api.route("/attachments")
     class AllAttachments(flask_restplus.Resource):
         """
@@ -460,6 +544,40 @@ def generate_interactive_api(ihandler):
     return app, api
 
 
+def _conditional_get(ihandler, uids, serialize):
+    """
+    Serialize a report entry for a GET request, unless the client already
+    has its current version: the ETag of the response is the entry version,
+    a request whose If-None-Match header matches it gets a 304 response
+    without serializing the entry. Must be called while holding the report
+    mutex.
+    """
+    etag = "{}-{}".format(ihandler.report_epoch, ihandler.entry_version(uids))
+    headers = {"ETag": werkzeug.http.quote_etag(etag)}
+    if flask.request.if_none_match.contains(etag):
+        return flask.Response(status=304, headers=headers)
+    return serialize(), 200, headers
+
+
+def _serialize_entry(root, uids):
+    """
+    Serialize the report entry at a UID path as the endpoint of its level
+    does, or return None if the entry no longer exists.
+    """
+    entry = root
+    try:
+        for uid in uids:
+            entry = entry[uid]
+    except KeyError:
+        return None
+
+    if len(uids) < 3:
+        return entry.shallow_serialize()
+    elif len(uids) == 3:
+        return _serialize_testcase(entry)
+    return entry.serialize()
+
+
 def _serialize_testcase(report_entry):
     """
     Serialize a report entry representing a testcase. Since the
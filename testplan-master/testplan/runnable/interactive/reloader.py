@@ -9,9 +9,14 @@ from future import standard_library
 
 standard_library.install_aliases()
 import os
+import ast
 import sys
+import json
 import time
+import getpass
+import hashlib
 import inspect
+import tempfile
 import modulefinder
 import collections
 import functools
@@ -19,30 +24,48 @@ import functools
 from six.moves import reload_module
 
 from testplan.common.utils import path as path_utils
+from testplan.common.utils.match import FileWatcher
 from testplan.testing.multitest import suite
 from testplan.common.utils import logger
 from testplan.common.utils import strings
 
+# Version of the format of the import scan cache.
+CACHE_VERSION = 1
+
 
 class ModuleReloader(logger.Loggable):
     """
     Reloads modules and their dependencies if there was any file modification.
 
+    The graph of dependencies is built from the modules already imported from
+    the reload directories, by scanning their import statements. Scans are
+    cached on disk and only repeated for files whose size or modification
+    time changed. File changes are reported by inotify where it is available,
+    otherwise all watched files are checked on reload.
+
     :param extra_deps: Modules to register as extra dependencies to reload,
             despite not being directly imported by __main__.
     :type extra_deps: ``Iterable[ModuleType]``
+    :param cache_path: Path of the import scan cache, by default a file in
+        the temporary directory named after the __main__ module path.
+    :type cache_path: ``str``
     """
 
-    def __init__(self, extra_deps=None):
+    def __init__(self, extra_deps=None, cache_path=None):
         super(ModuleReloader, self).__init__()
 
         self._extra_deps = extra_deps
+        self._cache_path = cache_path
+        self._scans = None
+        self._watcher = None
+        self._changed_paths = set()
         reload_dirs, dep_graph, watched_modules = self._build_dependencies(
             extra_deps
         )
         self._reload_dirs = reload_dirs
         self._dep_graph = dep_graph
         self._watched_modules = watched_modules
+        self._watch()
 
         # Last recorded reload time for watched modules.
         self._last_reload_time = {}  # type: Dict[_ModuleNode, float]
@@ -67,6 +90,9 @@ class ModuleReloader(logger.Loggable):
             self._reload_dirs = reload_dirs
             self._dep_graph = dep_graph
             self._watched_modules = watched_modules
+            self._watch()
+            # Changes made while the graph was rebuilt may not be reported.
+            self._changed_paths = None
 
         modified_modules = self._modified_modules
         if modified_modules:
@@ -81,6 +107,12 @@ class ModuleReloader(logger.Loggable):
         else:
             self.logger.debug("No watched files have been modified.")
 
+    def close(self):
+        """Stop watching file changes."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
     def _build_dependencies(self, extra_deps):
         """
         Build a list of directories to reload code from and a tree of
@@ -151,44 +183,194 @@ class ModuleReloader(logger.Loggable):
         :param reload_dirs: Directories to reload modules from.
         :type reload_dirs: ``Iterable[str]``
         """
-        finder = _GraphModuleFinder(path=self._filtered_syspath(reload_dirs))
-        try:
-            finder.run_script(main_module_file)
-        except OSError:
+        start_time = time.time()
+        filepaths = self._reloadable_modules(main_module_file, reload_dirs)
+
+        if self._scans is None:
+            self._scans = self._load_cache(main_module_file)
+        scans = {}
+        for name, filepath in filepaths.items():
+            scan = self._scan(filepath)
+            if scan is not None:
+                scans[name] = scan
+        # Only keep the scans of the modules currently in the graph.
+        self._scans = {filepaths[name]: scan for name, scan in scans.items()}
+
+        if "__main__" not in scans:
             raise RuntimeError(
-                "Could not run main module {} as a script.".format(
+                "Could not scan main module {} for imports.".format(
                     main_module_file
                 )
             )
-        return finder.build_dep_graph()
 
-    def _filtered_syspath(self, reload_dirs):
+        modules = {}
+        for name, scan in scans.items():
+            mod = modulefinder.Module(name, file=filepaths[name])
+            for global_name in scan["names"]:
+                mod.globalnames[global_name] = 1
+            modules[name] = mod
+
+        module_deps = {
+            modules[name]: [
+                modules[dep]
+                for dep in _resolve_imports(
+                    name, filepaths[name], scan["imports"], modules
+                )
+            ]
+            for name, scan in scans.items()
+        }
+        self._save_cache()
+        self.logger.debug(
+            "Built dependency graph of %d modules in %.2f seconds.",
+            len(modules),
+            time.time() - start_time,
+        )
+        return _GraphBuilder(module_deps).build_dep_graph(modules["__main__"])
+
+    def _reloadable_modules(self, main_module_file, reload_dirs):
         """
-        :return: sys.path filtered by paths that are in a reload dir.
-        :rtype: ``List[str]``
+        :return: Filepaths of the imported python source modules that are in
+            a reload dir, by module name.
+        :rtype: ``Dict[str, str]``
         """
-        return [
-            path
-            for path in sys.path
-            if any(path.startswith(d) for d in reload_dirs)
+        real_dirs = [
+            os.path.join(os.path.realpath(reload_dir), "")
+            for reload_dir in reload_dirs
         ]
+        filepaths = {
+            "__main__": path_utils.fix_home_prefix(
+                os.path.abspath(main_module_file)
+            )
+        }
+
+        for name, mod in list(sys.modules.items()):
+            if name == "__main__" or not _has_file(mod):
+                continue
+            filepath = _module_filepath(mod)
+            if not filepath.endswith(".py"):
+                continue
+            real_path = os.path.realpath(filepath)
+            if any(real_path.startswith(d) for d in real_dirs):
+                filepaths[name] = filepath
+
+        return filepaths
+
+    def _scan(self, filepath):
+        """
+        Return the import statements and global names of a module, parsing
+        the file only if it changed since it was cached.
+
+        :param filepath: Path of the module source file.
+        :type filepath: ``str``
+        :return: Scan result, or None if the file cannot be parsed.
+        :rtype: ``Optional[dict]``
+        """
+        try:
+            stats = os.stat(filepath)
+        except OSError:
+            return None
+
+        key = [stats.st_mtime, stats.st_size]
+        scan = self._scans.get(filepath)
+        if scan is None or scan["key"] != key:
+            try:
+                imports, names = _scan_source(filepath)
+            except (IOError, OSError, SyntaxError, ValueError) as exc:
+                self.logger.debug("Could not scan %s: %s", filepath, exc)
+                return None
+            scan = {"key": key, "imports": imports, "names": names}
+            self._scans[filepath] = scan
+        return scan
+
+    def _default_cache_path(self, main_module_file):
+        return os.path.join(
+            tempfile.gettempdir(),
+            "testplan_reloader_{}".format(getpass.getuser()),
+            "{}.json".format(
+                hashlib.sha1(
+                    os.path.abspath(main_module_file).encode("utf-8")
+                ).hexdigest()
+            ),
+        )
+
+    def _load_cache(self, main_module_file):
+        """
+        :return: Cached scans by filepath, empty if there is no usable cache.
+        :rtype: ``Dict[str, dict]``
+        """
+        if self._cache_path is None:
+            self._cache_path = self._default_cache_path(main_module_file)
+
+        try:
+            with open(self._cache_path) as cache_file:
+                content = json.load(cache_file)
+            if content.get("version") == CACHE_VERSION:
+                return content["files"]
+        except (IOError, OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        """
+        Write the scans of the modules in the graph to the cache, through a
+        temporary file so that concurrent readers never see a partial cache.
+        """
+        try:
+            directory = os.path.dirname(self._cache_path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(
+                    {"version": CACHE_VERSION, "files": self._scans},
+                    cache_file,
+                )
+            os.rename(tmp_path, self._cache_path)
+        except (IOError, OSError) as exc:
+            self.logger.debug(
+                "Could not write reloader cache %s: %s", self._cache_path, exc
+            )
+
+    def _watch(self):
+        """Watch the files of the modules in the graph for changes."""
+        self.close()
+        self._watcher = FileWatcher(
+            [mod.filepath for mod in self._watched_modules],
+            events=FileWatcher.EVENTS | FileWatcher.IN_ATTRIB,
+        )
+        self._changed_paths = set()
 
     @property
     def _modified_modules(self):
         """
-        Calls `os.stat` on all watched files to check which ones have been
-        modified and require a reload.
+        Check which watched files have been modified and require a reload.
+        Only the files reported changed are checked with `os.stat`, unless
+        changes are not watched or some were lost, when all files are.
 
-        :return: Set of all filepaths that have been modified and require
+        :return: Set of all modules that have been modified and require
             reloading.
-        :rtype: ``set[str]``
+        :rtype: ``set[_ModuleNode]``
         """
-        return set(
+        changes = self._watcher.changes() if self._watcher else None
+        if changes is None or self._changed_paths is None:
+            candidates = self._watched_modules
+        else:
+            self._changed_paths.update(changes)
+            candidates = [
+                mod
+                for mod in self._watched_modules
+                if mod.filepath in self._changed_paths
+            ]
+
+        modified = set(
             mod
-            for mod in self._watched_modules
+            for mod in candidates
             if os.stat(mod.filepath).st_mtime
             > self._last_reload_time.get(mod, self._init_time)
         )
+        # Files stay pending until their module is reloaded successfully.
+        self._changed_paths = set(mod.filepath for mod in modified)
+        return modified
 
     def _suites_by_class(self, tests):
         """
@@ -287,12 +469,12 @@ class ModuleReloader(logger.Loggable):
             return False
 
 
-class _GraphModuleFinder(modulefinder.ModuleFinder, logger.Loggable):
+class _GraphBuilder(logger.Loggable):
     """
-    Variant of the standard library ModuleFinder that is able to produce a
-    directed acyclic graph of dependencies. The root node corresponds to the
-    main module passed as a script, its child nodes correspond to its
-    direct import dependencie, and so on.
+    Produces a directed acyclic graph of dependencies from the direct
+    dependencies of each module. The root node corresponds to the main
+    module, its child nodes correspond to its direct import dependencies,
+    and so on.
 
     An example of how such a graph
     with a main module and dependendies A, B, C and D could look is:
@@ -307,87 +489,26 @@ class _GraphModuleFinder(modulefinder.ModuleFinder, logger.Loggable):
                               V       |    V
                               C        --> D
 
-    :param args: passed to ModuleFinder
-    :param kwargs: passed to ModuleFinder
+    :param module_deps: Mapping of module object to the list of modules it
+        imports, in import order.
+    :type module_deps: ``Dict[modulefinder.Module, List[modulefinder.Module]]``
     """
 
-    def __init__(self, *args, **kwargs):
-        # In the Python 2 stdlib, ModuleFinder is an old-style class that
-        # does not inherit from object, therefore we cannot use super().
-        modulefinder.ModuleFinder.__init__(self, *args, **kwargs)
-        logger.Loggable.__init__(self)  # Enable logging via self.logger
-
-        # Mapping of module object to a set of its dependencies. We store the
-        # dependencies in a list instead of a set to preserve ordering. While
-        # not strictly necessary, it makes testing easier when the ordering
-        # of nodes in the graph can be relied on. However, we must ensure that
-        # each dependency is unique, so we check before adding each new
-        # dependency below. This should be a significant performance issue,
-        # as we only expect each module to have a relatively small number
-        # of dependencies (around 10s) so O(n) adding is acceptable.
-        self._module_deps = collections.defaultdict(list)
-        self._curr_caller = None
+    def __init__(self, module_deps):
+        super(_GraphBuilder, self).__init__()
+        self._module_deps = module_deps
         self._module_nodes = {}
 
-    def import_hook(self, name, caller=None, *args, **kwargs):
-        """
-        Hook called when ``caller`` imports module ``name``. Store off the
-        caller so we can use it later.
-
-        :param name: Name of the module being imported.
-        :type name: ``str``
-        :param caller: Module object that is importing ``name``.
-        :type caller: ``modulefinder.Module``
-        :param args: Other args are passed down to
-            ``modulefinder.ModuleFinder.import_hook``
-        :param kwargs: Other kwargs are passed down to
-            ``modulefinder.ModuleFinder.import_hook``
-        :return: Return value from ``modulefinder.ModuleFinder.import_hook``
-        """
-        self._curr_caller = caller
-        return modulefinder.ModuleFinder.import_hook(
-            self, name, caller, *args, **kwargs
-        )
-
-    def import_module(self, *args, **kwargs):
-        """
-        Called a bit further down the stack when a module is imported. Update
-        the internal mapping of module dependencies.
-
-        :param args: all args are passed down to
-            ``modulefinder.ModuleFinder.import_module``
-        :param kwargs: all kwargs are passed down to
-            ``modulefinder.ModuleFinder.import_module``
-        :return: Imported module object.
-        :rtype: ``modulefinder.Module``
-        """
-        caller = self._curr_caller
-        self._curr_caller = None
-        mod = modulefinder.ModuleFinder.import_module(self, *args, **kwargs)
-
-        if (
-            (caller is not None)
-            and (mod is not None)
-            and _has_file(mod)
-            and mod not in self._module_deps[caller]
-        ):
-            self.logger.debug(
-                "Adding %(mod)s to %(caller)s's dependencies",
-                {"mod": mod.__name__, "caller": caller.__name__},
-            )
-            self._module_deps[caller].append(mod)
-
-        return mod
-
-    def build_dep_graph(self):
+    def build_dep_graph(self, main_mod):
         """
         Build a directed graph of dependencies, made up of ``_ModuleNode``s.
 
+        :param main_mod: Module object of __main__.
+        :type main_mod: ``modulefinder.Module``
         :return: Root node of dependency graph and a set of all nodes in the
             graph.
         :rtype: ``Tuple[_ModuleNode, set[_ModuleNode]``
         """
-        main_mod = self.modules["__main__"]
         root_node = self._produce_graph(main_mod, [])
         return root_node, set(self._module_nodes.values())
 
@@ -446,7 +567,7 @@ class _GraphModuleFinder(modulefinder.ModuleFinder, logger.Loggable):
 class _ModuleNode(object):
     """
     Node in the directed acyclic graph of dependencies produced by
-    _GraphModuleFinder.
+    _GraphBuilder.
 
     :param mod: Module object this node represents
     :type mod: ``modulefinder.Module``
@@ -573,3 +694,128 @@ def _is_testsuite(attr):
     :rtype: ``bool``
     """
     return inspect.isclass(attr) and hasattr(attr, "__testcases__")
+
+
+def _scan_source(filepath):
+    """
+    Parse a module source file for its import statements and the names it
+    binds at module level.
+
+    :param filepath: Path of the module source file.
+    :type filepath: ``str``
+    :return: Imports as ``[level, module, names]`` in source order, ``names``
+        being empty for plain ``import`` statements, and global names.
+    :rtype: ``Tuple[List[list], List[str]]``
+    """
+    with open(filepath, "rb") as source:
+        tree = ast.parse(source.read(), filepath)
+
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(
+                    (node.lineno, node.col_offset, [0, alias.name, []])
+                )
+        elif isinstance(node, ast.ImportFrom):
+            imports.append(
+                (
+                    node.lineno,
+                    node.col_offset,
+                    [
+                        node.level or 0,
+                        node.module or "",
+                        [alias.name for alias in node.names],
+                    ],
+                )
+            )
+    imports.sort(key=lambda item: item[:2])
+
+    names = []
+    for node in _module_level_statements(tree.body):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.extend(
+                alias.asname or alias.name.split(".")[0]
+                for alias in node.names
+                if alias.name != "*"
+            )
+        elif isinstance(node, (ast.Assign, getattr(ast, "AnnAssign", ()))):
+            targets = getattr(node, "targets", None) or [node.target]
+            for target in targets:
+                names.extend(
+                    name.id
+                    for name in ast.walk(target)
+                    if isinstance(name, ast.Name)
+                )
+        elif hasattr(node, "name"):
+            names.append(node.name)
+
+    return [item[2] for item in imports], sorted(set(names))
+
+
+def _module_level_statements(body):
+    """
+    Yield the statements executed at module level, including the ones nested
+    in blocks such as ``if`` or ``try``, but not in classes or functions.
+    """
+    for node in body:
+        yield node
+        if hasattr(node, "name"):
+            continue
+        for field in ("body", "orelse", "finalbody", "handlers"):
+            for child in getattr(node, field, None) or []:
+                if isinstance(child, ast.stmt):
+                    for stmt in _module_level_statements([child]):
+                        yield stmt
+                elif hasattr(child, "body"):
+                    for stmt in _module_level_statements(child.body):
+                        yield stmt
+
+
+def _resolve_imports(name, filepath, imports, modules):
+    """
+    Resolve the import statements of a module to the modules they load.
+
+    :param name: Name of the importing module.
+    :type name: ``str``
+    :param filepath: Path of the importing module source file.
+    :type filepath: ``str``
+    :param imports: Import statements as returned by ``_scan_source``.
+    :type imports: ``List[list]``
+    :param modules: Names of the modules that can be dependencies.
+    :type modules: ``Container[str]``
+    :return: Names of the imported modules, in import order.
+    :rtype: ``List[str]``
+    """
+    if os.path.basename(filepath) == "__init__.py":
+        package = name
+    else:
+        package = name.rpartition(".")[0]
+
+    deps = []
+    for level, module, names in imports:
+        if level:
+            base = package
+            for _ in range(level - 1):
+                base = base.rpartition(".")[0]
+            module = ".".join(part for part in (base, module) if part)
+
+        if names:
+            # ``from module import name`` may import a submodule.
+            candidates = [module] + [
+                "{}.{}".format(module, imported) if module else imported
+                for imported in names
+                if imported != "*"
+            ]
+        else:
+            # ``import a.b.c`` also imports its parent packages.
+            parts = module.split(".")
+            candidates = [
+                ".".join(parts[: idx + 1]) for idx in range(len(parts))
+            ]
+
+        for candidate in candidates:
+            if candidate in modules and candidate != name:
+                if candidate not in deps:
+                    deps.append(candidate)
+    return deps
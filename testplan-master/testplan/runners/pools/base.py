@@ -1,6 +1,7 @@
 """Worker pool executor base classes."""
 import os
 import numbers
+import collections
 import threading
 import time
 import datetime
@@ -8,6 +9,8 @@ import uuid
 import pprint
 import traceback
 
+from six.moves import queue
+
 from schema import Or, And, Use
 
 from testplan.common.config import ConfigOption, validate_func
@@ -20,9 +23,19 @@ from testplan.report import ReportCategories
 
 from .communication import Message
 from .connection import QueueClient, QueueServer
+from .scheduling import SchedulingPolicy, FIFOPolicy, TaskTiming
+from .scaling import ScalingPolicy
 from .tasks import Task, TaskResult
 from testplan.common.entity import ResourceStatus
 
+WorkerRecycle = collections.namedtuple(
+    "WorkerRecycle", "worker reason time task_count rss"
+)
+WorkerRecycle.__doc__ = """
+Replacement of a worker process by a pool, after the worker was handed
+``task_count`` tasks and while it used ``rss`` bytes of memory, if known.
+"""
+
 
 class WorkerConfig(entity.ResourceConfig):
     """
@@ -39,6 +52,8 @@ class WorkerConfig(entity.ResourceConfig):
             "index": Or(int, str),
             ConfigOption("transport", default=QueueClient): object,
             ConfigOption("restart_count", default=3): int,
+            ConfigOption("event_driven", default=False): bool,
+            ConfigOption("prefetch", default=0): And(int, lambda x: x >= 0),
         }
 
 
@@ -53,6 +68,10 @@ class Worker(entity.Resource):
     :type transport: :py:class:`~testplan.runners.pools.connection.Client`
     :param restart_count: How many times the worker had restarted.
     :type restart_count: ``int``
+    :param event_driven: Block on transport events instead of polling.
+    :type event_driven: ``bool``
+    :param prefetch: Number of tasks to keep queued locally while executing.
+    :type prefetch: ``int``
 
     Also inherits all :py:class:`~testplan.common.entity.base.Resource`
     options.
@@ -66,9 +85,20 @@ class Worker(entity.Resource):
         self._transport = self.cfg.transport()
         self._handler = None
         self.last_heartbeat = None
+        # Set by the pool once the worker process requests its config.
+        self.connected = threading.Event()
         self.assigned = set()
         self.requesting = 0
         self.restart_count = self.cfg.restart_count
+        # Usage of the worker process, reset when it is replaced.
+        self.task_count = 0
+        self.rss = None
+        self.retire_reason = None
+        # Usage over all worker processes.
+        self.peak_rss = None
+        self.recycle_count = 0
+        # Last time the worker was started, handed out tasks or sent results.
+        self.last_active = None
 
     @property
     def handler(self):
@@ -100,9 +130,21 @@ class Worker(entity.Resource):
         """Worker unique index."""
         return self.cfg.index
 
+    def update_rss(self, rss):
+        """Record the resident memory in bytes reported by the worker."""
+        self.rss = rss
+        self.peak_rss = max(rss, self.peak_rss or 0)
+
+    def reset_usage(self):
+        """Forget the usage of the worker process, before replacing it."""
+        self.task_count = 0
+        self.rss = None
+        self.retire_reason = None
+
     def starting(self):
         """Starts the daemonic worker loop."""
         self.make_runpath_dirs()
+        self._transport.blocking = self.cfg.event_driven
         self._handler = threading.Thread(
             target=self._loop, args=(self._transport,)
         )
@@ -127,6 +169,10 @@ class Worker(entity.Resource):
         return self._handler.is_alive()
 
     def _loop(self, transport):
+        if self.cfg.prefetch:
+            self._prefetch_loop(transport)
+            return
+
         message = Message(**self.metadata)
 
         while self.active and self.status.tag not in (
@@ -146,10 +192,85 @@ class Worker(entity.Resource):
                     message.make(message.TaskResults, data=results),
                     expect=message.Ack,
                 )
+                if self.cfg.event_driven:
+                    # Pull the next task straight away while there is work.
+                    continue
             elif received.cmd == Message.Ack:
                 pass
             time.sleep(self.cfg.active_loop_sleep)
 
+    def _prefetch_loop(self, transport):
+        """
+        Keep up to ``prefetch`` tasks queued locally. Tasks are executed in a
+        separate thread, so that pulling new tasks and sending back results
+        overlaps with execution instead of costing round trips between tasks.
+        """
+        message = Message(**self.metadata)
+        pending = queue.Queue()
+        finished = queue.Queue()
+        executor = threading.Thread(
+            target=self._execute_pending, args=(pending, finished)
+        )
+        executor.daemon = True
+        executor.start()
+
+        in_flight = 0  # Pulled tasks whose results were not sent back yet
+        results = []
+        try:
+            while self.active and self.status.tag not in (
+                self.status.STOPPING,
+                self.status.STOPPED,
+            ):
+                while True:
+                    try:
+                        results.append(finished.get_nowait())
+                    except queue.Empty:
+                        break
+                if results:
+                    in_flight -= len(results)
+                    transport.send_and_receive(
+                        message.make(message.TaskResults, data=results),
+                        expect=message.Ack,
+                    )
+                    results = []
+
+                demand = self.cfg.prefetch + 1 - in_flight
+                if demand > 0:
+                    received = transport.send_and_receive(
+                        message.make(message.TaskPullRequest, data=demand)
+                    )
+                    if received is None or received.cmd == Message.Stop:
+                        break
+                    elif received.cmd == Message.TaskSending:
+                        for task in received.data:
+                            pending.put(task)
+                        in_flight += len(received.data)
+                        continue
+
+                # Wait for a result, or until the next pull attempt.
+                try:
+                    results.append(
+                        finished.get(timeout=self.cfg.active_loop_sleep)
+                    )
+                except queue.Empty:
+                    pass
+        finally:
+            # Drop tasks not started yet, the pool reassigns them if needed.
+            while True:
+                try:
+                    pending.get_nowait()
+                except queue.Empty:
+                    break
+            pending.put(None)
+
+    def _execute_pending(self, pending, finished):
+        """Execute queued tasks until receiving ``None``."""
+        while True:
+            task = pending.get()
+            if task is None:
+                break
+            finished.put(self.execute(task))
+
     def execute(self, task):
         """
         Executes a task and return the associated task result.
@@ -195,6 +316,10 @@ class Worker(entity.Resource):
         return "{}[{}]".format(self.__class__.__name__, self.cfg.index)
 
 
+def _format_rss(rss):
+    return "{:.1f} MB".format(rss / float(2 ** 20))
+
+
 def default_check_rerun(pool, task_result):
     """
     Determines if a task needs to be rerun based on the task result info.
@@ -249,9 +374,23 @@ class PoolConfig(ExecutorConfig):
             ConfigOption("heartbeats_miss_limit", default=3): int,
             ConfigOption("restart_count", default=3): int,
             ConfigOption("max_active_loop_sleep", default=5): numbers.Number,
+            ConfigOption("event_driven", default=False): bool,
+            ConfigOption("prefetch", default=0): And(int, lambda x: x >= 0),
+            ConfigOption("scheduling_policy", default=None): Or(
+                None, SchedulingPolicy
+            ),
             ConfigOption("should_rerun", default=default_check_rerun): Use(
                 validate_custom_func
             ),
+            ConfigOption("max_tasks_per_worker", default=None): Or(
+                None, And(int, lambda x: x > 0)
+            ),
+            ConfigOption("max_worker_rss", default=None): Or(
+                None, And(int, lambda x: x > 0)
+            ),
+            ConfigOption("scaling_policy", default=None): Or(
+                None, ScalingPolicy
+            ),
         }
 
 
@@ -273,15 +412,44 @@ class Pool(Executor):
     :type restart_count: ``int``
     :param max_active_loop_sleep: Maximum value for delay logic in active sleep.
     :type max_active_loop_sleep: ``int`` or ``float``
+    :param event_driven: Block on the pool/worker transports waiting for
+        messages instead of polling them with fixed sleeps. Default: False
+    :type event_driven: ``bool``
+    :param prefetch: Number of tasks each worker keeps queued locally on top
+        of the one it is executing, so that results are sent back and new
+        tasks pulled while it keeps executing. Default: 0
+    :type prefetch: ``int``
+    :param scheduling_policy: Decides the order in which tasks are handed
+        out to workers. Default: tasks are handed out in the order they were
+        added.
+    :type scheduling_policy: ``NoneType`` or
+        :py:class:`~testplan.runners.pools.scheduling.SchedulingPolicy`
     :param should_rerun: Determines if a task needs to be rerun based on the
         task result fetched from worker.
     :type should_rerun: ``callable``
+    :param max_tasks_per_worker: Number of tasks handed out to a worker
+        before it is replaced by a new worker, once it finished them.
+        Default: workers are not replaced.
+    :type max_tasks_per_worker: ``int`` or ``NoneType``
+    :param max_worker_rss: Resident memory in bytes of a worker process and
+        its children above which the worker is replaced, once it finished its
+        tasks. Only process and remote workers report their memory usage.
+        Default: workers are not replaced.
+    :type max_worker_rss: ``int`` or ``NoneType``
+    :param scaling_policy: Starts and stops workers as the number of pending
+        tasks changes, ``size`` being the maximum number of workers.
+        Default: all workers are started with the pool.
+    :type scaling_policy: ``NoneType`` or
+        :py:class:`~testplan.runners.pools.scaling.ScalingPolicy`
 
     Also inherits all :py:class:`~testplan.runners.base.Executor` options.
     """
 
     CONFIG = PoolConfig
     CONN_MANAGER = QueueServer
+    # Upper bound of a blocking accept in event driven mode, so that the
+    # loop still notices when the pool is stopped.
+    _ACCEPT_TIMEOUT = 0.1
 
     def __init__(
         self,
@@ -292,17 +460,33 @@ class Pool(Executor):
         heartbeats_miss_limit=3,
         restart_count=3,
         max_active_loop_sleep=5,
+        event_driven=False,
+        prefetch=0,
+        scheduling_policy=None,
         should_rerun=default_check_rerun,
+        max_tasks_per_worker=None,
+        max_worker_rss=None,
+        scaling_policy=None,
         **options
     ):
         options.update(self.filter_locals(locals()))
         super(Pool, self).__init__(**options)
-        self.unassigned = []  # unassigned tasks
+        self.unassigned = (  # unassigned tasks
+            self.cfg.scheduling_policy or FIFOPolicy()
+        ).make_queue(self)
+        self.task_timings = {}  # uid: TaskTiming of the latest execution
+        self._task_starts = {}  # uid: time sent to a worker
         self._task_retries_cnt = {}  # uid: times_reassigned_without_result
         self._task_retries_limit = 2
         self._should_rerun = self.cfg.should_rerun
         self._workers = entity.Environment(parent=self)
+        # Created workers that are not running, with a scaling policy.
+        self._standby = collections.OrderedDict()
+        self._worker_order = []  # uids of the workers, in creation order
         self._workers_last_result = {}
+        self.recycles = []  # WorkerRecycle of each replaced worker
+        # Wakes up the worker monitor, to recycle or scale workers.
+        self._monitor_wakeup = threading.Event()
         self._conn = self.CONN_MANAGER()
         self._conn.parent = self
         self._pool_lock = threading.Lock()
@@ -341,6 +525,8 @@ class Pool(Executor):
         super(Pool, self).add(task, uid)
         self.unassigned.append(uid)
         self._task_retries_cnt[uid] = 0
+        if self.cfg.scaling_policy:
+            self._monitor_wakeup.set()
 
     def set_rerun_check(self, check_rerun):
         """
@@ -393,15 +579,20 @@ class Pool(Executor):
             self._worker_monitor.daemon = True
             self._worker_monitor.start()
 
+        event_driven = self.cfg.event_driven
         while self.active and not self._exit_loop:
-            msg = self._conn.accept()
+            if event_driven:
+                msg = self._conn.accept(timeout=self._ACCEPT_TIMEOUT)
+            else:
+                msg = self._conn.accept()
             if msg:
                 try:
                     self.handle_request(msg)
                 except Exception:
                     self.logger.error(traceback.format_exc())
 
-            time.sleep(self.cfg.active_loop_sleep)
+            if not event_driven:
+                time.sleep(self.cfg.active_loop_sleep)
 
     def handle_request(self, request):
         """
@@ -412,6 +603,11 @@ class Pool(Executor):
         """
 
         sender_index = request.sender_metadata["index"]
+        if sender_index not in self._workers:
+            # Late message of a worker that was scaled down.
+            worker = self._standby[sender_index]
+            worker.respond(Message(**self._metadata).make(Message.Stop))
+            return
         worker = self._workers[sender_index]
 
         self.logger.debug(
@@ -430,6 +626,20 @@ class Pool(Executor):
                 request.data,
             )
 
+        if request.sender_metadata.get("rss") is not None:
+            worker.update_rss(request.sender_metadata["rss"])
+            if (
+                self.cfg.max_worker_rss
+                and worker.rss > self.cfg.max_worker_rss
+            ):
+                self._retire_worker(
+                    worker,
+                    "memory usage {} exceeds {}".format(
+                        _format_rss(worker.rss),
+                        _format_rss(self.cfg.max_worker_rss),
+                    ),
+                )
+
         response = Message(**self._metadata)
 
         if not self.active or self.status.tag == self.STATUS.STOPPING:
@@ -446,6 +656,10 @@ class Pool(Executor):
 
     def _handle_cfg_request(self, worker, _, response):
         """Handle a ConfigRequest from a worker."""
+        # First request of a worker process, which is now started.
+        worker.last_heartbeat = time.time()
+        worker.connected.set()
+
         options = []
         cfg = self.cfg
 
@@ -459,10 +673,19 @@ class Pool(Executor):
         """Handle a TaskPullRequest from a worker."""
         tasks = []
 
-        if self.status.tag == self.status.STARTED:
-            for _ in range(request.data):
+        quota = request.data
+        if self.cfg.max_tasks_per_worker:
+            quota = min(
+                quota, self.cfg.max_tasks_per_worker - worker.task_count
+            )
+
+        if self.status.tag == self.status.STARTED and not worker.retire_reason:
+            # Refused tasks are queued again once the request is handled, a
+            # priority queue would otherwise hand them straight back.
+            refused = []
+            for _ in range(quota):
                 try:
-                    uid = self.unassigned.pop(0)
+                    uid = self.unassigned.pop()
                 except IndexError:
                     break
 
@@ -488,6 +711,9 @@ class Pool(Executor):
                                 )
                             )
                             worker.assigned.add(uid)
+                            worker.task_count += 1
+                            worker.last_active = time.time()
+                            self._task_starts[uid] = time.time()
                             tasks.append(task)
                             task.executors.setdefault(self.cfg.name, set())
                             task.executors[self.cfg.name].add(worker.uid())
@@ -495,7 +721,7 @@ class Pool(Executor):
                             self.logger.test_info(
                                 "Cannot schedule {} to {}".format(task, worker)
                             )
-                            self.unassigned.append(uid)
+                            refused.append(uid)
                             self._task_retries_cnt[uid] += 1
                 else:
                     # Later may create a default local pool as failover option
@@ -506,6 +732,14 @@ class Pool(Executor):
                         ),
                     )
 
+            for uid in refused:
+                self.unassigned.append(uid)
+
+            if worker.task_count == self.cfg.max_tasks_per_worker:
+                self._retire_worker(
+                    worker, "handed out {} tasks".format(worker.task_count)
+                )
+
             if tasks:
                 worker.respond(response.make(Message.TaskSending, data=tasks))
                 worker.requesting = request.data - len(tasks)
@@ -517,9 +751,17 @@ class Pool(Executor):
     def _handle_taskresults(self, worker, request, response):
         """Handle a TaskResults message from a worker."""
         worker.respond(response.make(Message.Ack))
+        worker.last_active = time.time()
         for task_result in request.data:
             uid = task_result.task.uid()
             worker.assigned.remove(uid)
+            if uid in self._task_starts:
+                self.task_timings[uid] = TaskTiming(
+                    pool=self.cfg.name,
+                    worker=worker.uid(),
+                    start=self._task_starts.pop(uid),
+                    end=time.time(),
+                )
             self._workers_last_result.setdefault(worker, time.time())
             self.logger.test_info(
                 "De-assign {} from {}".format(task_result.task, worker)
@@ -552,6 +794,9 @@ class Pool(Executor):
             self._results[uid] = task_result
             self.ongoing.remove(uid)
 
+        if worker.retire_reason and not worker.assigned:
+            self._monitor_wakeup.set()
+
     def _handle_heartbeat(self, worker, request, response):
         """Handle a Heartbeat message received from a worker."""
         worker.last_heartbeat = time.time()
@@ -572,6 +817,189 @@ class Pool(Executor):
         worker.respond(response.make(Message.Ack))
         self._decommission_worker(worker, "Aborting {}, setup failed.")
 
+    def _retire_worker(self, worker, reason):
+        """
+        Stop handing out tasks to a worker, which is replaced by the worker
+        monitor once it finished its tasks.
+        """
+        if worker.retire_reason is None:
+            worker.retire_reason = reason
+            self.logger.debug("Retiring %s, %s", worker, reason)
+        if not worker.assigned:
+            self._monitor_wakeup.set()
+
+    def _recycle_workers(self):
+        """Replace the retired workers that finished their tasks."""
+        self._monitor_wakeup.clear()
+        for worker in self._workers:
+            with self._pool_lock:
+                if not (
+                    worker.retire_reason
+                    and not worker.assigned
+                    and worker.status.tag == worker.status.STARTED
+                    and self.active
+                    and self.status.tag == self.status.STARTED
+                ):
+                    continue
+
+                self.logger.test_info(
+                    "Recycling {}, {}.".format(worker, worker.retire_reason)
+                )
+                self.recycles.append(
+                    WorkerRecycle(
+                        worker=worker.uid(),
+                        reason=worker.retire_reason,
+                        time=time.time(),
+                        task_count=worker.task_count,
+                        rss=worker.rss,
+                    )
+                )
+                worker.recycle_count += 1
+                worker.reset_usage()
+                try:
+                    worker.restart()
+                except Exception as exc:
+                    self.logger.critical(
+                        "Worker {} failed to restart: {}".format(worker, exc)
+                    )
+
+    def _scale_workers(self):
+        """Start or stop workers as decided by the scaling policy."""
+        policy = self.cfg.scaling_policy
+        if policy is None:
+            return
+
+        with self._pool_lock:
+            if not (self.active and self.status.tag == self.status.STARTED):
+                return
+            to_start, to_stop = policy.scale(
+                self, list(self._workers), list(self._standby.values())
+            )
+
+            for worker in to_stop:
+                self.logger.test_info(
+                    "Stopping {}, idle for {:.0f}s.".format(
+                        worker, time.time() - worker.last_active
+                    )
+                )
+                # No more tasks are handed out while the worker stops.
+                worker.retire_reason = "idle"
+                try:
+                    worker.stop()
+                    worker.wait(worker.status.STOPPED)
+                except Exception as exc:
+                    self.logger.error(
+                        "Worker {} failed to stop: {}".format(worker, exc)
+                    )
+                while worker.assigned:
+                    # Handed out while the worker was stopping.
+                    uid = worker.assigned.pop()
+                    self.logger.test_info(
+                        "Re-collect {} from {} to {}.".format(
+                            self._input[uid], worker, self
+                        )
+                    )
+                    self.unassigned.append(uid)
+                worker.reset_usage()
+                self._workers.remove(worker.uid())
+                self._standby[worker.uid()] = worker
+
+            if to_stop:
+                # Standby workers are started in the order they were created.
+                self._standby = collections.OrderedDict(
+                    (uid, self._standby[uid])
+                    for uid in self._worker_order
+                    if uid in self._standby
+                )
+
+            if to_start:
+                self.logger.test_info(
+                    "Starting {} for {} pending tasks.".format(
+                        ", ".join(str(worker) for worker in to_start),
+                        len(self.unassigned),
+                    )
+                )
+            for worker in to_start:
+                del self._standby[worker.uid()]
+                self._workers.add(worker, uid=worker.uid())
+                self._conn.register(worker)
+                worker.last_active = time.time()
+                worker.start()
+            for worker in to_start:
+                try:
+                    worker.wait(worker.status.STARTED)
+                except Exception as exc:
+                    self.logger.error(
+                        "Worker {} failed to start: {}".format(worker, exc)
+                    )
+
+    def _select_initial_workers(self):
+        """
+        Keep the workers that the scaling policy starts with the pool, the
+        others are put on standby.
+        """
+        if not self._worker_order:
+            self._worker_order = [worker.uid() for worker in self._workers]
+        workers = sorted(
+            self._all_workers(),
+            key=lambda worker: self._worker_order.index(worker.uid()),
+        )
+        for worker in list(self._workers):
+            self._workers.remove(worker.uid())
+        to_start, _ = self.cfg.scaling_policy.scale(self, [], workers)
+
+        self._standby.clear()
+        for worker in workers:
+            if worker in to_start:
+                worker.last_active = time.time()
+                self._workers.add(worker, uid=worker.uid())
+            else:
+                self._standby[worker.uid()] = worker
+
+    def worker_summary(self):
+        """
+        Usage of each worker: number of executed tasks, number of times it
+        was recycled and peak resident memory in bytes, if reported.
+
+        :rtype: ``dict`` of ``str`` to ``dict``
+        """
+        executed = collections.Counter(
+            timing.worker for timing in self.task_timings.values()
+        )
+        return {
+            worker.uid(): {
+                "tasks": executed[worker.uid()],
+                "recycles": worker.recycle_count,
+                "peak_rss": worker.peak_rss,
+            }
+            for worker in self._all_workers()
+        }
+
+    def _all_workers(self):
+        """Running and standby workers."""
+        return list(self._workers) + list(self._standby.values())
+
+    def _log_worker_summary(self):
+        summary = self.worker_summary()
+        if not summary:
+            return
+        self.logger.info(
+            "%s workers summary (%d recycled):\n%s",
+            self,
+            len(self.recycles),
+            "\n".join(
+                "  {}: {} tasks, recycled {} times, peak memory {}".format(
+                    uid,
+                    usage["tasks"],
+                    usage["recycles"],
+                    "unknown"
+                    if usage["peak_rss"] is None
+                    else _format_rss(usage["peak_rss"]),
+                )
+                for uid, usage in sorted(summary.items())
+            ),
+        )
+
     def _decommission_worker(self, worker, message):
         """
         Decommission a worker by move all assigned task back to pool
@@ -600,6 +1028,8 @@ class Pool(Executor):
 
         break_outer_loop = False
         while self.active:
+            self._recycle_workers()
+            self._scale_workers()
             hosts_status = {"active": [], "inactive": [], "initializing": []}
 
             for worker in self._workers:
@@ -641,14 +1071,16 @@ class Pool(Executor):
                 break
 
             try:
-                # For early finish of worker monitoring thread.
+                # For early finish of worker monitoring thread, or to
+                # replace the retired workers.
                 wait_until_predicate(
-                    lambda: not self.is_alive,
+                    lambda: not self.is_alive or self._monitor_wakeup.is_set(),
                     timeout=loop_interval,
                     interval=0.05,
                 )
             except RuntimeError:
-                break
+                if not self.is_alive:
+                    break
 
     def _query_worker_status(self, worker):
         """
@@ -715,6 +1147,7 @@ class Pool(Executor):
 
         if worker.restart_count:
             worker.restart_count -= 1
+            worker.reset_usage()
             try:
                 worker.restart()
                 return True
@@ -785,6 +1218,8 @@ class Pool(Executor):
             worker = self.cfg.worker_type(
                 index=idx,
                 restart_count=self.cfg.restart_count,
+                event_driven=self.cfg.event_driven,
+                prefetch=self.cfg.prefetch,
                 active_loop_sleep=0.01,
             )
             worker.parent = self
@@ -819,8 +1254,10 @@ class Pool(Executor):
         self._exit_loop = False
         super(Pool, self).starting()  # start the loop & monitor
 
-        if not self._workers:
+        if not self._workers and not self._standby:
             self._add_workers()
+        if self.cfg.scaling_policy:
+            self._select_initial_workers()
         self._start_workers()
 
         if self._workers.start_exceptions:
@@ -846,7 +1283,7 @@ class Pool(Executor):
 
         with self._pool_lock:
             self._stop_workers()
-            for worker in self._workers:
+            for worker in self._all_workers():
                 worker.transport.disconnect()
 
         self._exit_loop = True
@@ -854,6 +1291,7 @@ class Pool(Executor):
 
         self._conn.stop()
 
+        self._log_worker_summary()
         self.status.change(self.status.STOPPED)
         self.logger.debug("Stopped %s", self.__class__.__name__)
 
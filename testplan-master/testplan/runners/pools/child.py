@@ -2,7 +2,10 @@
 
 import os
 import sys
+import json
 import time
+import random
+import select
 import signal
 import socket
 import shutil
@@ -12,6 +15,21 @@ import platform
 import threading
 import subprocess
 import traceback
+import importlib
+
+# Modules that every process worker imports, loaded once by the zygote.
+ZYGOTE_PRELOAD = (
+    "psutil",
+    "zmq",
+    "testplan.runners.pools.base",
+    "testplan.runners.pools.communication",
+    "testplan.runners.pools.connection",
+    "testplan.runners.pools.process",
+    "testplan.testing.multitest",
+)
+
+# How often the zygote reaps the workers that exited, in seconds.
+ZYGOTE_REAP_INTERVAL = 0.1
 
 
 def parse_cmdline():
@@ -70,6 +88,7 @@ class ChildLoop(object):
             worker_type=self._worker_type,
             size=self._pool_size,
             runpath=self.runpath,
+            event_driven=self._pool_cfg.event_driven,
             should_rerun=lambda pool, task_result: False,  # always return False
         )
         self._pool.parent = self
@@ -116,6 +135,20 @@ class ChildLoop(object):
         fhandler.setLevel(self.logger.level)
         self.logger.addHandler(fhandler)
 
+    @staticmethod
+    def _rss():
+        """Resident memory in bytes of this process and of its children."""
+        import psutil
+
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass  # Exited meanwhile.
+        return rss
+
     def _send_and_expect(self, message, send, expect):
         try:
             return self._transport.send_and_receive(
@@ -147,6 +180,7 @@ class ChildLoop(object):
             except IndexError:
                 break
         self._pool_cfg = pool_cfg
+        self._transport.blocking = self._pool_cfg.event_driven
 
         for sig in self._pool_cfg.abort_signals:
             signal.signal(sig, self._handle_abort)
@@ -186,6 +220,7 @@ class ChildLoop(object):
                 now = time.time()
 
                 if self._pool_cfg.worker_heartbeat and now > next_heartbeat:
+                    message.sender_metadata["rss"] = self._rss()
                     hb_resp = self._transport.send_and_receive(
                         message.make(message.Heartbeat, data=time.time())
                     )
@@ -215,14 +250,18 @@ class ChildLoop(object):
                             )
                         )
                         del self._pool.results[uid]
+                    message.sender_metadata["rss"] = self._rss()
                     self._transport.send_and_receive(
                         message.make(message.TaskResults, data=task_results),
                         expect=message.Ack,
                     )
 
-                # Request new tasks
-                demand = self._pool.workers_requests() - len(
-                    self._pool.unassigned
+                # Request new tasks, keeping up to `prefetch` of them queued
+                # in the local pool on top of what its workers ask for.
+                demand = (
+                    self._pool.workers_requests()
+                    + self._pool_cfg.prefetch
+                    - len(self._pool.unassigned)
                 )
 
                 if demand > 0 and time.time() > next_possible_request:
@@ -314,6 +353,12 @@ class RemoteChildLoop(ChildLoop):
                     self._setup_metadata.workspace_paths.remote,
                     ignore_errors=True,
                 )
+            # The transferred files are removed, transfer all of them again.
+            if self._setup_metadata.sync_manifest:
+                try:
+                    os.remove(self._setup_metadata.sync_manifest)
+                except OSError:
+                    pass
         super(RemoteChildLoop, self).exit_loop()
 
 
@@ -403,6 +448,144 @@ def child_logic(args):
         loop.worker_loop()
 
 
+def _preload(modules):
+    """
+    Import modules, given as ``(name, path)`` pairs where path is an extra
+    ``sys.path`` entry needed to import them, or None.
+
+    :return: Traceback of each module that could not be imported.
+    :rtype: ``dict``
+    """
+    errors = {}
+    for name, path in modules:
+        path_inserted = False
+        if path and path not in sys.path:
+            sys.path.insert(0, path)
+            path_inserted = True
+        try:
+            importlib.import_module(name)
+        except Exception:
+            errors[name] = traceback.format_exc()
+        finally:
+            if path_inserted:
+                sys.path.remove(path)
+    return errors
+
+
+def _returncode(status):
+    """Exit status of a process in the format of ``subprocess.Popen``."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _fork_worker(args, request, replies):
+    """
+    Fork a process worker, which redirects its output to the requested file
+    and connects to the pool at the requested address.
+
+    :return: Process id of the worker.
+    :rtype: ``int``
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid:
+        return pid
+
+    code = 1
+    try:
+        replies.close()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        out = os.open(
+            request["outfile"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+        )
+        os.dup2(out, 1)
+        os.dup2(out, 2)
+        os.close(out)
+        # Workers must not share the random state of the zygote.
+        random.seed()
+
+        args.type = "process_worker"
+        args.index = request["index"]
+        args.address = request["address"]
+        child_logic(args)
+        code = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def zygote_logic(args):
+    """
+    Template process of a process pool: preloads the modules of process
+    workers and forks them on request.
+
+    Requests are JSON lines read from stdin, replies are JSON lines written
+    to the original stdout, along with the exit codes of the forked workers.
+    Other output goes to stderr.
+    """
+    if args.log_level:
+        from testplan.common.utils.logger import TESTPLAN_LOGGER
+
+        TESTPLAN_LOGGER.setLevel(args.log_level)
+
+    replies = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+
+    def reply(**data):
+        replies.write(json.dumps(data) + "\n")
+        replies.flush()
+
+    print(
+        "Starting zygote on {}, {}".format(socket.gethostname(), os.getpid())
+    )
+    workers = set()
+    buffer = b""
+    while True:
+        readable, _, _ = select.select([0], [], [], ZYGOTE_REAP_INTERVAL)
+
+        while workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError:
+                break
+            if not pid:
+                break
+            workers.discard(pid)
+            reply(exited=pid, returncode=_returncode(status))
+
+        if not readable:
+            continue
+        data = os.read(0, 65536)
+        if not data:
+            break  # The pool closed stdin.
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            request = json.loads(line.decode("utf-8"))
+            if "preload" in request:
+                reply(
+                    preloaded=True,
+                    errors=_preload(
+                        [(name, None) for name in ZYGOTE_PRELOAD]
+                        + [tuple(module) for module in request["preload"]]
+                    ),
+                )
+            elif "fork" in request:
+                pid = _fork_worker(args, request["fork"], replies)
+                workers.add(pid)
+                reply(forked=request["fork"]["index"], pid=pid)
+
+
 def parse_syspath_file(filename):
     """
     Read and parse the syspath file, which should contain each sys.path entry
@@ -443,4 +626,7 @@ if __name__ == "__main__":
     if ARGS.testplan_deps:
         os.environ[testplan.TESTPLAN_DEPENDENCIES_PATH] = ARGS.testplan_deps
 
-    child_logic(ARGS)
+    if ARGS.type == "zygote":
+        zygote_logic(ARGS)
+    else:
+        child_logic(ARGS)
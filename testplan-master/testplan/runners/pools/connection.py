@@ -6,6 +6,7 @@ import six
 import abc
 import zmq
 import time
+import threading
 from six.moves import queue
 
 from testplan.common import entity
@@ -21,6 +22,8 @@ class Client(logger.Loggable):
     def __init__(self):
         super(Client, self).__init__()
         self.active = False
+        # If True, receive waits on transport events instead of polling.
+        self.blocking = False
 
     @abc.abstractmethod
     def connect(self, server):
@@ -93,6 +96,10 @@ class QueueClient(Client):
     """
     Queue based client implementation, for thread pool workers to
     communicate with its pool.
+
+    :param recv_sleep: Sleep duration in msg receive loop, or maximum wait
+        time between checks of the active flag in blocking mode.
+    :type recv_sleep: ``float``
     """
 
     def __init__(self, recv_sleep=0.05):
@@ -102,6 +109,7 @@ class QueueClient(Client):
 
         # single-producer(pool) single-consumer(worker) FIFO queue
         self.responses = []
+        self._responded = threading.Condition()
 
     def connect(self, requests):
         """
@@ -116,6 +124,8 @@ class QueueClient(Client):
         """Disconnect worker from pool"""
         self.active = False
         self.requests = None
+        with self._responded:
+            self._responded.notify_all()
 
     def send(self, message):
         """
@@ -133,6 +143,15 @@ class QueueClient(Client):
         :return: Response to the message sent.
         :type: :py:class:`~testplan.runners.pools.communication.Message`
         """
+        if self.blocking:
+            with self._responded:
+                while self.active:
+                    try:
+                        return self.responses.pop()
+                    except IndexError:
+                        self._responded.wait(self._recv_sleep)
+            return None
+
         while self.active:
             try:
                 return self.responses.pop()
@@ -149,7 +168,9 @@ class QueueClient(Client):
             :py:class:`~testplan.runners.pools.communication.Message`
         """
         if self.active:
-            self.responses.append(message)
+            with self._responded:
+                self.responses.append(message)
+                self._responded.notify()
         else:
             raise RuntimeError("Responding to inactive worker")
 
@@ -163,6 +184,8 @@ class ZMQClient(Client):
     :type address: ``float``
     :param recv_sleep: Sleep duration in msg receive loop.
     :type recv_sleep: ``float``
+    :param recv_timeout: Maximum time to wait for a response.
+    :type recv_timeout: ``float``
     """
 
     def __init__(self, address, recv_sleep=0.05, recv_timeout=5):
@@ -209,6 +232,9 @@ class ZMQClient(Client):
         :return: Response to the message sent.
         :type: :py:class:`~testplan.runners.pools.communication.Message`
         """
+        if self.blocking:
+            return self._blocking_receive()
+
         start_time = time.time()
 
         while self.active:
@@ -232,6 +258,26 @@ class ZMQClient(Client):
                 time.sleep(self._recv_sleep)
         return None
 
+    def _blocking_receive(self):
+        """Wait on the socket with a poller until a response or timeout."""
+        if not self.active:
+            return None
+
+        if not self._sock.poll(timeout=int(self._recv_timeout * 1000)):
+            print(
+                "Transport receive timeout {}s reached!".format(
+                    self._recv_timeout
+                )
+            )
+            return None
+
+        received = self._sock.recv(flags=zmq.NOBLOCK)
+        try:
+            return pickle.loads(received)
+        except Exception as exc:
+            print("Deserialization error. - {}".format(exc))
+            raise
+
 
 class ZMQClientProxy(object):
     """
@@ -304,11 +350,15 @@ class Server(entity.Resource):
             )
 
     @abc.abstractmethod
-    def accept(self):
+    def accept(self, timeout=None):
         """
-        Accepts a new message from worker. This method should not block - if
-        no message is queued for receiving it should return None.
+        Accepts a new message from worker. By default this method should not
+        block - if no message is queued for receiving it should return None.
+        If a timeout is given, it waits up to that many seconds for a message
+        to arrive before returning None.
 
+        :param timeout: Maximum time to wait for a message, in seconds.
+        :type timeout: ``NoneType`` or ``float``
         :return: Message received from worker transport, or None.
         :rtype: ``NoneType`` or
             :py:class:`~testplan.runners.pools.communication.Message`
@@ -336,16 +386,20 @@ class QueueServer(Server):
         super(QueueServer, self).register(worker)
         worker.transport.connect(self.requests)
 
-    def accept(self):
+    def accept(self, timeout=None):
         """
         Accepts the next request in the request queue.
 
+        :param timeout: Maximum time to wait for a request, in seconds.
+        :type timeout: ``NoneType`` or ``float``
         :return: Message received from worker transport, or None.
         :rtype: ``NoneType`` or
             :py:class:`~testplan.runners.pools.communication.Message`
         """
         try:
-            return self.requests.get_nowait()
+            if timeout is None:
+                return self.requests.get_nowait()
+            return self.requests.get(timeout=timeout)
         except queue.Empty:
             return None
 
@@ -364,6 +418,7 @@ class ZMQServer(Server):
         # and cleaned up when stopping.
         self._zmq_context = None
         self._sock = None
+        self._poller = None
         self._address = None
 
     @property
@@ -392,12 +447,15 @@ class ZMQServer(Server):
                 )
             )
             port_selected = self.parent.cfg.port
+        self._poller = zmq.Poller()
+        self._poller.register(self._sock, zmq.POLLIN)
         self._address = "{}:{}".format(self.parent.cfg.host, port_selected)
         super(ZMQServer, self).starting()
 
     def _close(self):
         """Closes TCP connections managed by this object.."""
         self.logger.debug("Closing TCP connections for %s", self.parent)
+        self._poller = None
         self._sock.close()
         self._sock = None
         self._zmq_context.destroy()
@@ -425,15 +483,20 @@ class ZMQServer(Server):
         super(ZMQServer, self).register(worker)
         worker.transport.connect(self)
 
-    def accept(self):
+    def accept(self, timeout=None):
         """
         Accepts a new message from worker. Doesn't block if no message is
-        queued for receiving.
+        queued for receiving, unless a timeout is given in which case the
+        socket is polled for up to that many seconds.
 
+        :param timeout: Maximum time to wait for a message, in seconds.
+        :type timeout: ``NoneType`` or ``float``
         :return: Message received from worker transport, or None.
         :rtype: ``NoneType`` or
             :py:class:`~testplan.runners.pools.communication.Message`
         """
+        if timeout is not None and not self._poller.poll(int(timeout * 1000)):
+            return None
         try:
             return pickle.loads(self._sock.recv(flags=zmq.NOBLOCK))
         except zmq.Again:
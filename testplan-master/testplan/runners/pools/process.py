@@ -1,20 +1,23 @@
 """Process worker pool module."""
 
 import os
-import re
 import sys
+import json
 import time
 import signal
+import threading
 import subprocess
 import tempfile
 
+import psutil
+import six
 from schema import Or
+from six.moves import queue
 
 import testplan
 from testplan.common.utils.logger import TESTPLAN_LOGGER
 from testplan.common.config import ConfigOption
 from testplan.common.utils.process import kill_process
-from testplan.common.utils.match import match_regexps_in_file
 from testplan.common.utils.timing import get_sleeper
 from testplan.runners.pools import tasks
 
@@ -22,6 +25,260 @@ from .base import Pool, PoolConfig, Worker, WorkerConfig
 from .connection import ZMQClientProxy, ZMQServer
 
 
+def _child_script():
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(dirname, "child.py")
+
+
+def _write_syspath_file(logger):
+    """Write out our current sys.path to a file and return the filename."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+        f.write("\n".join(sys.path))
+        logger.debug("Written sys.path to file: %s", f.name)
+        return f.name
+
+
+def child_cmd(child_path, child_type, sys_path_file):
+    """
+    Command that starts a child process of a process pool.
+
+    :param child_path: Path of the child process script.
+    :type child_path: ``str``
+    :param child_type: Type of the child process, e.g. ``process_worker``.
+    :type child_type: ``str``
+    :param sys_path_file: File listing the ``sys.path`` of the child.
+    :type sys_path_file: ``str``
+    :return: Command arguments.
+    :rtype: ``list``
+    """
+    from testplan.common.utils.path import fix_home_prefix
+
+    cmd = [
+        sys.executable,
+        fix_home_prefix(child_path),
+        "--testplan",
+        os.path.join(os.path.dirname(testplan.__file__), ".."),
+        "--type",
+        child_type,
+        "--log-level",
+        TESTPLAN_LOGGER.getEffectiveLevel(),
+        "--sys-path-file",
+        sys_path_file,
+    ]
+    if os.environ.get(testplan.TESTPLAN_DEPENDENCIES_PATH):
+        cmd.extend(
+            [
+                "--testplan-deps",
+                fix_home_prefix(
+                    os.environ[testplan.TESTPLAN_DEPENDENCIES_PATH]
+                ),
+            ]
+        )
+    return cmd
+
+
+class ForkedProcess(object):
+    """
+    Handler of a process worker forked by a :py:class:`Zygote`, with the
+    methods of ``subprocess.Popen`` that pools use.
+
+    :param pid: Process id.
+    :type pid: ``int``
+    :param zygote: Zygote that forked the process and reports its exit code.
+    :type zygote: :py:class:`Zygote`
+    """
+
+    def __init__(self, pid, zygote):
+        self.pid = pid
+        self.returncode = None
+        self._zygote = zygote
+
+    def poll(self):
+        """Return the exit code of the process, None if it is running."""
+        if self.returncode is None:
+            self.returncode = self._zygote.returncode(self.pid)
+        return self.returncode
+
+    def wait(self):
+        """Wait for the process to exit and return its exit code."""
+        while self.poll() is None:
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, sig):
+        """Send a signal to the process, if it is running."""
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, sig)
+            except OSError:
+                pass  # Exited meanwhile.
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class Zygote(object):
+    """
+    Template process of a :py:class:`ProcessPool`. It imports the modules
+    that workers need once, then forks the workers, which start without
+    importing them again.
+
+    :param cmd: Command that starts the zygote.
+    :type cmd: ``list``
+    :param outfile: Output file of the zygote.
+    :type outfile: ``str``
+    :param logger: Logger of the pool.
+    :type logger: ``logging.Logger``
+    """
+
+    def __init__(self, cmd, outfile, logger):
+        self.cmd = cmd
+        self.outfile = outfile
+        self.logger = logger
+        self._handler = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._replies = queue.Queue()
+        self._returncodes = {}
+        self._exited = threading.Condition()
+
+    @property
+    def is_alive(self):
+        return self._handler is not None and self._handler.poll() is None
+
+    def start(self, modules, timeout=60):
+        """
+        Start the zygote and wait for it to preload the modules.
+
+        :param modules: Modules to preload, ``(name, path)`` pairs where path
+            is an extra ``sys.path`` entry needed to import them, or None.
+        :type modules: ``list`` of ``tuple``
+        :param timeout: Timeout of the preloading in seconds.
+        :type timeout: ``int`` or ``float``
+        """
+        with open(self.outfile, "wb") as out:
+            self._handler = subprocess.Popen(
+                [str(arg) for arg in self.cmd],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=out,
+            )
+        self._reader = threading.Thread(target=self._read_replies)
+        self._reader.daemon = True
+        self._reader.start()
+
+        reply = self._request({"preload": modules}, timeout)
+        for name, error in reply["errors"].items():
+            self.logger.warning(
+                "Zygote could not preload %s, workers will import it:\n%s",
+                name,
+                error,
+            )
+        self.logger.debug(
+            "Zygote %s started - output at %s", self._handler.pid, self.outfile
+        )
+
+    def _read_replies(self):
+        for line in iter(self._handler.stdout.readline, b""):
+            reply = json.loads(line.decode("utf-8"))
+            if "exited" in reply:
+                with self._exited:
+                    self._returncodes[reply["exited"]] = reply["returncode"]
+                    self._exited.notify_all()
+            else:
+                self._replies.put(reply)
+        self._replies.put(None)
+        with self._exited:
+            self._exited.notify_all()
+
+    def _request(self, request, timeout):
+        with self._lock:
+            if not self.is_alive:
+                raise RuntimeError(
+                    "Zygote is not running (logfile = {})".format(self.outfile)
+                )
+            self._handler.stdin.write(
+                (json.dumps(request) + "\n").encode("utf-8")
+            )
+            self._handler.stdin.flush()
+            try:
+                reply = self._replies.get(timeout=timeout)
+            except queue.Empty:
+                reply = None
+            if reply is None:
+                raise RuntimeError(
+                    "No reply from zygote (logfile = {})".format(self.outfile)
+                )
+            return reply
+
+    def fork(self, index, address, outfile, timeout=30):
+        """
+        Fork a process worker.
+
+        :param index: Worker index.
+        :type index: ``str``
+        :param address: Address of the pool transport.
+        :type address: ``str``
+        :param outfile: Output file of the worker.
+        :type outfile: ``str``
+        :param timeout: Timeout of the fork request in seconds.
+        :type timeout: ``int`` or ``float``
+        :return: Handler of the worker process.
+        :rtype: :py:class:`ForkedProcess`
+        """
+        reply = self._request(
+            {
+                "fork": {
+                    "index": index,
+                    "address": address,
+                    "outfile": outfile,
+                }
+            },
+            timeout,
+        )
+        return ForkedProcess(reply["pid"], self)
+
+    def returncode(self, pid, timeout=1):
+        """
+        Return the exit code of a forked process, None if it is running.
+        Processes that exit after the zygote have an exit code of -1.
+        """
+        with self._exited:
+            if pid in self._returncodes:
+                return self._returncodes[pid]
+        try:
+            process = psutil.Process(pid)
+            if process.status() != psutil.STATUS_ZOMBIE:
+                return None
+        except psutil.NoSuchProcess:
+            pass
+
+        # Exited, the zygote reports the exit code once it reaps it.
+        with self._exited:
+            if pid not in self._returncodes and self.is_alive:
+                self._exited.wait(timeout)
+            return self._returncodes.get(pid, -1)
+
+    def stop(self):
+        """Stop the zygote, forked workers keep running."""
+        if self._handler is None:
+            return
+        try:
+            self._handler.stdin.close()
+        except (IOError, OSError):
+            pass
+        for _ in get_sleeper(interval=(0.01, 0.2), timeout=5):
+            if self._handler.poll() is not None:
+                break
+        kill_process(self._handler)
+        self._reader.join()
+        self._handler.stdout.close()
+        self._handler = None
+
+
 class ProcessWorkerConfig(WorkerConfig):
     """
     Configuration object for
@@ -53,50 +310,37 @@ class ProcessWorker(Worker):
         super(ProcessWorker, self).__init__(**options)
 
     def _child_path(self):
-        dirname = os.path.dirname(os.path.abspath(__file__))
-        return os.path.join(dirname, "child.py")
+        return _child_script()
 
     def _proc_cmd(self):
         """Command to start child process."""
-        from testplan.common.utils.path import fix_home_prefix
-
-        cmd = [
-            sys.executable,
-            fix_home_prefix(self._child_path()),
-            "--index",
-            self.cfg.index,
-            "--address",
-            self.transport.address,
-            "--testplan",
-            os.path.join(os.path.dirname(testplan.__file__), ".."),
-            "--type",
-            "process_worker",
-            "--log-level",
-            TESTPLAN_LOGGER.getEffectiveLevel(),
-            "--sys-path-file",
-            self._write_syspath(),
-        ]
-        if os.environ.get(testplan.TESTPLAN_DEPENDENCIES_PATH):
-            cmd.extend(
-                [
-                    "--testplan-deps",
-                    fix_home_prefix(
-                        os.environ[testplan.TESTPLAN_DEPENDENCIES_PATH]
-                    ),
-                ]
-            )
-        return cmd
+        return child_cmd(
+            self._child_path(), "process_worker", self._write_syspath()
+        ) + ["--index", self.cfg.index, "--address", self.transport.address]
 
     def _write_syspath(self):
         """Write out our current sys.path to a file and return the filename."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            f.write("\n".join(sys.path))
-            self.logger.debug("Written sys.path to file: %s", f.name)
-            return f.name
+        return _write_syspath_file(self.logger)
 
     def starting(self):
         """Start a child process worker."""
+        self.connected.clear()
+
         # NOTE: Worker resource has no runpath.
+        zygote = getattr(self.parent, "zygote", None)
+        if zygote is not None:
+            self._handler = zygote.fork(
+                index=self.cfg.index,
+                address=self.transport.address,
+                outfile=self.outfile,
+            )
+            self.logger.debug(
+                "Forked child process %s - output at %s",
+                self._handler.pid,
+                self.outfile,
+            )
+            return
+
         cmd = self._proc_cmd()
         self.logger.debug("{} executes cmd: {}".format(self, cmd))
 
@@ -111,7 +355,10 @@ class ProcessWorker(Worker):
         self._handler.stdin.write(bytes("y\n".encode("utf-8")))
 
     def _wait_started(self, timeout=None):
-        """TODO."""
+        """
+        Wait for the child process to request its configuration from the
+        pool over the transport.
+        """
         sleeper = get_sleeper(
             interval=(0.04, 0.5),
             timeout=timeout,
@@ -120,10 +367,7 @@ class ProcessWorker(Worker):
             ),
         )
         while next(sleeper):
-            if match_regexps_in_file(
-                self.outfile, [re.compile("Starting child process worker on")]
-            )[0]:
-                self.last_heartbeat = time.time()
+            if self.connected.is_set():
                 self.status.change(self.STATUS.STARTED)
                 return
 
@@ -188,6 +432,8 @@ class ProcessPoolConfig(PoolConfig):
             ): [int],
             ConfigOption("worker_type", default=ProcessWorker): object,
             ConfigOption("worker_heartbeat", default=5): Or(int, float, None),
+            ConfigOption("zygote", default=False): bool,
+            ConfigOption("preload_modules", default=None): Or(None, [str]),
         }
 
 
@@ -210,6 +456,16 @@ class ProcessPool(Pool):
     :type worker_type: :py:class:`~testplan.runners.pools.process.ProcessWorker`
     :param worker_heartbeat: Worker heartbeat period.
     :type worker_heartbeat: ``int`` or ``float`` or ``NoneType``
+    :param zygote: Fork workers from a template process that imported the
+        modules they need once, instead of starting each worker from
+        scratch. Forked workers should not rely on state created by these
+        imports that cannot be shared, e.g. threads or open connections.
+        Not available on Windows. Default: False
+    :type zygote: ``bool``
+    :param preload_modules: Modules imported by the template process on top
+        of testplan modules and the modules of the tasks added before the
+        pool starts.
+    :type preload_modules: ``list`` of ``str``
 
     Also inherits all :py:class:`~testplan.runners.pools.base.Pool` options.
     """
@@ -226,10 +482,75 @@ class ProcessPool(Pool):
         abort_signals=None,
         worker_type=ProcessWorker,
         worker_heartbeat=5,
+        zygote=False,
+        preload_modules=None,
         **options
     ):
         options.update(self.filter_locals(locals()))
         super(ProcessPool, self).__init__(**options)
+        self._zygote = None
+
+    @property
+    def zygote(self):
+        """Template process that forks the workers, if any."""
+        return self._zygote
+
+    def _preload_modules(self):
+        """Modules of the tasks added so far and the configured modules."""
+        modules = []
+        for task in self._input.values():
+            if not isinstance(task, tasks.Task) or not isinstance(
+                task._target, six.string_types
+            ):
+                continue
+            module, _, _ = task._target.rpartition(".")
+            modules.append((module or task._module, task._path))
+        modules.extend(
+            (module, None) for module in self.cfg.preload_modules or ()
+        )
+        return sorted(set(module for module in modules if module[0]))
+
+    def _start_zygote(self):
+        if not hasattr(os, "fork"):
+            self.logger.warning(
+                "%s cannot fork workers on this platform, starting them"
+                " without zygote",
+                self,
+            )
+            return
+        self._zygote = Zygote(
+            cmd=child_cmd(
+                _child_script(), "zygote", _write_syspath_file(self.logger)
+            ),
+            outfile=os.path.join(self.runpath, "zygote_startup"),
+            logger=self.logger,
+        )
+        try:
+            self._zygote.start(self._preload_modules())
+        except Exception:
+            self._stop_zygote()
+            raise
+
+    def _stop_zygote(self):
+        if self._zygote is not None:
+            self._zygote.stop()
+            self._zygote = None
+
+    def _start_workers(self):
+        """Start the zygote if enabled, then all workers of the pool."""
+        if self.cfg.zygote and self._zygote is None:
+            self._start_zygote()
+        super(ProcessPool, self)._start_workers()
+
+    def stopping(self):
+        """Stop connections, workers and the zygote."""
+        super(ProcessPool, self).stopping()
+        self._stop_zygote()
+
+    def aborting(self):
+        """Aborting logic, also stops the zygote."""
+        super(ProcessPool, self).aborting()
+        self._stop_zygote()
 
     def add(self, task, uid):
         """
@@ -28,10 +28,12 @@ from testplan.common.utils.remote import (
     copy_cmd,
     link_cmd,
     remote_filepath_exists,
+    RemoteShell,
 )
 from testplan.common.utils import path as pathutils
 from testplan.common.utils.process import execute_cmd
-from testplan.common.utils.timing import get_sleeper
+from testplan.common.utils.sync import RemoteSync, SyncCache
+from testplan.common.utils.timing import get_sleeper, Timer
 
 from testplan.runners.pools.base import Pool, PoolConfig
 from testplan.runners.pools.process import ProcessWorker, ProcessWorkerConfig
@@ -53,6 +55,7 @@ class WorkerSetupMetadata(object):
         self.env = None
         self.workspace_paths = None
         self.workspace_pushed = False
+        self.sync_manifest = None
 
 
 class RemoteWorkerConfig(ProcessWorkerConfig):
@@ -112,6 +115,9 @@ class RemoteWorker(ProcessWorker):
         self.remote_push_dir = None
         self.ssh_cfg = {"host": self.cfg.remote_host}
         self._testplan_import_path = _LocationPaths()
+        self._remote_sync = None
+        self._remote_shell = None
+        self.setup_timer = Timer()
 
     def _execute_cmd_remote(self, cmd, label=None, check=True):
         """
@@ -121,14 +127,66 @@ class RemoteWorker(ProcessWorker):
         :param label: Optional label for debugging.
         :param check: Whether to check command return-code - defaults to True.
                       See self._execute_cmd for more detail.
+        :return: Return code of the command.
         """
-        execute_cmd(
-            self.cfg.ssh_cmd(self.ssh_cfg, " ".join([str(a) for a in cmd])),
+        command = " ".join([str(a) for a in cmd])
+        if self._remote_shell:
+            try:
+                return self._remote_shell.execute(
+                    command, label=label, check=check
+                )
+            except RuntimeError:
+                if self._remote_shell.active:
+                    raise
+                # Connection lost, the command may be executed again.
+                self.logger.warning(
+                    "Remote shell on %s exited, using a connection per"
+                    " command",
+                    self.cfg.remote_host,
+                )
+                self._close_remote_shell()
+
+        return execute_cmd(
+            self.cfg.ssh_cmd(self.ssh_cfg, command),
             label=label,
             check=check,
             logger=self.logger,
         )
 
+    def _execute_check_remote(self, check_cmd, path, label):
+        """
+        Execute a check command built by ``check_cmd(ssh_cmd, ssh_cfg, path)``
+        without checking its return-code. The check is sent to the remote
+        shell if it consists of a single remote command.
+
+        :return: Return code of the command.
+        """
+        if self._remote_shell:
+            command = check_cmd(lambda _, cmd: cmd, self.ssh_cfg, path)
+            if isinstance(command, six.string_types):
+                return self._execute_cmd_remote(
+                    [command], label=label, check=False
+                )
+
+        return execute_cmd(
+            check_cmd(self.cfg.ssh_cmd, self.ssh_cfg, path),
+            label=label,
+            check=False,
+            logger=self.logger,
+        )
+
+    def _open_remote_shell(self):
+        """Start the shell that executes the setup commands on remote."""
+        self._remote_shell = RemoteShell(
+            self.cfg.ssh_cmd, self.ssh_cfg, logger=self.logger
+        )
+        self._remote_shell.open()
+
+    def _close_remote_shell(self):
+        if self._remote_shell:
+            self._remote_shell.close()
+            self._remote_shell = None
+
     def _mkdir_remote(self, remote_dir, label=None):
         """
         Create a directory path on the remote host.
@@ -139,11 +197,31 @@ class RemoteWorker(ProcessWorker):
         if not label:
             label = "remote mkdir"
 
-        cmd = self.cfg.remote_mkdir + [remote_dir]
-        execute_cmd(
-            self.cfg.ssh_cmd(self.ssh_cfg, " ".join([str(a) for a in cmd])),
-            label=label,
-            logger=self.logger,
+        self._execute_cmd_remote(
+            self.cfg.remote_mkdir + [remote_dir], label=label
+        )
+
+    def _mkdirs_remote(self, remote_dirs, label=None):
+        """
+        Create directory paths on the remote host, in a single round trip
+        if the remote shell is used.
+
+        :param remote_dirs: Paths to create.
+        :param label: Optional debug label.
+        """
+        if not self._remote_shell:
+            for remote_dir in remote_dirs:
+                self._mkdir_remote(remote_dir, label=label)
+            return
+
+        self._remote_shell.batch(
+            [
+                " ".join(
+                    [str(a) for a in self.cfg.remote_mkdir + [remote_dir]]
+                )
+                for remote_dir in remote_dirs
+            ],
+            label=label or "remote mkdir",
         )
 
     def _define_remote_dirs(self):
@@ -159,11 +237,8 @@ class RemoteWorker(ProcessWorker):
 
     def _create_remote_dirs(self):
         """Create mandatory directories in remote host."""
-        cmd = self.cfg.remote_mkdir + [self._remote_testplan_path]
-        execute_cmd(
-            self.cfg.ssh_cmd(self.ssh_cfg, " ".join([str(a) for a in cmd])),
-            label="create remote dirs",
-            logger=self.logger,
+        self._mkdir_remote(
+            self._remote_testplan_path, label="create remote dirs"
         )
 
     def _set_child_script(self):
@@ -183,6 +258,9 @@ class RemoteWorker(ProcessWorker):
             return
         local_path = "{}/dependencies.py".format(path)
         remote_path = "{}/dependencies.py".format(self._remote_testplan_path)
+        if self._remote_sync:
+            self._remote_sync.add(local_path, remote_path)
+            return
         self._transfer_data(
             source=local_path, target=remote_path, remote_target=True
         )
@@ -201,14 +279,10 @@ class RemoteWorker(ProcessWorker):
             return
 
         # test if testplan package is available on remote host
-        cmd = remote_filepath_exists(
-            self.cfg.ssh_cmd, self.ssh_cfg, self._testplan_import_path.local
-        )
-        if 0 == execute_cmd(
-            cmd,
+        if 0 == self._execute_check_remote(
+            remote_filepath_exists,
+            self._testplan_import_path.local,
             label="testplan package availability check",
-            check=False,
-            logger=self.logger,
         ):  # exists on remote
 
             self._testplan_import_path.remote = (
@@ -219,6 +293,13 @@ class RemoteWorker(ProcessWorker):
             self._testplan_import_path.remote = os.path.join(
                 self._remote_testplan_path, "testplan_lib"
             )
+            if self._remote_sync:
+                self._remote_sync.add(
+                    self._testplan_import_path.local,
+                    self._testplan_import_path.remote,
+                    deref_links=True,
+                )
+                return
             # add trailing / to _testplan_import_path.local
             # this will copy everything under import path to to testplan_lib
             self._transfer_data(
@@ -364,11 +445,23 @@ class RemoteWorker(ProcessWorker):
         :param push_files: Files to push.
         :param push_dirs:  Directories to push.
         """
-        for source, dest in itertools.chain(push_files, push_dirs):
-            remote_dir = dest.rpartition("/")[0]
-            self.logger.debug("Create remote dir: %s", remote_dir)
-            self._mkdir_remote(remote_dir)
+        if self._remote_sync:
+            for source, dest in itertools.chain(push_files, push_dirs):
+                self._remote_sync.add(
+                    source, dest, exclude=self.cfg.push_exclude
+                )
+            return
+
+        remote_dirs = sorted(
+            set(
+                dest.rpartition("/")[0]
+                for _, dest in itertools.chain(push_files, push_dirs)
+            )
+        )
+        self.logger.debug("Create remote dirs: %s", remote_dirs)
+        self._mkdirs_remote(remote_dirs)
 
+        for source, dest in itertools.chain(push_files, push_dirs):
             self._transfer_data(
                 source=source,
                 target=dest,
@@ -388,62 +481,52 @@ class RemoteWorker(ProcessWorker):
         if self.cfg.remote_workspace:
             # User defined the remote workspace to be used
             # Make a soft link and return
-            execute_cmd(
-                self.cfg.ssh_cmd(
-                    self.ssh_cfg,
-                    " ".join(
-                        self.cfg.link_cmd(
-                            path=fix_home_prefix(self.cfg.remote_workspace),
-                            link=self._workspace_paths.remote,
-                        )
-                    ),
+            self._execute_cmd_remote(
+                self.cfg.link_cmd(
+                    path=fix_home_prefix(self.cfg.remote_workspace),
+                    link=self._workspace_paths.remote,
                 ),
                 label="linking to remote workspace (1).",
-                logger=self.logger,
             )
             return
 
         copy = True  # flag to make a copy of workspace to remote
 
         if self.cfg.copy_workspace_check:
-            cmd = self.cfg.copy_workspace_check(
-                self.cfg.ssh_cmd, self.ssh_cfg, self._workspace_paths.local
-            )
-
             copy = (
-                execute_cmd(
-                    cmd,
+                self._execute_check_remote(
+                    self.cfg.copy_workspace_check,
+                    self._workspace_paths.local,
                     label="workspace availability check",
-                    check=False,
-                    logger=self.logger,
                 )
                 != 0
             )
         if copy:
             # Workspace should be copied to remote.
-            self._transfer_data(
-                source=self._workspace_paths.local,
-                target=self._remote_testplan_path,
-                remote_target=True,
-                exclude=self.cfg.workspace_exclude,
-            )
+            if self._remote_sync:
+                self._remote_sync.add(
+                    self._workspace_paths.local,
+                    self._workspace_paths.remote,
+                    exclude=self.cfg.workspace_exclude,
+                )
+            else:
+                self._transfer_data(
+                    source=self._workspace_paths.local,
+                    target=self._remote_testplan_path,
+                    remote_target=True,
+                    exclude=self.cfg.workspace_exclude,
+                )
             # Mark that workspace pushed is safe to delete. Not some NFS.
             self.setup_metadata.workspace_pushed = True
 
         else:
             # Make a soft link instead of copying workspace.
-            execute_cmd(
-                self.cfg.ssh_cmd(
-                    self.ssh_cfg,
-                    " ".join(
-                        self.cfg.link_cmd(
-                            path=self._workspace_paths.local,
-                            link=self._workspace_paths.remote,
-                        )
-                    ),
+            self._execute_cmd_remote(
+                self.cfg.link_cmd(
+                    path=self._workspace_paths.local,
+                    link=self._workspace_paths.remote,
                 ),
                 label="linking to remote workspace (2).",
-                logger=self.logger,
             )
 
     def _remote_copy_path(self, path):
@@ -503,23 +586,68 @@ class RemoteWorker(ProcessWorker):
             )
         )
 
+    def _create_remote_sync(self):
+        """
+        Create the incremental transfer of the files to the remote host, its
+        manifest is kept in the remote testplan directory.
+        """
+        if not self.cfg.incremental_sync:
+            self._remote_sync = None
+            return
+
+        self._remote_sync = RemoteSync(
+            ssh_cmd=self.cfg.ssh_cmd,
+            ssh_cfg=self.ssh_cfg,
+            copy_cmd=self.cfg.copy_cmd,
+            remote_copy_path=self._remote_copy_path,
+            manifest="/".join((self._remote_testplan_path, "sync_manifest")),
+            cache=getattr(self.parent, "sync_cache", None),
+            logger=self.logger,
+        )
+        self.setup_metadata.sync_manifest = self._remote_sync.manifest
+
     def _prepare_remote(self):
         """Transfer local data to remote host."""
-
+        self.setup_timer = Timer()
         self._define_remote_dirs()
-        self._create_remote_dirs()
-        self._copy_workspace()
-        self._copy_testplan_package()
-        self._copy_dependencies_module()
-        self._set_child_script()
-
-        self._working_dirs.local = pwd()
-        self._working_dirs.remote = self._remote_working_dir
+        try:
+            if self.cfg.persistent_shell:
+                with self.setup_timer.record("open remote shell"):
+                    self._open_remote_shell()
+            with self.setup_timer.record("create remote dirs"):
+                self._create_remote_dirs()
+                self._create_remote_sync()
+            with self.setup_timer.record("copy workspace"):
+                self._copy_workspace()
+            with self.setup_timer.record("copy testplan package"):
+                self._copy_testplan_package()
+                self._copy_dependencies_module()
+            self._set_child_script()
+
+            self._working_dirs.local = pwd()
+            self._working_dirs.remote = self._remote_working_dir
+            self.logger.debug(
+                "Remote working path = %s", self._working_dirs.remote
+            )
+
+            with self.setup_timer.record("push files"):
+                self._push_files()
+            if self._remote_sync:
+                with self.setup_timer.record("sync files"):
+                    self._remote_sync.sync()
+        finally:
+            self._close_remote_shell()
+
         self.logger.debug(
-            "Remote working path = %s", self._working_dirs.remote
+            "Remote setup on %s: %s",
+            self.cfg.remote_host,
+            ", ".join(
+                "{} {:.2f}s".format(stage, interval.elapsed)
+                for stage, interval in sorted(
+                    self.setup_timer.items(), key=lambda item: item[1].start
+                )
+            ),
         )
-
-        self._push_files()
         self.setup_metadata.setup_script = self.cfg.setup_script
         self.setup_metadata.env = self.cfg.env
         self.setup_metadata.workspace_paths = self._workspace_paths
@@ -700,6 +828,8 @@ class RemotePoolConfig(PoolConfig):
             ConfigOption("pull", default=[]): Or(list, None),
             ConfigOption("pull_exclude", default=[]): Or(list, None),
             ConfigOption("remote_mkdir", default=["/bin/mkdir", "-p"]): list,
+            ConfigOption("incremental_sync", default=False): bool,
+            ConfigOption("persistent_shell", default=False): bool,
             ConfigOption("testplan_path", default=None): Or(str, None),
             ConfigOption("worker_heartbeat", default=30): Or(int, float, None),
         }
@@ -759,6 +889,16 @@ class RemotePool(Pool):
     :type pull_exclude: ``list`` of ``str``
     :param remote_mkdir: Command to make directories in remote worker.
     :type remote_mkdir: ``list`` of ``str``
+    :param incremental_sync: Keep a manifest of the content hashes of the
+        files transferred to each host, and only transfer the changed files
+        of the workspace, testplan package and pushed files, in a single
+        archive extracted with ``tar`` on the host.
+    :type incremental_sync: ``bool``
+    :param persistent_shell: Execute the setup commands of each host, such as
+        creating directories, checking paths and linking the workspace,
+        through a single long-lived remote shell instead of a new ssh
+        connection per command.
+    :type persistent_shell: ``bool``
     :param testplan_path: Path to import testplan from on remote host.
     :type testplan_path: ``str``
     :param worker_heartbeat: Worker heartbeat period.
@@ -796,11 +936,14 @@ class RemotePool(Pool):
         pull=None,
         pull_exclude=None,
         remote_mkdir=None,
+        incremental_sync=False,
+        persistent_shell=False,
         testplan_path=None,
         worker_heartbeat=30,
         **options
     ):
         self.pool = None
+        self.sync_cache = None
         options.update(self.filter_locals(locals()))
         super(RemotePool, self).__init__(**options)
 
@@ -831,6 +974,8 @@ class RemotePool(Pool):
                 workers=instance["number_of_workers"],
                 pool_type=self.cfg.pool_type,
                 restart_count=self.cfg.restart_count,
+                event_driven=self.cfg.event_driven,
+                prefetch=self.cfg.prefetch,
             )
             self.logger.debug("Created {}".format(worker))
             worker.parent = self
@@ -855,7 +1000,8 @@ class RemotePool(Pool):
     def _start_thread_pool(self):
         size = len(self._instances)
         try:
-            if size > 2:
+            if size > 1:
+                # Hosts are prepared and started in parallel.
                 self.pool = ThreadPool(5 if size > 5 else size)
         except Exception as exc:
             if isinstance(exc, AttributeError):
@@ -865,6 +1011,8 @@ class RemotePool(Pool):
 
     def starting(self):
         self._start_thread_pool()
+        if self.cfg.incremental_sync:
+            self.sync_cache = SyncCache()
         super(RemotePool, self).starting()
 
     def stopping(self):
@@ -885,3 +1033,6 @@ class RemotePool(Pool):
         if self.pool:
             self.pool.terminate()
             self.pool = None
+        if self.sync_cache:
+            self.sync_cache.close()
+            self.sync_cache = None
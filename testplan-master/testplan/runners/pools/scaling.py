@@ -0,0 +1,118 @@
+"""
+Scaling policies, deciding how many workers an elastic
+:py:class:`~testplan.runners.pools.base.Pool` runs. The pool creates ``size``
+workers and starts or stops them as the number of pending tasks changes.
+
+.. code-block:: python
+
+  from testplan.runners.pools.scaling import QueueDepthPolicy
+
+  pool = ProcessPool(
+      name='MyPool',
+      size=32,
+      scaling_policy=QueueDepthPolicy(min_size=2, idle_timeout=30),
+  )
+"""
+import time
+
+
+class ScalingPolicy(object):
+    """Base class of pool scaling policies."""
+
+    def scale(self, pool, running, standby):
+        """
+        Decide which workers to start and which to stop. Called by the pool
+        when it starts and then periodically, and when tasks are added.
+
+        :param pool: Pool to scale, its pending tasks are ``pool.unassigned``.
+        :type pool: :py:class:`~testplan.runners.pools.base.Pool`
+        :param running: Started workers.
+        :type running: ``list`` of
+            :py:class:`~testplan.runners.pools.base.Worker`
+        :param standby: Workers that are not started, in the order they
+            should be started.
+        :type standby: ``list`` of
+            :py:class:`~testplan.runners.pools.base.Worker`
+        :return: Workers to start and workers to stop.
+        :rtype: ``tuple`` of ``list``
+        """
+        raise NotImplementedError
+
+
+class QueueDepthPolicy(ScalingPolicy):
+    """
+    Runs one worker per task that is pending or being executed, and stops
+    the workers that have been idle for a while.
+
+    :param min_size: Number of workers that are never stopped.
+    :type min_size: ``int``
+    :param idle_timeout: Seconds without tasks after which a worker is
+        stopped.
+    :type idle_timeout: ``int`` or ``float``
+    """
+
+    def __init__(self, min_size=1, idle_timeout=60):
+        if min_size < 1:
+            raise ValueError("min_size must be positive: {}".format(min_size))
+        self.min_size = min_size
+        self.idle_timeout = idle_timeout
+
+    def capacity(self, worker):
+        """Number of tasks a worker executes in parallel."""
+        return 1
+
+    def scale(self, pool, running, standby):
+        demand = len(pool.unassigned) + sum(
+            len(worker.assigned) for worker in running
+        )
+        capacity = sum(self.capacity(worker) for worker in running)
+
+        to_start = []
+        for worker in standby:
+            if (
+                capacity >= demand
+                and len(running) + len(to_start) >= self.min_size
+            ):
+                break
+            to_start.append(worker)
+            capacity += self.capacity(worker)
+        if to_start:
+            return to_start, []
+
+        to_stop = []
+        now = time.time()
+        for worker in reversed(running):
+            if len(running) - len(to_stop) <= self.min_size:
+                break
+            if (
+                not worker.assigned
+                and worker.last_active is not None
+                and now - worker.last_active > self.idle_timeout
+                and capacity - self.capacity(worker) >= demand
+            ):
+                to_stop.append(worker)
+                capacity -= self.capacity(worker)
+        return [], to_stop
+
+
+class HostPolicy(QueueDepthPolicy):
+    """
+    Policy for :py:class:`~testplan.runners.pools.remote.RemotePool`, whose
+    workers are hosts that each execute several tasks in parallel. Hosts are
+    started in the order of the ``hosts`` option of the pool until they can
+    execute all pending tasks, and stopped after a longer idle time as
+    preparing a host is slow.
+
+    :param min_size: Number of hosts that are never stopped.
+    :type min_size: ``int``
+    :param idle_timeout: Seconds without tasks after which a host is stopped.
+    :type idle_timeout: ``int`` or ``float``
+    """
+
+    def __init__(self, min_size=1, idle_timeout=300):
+        super(HostPolicy, self).__init__(
+            min_size=min_size, idle_timeout=idle_timeout
+        )
+
+    def capacity(self, worker):
+        return int(worker.cfg.workers)
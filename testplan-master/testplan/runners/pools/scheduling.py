@@ -0,0 +1,210 @@
+"""
+Scheduling policies, deciding the order in which a
+:py:class:`~testplan.runners.pools.base.Pool` hands its tasks to workers.
+
+.. code-block:: python
+
+  from testplan.runners.pools.scheduling import LongestFirstPolicy
+
+  pool = ProcessPool(
+      name='MyPool',
+      scheduling_policy=LongestFirstPolicy('runtime_history.txt'),
+  )
+"""
+import heapq
+import itertools
+import collections
+
+import six
+
+from testplan.report.testing.history import RuntimeHistory
+
+
+TaskTiming = collections.namedtuple("TaskTiming", "pool worker start end")
+TaskTiming.__doc__ = """
+Wall clock interval (seconds since epoch) between a task being sent to a
+worker and its results being received by the pool.
+"""
+
+
+def task_history_uid(task):
+    """
+    Uid of a task in the runtime history. Task uids are random by default, so
+    the uid is derived from what the task executes instead.
+
+    :param task: Task scheduled to a pool.
+    :type task: :py:class:`~testplan.runners.pools.tasks.base.Task`
+    :return: History uid of the task.
+    :rtype: ``str``
+    """
+    target = task._target
+    if not isinstance(target, six.string_types):
+        if hasattr(target, "uid"):
+            return target.uid()
+        target = getattr(target, "__name__", target.__class__.__name__)
+
+    uid = ".".join(part for part in (task.module, target) if part)
+    if task.args or task.kwargs:
+        uid = "{}({})".format(
+            uid,
+            ", ".join(
+                [repr(arg) for arg in task.args]
+                + [
+                    "{}={!r}".format(key, value)
+                    for key, value in sorted(task.kwargs.items())
+                ]
+            ),
+        )
+    return uid
+
+
+class TaskQueue(object):
+    """
+    Unassigned task uids of a pool. Subclasses decide which task is handed
+    out next.
+    """
+
+    def append(self, uid):
+        """Add a task uid to the queue."""
+        raise NotImplementedError
+
+    def pop(self):
+        """
+        Remove and return the next task uid.
+
+        :raises IndexError: if the queue is empty.
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+class FIFOQueue(TaskQueue):
+    """Hands out tasks in the order they were added."""
+
+    def __init__(self):
+        self._uids = collections.deque()
+
+    def append(self, uid):
+        self._uids.append(uid)
+
+    def pop(self):
+        return self._uids.popleft()
+
+    def __len__(self):
+        return len(self._uids)
+
+    def __iter__(self):
+        return iter(self._uids)
+
+
+class PriorityQueue(TaskQueue):
+    """
+    Hands out tasks with the lowest priority key first, ties are broken by
+    the order they were added.
+
+    :param priority: Returns the priority key of a task uid.
+    :type priority: ``callable``
+    """
+
+    def __init__(self, priority):
+        self._priority = priority
+        self._heap = []
+        self._counter = itertools.count()
+
+    def append(self, uid):
+        heapq.heappush(
+            self._heap, (self._priority(uid), next(self._counter), uid)
+        )
+
+    def pop(self):
+        return heapq.heappop(self._heap)[-1]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (item[-1] for item in sorted(self._heap))
+
+
+class SchedulingPolicy(object):
+    """Base class of pool scheduling policies."""
+
+    def make_queue(self, pool):
+        """
+        Create the queue of unassigned tasks of a pool.
+
+        :param pool: Pool the queue is created for, its tasks can be looked
+            up with ``pool.added_item(uid)``.
+        :type pool: :py:class:`~testplan.runners.pools.base.Pool`
+        :return: Empty task queue.
+        :rtype: :py:class:`TaskQueue`
+        """
+        raise NotImplementedError
+
+
+class FIFOPolicy(SchedulingPolicy):
+    """Default policy, tasks are handed out in the order they were added."""
+
+    def make_queue(self, pool):
+        return FIFOQueue()
+
+
+class LongestFirstPolicy(SchedulingPolicy):
+    """
+    Hands out the tasks with the longest expected runtime first, so that
+    long tasks do not start last and hold the run open on their own.
+
+    Tasks that are not in the history yet are handed out first, in the order
+    they were added, as nothing is known about how long they take.
+
+    :param history: Runtime history of tasks, or path to its file, as
+        recorded with the ``runtime_history`` option of
+        :py:class:`~testplan.runnable.base.TestRunner`.
+    :type history: ``str`` or
+        :py:class:`~testplan.report.testing.history.RuntimeHistory`
+    """
+
+    def __init__(self, history):
+        if not isinstance(history, RuntimeHistory):
+            history = RuntimeHistory(history)
+        self.history = history
+
+    def make_queue(self, pool):
+        def priority(uid):
+            expected = self.history.expected(
+                task_history_uid(pool.added_item(uid))
+            )
+            if expected is None:
+                return (0, 0)
+            return (1, -expected)
+
+        return PriorityQueue(priority)
+
+
+def critical_path(timings):
+    """
+    Tasks that held a run open: the ones executed by the worker that received
+    the last task results, in execution order.
+
+    :param timings: Task uid to timing of all tasks of the run.
+    :type timings: ``dict`` of ``str`` to :py:class:`TaskTiming`
+    :return: (task uid, timing) pairs, ending with the last finished task.
+    :rtype: ``list`` of ``tuple``
+    """
+    if not timings:
+        return []
+
+    last = max(timings.values(), key=lambda timing: timing.end)
+    return sorted(
+        (
+            (uid, timing)
+            for uid, timing in timings.items()
+            if (timing.pool, timing.worker) == (last.pool, last.worker)
+        ),
+        key=lambda item: item[1].start,
+    )
@@ -353,10 +353,11 @@ class Test(Runnable):
         """
         self.resources.stop()
 
-    def dry_run(self):
+    def dry_run(self, status=None):
         """
         Return an empty report skeleton for this Test including all
         testsuites, testcases etc. hierarchy. Does not run any tests.
+        Initial status of each testcase can be set.
         """
         suites_to_run = self.test_context
         self.result.report = self._new_test_report()
@@ -370,6 +371,8 @@ class Test(Runnable):
 
             for testcase in testcases:
                 testcase_report = TestCaseReport(name=testcase, uid=testcase,)
+                if status:
+                    testcase_report.status_override = status
                 testsuite_report.append(testcase_report)
 
             self.result.report.append(testsuite_report)
@@ -703,6 +706,7 @@ class ProcessRunnerTest(Test):
         suite_report = TestGroupReport(
             name="ProcessChecks",
             category=ReportCategories.TESTSUITE,
+            uid="ProcessChecks",
             entries=[testcase_report],
         )
 
@@ -768,12 +772,13 @@ class ProcessRunnerTest(Test):
             kill_process(self._test_process)
             self._test_process_killed = True
 
-    def dry_run(self):
+    def dry_run(self, status=None):
         """
         Return an empty report skeleton for this Test including all
         testsuites, testcases etc. hierarchy. Does not run any tests.
+        Initial status of each testcase can be set.
         """
-        result = super(ProcessRunnerTest, self).dry_run()
+        result = super(ProcessRunnerTest, self).dry_run(status=status)
         report = result.report
 
         testsuite_report = TestGroupReport(
@@ -785,6 +790,8 @@ class ProcessRunnerTest(Test):
         testcase_report = TestCaseReport(
             name="ExitCodeCheck", uid="ExitCodeCheck", suite_related=True,
         )
+        if status:
+            testcase_report.status_override = status
         testsuite_report.append(testcase_report)
         report.append(testsuite_report)
 
@@ -1,6 +1,15 @@
-from schema import Or
+import os
+import socket
+import tempfile
+import threading
+from contextlib import closing
+
+from schema import Or, And
+from six.moves import queue
+from six.moves.urllib.parse import unquote
 
 from testplan.common.config import ConfigOption
+from testplan.common.utils.process import subprocess_popen, kill_process
 
 from testplan.report import (
     TestGroupReport,
@@ -13,6 +22,169 @@ from testplan.testing.multitest.entries.schemas.base import registry
 from ..base import ProcessRunnerTest, ProcessRunnerTestConfig
 
 
+class GTestStreamListener(object):
+    """
+    Local socket server receiving the events that Google Test sends with
+    ``--gtest_stream_result_to``, building testsuite and testcase reports
+    while the binary runs. Results of the testcases that finished are kept
+    if the binary crashes or is killed.
+
+    :param report: Report that testsuite reports are appended to.
+    :type report: :py:class:`~testplan.report.testing.base.TestGroupReport`
+    :param on_testcase: Called with the testsuite and testcase reports when
+        a testcase starts and when it ends.
+    :type on_testcase: ``callable``
+    """
+
+    def __init__(self, report=None, on_testcase=None):
+        self.report = report
+        self.on_testcase = on_testcase
+        self.suites = []
+        self._suite = None
+        self._testcase = None
+        self._sock = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def address(self):
+        """Address to pass to ``--gtest_stream_result_to``."""
+        return "{}:{}".format(*self._sock.getsockname()[:2])
+
+    def start(self):
+        """Listen on a free local port."""
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(1)
+        self._sock.settimeout(0.1)
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Stop listening once the pending events are read, the testcase that
+        was running is marked as failed.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._sock is not None:
+            self._sock.close()
+
+        if self._testcase is not None:
+            self._testcase.append(
+                RawAssertion(
+                    description="Unfinished",
+                    content="Testcase {} did not finish".format(
+                        self._testcase.name
+                    ),
+                    passed=False,
+                ).serialize()
+            )
+            self._end_testcase()
+
+    def _serve(self):
+        while True:
+            # Connections pending when stopping are still read.
+            stopping = self._stop.is_set()
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                if stopping:
+                    return
+                continue
+            except socket.error:
+                return
+            with closing(conn):
+                self._read(conn)
+
+    def _read(self, conn):
+        conn.settimeout(0.1)
+        buf = b""
+        while True:
+            try:
+                data = conn.recv(4096)
+            except socket.timeout:
+                if self._stop.is_set():
+                    return
+                continue
+            except socket.error:
+                return
+            if not data:
+                return
+            lines = (buf + data).split(b"\n")
+            buf = lines.pop()
+            for line in lines:
+                self.handle(line.decode("utf-8", "replace"))
+
+    def handle(self, line):
+        """
+        Update the reports with an event, a line of ``key=value`` pairs
+        separated by ``&`` with URL encoded values.
+
+        :param line: Event received from Google Test.
+        :type line: ``str``
+        """
+        fields = {}
+        for item in line.split("&"):
+            key, _, value = item.partition("=")
+            fields[key] = unquote(value)
+        event = fields.get("event")
+
+        if event == "TestIterationStart":
+            self.suites = []
+        elif event == "TestCaseStart":
+            self._suite = TestGroupReport(
+                name=fields["name"], uid=fields["name"], category="testsuite"
+            )
+            self.suites.append(self._suite)
+            if self.report is not None:
+                # Repeated iterations replace the previous results, the XML
+                # output also holds the last iteration only.
+                self.report[self._suite.uid] = self._suite
+        elif event == "TestStart":
+            self._testcase = TestCaseReport(
+                name=fields["name"], uid=fields["name"]
+            )
+            self._testcase.runtime_status = RuntimeStatus.RUNNING
+            self._suite.append(self._testcase)
+            if self.on_testcase:
+                self.on_testcase(self._suite, self._testcase)
+        elif event == "TestPartResult" and self._testcase is not None:
+            # Successes and skips are sent the same way as failures, they
+            # are replaced when the testcase ends if it passed.
+            self._testcase.append(
+                RawAssertion(
+                    description="failure",
+                    content="{}:{}\n{}".format(
+                        fields.get("file"),
+                        fields.get("line"),
+                        fields.get("message"),
+                    ),
+                    passed=False,
+                ).serialize()
+            )
+        elif event == "TestEnd" and self._testcase is not None:
+            if fields.get("passed") == "1":
+                self._testcase.entries = [
+                    RawAssertion(
+                        description="Passed",
+                        content="Testcase {} passed".format(
+                            self._testcase.name
+                        ),
+                        passed=True,
+                    ).serialize()
+                ]
+            self._end_testcase()
+
+    def _end_testcase(self):
+        testcase, self._testcase = self._testcase, None
+        testcase.runtime_status = RuntimeStatus.FINISHED
+        if self.on_testcase:
+            self.on_testcase(self._suite, testcase)
+
+
 class GTestConfig(ProcessRunnerTestConfig):
     """
     Configuration object for
@@ -42,9 +214,19 @@ class GTestConfig(ProcessRunnerTestConfig):
             ConfigOption("gtest_shuffle", default=False): bool,
             ConfigOption("gtest_random_seed", default=0): int,
             ConfigOption("gtest_stream_result_to", default=""): str,
+            ConfigOption("stream_results", default=False): bool,
             ConfigOption("gtest_death_test_style", default="fast"): Or(
                 "fast", "threadsafe"
             ),
+            ConfigOption("part", default=None): Or(
+                None,
+                And(
+                    (int,),
+                    lambda tp: len(tp) == 2
+                    and 0 <= tp[0] < tp[1]
+                    and tp[1] > 1,
+                ),
+            ),
         }
 
 
@@ -85,9 +267,19 @@ class GTest(ProcessRunnerTest):
     :param gtest_stream_result_to: Flag for specifying host name and port number
                                 on which to stream test results.
     :type gtest_stream_result_to: ``str``
+    :param stream_results: Stream the results to Testplan while the binary
+        runs, so that the testcases that finished are reported if the binary
+        crashes or times out, and interactive mode shows their progress. The
+        XML output replaces the streamed results when the binary completes.
+        Cannot be used with ``gtest_stream_result_to``.
+    :type stream_results: ``bool``
     :param gtest_death_test_style: Test style flag, can either be
                         ``threadsafe`` or ``fast``. (Default value is ``fast``)
     :type gtest_death_test_style: ``str``
+    :param part: Execute only a shard of the testcases, using the native
+        sharding of Google Test. The tuple holds the index of the shard and
+        the total number of shards.
+    :type part: ``tuple`` of (``int``, ``int``)
 
     Also inherits all
     :py:class:`~testplan.testing.base.ProcessRunnerTest` options.
@@ -107,10 +299,38 @@ class GTest(ProcessRunnerTest):
         gtest_random_seed=0,
         gtest_stream_result_to="",
         gtest_death_test_style="fast",
+        part=None,
+        stream_results=False,
         **options
     ):
         options.update(self.filter_locals(locals()))
         super(GTest, self).__init__(**options)
+        if self.cfg.stream_results and self.cfg.gtest_stream_result_to:
+            raise ValueError(
+                "`stream_results` cannot be used with `gtest_stream_result_to`"
+            )
+        self._listener = None  # set while results are streamed
+
+    @property
+    def report_path(self):
+        if self.cfg.part:
+            return os.path.join(
+                self._runpath, "report-part{}.xml".format(self.cfg.part[0])
+            )
+        return super(GTest, self).report_path
+
+    def _new_test_report(self):
+        report = super(GTest, self)._new_test_report()
+        report.part = self.cfg.part
+        return report
+
+    def get_proc_env(self):
+        """Select the shard to run with the Google Test variables."""
+        env = super(GTest, self).get_proc_env()
+        if self.cfg.part:
+            env["GTEST_SHARD_INDEX"] = str(self.cfg.part[0])
+            env["GTEST_TOTAL_SHARDS"] = str(self.cfg.part[1])
+        return env
 
     def base_command(self):
         cmd = [self.cfg.binary]
@@ -145,6 +365,10 @@ class GTest(ProcessRunnerTest):
                     self.cfg.gtest_stream_result_to
                 )
             )
+        elif self._listener is not None:
+            cmd.append(
+                "--gtest_stream_result_to={}".format(self._listener.address)
+            )
 
         return cmd
 
@@ -243,15 +467,124 @@ class GTest(ProcessRunnerTest):
                 result[-1][1].append(line.strip())
         return result
 
+    def run_tests(self):
+        """
+        Run the tests, streaming their results into the report if
+        ``stream_results`` is set.
+        """
+        if not self.cfg.stream_results:
+            super(GTest, self).run_tests()
+            return
+
+        # A report left by a previous run must not be taken for the result.
+        if os.path.exists(self.report_path):
+            os.remove(self.report_path)
+
+        self._listener = GTestStreamListener(report=self.result.report)
+        self._listener.start()
+        try:
+            super(GTest, self).run_tests()
+        finally:
+            self._listener.stop()
+
     def update_test_report(self):
         """
         Attach XML report contents to the report, which can be
         used by XML exporters, but will be discarded by serializers.
+
+        Streamed results are replaced by the XML report, they are kept
+        if the binary did not complete.
         """
+        if self._listener is not None:
+            if (
+                self._test_process_killed
+                or not self._test_has_run
+                or not os.path.exists(self.report_path)
+            ):
+                with open(self.stdout) as stdout, open(self.stderr) as stderr:
+                    self.result.report.append(
+                        self.get_process_check_report(
+                            self._test_process_retcode, stdout, stderr,
+                        )
+                    )
+                return
+            self.result.report.entries = []
+
         super(GTest, self).update_test_report()
 
-        with open(self.report_path) as report_xml:
-            self.result.report.xml_string = report_xml.read()
+        if os.path.exists(self.report_path):
+            with open(self.report_path) as report_xml:
+                self.result.report.xml_string = report_xml.read()
+
+    def run_testcases_iter(self, testsuite_pattern="*", testcase_pattern="*"):
+        """
+        Run testcases as defined by the given filter patterns and yield
+        testcase reports. With ``stream_results``, testcase reports are
+        yielded as the binary runs them and again from the XML report once
+        the binary completes.
+        """
+        if not self.cfg.stream_results:
+            for item in super(GTest, self).run_testcases_iter(
+                testsuite_pattern, testcase_pattern
+            ):
+                yield item
+            return
+
+        self.make_runpath_dirs()
+        if os.path.exists(self.report_path):
+            os.remove(self.report_path)
+
+        updates = queue.Queue()
+        self._listener = GTestStreamListener(
+            on_testcase=lambda suite, testcase: updates.put(
+                (testcase, [self.name, suite.name])
+            )
+        )
+        self._listener.start()
+        proc = None
+        try:
+            test_cmd = self.test_command_filter(
+                testsuite_pattern, testcase_pattern
+            )
+            self.logger.debug("test_cmd = %s", test_cmd)
+
+            with tempfile.TemporaryFile(
+                mode="w+"
+            ) as stdout, tempfile.TemporaryFile(mode="w+") as stderr:
+                proc = subprocess_popen(
+                    test_cmd,
+                    stderr=stderr,
+                    stdout=stdout,
+                    cwd=self.cfg.proc_cwd,
+                    env=self.get_proc_env(),
+                )
+                while proc.poll() is None:
+                    try:
+                        yield updates.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+                self._listener.stop()
+                while not updates.empty():
+                    yield updates.get()
+
+                stdout.seek(0)
+                stderr.seek(0)
+                check_report = self.get_process_check_report(
+                    proc.returncode, stdout, stderr
+                )
+        finally:
+            if proc is not None and proc.poll() is None:
+                kill_process(proc)
+            self._listener.stop()
+            self._listener = None
+
+        yield check_report["ExitCodeCheck"], [self.name, check_report.name]
+
+        if os.path.exists(self.report_path):
+            for suite_report in self.process_test_data(self.read_test_data()):
+                for testcase_report in suite_report:
+                    yield testcase_report, [self.name, suite_report.name]
 
     def test_command_filter(self, testsuite_pattern, testcase_pattern):
         """
@@ -33,6 +33,7 @@ from testplan.testing import base as testing_base
 from testplan.testing.multitest.entries import base as entries_base
 from testplan.testing.multitest import result
 from testplan.testing.multitest import suite as mtest_suite
+from testplan.report.testing import history
 
 
 def iterable_suites(obj):
@@ -88,9 +89,13 @@ class MultiTestConfig(testing_base.TestConfig):
             config.ConfigOption(
                 "result", default=result.Result
             ): validation.is_subclass(result.Result),
+            config.ConfigOption("capture_location", default=True): bool,
             config.ConfigOption("fix_spec_path", default=None): Or(
                 None, And(str, os.path.exists)
             ),
+            config.ConfigOption("runtime_history", default=None): Or(
+                None, str, history.RuntimeHistory
+            ),
         }
 
 
@@ -138,8 +143,17 @@ class MultiTest(testing_base.Test):
     :param result: Result class definition for result object made available
         from within the testcases.
     :type result: :py:class:`~testplan.testing.multitest.result.result.Result`
+    :param capture_location: Record the source file and line number of each
+        assertion entry. Can be disabled for suites making a very large
+        number of assertions.
+    :type capture_location: ``bool``
     :param fix_spec_path: Path of fix specification file.
     :type fix_spec_path: ``NoneType`` or ``str``.
+    :param runtime_history: Runtime history of testcases, or path to its
+        file. When given, parts are built to have similar expected runtimes
+        instead of taking every n-th testcase.
+    :type runtime_history: ``NoneType`` or ``str`` or
+        :py:class:`~testplan.report.testing.history.RuntimeHistory`
 
     Also inherits all
     :py:class:`~testplan.testing.base.Test` options.
@@ -171,7 +185,9 @@ class MultiTest(testing_base.Test):
         stdout_style=None,
         tags=None,
         result=result.Result,
+        capture_location=True,
         fix_spec_path=None,
+        runtime_history=None,
         **options
     ):
         self._tags_index = None
@@ -242,17 +258,76 @@ class MultiTest(testing_base.Test):
                 if test_filter.filter(test=self, suite=suite, case=case)
             ]
 
-            if self.cfg.part and self.cfg.part[1] > 1:
-                testcases_to_run = [
-                    testcase
-                    for (idx, testcase) in enumerate(testcases_to_run)
-                    if idx % self.cfg.part[1] == self.cfg.part[0]
+            ctx.append((suite, testcases_to_run))
+
+        if self.cfg.part and self.cfg.part[1] > 1:
+            if self.cfg.runtime_history is not None:
+                ctx = self._split_by_runtime(ctx)
+            else:
+                ctx = [
+                    (
+                        suite,
+                        [
+                            testcase
+                            for (idx, testcase) in enumerate(testcases)
+                            if idx % self.cfg.part[1] == self.cfg.part[0]
+                        ],
+                    )
+                    for suite, testcases in ctx
                 ]
 
-            if testcases_to_run:
-                ctx.append((suite, testcases_to_run))
+        return [(suite, testcases) for suite, testcases in ctx if testcases]
 
-        return ctx
+    def _split_by_runtime(self, ctx):
+        """
+        Select the testcases of this part so that all parts have similar
+        expected runtimes. Testcases are assigned longest first to the part
+        with the lowest total so far, testcases without history are assumed
+        to take the average runtime of the known ones.
+
+        Every part computes the same assignment, as long as they all see the
+        same runtime history.
+        """
+        runtime_history = self.cfg.runtime_history
+        if not isinstance(runtime_history, history.RuntimeHistory):
+            runtime_history = history.RuntimeHistory(runtime_history)
+
+        cases = [
+            (mtest_suite.get_testsuite_name(suite), testcase.name)
+            for suite, testcases in ctx
+            for testcase in testcases
+        ]
+        durations = [
+            runtime_history.expected(history.testcase_uid(self.uid(), *case))
+            for case in cases
+        ]
+        known = [value for value in durations if value is not None]
+        default = sum(known) / len(known) if known else 1.0
+        durations = [
+            default if value is None else value for value in durations
+        ]
+
+        part_idx, num_parts = self.cfg.part
+        loads = [0.0] * num_parts
+        selected = set()
+        for idx in sorted(range(len(cases)), key=lambda idx: -durations[idx]):
+            target = min(range(num_parts), key=lambda part: loads[part])
+            loads[target] += durations[idx]
+            if target == part_idx:
+                selected.add(cases[idx])
+
+        return [
+            (
+                suite,
+                [
+                    testcase
+                    for testcase in testcases
+                    if (mtest_suite.get_testsuite_name(suite), testcase.name)
+                    in selected
+                ],
+            )
+            for suite, testcases in ctx
+        ]
 
     def dry_run(self, status=None):
         """
@@ -385,6 +460,13 @@ class MultiTest(testing_base.Test):
                 self.result.report.logger.error(msg)
             self.result.report.status_override = testplan.report.Status.ERROR
 
+        if step == self.resources.start:
+            self._record_resource_timings(
+                "start", self.resources.start_timings
+            )
+        elif step == self.resources.stop:
+            self._record_resource_timings("stop", self.resources.stop_timings)
+
         if step == self.resources.stop:
             drivers = set(self.resources.start_exceptions.keys())
             drivers.update(self.resources.stop_exceptions.keys())
@@ -394,6 +476,21 @@ class MultiTest(testing_base.Test):
                     if error_log:
                         self.result.report.logger.error(error_log)
 
+    def _record_resource_timings(self, action, timings):
+        """
+        Add the start or stop interval of each driver to the report timer,
+        e.g. as ``start:server``.
+        """
+        for resource, interval in timings.items():
+            key = "{}:{}".format(action, resource.uid())
+            self.result.report.timer[key] = interval
+            self.logger.debug(
+                "%s %s took %.2fs",
+                action.capitalize(),
+                resource,
+                interval.elapsed,
+            )
+
     def pre_resource_steps(self):
         """Runnable steps to be executed before environment starts."""
         self._add_step(self.make_runpath_dirs)
@@ -838,7 +935,9 @@ class MultiTest(testing_base.Test):
         )
         testcase_report.runtime_status = testplan.report.RuntimeStatus.RUNNING
         case_result = self.cfg.result(
-            stdout_style=self.stdout_style, _scratch=self.scratch
+            stdout_style=self.stdout_style,
+            capture_location=self.cfg.capture_location,
+            _scratch=self.scratch,
         )
 
         with testcase_report.timer.record("run"):
@@ -909,7 +1008,9 @@ class MultiTest(testing_base.Test):
         @functools.wraps(func)
         def _wrapper():
             case_result = self.cfg.result(
-                stdout_style=self.stdout_style, _scratch=self.scratch
+                stdout_style=self.stdout_style,
+                capture_location=self.cfg.capture_location,
+                _scratch=self.scratch,
             )
 
             testcase_report = testplan.report.TestCaseReport(
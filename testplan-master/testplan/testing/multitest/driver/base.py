@@ -8,7 +8,7 @@ from schema import Or
 
 from testplan.common.config import ConfigOption
 from testplan.common.entity import Resource, ResourceConfig, FailedAction
-from testplan.common.utils.match import match_regexps_in_file
+from testplan.common.utils.match import FileWatcher, LogTailer
 from testplan.common.utils.path import instantiate
 from testplan.common.utils.timing import wait
 from testplan.common.config.base import validate_func
@@ -57,6 +57,7 @@ class DriverConfig(ResourceConfig):
             ConfigOption("log_regexps", default=None): Or(None, list),
             ConfigOption("stdout_regexps", default=None): Or(None, list),
             ConfigOption("stderr_regexps", default=None): Or(None, list),
+            ConfigOption("watch_logs", default=False): bool,
             ConfigOption("async_start", default=False): bool,
             ConfigOption("report_errors_from_logs", default=False): bool,
             ConfigOption("error_logs_max_lines", default=10): int,
@@ -100,8 +101,17 @@ class Driver(Resource):
     :type stdout_regexps: ``list`` of ``_sre.SRE_Pattern``
     :param stderr_regexps: Same with log_regexps but matching stderr file.
     :type stderr_regexps: ``list`` of ``_sre.SRE_Pattern``
+    :param watch_logs: While waiting for the regexps to match, wake up when
+        the matched files change (using inotify, where available) instead
+        of polling at a fixed interval.
+    :type watch_logs: ``bool``
     :param async_start: Enable driver asynchronous start within an environment.
     :type async_start: ``bool``
+    :param depends_on: Drivers, or their names, of the same environment that
+        have to be started before this one (e.g. the server of a client).
+        Once a driver of an environment declares its dependencies, drivers
+        are started concurrently as soon as their dependencies are started.
+    :type depends_on: ``list`` or ``NoneType``
     :param report_errors_from_logs: On startup/stop exception, report log
         lines from tail of stdout/stderr/logfile logs if enabled.
     :type report_errors_from_logs: ``bool``
@@ -129,6 +139,7 @@ class Driver(Resource):
         super(Driver, self).__init__(**options)
         self.extracts = {}
         self.file_logger = None
+        self._log_tailers = {}
 
     @property
     def name(self):
@@ -159,17 +170,35 @@ class Driver(Resource):
     def pre_start(self):
         """Steps to be executed right before driver starts."""
         self.make_runpath_dirs()
+        self._log_tailers = {}
 
     def post_start(self):
         """Steps to be executed right after driver is started."""
 
     def started_check(self, timeout=None):
         """Driver started status condition check."""
-        wait(
-            lambda: self.extract_values(),
-            timeout or self.cfg.timeout,
-            raise_on_timeout=True,
+        if not self.cfg.watch_logs:
+            wait(
+                lambda: self.extract_values(),
+                timeout or self.cfg.timeout,
+                raise_on_timeout=True,
+            )
+            return
+
+        watcher = FileWatcher(
+            [outfile for outfile, _, _ in self._regex_sources()]
         )
+        try:
+            # Changes are waited for, the interval only bounds each sleep.
+            wait(
+                lambda: self.extract_values(),
+                timeout or self.cfg.timeout,
+                interval=1 if watcher.inotify else 0.05,
+                raise_on_timeout=True,
+                sleep=watcher.sleep,
+            )
+        finally:
+            watcher.close()
 
     def pre_stop(self):
         """Steps to be executed right before driver stops."""
@@ -227,32 +256,42 @@ class Driver(Resource):
         """Path for stderr file regex matching."""
         return None
 
-    def extract_values(self):
-        """Extract matching values from input regex configuration options."""
-        log_unmatched = []
-        stdout_unmatched = []
-        stderr_unmatched = []
-        result = True
-
+    def _regex_sources(self):
+        """(path, regexps, name) of the files matched at startup."""
         regex_sources = []
         if self.logpath and self.cfg.log_regexps:
-            regex_sources.append(
-                (self.logpath, self.cfg.log_regexps, log_unmatched)
-            )
+            regex_sources.append((self.logpath, self.cfg.log_regexps, "log"))
         if self.outpath and self.cfg.stdout_regexps:
             regex_sources.append(
-                (self.outpath, self.cfg.stdout_regexps, stdout_unmatched)
+                (self.outpath, self.cfg.stdout_regexps, "stdout")
             )
         if self.errpath and self.cfg.stderr_regexps:
             regex_sources.append(
-                (self.errpath, self.cfg.stderr_regexps, stderr_unmatched)
+                (self.errpath, self.cfg.stderr_regexps, "stderr")
             )
+        return regex_sources
+
+    def extract_values(self):
+        """
+        Extract matching values from input regex configuration options.
+        Files are tailed, each call only reads the lines appended since the
+        previous one (for the current start of the driver).
+        """
+        unmatched_by_name = {"log": [], "stdout": [], "stderr": []}
+        result = True
 
-        for outfile, regexps, unmatched in regex_sources:
-            file_result, file_extracts, file_unmatched = match_regexps_in_file(
-                logpath=outfile, log_extracts=regexps, return_unmatched=True
+        for outfile, regexps, name in self._regex_sources():
+            tailer = self._log_tailers.get(name)
+            if (
+                tailer is None
+                or tailer.logpath != outfile
+                or tailer.log_extracts is not regexps
+            ):
+                tailer = self._log_tailers[name] = LogTailer(outfile, regexps)
+            file_result, file_extracts, file_unmatched = tailer.match(
+                return_unmatched=True
             )
-            unmatched.extend(file_unmatched)
+            unmatched_by_name[name].extend(file_unmatched)
             for k, v in file_extracts.items():
                 if isinstance(v, bytes):
                     self.extracts[k] = v.decode("utf_8")
@@ -260,6 +299,9 @@ class Driver(Resource):
                     self.extracts[k] = v
             result = result and file_result
 
+        log_unmatched = unmatched_by_name["log"]
+        stdout_unmatched = unmatched_by_name["stdout"]
+        stderr_unmatched = unmatched_by_name["stderr"]
         if log_unmatched or stdout_unmatched or stderr_unmatched:
 
             err = (
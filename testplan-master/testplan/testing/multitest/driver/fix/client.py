@@ -39,6 +39,7 @@ class FixClientConfig(DriverConfig):
             ConfigOption("receive_timeout", default=30): Or(int, float),
             ConfigOption("logon_timeout", default=10): Or(int, float),
             ConfigOption("logoff_timeout", default=3): Or(int, float),
+            ConfigOption("validate_checksum", default=False): bool,
         }
 
 
@@ -88,6 +89,10 @@ class FixClient(Driver):
     :type logon_timeout: ``int`` or ``float``
     :param logoff_timeout: Timeout in seconds to wait for logoff response.
     :type logoff_timeout: ``int`` or ``float``
+    :param validate_checksum: Raise an error when receiving a message whose
+      CheckSum (10) does not match its bytes. Off by default so that
+      malformed messages from the system under test can be received.
+    :type validate_checksum: ``bool``
 
     Also inherits all
     :py:class:`~testplan.testing.multitest.driver.base.Driver`` options.
@@ -113,6 +118,7 @@ class FixClient(Driver):
         receive_timeout=30,
         logon_timeout=10,
         logoff_timeout=3,
+        validate_checksum=False,
         **options
     ):
         options.update(self.filter_locals(locals()))
@@ -191,6 +197,7 @@ class FixClient(Driver):
             sendersub=self.cfg.sendersub,
             interface=self.cfg.interface,
             logger=self.file_logger,
+            validate_checksum=self.cfg.validate_checksum,
         )
 
         if self.cfg.connect_at_start or self.cfg.logon_at_start:
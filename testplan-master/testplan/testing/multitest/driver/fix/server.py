@@ -32,6 +32,7 @@ class FixServerConfig(DriverConfig):
             ConfigOption("host", default="localhost"): str,
             ConfigOption("port", default=0): Use(int),
             ConfigOption("version", default="FIX.4.2"): str,
+            ConfigOption("validate_checksum", default=False): bool,
         }
 
 
@@ -64,6 +65,10 @@ class FixServer(Driver):
     :param version: FIX version, defaults to "FIX.4.2". This string is used
       as the contents of tag 8 (BeginString).
     :type version: ``str``
+    :param validate_checksum: Close connections that send a message whose
+      CheckSum (10) does not match its bytes. Off by default so that
+      malformed messages from the system under test can be received.
+    :type validate_checksum: ``bool``
 
     Also inherits all
     :py:class:`~testplan.testing.multitest.driver.base.Driver`` options.
@@ -79,6 +84,7 @@ class FixServer(Driver):
         host="localhost",
         port=0,
         version="FIX.4.2",
+        validate_checksum=False,
         **options
     ):
         options.update(self.filter_locals(locals()))
@@ -121,6 +127,7 @@ class FixServer(Driver):
             port=self.cfg.port,
             version=self.cfg.version,
             logger=self.file_logger,
+            validate_checksum=self.cfg.validate_checksum,
         )
         self._server.start()
         self._host = self.cfg.host
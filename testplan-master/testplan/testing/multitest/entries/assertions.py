@@ -10,6 +10,7 @@ import os
 import re
 import operator
 import collections
+import datetime
 import numbers
 import decimal
 import cmath
@@ -17,10 +18,45 @@ import six
 import lxml
 import copy
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from testplan.common.utils.convert import make_tuple, flatten_dict_comparison
 from testplan.common.utils import comparison, difflib
 
-from .base import BaseEntry, get_table
+from .base import BaseEntry, get_table, get_columns
+
+# Types of table cells that cannot be custom comparators, and whose values
+# are equal when their hashes are.
+_PLAIN_TYPES = frozenset(
+    (
+        bool,
+        float,
+        type(None),
+        six.binary_type,
+        six.text_type,
+        decimal.Decimal,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+    )
+    + six.integer_types
+    + six.string_types
+)
+
+# Types of table cells compared with NumPy, when a whole column has one of
+# them. Integers and floats are not mixed, as NumPy would compare them as
+# floats.
+_NUMPY_TYPES = frozenset((bool, float) + six.integer_types)
+
+# Columns shorter than this are faster to compare without NumPy.
+_NUMPY_MIN_ROWS = 64
+
+# Placeholder of the cells of rows that lack a column.
+_ABSENT = object()
 
 
 __all__ = [
@@ -638,7 +674,9 @@ class ColumnContain(Assertion):
         description=None,
         category=None,
     ):
-        self.table = get_table(table)
+        self._source = table
+        self._table = None
+        self._columns = get_columns(table)
         self.values = values
         self.column = column
         self.limit = limit
@@ -649,15 +687,35 @@ class ColumnContain(Assertion):
             description=description, category=category
         )
 
+    @property
+    def table(self):
+        """Table as a ``list`` of ``dict``, built on first access."""
+        if self._table is None:
+            self._table = get_table(self._source)
+        return self._table
+
     def evaluate(self):
         passed = True
+        columns, num_rows = self._columns
+        column_values = columns[self.column] if num_rows else []
+
+        # Plain values are looked up in a set rather than in the list.
+        lookup = None
+        if set(map(type, self.values)) <= _PLAIN_TYPES:
+            try:
+                lookup = set(self.values)
+            except TypeError:
+                pass
+
+        for idx, value in enumerate(column_values):
 
-        for idx, row in enumerate(self.table):
+            if lookup is not None and type(value) in _PLAIN_TYPES:
+                contained = value in lookup
+            else:
+                contained = value in self.values
 
             comp_obj = ColumnContainComparison(
-                idx=idx,
-                value=row[self.column],
-                passed=row[self.column] in self.values,
+                idx=idx, value=value, passed=contained
             )
 
             if not comp_obj.passed:
@@ -739,6 +797,22 @@ def get_comparison_columns(table_1, table_2, include_columns, exclude_columns):
     :type exclude_columns: ``list`` of ``str``
     """
 
+    return _comparison_columns(
+        columns_1=table_1[0].keys() if table_1 else [],
+        columns_2=table_2[0].keys() if table_2 else [],
+        include_columns=include_columns,
+        exclude_columns=exclude_columns,
+    )
+
+
+def _comparison_columns(
+    columns_1, columns_2, include_columns, exclude_columns
+):
+    """
+    Same as :py:func:`get_comparison_columns`, given the column names of the
+    two tables.
+    """
+
     def check_missing_columns(columns, lookup):
         """Check if ``columns`` have any missing elements from ``lookup``."""
         diff = set(lookup) - set(columns)
@@ -753,9 +827,6 @@ def get_comparison_columns(table_1, table_2, include_columns, exclude_columns):
             )
         )
 
-    columns_1 = table_1[0].keys() if table_1 else []
-    columns_2 = table_2[0].keys() if table_2 else []
-
     comparison_columns = columns_1
 
     if include_columns:
@@ -831,6 +902,37 @@ def compare_rows(
     :returns: overall passed status and RowComparison data.
     """
 
+    _check_display_columns(comparison_columns, display_columns)
+
+    columns = {
+        col: [row[col] for row in table]
+        for col in set(comparison_columns).union(display_columns)
+    }
+    expected_columns = {
+        col: [row[col] for row in expected_table] for col in comparison_columns
+    }
+    # Display only columns may be missing from some expected rows.
+    expected_columns.update(
+        {
+            col: [row.get(col, _ABSENT) for row in expected_table]
+            for col in display_columns
+            if col not in comparison_columns
+        }
+    )
+
+    return compare_columns(
+        columns=columns,
+        expected_columns=expected_columns,
+        num_rows=min(len(table), len(expected_table)),
+        comparison_columns=comparison_columns,
+        display_columns=display_columns,
+        strict=strict,
+        fail_limit=fail_limit,
+        report_fails_only=report_fails_only,
+    )
+
+
+def _check_display_columns(comparison_columns, display_columns):
     # We always want to display a superset of comparison columns
     # otherwise we can have a failing comparison but the
     # resulting data will not include the mismatch context.
@@ -843,21 +945,168 @@ def compare_rows(
             )
         )
 
+
+def _comparator_rows(values):
+    """Indices of the custom comparators (callables or regexes)."""
+    if set(map(type, values)) <= _PLAIN_TYPES:
+        return set()
+    return set(
+        idx
+        for idx, value in enumerate(values)
+        if type(value) not in _PLAIN_TYPES and comparison.is_comparator(value)
+    )
+
+
+def _compare_cells(first_values, second_values, compare):
+    """
+    Compare two columns cell by cell, with NumPy if both columns hold values
+    of the same numeric type.
+
+    :param compare: Comparison operator, e.g. ``operator.eq``.
+    :type compare: ``callable``
+    :return: Comparison result of each pair of cells, or None if a
+        comparison raised an error or did not return a ``bool``.
+    :rtype: ``list`` of ``bool``
+    """
+    if numpy is not None and len(first_values) >= _NUMPY_MIN_ROWS:
+        types = set(map(type, first_values)) | set(map(type, second_values))
+        if len(types) == 1 and types.pop() in _NUMPY_TYPES:
+            first_array = numpy.asarray(first_values)
+            second_array = numpy.asarray(second_values)
+            # Integers that overflow NumPy types give object arrays, or
+            # unsigned ones that would be compared as floats.
+            if first_array.dtype == second_array.dtype != object:
+                return compare(first_array, second_array).tolist()
+
+    try:
+        results = list(map(compare, first_values, second_values))
+    except Exception:  # pylint: disable=broad-except
+        return None
+    if set(map(type, results)) <= {bool}:
+        return results
+    return None
+
+
+def _failure_candidates(comparisons, num_rows):
+    """
+    Indices of the rows that may fail the comparison, the other rows have
+    equal plain values in all comparison columns.
+    """
+    passing = [True] * num_rows
+    for _, _, _, equal, comparators in comparisons:
+        if equal is None:
+            return range(num_rows)
+        passing = list(map(operator.and_, passing, equal))
+        for idx in comparators:
+            passing[idx] = False
+    return [idx for idx, passed in enumerate(passing) if not passed]
+
+
+def compare_columns(
+    columns,
+    expected_columns,
+    num_rows,
+    comparison_columns,
+    display_columns,
+    strict=True,
+    fail_limit=0,
+    report_fails_only=False,
+):
+    """
+    Apply row by row comparison of two tables given as columns, creating
+    a ``RowComparison`` for each row couple, like :py:func:`compare_rows`.
+
+    Plain values are compared a column at a time, custom comparators (and
+    columns whose values cannot be compared that way) are evaluated cell by
+    cell, in row order.
+
+    :param columns: Values of each column of the original table.
+    :type columns: ``dict`` of ``list``
+    :param expected_columns: Values of each column of the comparison table,
+                             which can contain custom comparators.
+    :type expected_columns: ``dict`` of ``list``
+    :param num_rows: Number of rows to compare.
+    :type num_rows: ``int``
+    :param comparison_columns: Columns to be used for comparison.
+    :type comparison_columns: ``list`` of ``str``
+    :param display_columns: Columns to be used
+                            for populating ``RowComparison`` data.
+    :type display_columns: ``list`` of ``str``
+    :param strict: Custom comparator strictness flag, currently will
+                   auto-convert non-str values to
+                   ``str`` for pattern if ``False``.
+    :type strict: ``bool``
+    :param fail_limit: Max number of failures before aborting
+                       the comparison run.
+    :type fail_limit: ``int``
+    :param report_fails_only: If ``True``, only report the failures.
+    :type report_fails_only: ``bool``
+    :returns: overall passed status and RowComparison data.
+    """
+    _check_display_columns(comparison_columns, display_columns)
+
+    comparisons = []
+    for column_name in comparison_columns:
+        first_values = columns[column_name]
+        second_values = expected_columns[column_name]
+        comparisons.append(
+            (
+                column_name,
+                first_values,
+                second_values,
+                _compare_cells(first_values, second_values, operator.eq),
+                _comparator_rows(second_values),
+            )
+        )
+
+    # Need to populate extra with values from the
+    # second table, if they are not being used
+    # for comparison but have different values.
+    display_only = []
+    for column_name in display_columns:
+        if column_name in comparison_columns:
+            continue
+        if column_name not in expected_columns:
+            continue
+        first_values = columns[column_name]
+        second_values = expected_columns[column_name]
+        display_only.append(
+            (
+                column_name,
+                first_values,
+                second_values,
+                _compare_cells(second_values, first_values, operator.ne),
+            )
+        )
+
+    display_values = [columns[col] for col in display_columns]
+    if report_fails_only:
+        # Rows that pass are not reported and do not count towards the limit.
+        rows = _failure_candidates(comparisons, num_rows)
+    else:
+        rows = range(num_rows)
+
     data = []
     num_failures = 0
-    display_only = [
-        col for col in display_columns if col not in comparison_columns
-    ]
 
-    for idx, (row_1, row_2) in enumerate(zip(table, expected_table)):
+    for idx in rows:
         diff, errors, extra = {}, {}, {}
 
-        for column_name in comparison_columns:
-            first, second = row_1[column_name], row_2[column_name]
-
-            passed, error = comparison.basic_compare(
-                first=first, second=second, strict=strict
-            )
+        for (
+            column_name,
+            first_values,
+            second_values,
+            equal,
+            comparators,
+        ) in comparisons:
+            first, second = first_values[idx], second_values[idx]
+
+            if equal is None or idx in comparators:
+                passed, error = comparison.basic_compare(
+                    first=first, second=second, strict=strict
+                )
+            else:
+                passed, error = equal[idx], None
 
             if error:
                 errors[column_name] = error
@@ -870,18 +1119,18 @@ def compare_rows(
             if first is not second and (error or passed):
                 extra[column_name] = second
 
-        row_data = [row_1[col] for col in display_columns]
-
-        # Need to populate extra with values from the
-        # second table, if they are not being used
-        # for comparison but have different values.
-        extra.update(
-            {
-                col: row_2[col]
-                for col in display_only
-                if col in row_2 and row_2[col] != row_1[col]
-            }
-        )
+        row_data = [values[idx] for values in display_values]
+
+        for column_name, first_values, second_values, unequal in display_only:
+            second = second_values[idx]
+            if second is _ABSENT:
+                continue
+            if unequal is None:
+                unequal_cell = second != first_values[idx]
+            else:
+                unequal_cell = unequal[idx]
+            if unequal_cell:
+                extra[column_name] = second
 
         row_comparison = RowComparison(idx, row_data, diff, errors, extra)
 
@@ -916,8 +1165,11 @@ class TableMatch(Assertion):
         description=None,
         category=None,
     ):
-        self.table = get_table(table)
-        self.expected_table = get_table(expected_table)
+        self._source = table
+        self._expected_source = expected_table
+        self._tables = {}
+        self._columns = get_columns(table)
+        self._expected_columns = get_columns(expected_table)
         self.include_columns = include_columns
         self.exclude_columns = exclude_columns
         self.strict = strict
@@ -935,8 +1187,23 @@ class TableMatch(Assertion):
             description=description, category=category
         )
 
+    @property
+    def table(self):
+        """Table as a ``list`` of ``dict``, built on first access."""
+        if "table" not in self._tables:
+            self._tables["table"] = get_table(self._source)
+        return self._tables["table"]
+
+    @property
+    def expected_table(self):
+        """Expected table as a ``list`` of ``dict``, built on first access."""
+        if "expected_table" not in self._tables:
+            self._tables["expected_table"] = get_table(self._expected_source)
+        return self._tables["expected_table"]
+
     def evaluate(self):
-        len_table, len_expected = len(self.table), len(self.expected_table)
+        columns, len_table = self._columns
+        expected_columns, len_expected = self._expected_columns
 
         if len_table != len_expected:
             self.message = (
@@ -945,14 +1212,14 @@ class TableMatch(Assertion):
             ).format(len_table, len_expected)
             return False
 
-        if not (self.table or self.expected_table):
+        if not (len_table or len_expected):
             self.message = "Both tables are empty."
             return True
 
         try:
-            comparison_columns = get_comparison_columns(
-                table_1=self.table,
-                table_2=self.expected_table,
+            comparison_columns = _comparison_columns(
+                columns_1=list(columns.keys()),
+                columns_2=list(expected_columns.keys()),
                 include_columns=self.include_columns,
                 exclude_columns=self.exclude_columns,
             )
@@ -961,12 +1228,13 @@ class TableMatch(Assertion):
             return False  # Fail on invalid tables
 
         self.display_columns = (
-            self.table[0].keys() if self.report_all else comparison_columns
+            list(columns.keys()) if self.report_all else comparison_columns
         )
 
-        passed, self.data = compare_rows(
-            table=self.table,
-            expected_table=self.expected_table,
+        passed, self.data = compare_columns(
+            columns=columns,
+            expected_columns=expected_columns,
+            num_rows=len_table,
             comparison_columns=comparison_columns,
             display_columns=self.display_columns,
             strict=self.strict,
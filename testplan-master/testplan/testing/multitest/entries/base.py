@@ -3,6 +3,7 @@ Base classes go here.
 """
 import datetime
 import operator
+import collections
 import pprint
 import re
 import os
@@ -51,6 +52,22 @@ def get_table(source, keep_column_order=True):
     return table.as_list_of_dict(keep_column_order=keep_column_order)
 
 
+def get_columns(source):
+    """
+    Return table formatted as columns.
+
+    :param source: Tabular data.
+    :type source: ``list`` of ``list`` or ``list`` of ``dict``
+    :return: Values of each column by column name, and number of rows.
+    :rtype: ``tuple`` of ``OrderedDict`` and ``int``
+    """
+    if not source:
+        return collections.OrderedDict(), 0
+
+    table = source if isinstance(source, TableEntry) else TableEntry(source)
+    return table.as_columns(), len(table)
+
+
 class BaseEntry(object):
     """Base class for all entries, stores common context like time etc."""
 
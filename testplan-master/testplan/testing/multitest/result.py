@@ -9,6 +9,7 @@ after testcases have finished running.
 import inspect
 import os
 import re
+import sys
 import uuid
 
 from testplan import defaults
@@ -19,6 +20,37 @@ from .entries import assertions, base
 from .entries.schemas.base import registry as schema_registry
 from .entries.stdout.base import registry as stdout_registry
 
+# Not available on all Python implementations.
+_getframe = getattr(sys, "_getframe", None)
+
+# Absolute source file paths do not depend on the cwd and can be cached.
+_ABSPATHS = {}
+
+
+def _abspath(path):
+    try:
+        return _ABSPATHS[path]
+    except KeyError:
+        abspath = os.path.abspath(path)
+        if os.path.isabs(path):
+            _ABSPATHS[path] = abspath
+        return abspath
+
+
+def _caller_location(depth):
+    """
+    Source file path and line number of the frame ``depth`` levels above the
+    function calling this one. Only the frame itself is looked up, unlike
+    ``inspect.stack()`` which also reads the source context of every frame
+    of the stack.
+    """
+    depth += 1  # skip this function
+    if _getframe is None:
+        frame_info = inspect.stack()[depth]
+        return os.path.abspath(frame_info[1]), frame_info[2]
+    frame = _getframe(depth)
+    return _abspath(frame.f_code.co_filename), frame.f_lineno
+
 
 class ExceptionCapture(object):
     """
@@ -74,9 +106,10 @@ class ExceptionCapture(object):
             description=self.description,
         )
 
-        caller_frame = inspect.stack()[1]
-        exc_assertion.file_path = os.path.abspath(caller_frame[1])
-        exc_assertion.line_no = caller_frame[2]
+        if self.result.capture_location:
+            file_path, line_no = _caller_location(1)
+            exc_assertion.file_path = file_path
+            exc_assertion.line_no = line_no
 
         # We cannot use `bind_entry` here as this block will
         # be run when an exception is raised
@@ -93,9 +126,8 @@ def _bind_entry(entry, result_obj):
     ``entries`` list.
     """
     # Second element is the caller
-    caller_frame = inspect.stack()[2]
-    entry.file_path = os.path.abspath(caller_frame[1])
-    entry.line_no = caller_frame[2]
+    if result_obj.capture_location:
+        entry.file_path, entry.line_no = _caller_location(2)
 
     result_obj.entries.append(entry)
 
@@ -1246,6 +1278,7 @@ class Result(object):
         self,
         stdout_style=None,
         continue_on_failure=True,
+        capture_location=True,
         _group_description=None,
         _parent=None,
         _summarize=False,
@@ -1259,6 +1292,7 @@ class Result(object):
 
         self.stdout_style = stdout_style or STDOUT_STYLE
         self.continue_on_failure = continue_on_failure
+        self.capture_location = capture_location
 
         for key, value in self.get_namespaces().items():
             if hasattr(self, key):
@@ -1279,6 +1313,7 @@ class Result(object):
         return self.__class__(
             stdout_style=self.stdout_style,
             continue_on_failure=self.continue_on_failure,
+            capture_location=self.capture_location,
             _group_description=self._group_description,
             _parent=self._parent,
             _summarize=self._summarize,
@@ -1379,6 +1414,7 @@ class Result(object):
         return Result(
             stdout_style=self.stdout_style,
             continue_on_failure=self.continue_on_failure,
+            capture_location=self.capture_location,
             _group_description=description,
             _parent=self,
             _summarize=summarize,
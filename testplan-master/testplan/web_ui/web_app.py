@@ -2,26 +2,38 @@
 """
 Web application for Testplan & Monitor UIs,
 """
+import io
 import os
+import gzip
+import json
 import argparse
-from threading import Thread
+from threading import Thread, Lock
 
-from flask import Flask, send_from_directory, abort
+from flask import Flask, Response, request, send_from_directory, abort
 from flask_restplus import Resource, Api
 from werkzeug import exceptions
 from cheroot.wsgi import Server as WSGIServer, PathInfoDispatcher
 
 from testplan import defaults
 from testplan.common.utils.path import pwd
+from testplan.exporters.testing.json import load_json, read_assertions
 
 TESTPLAN_UI_STATIC_DIR = os.path.abspath(os.path.dirname(__file__))
 INDEX_HTML = "index.html"
 TESTPLAN_REPORT = os.path.basename(defaults.JSON_PATH)
 MONITOR_REPORT = "monitor_report.json"
+# Number of assertions returned by default, and at most, per request.
+ASSERTIONS_PAGE_SIZE = 100
+ASSERTIONS_MAX_PAGE_SIZE = 1000
+# Responses smaller than this are sent uncompressed.
+GZIP_MIN_SIZE = 1024
 
 app = Flask(__name__)
 _api = Api(app)
 
+_json_cache = {}
+_json_cache_lock = Lock()
+
 
 def parse_cli_args():
     """Web App command line arguments."""
@@ -32,6 +44,133 @@ def parse_cli_args():
     return parser.parse_args()
 
 
+def _accepts_gzip():
+    """Whether the client accepts gzip encoded responses."""
+    return request.accept_encodings["gzip"] > 0
+
+
+def _gzip(data):
+    """Compress bytes with gzip."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6) as out:
+        out.write(data)
+    return buffer.getvalue()
+
+
+def _is_gzip(path):
+    with open(path, "rb") as json_file:
+        return json_file.read(2) == b"\x1f\x8b"
+
+
+def _send_file(path):
+    """
+    Send a file of the data directory. JSON files that were exported
+    compressed are sent as they are with a gzip content encoding, or
+    decompressed for clients that do not accept it.
+    """
+    if not os.path.exists(path):
+        raise exceptions.NotFound()
+
+    if not path.endswith((".json", ".json.gz")) or not _is_gzip(path):
+        return send_from_directory(
+            directory=os.path.dirname(path), filename=os.path.basename(path)
+        )
+    if _accepts_gzip():
+        response = send_from_directory(
+            directory=os.path.dirname(path), filename=os.path.basename(path)
+        )
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        with gzip.open(path, "rb") as json_file:
+            response = Response(json_file.read())
+        response.mimetype = "application/json"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _json_response(data):
+    """JSON response, gzip encoded if large enough and accepted."""
+    body = json.dumps(data).encode("utf-8")
+    response = Response(body, mimetype="application/json")
+    if len(body) >= GZIP_MIN_SIZE and _accepts_gzip():
+        response.set_data(_gzip(body))
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _load_cached(path, select=None):
+    """
+    Load a JSON file, cached until the file changes. Only the result of
+    ``select`` is cached if given, for files that are large.
+    """
+    stats = os.stat(path)
+    key = (stats.st_mtime, stats.st_size)
+    with _json_cache_lock:
+        cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        data = load_json(path)
+        cached = key, select(data) if select else data
+        with _json_cache_lock:
+            _json_cache[path] = cached
+    return cached[1]
+
+
+def _attachment_path(data_path, meta, name):
+    """
+    Path of a file attached to a report. Attachments are recorded with
+    the path they were exported to, they are looked up by name in the data
+    directory if the report was moved.
+    """
+    path = (meta["attachments"] or {}).get(name)
+    if path is None:
+        return None
+    if not os.path.exists(path):
+        path = os.path.join(data_path, defaults.ATTACHMENTS, name)
+    return path
+
+
+def _assertions_index(data_path, report_name):
+    """
+    Load the index of the assertions of a report exported with
+    ``split_json_report``, as recorded in the meta report.
+
+    :return: Path of the assertions file and content of the index, or None
+        if the report has no index.
+    :rtype: ``tuple`` or ``NoneType``
+    """
+    report_path = os.path.join(data_path, report_name)
+    if not os.path.exists(report_path):
+        return None
+    try:
+        meta = _load_cached(
+            report_path,
+            select=lambda report: {
+                key: report.get(key)
+                for key in (
+                    "attachments",
+                    "assertions_index",
+                    "assertions_file",
+                )
+            },
+        )
+    except (IOError, ValueError, AttributeError):
+        # Not a JSON report exported by Testplan.
+        return None
+
+    index_path = _attachment_path(
+        data_path, meta, meta.get("assertions_index")
+    )
+    assertions_path = _attachment_path(
+        data_path, meta, meta.get("assertions_file")
+    )
+    if index_path is None or assertions_path is None:
+        return None
+    if not os.path.exists(index_path):
+        return None
+    return assertions_path, _load_cached(index_path)
+
+
 @_api.route("/testplan/<string:report_uid>")
 class Testplan(Resource):
     def get(self, report_uid):
@@ -60,25 +199,53 @@ class TestplanReport(Resource):
             )
         )
 
-        if os.path.exists(report_path):
-            return send_from_directory(
-                directory=os.path.dirname(report_path),
-                filename=os.path.basename(report_path),
-            )
-        else:
-            raise exceptions.NotFound()
+        return _send_file(report_path)
 
 
 @_api.route(
-    "/api/v1/reports/<string:report_uid>/assertions/<string:assertions_uid>"
+    "/api/v1/reports/<string:report_uid>/assertions/<path:assertions_uid>"
 )
 class TestplanAssertions(Resource):
     def get(self, report_uid, assertions_uid):
         """
-        Get an Assertion report (JSON) for a specific Testplan report given
-        their uids.
+        Get a page of the assertions (JSON) of a testcase, for a Testplan
+        report exported with ``split_json_report``. The testcase uid is
+        prefixed with the uids of its parents, separated by ``/``, and the
+        ``start`` and ``limit`` query parameters select the page.
         """
-        raise exceptions.NotImplemented()  # pylint: disable=notimplemented-raised
+        index = _assertions_index(
+            app.config["DATA_PATH"], app.config["TESTPLAN_REPORT_NAME"]
+        )
+        if index is None:
+            raise exceptions.NotFound("Report has no assertions index.")
+        assertions_path, content = index
+
+        location = content["testcases"].get(assertions_uid)
+        if location is None:
+            raise exceptions.NotFound(
+                "No testcase {} in report.".format(assertions_uid)
+            )
+
+        start = request.args.get("start", 0, type=int)
+        limit = request.args.get("limit", ASSERTIONS_PAGE_SIZE, type=int)
+        if start < 0 or not 0 < limit <= ASSERTIONS_MAX_PAGE_SIZE:
+            raise exceptions.BadRequest(
+                "Expected start >= 0 and 0 < limit <= {}.".format(
+                    ASSERTIONS_MAX_PAGE_SIZE
+                )
+            )
+
+        entries = read_assertions(
+            assertions_path, location, start, start + limit
+        )
+        return _json_response(
+            {
+                "uid": assertions_uid,
+                "start": start,
+                "total": location["count"],
+                "entries": entries,
+            }
+        )
 
 
 @_api.route(
@@ -93,13 +260,7 @@ class TestplanAttachment(Resource):
             )
         )
 
-        if os.path.exists(attachment_path):
-            return send_from_directory(
-                directory=os.path.dirname(attachment_path),
-                filename=os.path.basename(attachment_path),
-            )
-        else:
-            raise exceptions.NotFound()
+        return _send_file(attachment_path)
 
 
 class WebServer(Thread):
@@ -4,12 +4,21 @@ import os
 import hashlib
 import tempfile
 
+import pytest
+
 from testplan.testing import multitest
 
 from testplan import TestplanMock
 from testplan.common.utils.testing import argv_overridden
 from testplan.exporters.testing import JSONExporter
-from testplan.exporters.testing.json import gen_attached_report_names
+from testplan.exporters.testing.json import (
+    ASSERTIONS_INDEX_STRIDE,
+    gen_assertions_index_name,
+    gen_attached_report_names,
+    load_json,
+    read_assertions,
+)
+from testplan.report.testing.schemas import TestReportSchema
 
 
 @multitest.testsuite
@@ -110,15 +119,18 @@ def test_json_exporter_split_report(runpath):
     attachments_dir = os.path.join(os.path.dirname(json_path), "_attachments")
     assert os.path.isdir(attachments_dir)
     assert len(report["entries"]) == 0
-    assert len(report["attachments"]) == 3
+    assert len(report["attachments"]) == 4
 
     structure_filename, assertions_filename = gen_attached_report_names(
         json_path
     )
+    index_filename = gen_assertions_index_name(json_path)
     assert structure_filename in report["attachments"]
     assert assertions_filename in report["attachments"]
+    assert index_filename in report["attachments"]
     assert report["structure_file"] == structure_filename
     assert report["assertions_file"] == assertions_filename
+    assert report["assertions_index"] == index_filename
 
     structure_filepath = os.path.join(attachments_dir, structure_filename)
     assertions_filepath = os.path.join(attachments_dir, assertions_filename)
@@ -171,6 +183,113 @@ def test_json_exporter_split_report(runpath):
     assert len(assertions["plan"]["Secondary"]["Beta"]["test_error"]) == 0
 
 
+@pytest.mark.parametrize("split_json_report", (False, True))
+def test_json_exporter_compressed(runpath, split_json_report):
+    """
+    Compressed JSON reports should hold the same data as the JSON
+    serialization of the report.
+    """
+    json_path = os.path.join(runpath, "report.json.gz")
+
+    plan = TestplanMock("plan", runpath=runpath)
+    multitest_1 = multitest.MultiTest(name="Primary", suites=[Alpha()])
+    multitest_2 = multitest.MultiTest(name="Secondary", suites=[Beta()])
+    plan.add(multitest_1)
+    plan.add(multitest_2)
+    report = plan.run().report
+
+    JSONExporter(
+        json_path=json_path,
+        split_json_report=split_json_report,
+        compress_json_report=True,
+    ).export(report)
+
+    with open(json_path, "rb") as json_file:
+        assert json_file.read(2) == b"\x1f\x8b"
+
+    expected = json.loads(json.dumps(TestReportSchema().dump(report).data))
+    data = load_json(json_path)
+    if split_json_report:
+        assert data["version"] == 2
+        assert data["structure_file"].endswith(".json.gz")
+        assert data["assertions_file"].endswith(".json.gz")
+        structure = load_json(data["attachments"][data["structure_file"]])
+        assertions = load_json(data["attachments"][data["assertions_file"]])
+        data = JSONExporter.merge_json_report(data, structure, assertions)
+        for key in (
+            "structure_file",
+            "assertions_file",
+            "assertions_index",
+            "attachments",
+        ):
+            data.pop(key)
+        expected.pop("attachments")
+    else:
+        assert data["version"] == 1
+
+    data.pop("version")
+    assert data == expected
+
+
+@multitest.testsuite
+class Gamma(object):
+    @multitest.testcase
+    def test_many(self, env, result):
+        for idx in range(ASSERTIONS_INDEX_STRIDE * 2 + 5):
+            result.log("message \u00e9 {}".format(idx))
+
+    @multitest.testcase
+    def test_none(self, env, result):
+        pass
+
+
+@pytest.mark.parametrize("compress_json_report", (False, True))
+def test_json_exporter_assertions_index(runpath, compress_json_report):
+    """
+    Any range of the assertions of a testcase can be read with the index
+    of a split report.
+    """
+    json_path = os.path.join(runpath, "report.json")
+    plan = TestplanMock("plan", runpath=runpath)
+    plan.add(multitest.MultiTest(name="Primary", suites=[Alpha(), Gamma()]))
+    report = plan.run().report
+
+    JSONExporter(
+        json_path=json_path,
+        split_json_report=True,
+        compress_json_report=compress_json_report,
+    ).export(report)
+
+    meta = load_json(json_path)
+    index = load_json(meta["attachments"][meta["assertions_index"]])
+    assert index["assertions_file"] == meta["assertions_file"]
+    assertions_path = meta["attachments"][meta["assertions_file"]]
+    assertions = load_json(assertions_path)
+
+    suites = assertions["plan"]["Primary"]
+    for suite in ("Alpha", "Gamma"):
+        for name, entries in suites[suite].items():
+            location = index["testcases"][
+                "plan/Primary/{}/{}".format(suite, name)
+            ]
+            assert location["count"] == len(entries)
+            assert read_assertions(assertions_path, location) == entries
+
+    location = index["testcases"]["plan/Primary/Gamma/test_many"]
+    entries = suites["Gamma"]["test_many"]
+    for start, stop in (
+        (0, 10),
+        (95, 105),
+        (ASSERTIONS_INDEX_STRIDE, ASSERTIONS_INDEX_STRIDE * 2),
+        (150, 1000),
+        (len(entries), len(entries) + 10),
+    ):
+        assert read_assertions(assertions_path, location, start, stop) == (
+            entries[start:stop]
+        )
+    assert entries[0]["message"] == "message \u00e9 0"
+
+
 def test_implicit_exporter_initialization(runpath):
     """
     An implicit JSON should be generated if `json_path` is available
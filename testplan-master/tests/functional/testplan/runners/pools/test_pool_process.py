@@ -7,6 +7,7 @@ import pytest
 from testplan.common.utils.testing import log_propagation_disabled
 from testplan.report import Status
 from testplan.runners.pools import ProcessPool
+from testplan.runners.pools.scaling import QueueDepthPolicy
 from testplan.common.utils.logger import TESTPLAN_LOGGER
 from testplan.testing import multitest
 
@@ -16,10 +17,27 @@ from tests.functional.testplan.runners.pools.func_pool_base_tasks import (
 from tests.unit.testplan.common.serialization import test_fields
 
 
-def test_pool_basic(mockplan):
+@pytest.mark.parametrize("event_driven", (False, True))
+def test_pool_basic(mockplan, event_driven):
     """Basic test scheduling."""
     schedule_tests_to_pool(
-        mockplan, ProcessPool, worker_heartbeat=2, heartbeats_miss_limit=2
+        mockplan,
+        ProcessPool,
+        worker_heartbeat=2,
+        heartbeats_miss_limit=2,
+        event_driven=event_driven,
+    )
+
+
+def test_pool_prefetch(mockplan):
+    """Child workers keep tasks queued locally."""
+    schedule_tests_to_pool(
+        mockplan,
+        ProcessPool,
+        size=2,
+        worker_heartbeat=2,
+        heartbeats_miss_limit=2,
+        prefetch=2,
     )
 
 
@@ -348,3 +366,117 @@ def test_restart_worker(mockplan):
     assert res.success is False
     assert mockplan.report.status == Status.ERROR
     assert mockplan.report.counter[Status.ERROR] == 1
+
+
+def test_pool_zygote(mockplan):
+    """Workers forked by a zygote execute tests."""
+    schedule_tests_to_pool(
+        mockplan,
+        ProcessPool,
+        size=2,
+        worker_heartbeat=2,
+        heartbeats_miss_limit=2,
+        zygote=True,
+    )
+
+
+def test_zygote_restart_worker(mockplan):
+    """Killed workers are forked again by the zygote."""
+    pool_name = ProcessPool.__name__
+    pool = ProcessPool(
+        name=pool_name,
+        size=2,
+        worker_heartbeat=1,
+        heartbeats_miss_limit=2,
+        max_active_loop_sleep=1,
+        zygote=True,
+    )
+    pool._task_retries_limit = 1
+    pool_uid = mockplan.add_resource(pool)
+
+    dirname = os.path.dirname(os.path.abspath(__file__))
+
+    mockplan.schedule(
+        target="multitest_kills_worker",
+        module="func_pool_base_tasks",
+        path=dirname,
+        resource=pool_name,
+    )
+    for idx in range(1, 5):
+        mockplan.schedule(
+            target="get_mtest",
+            module="func_pool_base_tasks",
+            path=dirname,
+            kwargs=dict(name=idx),
+            resource=pool_name,
+        )
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        res = mockplan.run()
+
+    workers = mockplan.resources[pool_uid]._workers
+    assert not any(worker._aborted for worker in workers)
+    assert sum(worker.restart_count for worker in workers) < 2 * 3
+    assert mockplan.report.status == Status.ERROR
+    assert mockplan.report.counter[Status.ERROR] == 1
+    assert mockplan.report.counter[Status.PASSED] == 4
+
+
+def test_recycle_workers(mockplan):
+    """Workers are replaced after their maximum number of tasks."""
+    pool_name = ProcessPool.__name__
+    pool = ProcessPool(name=pool_name, size=2, max_tasks_per_worker=2)
+    mockplan.add_resource(pool)
+
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    for idx in range(1, 7):
+        mockplan.schedule(
+            target="get_mtest",
+            module="func_pool_base_tasks",
+            path=dirname,
+            kwargs=dict(name=idx),
+            resource=pool_name,
+        )
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        res = mockplan.run()
+
+    assert res.success is True
+    assert mockplan.report.counter[Status.PASSED] == 6
+    assert all(recycle.task_count == 2 for recycle in pool.recycles)
+    assert pool.recycles
+
+    summary = pool.worker_summary()
+    assert sum(usage["tasks"] for usage in summary.values()) == 6
+    assert all(usage["peak_rss"] > 0 for usage in summary.values())
+
+
+def test_scaling_pool(mockplan):
+    """Workers are started for the scheduled tasks by the scaling policy."""
+    pool_name = ProcessPool.__name__
+    pool = ProcessPool(
+        name=pool_name,
+        size=3,
+        scaling_policy=QueueDepthPolicy(min_size=1, idle_timeout=0),
+    )
+    mockplan.add_resource(pool)
+
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    for idx in range(1, 7):
+        mockplan.schedule(
+            target="get_mtest",
+            module="func_pool_base_tasks",
+            path=dirname,
+            kwargs=dict(name=idx),
+            resource=pool_name,
+        )
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        res = mockplan.run()
+
+    assert res.success is True
+    assert mockplan.report.counter[Status.PASSED] == 6
+
+    summary = pool.worker_summary()
+    assert sorted(summary) == ["0", "1", "2"]
+    assert sum(usage["tasks"] for usage in summary.values()) == 6
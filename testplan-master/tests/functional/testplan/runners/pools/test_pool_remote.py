@@ -107,3 +107,33 @@ def test_pool_basic(mockplan, remote_pool_type):
     finally:
         os.chdir(orig_dir)
         shutil.rmtree(workspace)
+
+
+@pytest.mark.skipif(IS_WIN, reason="Remote pool is skipped on Windows.")
+@pytest.mark.parametrize(
+    "incremental_sync, persistent_shell",
+    ((True, False), (False, True), (True, True)),
+)
+def test_pool_setup_options(mockplan, incremental_sync, persistent_shell):
+    """Test scheduling with the remote setup optimizations."""
+    workspace, schedule_path = setup_workspace()
+
+    try:
+        orig_dir = os.getcwd()
+        os.chdir(workspace)
+
+        schedule_tests_to_pool(
+            mockplan,
+            RemotePool,
+            hosts={"localhost": 2},
+            ssh_cmd=mock_ssh,
+            copy_cmd=strip_host,
+            workspace=workspace,
+            copy_workspace_check=None,
+            incremental_sync=incremental_sync,
+            persistent_shell=persistent_shell,
+            schedule_path=schedule_path,
+        )
+    finally:
+        os.chdir(orig_dir)
+        shutil.rmtree(workspace)
@@ -0,0 +1,7 @@
+"""Task targets creating GTest instances."""
+
+from testplan.testing.cpp import GTest
+
+
+def make_gtest(binary, part=None):
+    return GTest(name="MyGTest", binary=binary, part=part)
@@ -3,11 +3,13 @@ import platform
 
 import pytest
 
+from testplan import TestplanMock
 from testplan.common.utils.testing import (
     log_propagation_disabled,
     check_report,
 )
 from testplan.common.utils.logger import TESTPLAN_LOGGER
+from testplan.runners.pools import ThreadPool
 from testplan.testing.cpp import GTest
 from testplan.report import Status
 
@@ -64,3 +66,122 @@ def test_gtest(mockplan, binary_dir, expected_report, report_status):
     check_report(expected=expected_report, actual=mockplan.report)
 
     assert mockplan.report.status == report_status
+
+
+@pytest.mark.skipif(
+    platform.system() == "Windows", reason="GTest is skipped on Windows."
+)
+@pytest.mark.parametrize(
+    "binary_dir, expected_report, report_status",
+    (
+        (
+            os.path.join(fixture_root, "failing"),
+            gtest.failing.report.expected_report,
+            Status.FAILED,
+        ),
+        (
+            os.path.join(fixture_root, "passing"),
+            gtest.passing.report.expected_report,
+            Status.PASSED,
+        ),
+    ),
+)
+def test_gtest_shards(runpath, binary_dir, expected_report, report_status):
+    """Shards run in a pool are merged into the report of the whole test."""
+    binary_path = os.path.join(binary_dir, "runTests")
+
+    if not os.path.exists(binary_path):
+        msg = BINARY_NOT_FOUND_MESSAGE.format(
+            binary_dir=binary_dir, binary_path=binary_path
+        )
+        pytest.skip(msg)
+
+    plan = TestplanMock("plan", runpath=runpath, merge_scheduled_parts=True)
+    plan.add_resource(ThreadPool(name="MyPool", size=2))
+    uids = plan.schedule(
+        target="make_gtest",
+        module="gtest_tasks",
+        path=os.path.dirname(os.path.abspath(__file__)),
+        kwargs={"binary": binary_path},
+        resource="MyPool",
+        shards=3,
+    )
+    assert len(uids) == 3
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert plan.run().run is True
+
+    check_report(expected=expected_report, actual=plan.report)
+
+    assert plan.report.status == report_status
+
+
+@pytest.mark.skipif(
+    platform.system() == "Windows", reason="GTest is skipped on Windows."
+)
+@pytest.mark.parametrize(
+    "binary_dir, expected_report, report_status",
+    (
+        (
+            os.path.join(fixture_root, "failing"),
+            gtest.failing.report.expected_report,
+            Status.FAILED,
+        ),
+        (
+            os.path.join(fixture_root, "passing"),
+            gtest.passing.report.expected_report,
+            Status.PASSED,
+        ),
+    ),
+)
+def test_gtest_stream_results(
+    mockplan, binary_dir, expected_report, report_status
+):
+    """Streamed results are reconciled with the XML report."""
+    binary_path = os.path.join(binary_dir, "runTests")
+
+    if not os.path.exists(binary_path):
+        msg = BINARY_NOT_FOUND_MESSAGE.format(
+            binary_dir=binary_dir, binary_path=binary_path
+        )
+        pytest.skip(msg)
+
+    mockplan.add(
+        GTest(name="MyGTest", binary=binary_path, stream_results=True)
+    )
+
+    with log_propagation_disabled(TESTPLAN_LOGGER):
+        assert mockplan.run().run is True
+
+    check_report(expected=expected_report, actual=mockplan.report)
+
+    assert mockplan.report.status == report_status
+
+
+@pytest.mark.skipif(
+    platform.system() == "Windows", reason="GTest is skipped on Windows."
+)
+def test_gtest_stream_results_iter(mockplan):
+    """Testcases are yielded while the binary runs them."""
+    binary_path = os.path.join(fixture_root, "failing", "runTests")
+
+    if not os.path.exists(binary_path):
+        msg = BINARY_NOT_FOUND_MESSAGE.format(
+            binary_dir=os.path.dirname(binary_path), binary_path=binary_path
+        )
+        pytest.skip(msg)
+
+    test = GTest(name="MyGTest", binary=binary_path, stream_results=True)
+    mockplan.add(test)
+
+    yielded = [
+        (parent_uids[-1], report.uid)
+        for report, parent_uids in test.run_testcases_iter()
+    ]
+
+    # Each testcase is yielded when it starts and when it ends, then from
+    # the XML report after the process check.
+    check_idx = yielded.index(("ProcessChecks", "ExitCodeCheck"))
+    streamed, reconciled = yielded[:check_idx], yielded[check_idx + 1 :]
+    assert streamed[0::2] == streamed[1::2] == reconciled
+    assert ("SquareRootTest", "PositiveNos") in reconciled
@@ -0,0 +1,157 @@
+"""Unit tests for the FIX framer and the FIX client / server using it."""
+
+import socket
+
+import pytest
+
+from testplan.common.utils.sockets.fix.client import Client
+from testplan.common.utils.sockets.fix.framer import (
+    FixFramer,
+    FixFramingError,
+    frame,
+)
+from testplan.common.utils.sockets.fix.server import Server
+
+
+class FixMessage(dict):
+    """Minimal FIX message class, codecs are ignored."""
+
+    @classmethod
+    def from_buffer(cls, data, codec):
+        msg = cls()
+        for field in data.split(b"\x01")[:-1]:
+            tag, _, value = field.partition(b"=")
+            msg[int(tag)] = value.decode("ascii")
+        return msg
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
+
+    def tag_exact(self, tag, value):
+        return self.get(tag) == value
+
+    def to_wire(self, codec):
+        body = "".join(
+            "{}={}\x01".format(tag, value)
+            for tag, value in self.items()
+            if tag not in (8, 9, 10)
+        )
+        return frame(body.encode("ascii"), self.get(8, "FIX.4.2"))
+
+
+MESSAGES = [
+    frame(b"35=D\x0111=order-1\x01"),
+    frame(b"35=8\x0111=order-1\x0158=" + b"x" * 300 + b"\x01"),
+    frame(b"35=0\x01", version="FIX.4.4"),
+]
+
+
+def test_frame():
+    assert frame(b"35=0\x01") == b"8=FIX.4.2\x019=5\x0135=0\x0110=161\x01"
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 64, 4096))
+def test_framer_chunks(chunk_size):
+    """Messages are framed whichever way the stream is split."""
+    stream = b"".join(MESSAGES)
+    framer = FixFramer(buffer_size=16, read_size=8)
+    received = []
+    for idx in range(0, len(stream), chunk_size):
+        framer.feed(stream[idx : idx + chunk_size])
+        received.extend(framer)
+
+    assert received == MESSAGES
+    assert len(framer) == 0
+    assert framer.pop() is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        b"9=5\x0135=0\x0110=161\x01",
+        b"8=FIX.4.2\x019=five\x0135=0\x0110=161\x01",
+        b"8=FIX.4.2\x019=4\x0135=0\x0110=161\x01",
+        b"8=FIX.4.2\x019=5\x0135=0\x0110=999\x01",
+    ),
+)
+def test_framer_errors(data):
+    framer = FixFramer()
+    framer.feed(data)
+    with pytest.raises(FixFramingError):
+        framer.pop()
+
+
+def test_framer_checksum_not_validated():
+    data = b"8=FIX.4.2\x019=5\x0135=0\x0110=999\x01"
+    framer = FixFramer(validate_checksum=False)
+    framer.feed(data)
+    assert framer.pop() == data
+
+
+def test_client_server_coalesced_messages():
+    """Several messages sent at once are all received, in order."""
+    server = Server(msgclass=FixMessage, codec=None)
+    server.start()
+    client = Client(
+        msgclass=FixMessage,
+        codec=None,
+        host=server.ip,
+        port=server.port,
+        sender="CLIENT",
+        target="SERVER",
+    )
+    try:
+        client.connect()
+        client.sendlogon()
+        assert client.receive(timeout=5)[35] == "A"
+
+        client.socket.send(
+            b"".join(
+                client._populate_tags(
+                    FixMessage({35: "D", 11: "order-{}".format(idx)})
+                ).to_wire(None)
+                for idx in range(3)
+            )
+        )
+        for idx in range(3):
+            msg = server.receive(timeout=5)
+            assert msg[11] == "order-{}".format(idx)
+
+        for idx in range(3):
+            server.send(FixMessage({35: "8", 11: "order-{}".format(idx)}))
+        for idx in range(3):
+            assert client.receive(timeout=5)[11] == "order-{}".format(idx)
+    finally:
+        client.close()
+        server.stop()
+
+
+@pytest.mark.parametrize("validate_checksum", (False, True))
+def test_client_checksum(validate_checksum):
+    """Messages with a wrong checksum are received unless validated."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    client = Client(
+        msgclass=FixMessage,
+        codec=None,
+        host="localhost",
+        port=listener.getsockname()[1],
+        sender="CLIENT",
+        target="SERVER",
+        validate_checksum=validate_checksum,
+    )
+    try:
+        client.connect()
+        connection, _ = listener.accept()
+        connection.send(b"8=FIX.4.2\x019=5\x0135=0\x0110=999\x01")
+        if validate_checksum:
+            with pytest.raises(FixFramingError):
+                client.receive(timeout=5)
+        else:
+            assert client.receive(timeout=5)[10] == "999"
+        connection.close()
+    finally:
+        client.close()
+        listener.close()
@@ -1,3 +1,6 @@
+import random
+import itertools
+
 import pytest
 from testplan.common.utils import comparison as cmp
 
@@ -82,3 +85,42 @@ def test_comparator_composition(
 ):
     assert composed_callable(value) == expected
     assert str(composed_callable) == description
+
+
+def _total_error(grid, permutation):
+    return sum(grid[row][col] for row, col in enumerate(permutation))
+
+
+@pytest.mark.parametrize("size", range(7))
+def test_assignment_least_error(size):
+    """Both solvers find a permutation with the least total error."""
+    rng = random.Random(size)
+    for _ in range(50):
+        grid = [
+            [rng.choice((0, 5, 100, 10000, 100000)) for _ in range(size)]
+            for _ in range(size)
+        ]
+        least = min(
+            _total_error(grid, permutation)
+            for permutation in itertools.permutations(range(size))
+        )
+        for solver in (cmp._assignment, cmp._best_permutation):
+            permutation = solver(grid)
+            assert sorted(permutation) == list(range(size))
+            assert _total_error(grid, permutation) == least
+
+
+def test_unordered_compare_large():
+    """Unordered matching scales beyond the previous limit of 16 values."""
+    expected = [{"id": idx, "qty": idx * 10} for idx in range(100)]
+    values = [dict(msg) for msg in expected]
+    random.Random(0).shuffle(values)
+    values[0]["qty"] = -1
+
+    matches = cmp.unordered_compare(
+        "dictmatch", values, [cmp.Expected(msg) for msg in expected]
+    )
+    assert len(matches) == 100
+    assert [match["passed"] for match in matches] == [False] + [True] * 99
+    for msg_indx, match in enumerate(matches):
+        assert values[msg_indx]["id"] == match["comparison_index"]
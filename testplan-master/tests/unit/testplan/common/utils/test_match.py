@@ -1,11 +1,18 @@
 import os
 import re
+import time
 import itertools
 import tempfile
+import threading
 
 import pytest
 
-from testplan.common.utils.match import LogMatcher, match_regexps_in_file
+from testplan.common.utils.match import (
+    FileWatcher,
+    LogMatcher,
+    LogTailer,
+    match_regexps_in_file,
+)
 from testplan.common.utils import timing
 
 
@@ -76,6 +83,105 @@ class TestMatchRegexpsInFile(object):
         assert isinstance(values["second"], bytes)
 
 
+class TestLogTailer(object):
+    """
+    Test the LogTailer class.
+    """
+
+    def test_incremental(self, tmpdir):
+        """Appended lines are matched, matched regexps are remembered."""
+        logpath = str(tmpdir.join("app.log"))
+        log_extracts = [
+            re.compile(r"Listening on (?P<host>\w+):(?P<port>\d+)$"),
+            re.compile(r"Ready"),
+        ]
+        tailer = LogTailer(logpath, log_extracts)
+        assert tailer.match(return_unmatched=True) == (
+            False,
+            {},
+            log_extracts,
+        )
+
+        with open(logpath, "w") as log:
+            log.write("Starting\r\nListening on localhost:80")
+        # The incomplete last line is matched, but read again when complete
+        assert tailer.match() == (False, {"host": "localhost", "port": "80"})
+
+        with open(logpath, "a") as log:
+            log.write("80\r\nReady\n")
+        assert tailer.match() == (True, {"host": "localhost", "port": "8080"})
+        assert tailer.match() == match_regexps_in_file(logpath, log_extracts)
+        position = tailer.position
+
+        with open(logpath, "a") as log:
+            log.write("Listening on otherhost:1\n")
+        assert tailer.match()[1] == {"host": "otherhost", "port": "1"}
+        assert tailer.position > position
+
+        # A recreated file is read from the start
+        with open(logpath, "w") as log:
+            log.write("Ready\n")
+        assert tailer.match(return_unmatched=True) == (
+            False,
+            {},
+            log_extracts[:1],
+        )
+
+    def test_bytes(self, basic_logfile):
+        log_extracts = [re.compile(br"(?P<first>fir)st$"), re.compile("fifth")]
+        status, values = LogTailer(basic_logfile, log_extracts).match()
+        assert status is True
+        assert values == {"first": b"fir"}
+
+
+def test_file_watcher(tmpdir):
+    """Sleeps are interrupted by changes of the watched files."""
+    logpath = str(tmpdir.join("app.log"))
+    watcher = FileWatcher([logpath])
+    if not watcher.inotify:
+        pytest.skip("inotify is not available")
+
+    def write():
+        time.sleep(0.2)
+        with open(logpath, "w") as log:
+            log.write("Ready\n")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        start = time.time()
+        watcher.sleep(10)
+        assert time.time() - start < 5
+        assert os.path.exists(logpath)
+    finally:
+        thread.join()
+        watcher.close()
+
+
+def test_file_watcher_changes(tmpdir):
+    """Paths changed since the previous call are reported."""
+    paths = [str(tmpdir.join(name)) for name in ("a.py", "b.py")]
+    for path in paths:
+        open(path, "w").close()
+    watcher = FileWatcher(
+        paths, events=FileWatcher.EVENTS | FileWatcher.IN_ATTRIB
+    )
+    if not watcher.inotify:
+        assert watcher.changes() is None
+        pytest.skip("inotify is not available")
+
+    try:
+        assert watcher.changes() == set()
+        with open(paths[0], "a") as source:
+            source.write("value = 1\n")
+        os.utime(paths[1], None)
+        assert watcher.changes() == set(paths)
+        assert watcher.changes() == set()
+    finally:
+        watcher.close()
+    assert watcher.changes() is None
+
+
 class TestLogMatcher(object):
     """
     Test the LogMatcher class.
@@ -146,3 +252,86 @@ class TestLogMatcher(object):
 
         assert match is not None
         assert match.group(0) == "Match me!"
+
+    @pytest.mark.parametrize("chunk_size", (4, 1024 * 1024))
+    def test_match_any(self, basic_logfile, chunk_size):
+        """The first line matched by any of the regexps is returned."""
+        matcher = LogMatcher(log_path=basic_logfile, chunk_size=chunk_size)
+        regexps = [re.compile(r"fourth"), re.compile(b"third")]
+        match = matcher.match_any(regexps)
+        assert match.re is regexps[1]
+        assert match.group(0) == b"third"
+
+        match = matcher.match_any(regexps)
+        assert match.re is regexps[0]
+        with pytest.raises(timing.TimeoutException):
+            matcher.match_any(regexps, timeout=0.1)
+
+    @pytest.mark.parametrize("chunk_size", (4, 1024 * 1024))
+    def test_match_all(self, basic_logfile, chunk_size):
+        """Each regexp is matched once, the position follows the last one."""
+        matcher = LogMatcher(log_path=basic_logfile, chunk_size=chunk_size)
+        matches = matcher.match_all([r"fourth", r"sec(ond)", r".*"])
+        assert [match.group(0) for match in matches] == [
+            "fourth",
+            "second",
+            "first",
+        ]
+        assert matcher.match(r".*").group(0) == "fifth"
+
+        matcher.seek()
+        with pytest.raises(timing.TimeoutException):
+            matcher.match_all([r"first", r"bob"], timeout=0.1)
+
+    @pytest.mark.parametrize("chunk_size", (4, 1024 * 1024))
+    def test_find_all(self, basic_logfile, chunk_size):
+        """All matches between marks are found, the position is kept."""
+        matcher = LogMatcher(log_path=basic_logfile, chunk_size=chunk_size)
+        matcher.match(r"second")
+        matcher.mark("second")
+        matcher.match(r"fourth")
+        matcher.mark("fourth")
+        matcher.seek()
+
+        found = matcher.find_all([r".*i", r"f"])
+        assert [match.group(0) for match in found] == [
+            "fi",
+            "f",
+            "thi",
+            "f",
+            "fi",
+            "f",
+        ]
+        found = matcher.find_all(b".+", start_mark="second", end_mark="fourth")
+        assert [match.group(0) for match in found] == [b"third", b"fourth"]
+        assert matcher.position == 0
+
+    @pytest.mark.parametrize("chunk_size", (4, 1024 * 1024))
+    def test_find_last(self, basic_logfile, chunk_size):
+        """The file is searched backwards, down to the current position."""
+        matcher = LogMatcher(log_path=basic_logfile, chunk_size=chunk_size)
+        assert matcher.find_last([r"s", r"f"]).group(0) == "f"
+        assert matcher.find_last(r"s").group(0) == "s"
+        assert matcher.find_last(b"first").group(0) == b"first"
+
+        matcher.match(r"third")
+        assert matcher.find_last(r"first") is None
+        assert matcher.position == len("first\nsecond\nthird\n")
+
+    def test_incomplete_line(self, tmpdir):
+        """A line being written is matched again once it is complete."""
+        log_path = str(tmpdir.join("incomplete.log"))
+        with open(log_path, "wb") as log:
+            log.write(b"first\r\nsecond ")
+
+        matcher = LogMatcher(log_path=log_path)
+        assert matcher.match(r"first$").group(0) == "first"
+        with pytest.raises(timing.TimeoutException):
+            matcher.match_all([r"second", r".*done"], timeout=0.1)
+        assert matcher.position == len(b"first\r\n")
+
+        with open(log_path, "ab") as log:
+            log.write(b"done\n")
+        matches = matcher.match_all([r"second", r".*done"], timeout=0.1)
+        assert matches[1].group(0) == "second done"
+        assert matcher.position == len(b"first\r\nsecond done\n")
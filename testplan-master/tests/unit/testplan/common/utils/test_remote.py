@@ -0,0 +1,77 @@
+"""Unit tests for the remote execution utilities."""
+
+import os
+import platform
+
+import pytest
+
+from testplan.common.utils.remote import RemoteShell
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="Uses a POSIX shell."
+)
+
+
+def local_ssh(ssh_cfg, command):
+    """Avoid network connection."""
+    return ["/bin/sh", "-c", command]
+
+
+@pytest.fixture
+def shell():
+    shell = RemoteShell(local_ssh, {"host": "localhost"})
+    shell.open()
+    yield shell
+    shell.close()
+    assert not shell.active
+
+
+def test_execute(shell, tmpdir):
+    path = str(tmpdir.join("a", "b"))
+    assert shell.execute("mkdir -p {}".format(path)) == 0
+    assert os.path.isdir(path)
+    assert shell.execute("test -e {}".format(path), check=False) == 0
+
+    with pytest.raises(RuntimeError):
+        shell.execute("test -e {}/c".format(path))
+    # The shell is still usable after a failure.
+    assert shell.active
+    assert shell.execute("true") == 0
+
+
+def test_execute_many(shell, tmpdir):
+    results = shell.execute_many(
+        [
+            "echo hello",
+            "printf no-newline",
+            "cd {}; exit 3".format(tmpdir),
+            "pwd; echo error >&2",
+            "cat",
+        ]
+    )
+    assert results == [
+        (0, b"hello\n"),
+        (0, b"no-newline"),
+        (3, b""),
+        (0, "{}\nerror\n".format(os.getcwd()).encode()),
+        (0, b""),
+    ]
+
+
+def test_batch(shell, tmpdir):
+    paths = [str(tmpdir.join(name)) for name in ("a", "b")]
+    assert shell.batch(
+        ["mkdir {}".format(path) for path in paths]
+        + ["test -e {}".format(tmpdir.join("c"))],
+        check=False,
+    ) == [0, 0, 1]
+    assert all(os.path.isdir(path) for path in paths)
+
+
+def test_shell_exited():
+    shell = RemoteShell(local_ssh, {"host": "localhost"}, shell="exit 1")
+    shell.open()
+    with pytest.raises(RuntimeError):
+        shell.execute("true")
+    assert not shell.active
+    shell.close()
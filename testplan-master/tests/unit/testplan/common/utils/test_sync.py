@@ -0,0 +1,149 @@
+"""Unit tests for the incremental remote transfer."""
+
+import os
+import shutil
+import platform
+
+import pytest
+
+from testplan.common.utils.sync import RemoteSync, SyncCache, excluded
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="Uses a POSIX shell and tar."
+)
+
+
+class LocalHost(object):
+    """ssh and copy commands that run locally, recording the copies."""
+
+    def __init__(self):
+        self.copies = []
+
+    def ssh_cmd(self, ssh_cfg, command):
+        return ["/bin/sh", "-c", command]
+
+    def copy_cmd(self, source, target, **kwargs):
+        self.copies.append((source, target))
+        return ["cp", source.split(":")[-1], target.split(":")[-1]]
+
+    def sync(self, remote_root, workspace, cache=None, **options):
+        sync = RemoteSync(
+            ssh_cmd=self.ssh_cmd,
+            ssh_cfg={"host": "localhost"},
+            copy_cmd=self.copy_cmd,
+            remote_copy_path=lambda path: "localhost:{}".format(path),
+            manifest=os.path.join(remote_root, "sync_manifest"),
+            cache=cache,
+        )
+        sync.add(workspace, os.path.join(remote_root, "workspace"), **options)
+        return sync
+
+
+def write(path, content):
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as fobj:
+        fobj.write(content)
+
+
+def read(path):
+    with open(path) as fobj:
+        return fobj.read()
+
+
+@pytest.mark.parametrize(
+    "relpath, exclude, expected",
+    (
+        ("a/b/c.pyc", ["*.pyc"], True),
+        ("a/.git/config", [".git"], True),
+        ("a/b/c.py", ["*.pyc", ".git"], False),
+        ("a/b/c.py", ["a/b"], True),
+        ("x/a/b/c.py", ["/a/b/"], False),
+        ("a/b/c.py", None, False),
+    ),
+)
+def test_excluded(relpath, exclude, expected):
+    assert excluded(relpath, exclude) is expected
+
+
+def test_remote_sync(tmpdir):
+    """Only changed files are transferred, deleted files are removed."""
+    workspace = str(tmpdir.mkdir("local"))
+    remote_root = str(tmpdir.join("remote"))
+    remote_ws = os.path.join(remote_root, "workspace")
+    write(os.path.join(workspace, "a.py"), "a")
+    write(os.path.join(workspace, "pkg", "b.py"), "b")
+    write(os.path.join(workspace, "pkg", "b.pyc"), "compiled")
+    os.symlink("a.py", os.path.join(workspace, "link.py"))
+
+    host = LocalHost()
+    cache = SyncCache()
+    try:
+        sync = host.sync(remote_root, workspace, cache, exclude=["*.pyc"])
+        assert sync.sync() == (3, 0)
+        assert read(os.path.join(remote_ws, "pkg", "b.py")) == "b"
+        assert not os.path.exists(os.path.join(remote_ws, "pkg", "b.pyc"))
+        assert os.readlink(os.path.join(remote_ws, "link.py")) == "a.py"
+        # Only the manifest was fetched and the bundle copied.
+        assert len(host.copies) == 2
+
+        del host.copies[:]
+        sync = host.sync(remote_root, workspace, cache, exclude=["*.pyc"])
+        assert sync.sync() == (0, 0)
+        assert len(host.copies) == 1
+
+        write(os.path.join(workspace, "a.py"), "changed")
+        os.remove(os.path.join(workspace, "pkg", "b.py"))
+        sync = host.sync(remote_root, workspace, cache, exclude=["*.pyc"])
+        assert sync.sync() == (1, 1)
+        assert read(os.path.join(remote_ws, "a.py")) == "changed"
+        assert not os.path.exists(os.path.join(remote_ws, "pkg", "b.py"))
+        assert sorted(os.listdir(remote_root)) == [
+            "sync_manifest",
+            "workspace",
+        ]
+    finally:
+        cache.close()
+
+
+def test_remote_sync_missing_manifest(tmpdir):
+    """Everything is transferred again if the remote manifest is removed."""
+    workspace = str(tmpdir.mkdir("local"))
+    remote_root = str(tmpdir.join("remote"))
+    write(os.path.join(workspace, "a.py"), "a")
+
+    host = LocalHost()
+    assert host.sync(remote_root, workspace).sync() == (1, 0)
+    shutil.rmtree(os.path.join(remote_root, "workspace"))
+    os.remove(os.path.join(remote_root, "sync_manifest"))
+    assert host.sync(remote_root, workspace).sync() == (1, 0)
+    assert read(os.path.join(remote_root, "workspace", "a.py")) == "a"
+
+
+def test_shared_bundle(tmpdir):
+    """Hosts in the same state receive the same archive."""
+    workspace = str(tmpdir.mkdir("local"))
+    remote_root = str(tmpdir.join("remote"))
+    write(os.path.join(workspace, "a.py"), "a")
+
+    host = LocalHost()
+    cache = SyncCache()
+    try:
+        for _ in range(2):
+            # A new host has neither the files nor the manifest.
+            shutil.rmtree(remote_root, ignore_errors=True)
+            assert host.sync(remote_root, workspace, cache).sync() == (1, 0)
+        bundles = [
+            source for source, _ in host.copies if source.endswith(".tar.gz")
+        ]
+        assert len(bundles) == 2 and bundles[0] == bundles[1]
+        assert os.listdir(cache.directory) == [os.path.basename(bundles[0])]
+    finally:
+        cache.close()
+
+
+def test_relative_remote_path(tmpdir):
+    host = LocalHost()
+    sync = host.sync(str(tmpdir), str(tmpdir))
+    with pytest.raises(ValueError):
+        sync.add(str(tmpdir), "relative/path")
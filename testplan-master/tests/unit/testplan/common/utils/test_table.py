@@ -30,3 +30,14 @@ class TestTableEntry(object):
     )
     def test_validation_success(self, value):
         TableEntry(value)
+
+    @pytest.mark.parametrize(
+        "value",
+        (
+            [["foo", "bar"], [1, 2], [3, 4]],
+            [{"foo": 1, "bar": 2}, {"foo": 3, "bar": 4}],
+        ),
+    )
+    def test_as_columns(self, value):
+        columns = TableEntry(value).as_columns()
+        assert sorted(columns.items()) == [("bar", [2, 4]), ("foo", [1, 3])]
@@ -0,0 +1,106 @@
+"""Unit tests for the testcase runtime history."""
+
+import json
+import datetime
+
+from testplan.common.utils import timing
+from testplan.exporters.testing import JSONExporter
+from testplan.report import (
+    TestReport,
+    TestGroupReport,
+    TestCaseReport,
+    ReportCategories,
+)
+from testplan.report.testing import history
+
+
+def _testcase_report(name, elapsed):
+    report = TestCaseReport(name=name)
+    start = timing.utcnow()
+    report.timer["run"] = timing.Interval(
+        start=start, end=start + datetime.timedelta(seconds=elapsed)
+    )
+    return report
+
+
+def _plan_report():
+    return TestReport(
+        name="Plan",
+        entries=[
+            TestGroupReport(
+                name="MTest",
+                uid="MTest",
+                category=ReportCategories.MULTITEST,
+                entries=[
+                    TestGroupReport(
+                        name="Suite",
+                        uid="Suite",
+                        category=ReportCategories.TESTSUITE,
+                        entries=[
+                            _testcase_report("case", 2),
+                            TestGroupReport(
+                                name="param",
+                                uid="param",
+                                category=ReportCategories.PARAMETRIZATION,
+                                entries=[
+                                    _testcase_report("param <val=1>", 1),
+                                    _testcase_report("param <val=2>", 3),
+                                ],
+                            ),
+                        ],
+                    )
+                ],
+            )
+        ],
+    )
+
+
+EXPECTED_DURATIONS = [
+    ("MTest/Suite/case", 2),
+    ("MTest/Suite/param <val=1>", 1),
+    ("MTest/Suite/param <val=2>", 3),
+]
+
+
+def test_record_and_reload(tmpdir):
+    path = str(tmpdir.join("history.txt"))
+    runtime_history = history.RuntimeHistory(path)
+    assert len(runtime_history) == 0
+    assert runtime_history.expected("MTest/Suite/case", 5) == 5
+
+    runtime_history.record([("MTest/Suite/case", 2), ("unfinished", None)])
+    runtime_history.record([("MTest/Suite/case", 4)])
+    assert runtime_history.expected("MTest/Suite/case") == 3
+    assert "unfinished" not in runtime_history
+
+    with open(path) as history_file:
+        assert len(history_file.readlines()) == 2
+
+    reloaded = history.RuntimeHistory(path)
+    assert reloaded.expected("MTest/Suite/case") == 3
+
+    reloaded.compact()
+    with open(path) as history_file:
+        assert [json.loads(line) for line in history_file] == [
+            ["MTest/Suite/case", 3]
+        ]
+    assert history.RuntimeHistory(path).expected("MTest/Suite/case") == 3
+
+
+def test_report_durations():
+    assert sorted(history.report_durations(_plan_report())) == (
+        EXPECTED_DURATIONS
+    )
+
+
+def test_json_report_durations(tmpdir):
+    for split in (False, True):
+        json_path = str(tmpdir.join("report_{}.json".format(split)))
+        JSONExporter(json_path=json_path, split_json_report=split).export(
+            _plan_report()
+        )
+        runtime_history = history.RuntimeHistory(
+            str(tmpdir.join("history_{}.txt".format(split)))
+        )
+        runtime_history.record_json_report(json_path)
+        assert sorted(runtime_history.items()) == EXPECTED_DURATIONS
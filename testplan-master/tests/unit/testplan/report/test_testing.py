@@ -1,3 +1,4 @@
+import copy
 import functools
 import json
 import six
@@ -13,6 +14,7 @@ from testplan.common.utils.testing import disable_log_propagation
 
 from testplan.report.testing.base import (
     Status,
+    RuntimeStatus,
     BaseReportGroup,
     TestCaseReport,
     TestGroupReport,
@@ -211,6 +213,59 @@ class TestBaseReportGroup(object):
         parent.merge(parent2)
         assert parent.hash != orig_parent_hash
 
+    def test_cached_status_invalidation(self):
+        """
+        Cached statuses and counters of all ancestors are updated when a
+        descendant changes.
+        """
+        root = TestGroupReport(name="root")
+        group = TestGroupReport(name="group")
+        testcase = TestCaseReport(name="testcase")
+        root.append(group)
+        group.append(testcase)
+
+        testcase.append({"name": "entry", "passed": True})
+        assert root.status == Status.PASSED
+        assert root.counter["passed"] == 1
+
+        testcase.append({"name": "entry", "passed": False})
+        assert root.status == Status.FAILED
+        assert root.counter["failed"] == 1
+
+        testcase.status_override = Status.ERROR
+        assert root.status == Status.ERROR
+        assert root.counter["error"] == 1
+
+        other = TestCaseReport(name="other", uid=testcase.uid)
+        other.append({"name": "entry", "passed": True})
+        group.set_by_uid(testcase.uid, other)
+        assert root.status == Status.PASSED
+        assert root.counter == {"passed": 1, "failed": 0, "total": 1}
+
+        other.runtime_status = RuntimeStatus.RUNNING
+        assert root.runtime_status == RuntimeStatus.RUNNING
+        assert root.status == Status.UNKNOWN
+
+        # Returned counters are copies of the cached one
+        root.counter.update({"total": 10})
+        assert root.counter["total"] == 1
+
+    def test_cached_status_copy(self):
+        """Copies of a subtree are linked to their own parents."""
+        root = TestGroupReport(name="root")
+        group = TestGroupReport(name="group")
+        testcase = TestCaseReport(name="testcase")
+        root.append(group)
+        group.append(testcase)
+        testcase.append({"name": "entry", "passed": True})
+        assert root.status == Status.PASSED
+
+        group_copy = copy.deepcopy(group)
+        assert group_copy.status == Status.PASSED
+        group_copy.entries[0].append({"name": "entry", "passed": False})
+        assert group_copy.status == Status.FAILED
+        assert root.status == Status.PASSED
+
 
 class TestTestCaseReport(object):
     @pytest.mark.parametrize(
@@ -0,0 +1,137 @@
+"""Test the versioning of the interactive report in the HTTP API."""
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+from future import standard_library
+
+standard_library.install_aliases()
+
+import time
+import threading
+
+from .test_api import example_report, api_env  # pylint: disable=unused-import
+
+API = "/api/v1/interactive"
+TESTCASE_URL = API + "/report/tests/MTest1/suites/MT1Suite1/testcases/{}"
+
+
+def test_etag(api_env):
+    """GETs return 304 until the entry or one of its descendants changes."""
+    client, ihandler = api_env
+    urls = (
+        API + "/report",
+        API + "/report/tests",
+        API + "/report/tests/MTest1",
+        API + "/report/tests/MTest1/suites/MT1Suite1",
+        TESTCASE_URL.format("MT1S1TC1"),
+        TESTCASE_URL.format("MT1S1TC2"),
+        TESTCASE_URL.format("MT1S1TC2") + "/parametrizations",
+    )
+    etags = {}
+    for url in urls:
+        rsp = client.get(url)
+        assert rsp.status_code == 200
+        etags[url] = rsp.headers["ETag"]
+        rsp = client.get(url, headers={"If-None-Match": etags[url]})
+        assert rsp.status_code == 304
+        assert not rsp.data
+
+    with ihandler.report_mutex:
+        ihandler.record_change(["MTest1", "MT1Suite1", "MT1S1TC1"])
+
+    for url in urls:
+        rsp = client.get(url, headers={"If-None-Match": etags[url]})
+        if "MT1S1TC2" in url:
+            assert rsp.status_code == 304
+        else:
+            assert rsp.status_code == 200
+            assert rsp.headers["ETag"] != etags[url]
+
+
+def test_put_changes_etag(api_env):
+    client, ihandler = api_env
+    url = TESTCASE_URL.format("MT1S1TC1")
+    etag = client.get(url).headers["ETag"]
+
+    testcase_json = ihandler.report["MTest1"]["MT1Suite1"][
+        "MT1S1TC1"
+    ].serialize()
+    testcase_json["runtime_status"] = "running"
+    assert client.put(url, json=testcase_json).status_code == 200
+
+    rsp = client.get(url, headers={"If-None-Match": etag})
+    assert rsp.status_code == 200
+    assert rsp.get_json()["runtime_status"] == "running"
+
+
+def test_changes(api_env):
+    """Only the changed entries and their parents are returned."""
+    client, ihandler = api_env
+    rsp = client.get(API + "/report/changes").get_json()
+    assert rsp["version"] == 0
+    assert rsp["changes"] == []
+    assert rsp["epoch"] == ihandler.report_epoch
+
+    rsp = client.get(API + "/report/changes?since=0").get_json()
+    assert rsp["changes"] == []
+
+    with ihandler.report_mutex:
+        ihandler.record_change(
+            ["MTest1", "MT1Suite1", "MT1S1TC2"], recursive=True
+        )
+        ihandler.record_change(["MTest1", "MT1Suite1", "MT1S1TC1"])
+
+    rsp = client.get(API + "/report/changes?since=0").get_json()
+    assert rsp["version"] == 2
+    assert [change["uids"] for change in rsp["changes"]] == [
+        [],
+        ["MTest1"],
+        ["MTest1", "MT1Suite1"],
+        ["MTest1", "MT1Suite1", "MT1S1TC1"],
+        ["MTest1", "MT1Suite1", "MT1S1TC2"],
+        ["MTest1", "MT1Suite1", "MT1S1TC2", "MT1S1TC2_0"],
+        ["MTest1", "MT1Suite1", "MT1S1TC2", "MT1S1TC2_1"],
+        ["MTest1", "MT1Suite1", "MT1S1TC2", "MT1S1TC2_2"],
+    ]
+    entries = {
+        tuple(change["uids"]): change["entry"] for change in rsp["changes"]
+    }
+    assert entries[()]["uid"] == ihandler.report.uid
+    assert "entries" in entries[("MTest1", "MT1Suite1", "MT1S1TC1")]
+
+    rsp = client.get(API + "/report/changes?since=1").get_json()
+    assert [change["uids"] for change in rsp["changes"]] == [
+        [],
+        ["MTest1"],
+        ["MTest1", "MT1Suite1"],
+        ["MTest1", "MT1Suite1", "MT1S1TC1"],
+    ]
+
+    rsp = client.get(API + "/report/changes?since=2").get_json()
+    assert rsp["changes"] == []
+    assert client.get(API + "/report/changes?since=x").status_code == 400
+
+
+def test_changes_long_poll(api_env):
+    """Waits for a change when there is none."""
+    client, ihandler = api_env
+
+    def change():
+        time.sleep(0.2)
+        with ihandler.report_mutex:
+            ihandler.record_change(["MTest1"])
+
+    start = time.time()
+    rsp = client.get(API + "/report/changes?since=0&timeout=0.1").get_json()
+    assert rsp["changes"] == []
+    assert time.time() - start >= 0.1
+
+    thread = threading.Thread(target=change)
+    thread.start()
+    try:
+        rsp = client.get(API + "/report/changes?since=0&timeout=10").get_json()
+    finally:
+        thread.join()
+    assert rsp["version"] == 1
+    assert [change["uids"] for change in rsp["changes"]] == [[], ["MTest1"]]
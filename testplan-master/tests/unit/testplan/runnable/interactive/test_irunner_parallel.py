@@ -0,0 +1,141 @@
+"""Test running tests concurrently with the interactive test runner."""
+import time
+import threading
+from concurrent import futures
+
+import six
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+import pytest
+
+from testplan import defaults
+from testplan import runners
+from testplan import runnable
+from testplan.common import entity
+from testplan.testing import filtering
+from testplan.testing import multitest
+from testplan.testing import ordering
+from testplan.runnable.interactive import base
+from testplan.testing.multitest import driver
+
+
+class Concurrency(object):
+    """Records the maximum number of concurrent calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+        self.maximum = 0
+
+    def __call__(self, duration=0.2):
+        with self._lock:
+            self._active += 1
+            self.maximum = max(self.maximum, self._active)
+        time.sleep(duration)
+        with self._lock:
+            self._active -= 1
+
+
+RUNS = Concurrency()
+STARTS = Concurrency()
+
+
+class SlowDriver(driver.Driver):
+    """Driver that takes some time to start."""
+
+    def starting(self):
+        super(SlowDriver, self).starting()
+        STARTS()
+
+
+@multitest.testsuite
+class Suite(object):
+    """Test suite."""
+
+    @multitest.testcase
+    def case(self, env, result):
+        """Testcase."""
+        del env  # unused
+        RUNS()
+        result.true(True)
+
+
+@pytest.fixture
+def irunner(request):
+    """Set up an irunner instance running tests concurrently."""
+    RUNS.maximum = STARTS.maximum = 0
+    target = runnable.TestRunner(
+        name="TestRunner", interactive_parallel=request.param
+    )
+
+    local_runner = runners.LocalRunner()
+    for uid in ("test_1", "test_2", "test_3"):
+        test = multitest.MultiTest(
+            name=uid,
+            suites=[Suite()],
+            test_filter=filtering.Filter(),
+            test_sorter=ordering.NoopSorter(),
+            stdout_style=defaults.STDOUT_STYLE,
+            environment=[SlowDriver(name="slow_driver")],
+        )
+        local_runner.add(test, test.uid())
+    target.resources.add(local_runner)
+
+    with mock.patch("cheroot.wsgi.Server"):
+        irunner = base.TestRunnerIHandler(target)
+        irunner.setup()
+        yield irunner
+        irunner.teardown()
+
+
+@pytest.mark.parametrize("irunner", (1, 3), indirect=True)
+def test_run_all_tests(irunner):
+    irunner.run_all_tests()
+
+    assert irunner.report.passed
+    parallel = irunner.cfg.interactive_parallel
+    assert RUNS.maximum == parallel
+    assert STARTS.maximum == parallel
+    for test_uid in irunner.all_tests():
+        assert (
+            irunner.report[test_uid].env_status
+            == entity.ResourceStatus.STARTED
+        )
+
+
+@pytest.mark.parametrize("irunner", (3,), indirect=True)
+def test_start_stop_tests(irunner):
+    irunner.start_tests()
+    assert STARTS.maximum == 3
+    for test_uid in irunner.all_tests():
+        assert irunner.test(test_uid).resources.all_status(
+            entity.ResourceStatus.STARTED
+        )
+
+    irunner.stop_tests()
+    for test_uid in irunner.all_tests():
+        assert (
+            irunner.report[test_uid].env_status
+            == entity.ResourceStatus.STOPPED
+        )
+
+
+@pytest.mark.parametrize("irunner", (3,), indirect=True)
+def test_same_test_not_concurrent(irunner):
+    """Operations on the same test are serialized."""
+    with futures.ThreadPoolExecutor(max_workers=3) as pool:
+        results = [
+            pool.submit(irunner.run_test, "test_1"),
+            pool.submit(irunner.run_test, "test_1"),
+            pool.submit(irunner.run_test_suite, "test_1", "Suite"),
+        ]
+    for result in results:
+        result.result()
+
+    assert RUNS.maximum == 1
+    assert STARTS.maximum == 1
+    assert irunner.report["test_1"].passed
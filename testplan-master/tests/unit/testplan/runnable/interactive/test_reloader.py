@@ -13,7 +13,6 @@ if six.PY2:
 else:
     from unittest import mock
 
-import modulefinder
 import os
 import time
 import sys
@@ -21,7 +20,6 @@ import sys
 import pytest
 
 from testplan.runnable.interactive import reloader
-from testplan.common.utils import logger
 from testplan.testing import multitest
 
 
@@ -48,20 +46,26 @@ class Suite(object):
         result.fail("oops")
 
 
-# Mapping of module name to filepath and a list of owned objects for the mocked
-# modules we will be "reloading".
-MOCK_MOD_DIR = os.path.abspath(os.path.join(os.sep, "path", "to"))
-MOCK_MODULES = {
-    "__main__": os.path.join(MOCK_MOD_DIR, "main.py"),
-    "mod_a": os.path.join(MOCK_MOD_DIR, "mod_a.py"),
-    "mod_b": os.path.join(MOCK_MOD_DIR, "mod_b.py"),
-    "mod_c": os.path.join(MOCK_MOD_DIR, "mod_c.py"),
-    "mod_d": os.path.join(MOCK_MOD_DIR, "mod_d.py"),
+# Source of the modules we will be "reloading", by module name. The
+# dependencies of each module are found by scanning these files.
+MODULE_SOURCES = {
+    "__main__": "import mod_a\nimport mod_b\n",
+    "mod_a": (
+        "import mod_b\n"
+        "import mod_c\n"
+        "from mod_d import value\n\n\n"
+        "class Suite(object):\n"
+        "    pass\n"
+    ),
+    "mod_b": "import mod_d\n",
+    "mod_c": "",
+    "mod_d": "value = 1\n",
 }
 
 # Mapping of module name to a list of attributes to set on that module. For
 # simplicity we just assign a single test suite to mod_a.
 MODULE_ATTRS = {"mod_a": [Suite]}
+Suite.__module__ = "mod_a"
 
 
 class MockModule(object):
@@ -77,130 +81,68 @@ class MockModule(object):
         return "MockModule[{}]".format(self.__name__)
 
 
-# Mock for sys.modules, which are searched to find the modules that need
-# reloading. PyTest will inspect sys.modules to do its magic so we extend
-# a copy of the real sys.modules rather than just creating a totally bogus
-# new one.
-MOCK_SYSMODULES = sys.modules.copy()
-MOCK_SYSMODULES.update(
-    {
-        name: MockModule(name, filepath, MODULE_ATTRS.get(name, []))
-        for name, filepath in MOCK_MODULES.items()
-    }
-)
-
-# Mapping of module name to a modulefinder.Module object, which is used by
-# the modulefinder module to store metadata about a module - e.g. its name,
-# filepath and the names of its attributes.
-MOCK_MODULEFINDER_MODS = {
-    name: modulefinder.Module(name, file=filepath)
-    for name, filepath in MOCK_MODULES.items()
-}
+def _write_modules(mod_dir, sources):
+    """Write module sources, return their filepaths by module name."""
+    filepaths = {}
+    for name, source in sources.items():
+        filename = "main.py" if name == "__main__" else "{}.py".format(name)
+        filepaths[name] = os.path.join(mod_dir, filename)
+        with open(filepaths[name], "w") as module_file:
+            module_file.write(source)
+    return filepaths
 
 
-def _set_module_globals():
+def _modify(filepath):
     """
-    Set the globalnames attribute on the mocked modulefinder modules, and
-    set the __module__ attribute on each attribute to match its owning module.
-
-    WARNING: this function mutates MOCK_MODULEFINDER_MODS, it should only be
-    called once.
-    """
-    for mod_name, mod in MOCK_MODULEFINDER_MODS.items():
-        for attr in MODULE_ATTRS.get(mod_name, []):
-            mod.globalnames[attr.__name__] = 1
-            attr.__module__ = mod_name
-
-
-_set_module_globals()
-del _set_module_globals
-
-
-class MockModuleFinder(object):
-    """
-    Mock ModuleFinder object. Allows us to control the structure of discovered
-    module dependencies.
+    Set the modification time of a file to the current time, after the
+    previous reload and before the next one.
     """
+    time.sleep(0.01)
+    now = time.time()
+    os.utime(filepath, (now, now))
+    time.sleep(0.01)
+
+
+class MockReloadEnv(object):
+    """Files, modules and mocks of the reloader unit tests."""
+
+    def __init__(self, mod_dir, mock_reload):
+        self.mod_dir = mod_dir
+        self.mock_reload = mock_reload
+        self.cache_path = os.path.join(mod_dir, "cache", "reloader.json")
+        self.filepaths = _write_modules(mod_dir, MODULE_SOURCES)
+
+        # Mock for sys.modules, which are searched to find the modules that
+        # need reloading. PyTest will inspect sys.modules to do its magic so
+        # we extend a copy of the real sys.modules rather than just creating
+        # a totally bogus new one.
+        self.sys_modules = sys.modules.copy()
+        self.sys_modules.update(
+            {
+                name: MockModule(name, filepath, MODULE_ATTRS.get(name, []))
+                for name, filepath in self.filepaths.items()
+            }
+        )
 
-    def __init__(self, path):
-        del path  # Unused
-        self.modules = {}
-        self._curr_module = None
-
-    def run_script(self, script_filepath):
-        """
-        Don't actually run any script - just call the expected hooks to
-        simulate the dependency structure we want.
-        """
-        del script_filepath  # Unused
-
-        self.modules = MOCK_MODULEFINDER_MODS
-
-        self.import_hook("mod_a", self.modules["__main__"])
-        self.import_module()
-        self.import_hook("mod_b", self.modules["__main__"])
-        self.import_module()
-        self.import_hook("mod_b", self.modules["mod_a"])
-        self.import_module()
-        self.import_hook("mod_c", self.modules["mod_a"])
-        self.import_module()
-        self.import_hook("mod_d", self.modules["mod_a"])
-        self.import_module()
-        self.import_hook("mod_d", self.modules["mod_b"])
-        self.import_module()
-
-    def import_hook(self, name, caller=None):
-        del caller  # unused
-        self._curr_module = self.modules[name]
-
-    def import_module(self, *args):
-        del args  # unused
-        curr_mod = self._curr_module
-        self._curr_module = None
-        return curr_mod
+    def reloader(self):
+        with mock.patch("sys.modules", new=self.sys_modules):
+            return reloader.ModuleReloader(cache_path=self.cache_path)
 
 
 @pytest.fixture
-def mock_reload_env():
+def mock_reload_env(tmpdir):
     """Set up the mock environment for unit-testing the reloader module."""
-    # For unmodified files, just return a fake stat result with everything set
-    # to 0.
-    unmodified_stat_result = os.stat_result(0 for _ in range(10))
-
-    # For modified files, set the st_mtime to 1 day in the future. It doesn't
-    # matter that the modification time is in the future - just so long as it
-    # is greater than the current time. The reloader only checks st_mtime,
-    # which is the value at the 8th index passed to os.stat_result.
-    one_day_hence = time.time() + 24 * 60 * 60
-    modified_stat_result = os.stat_result(
-        0 if i != 8 else one_day_hence for i in range(10)
-    )
-
-    def mock_stat(filepath):
-        if filepath in mock_stat.modified_files:
-            return modified_stat_result
-        else:
-            return unmodified_stat_result
-
-    mock_stat.modified_files = set()
-
     reloader_patch = "testplan.runnable.interactive.reloader.reload_module"
-    with mock.patch("modulefinder.ModuleFinder", new=MockModuleFinder), (
-        mock.patch(reloader_patch, side_effect=lambda module: module)
-    ) as mock_reload, (mock.patch("os.stat", new=mock_stat)), (
-        mock.patch("sys.modules", new=MOCK_SYSMODULES)
-    ):
-
-        # Despite mocking modulefinder.ModuleFinder above, we also need to
-        # swap out the real ModuleFinder with our mock one in the list of
-        # bases for the GraphModuleFinder.
-        reloader._GraphModuleFinder.__bases__ = (
-            MockModuleFinder,
-            logger.Loggable,
-        )
-        reload_obj = reloader.ModuleReloader()
-
-        yield reload_obj, mock_reload, mock_stat
+    with mock.patch(
+        reloader_patch, side_effect=lambda module: module
+    ) as mock_reload:
+        env = MockReloadEnv(str(tmpdir), mock_reload)
+        with mock.patch("sys.modules", new=env.sys_modules):
+            reload_obj = env.reloader()
+            try:
+                yield reload_obj, env
+            finally:
+                reload_obj.close()
 
 
 def test_dependency_reload(mock_reload_env):
@@ -221,7 +163,8 @@ def test_dependency_reload(mock_reload_env):
     We then test making modifications to each of A, B, C and D in turn to check
     that the expected modules are reloaded in the correct order.
     """
-    reload_obj, mock_reload, mock_stat = mock_reload_env
+    reload_obj, env = mock_reload_env
+    mock_reload = env.mock_reload
 
     # First we check that the dependency graph was built as expected.
     _check_dep_graph(reload_obj._dep_graph)
@@ -234,70 +177,188 @@ def test_dependency_reload(mock_reload_env):
     mock_reload.assert_not_called()
 
     # Now let's say we modify mod_a. Only mod_a needs reloading.
-    mock_stat.modified_files = {MOCK_MODULES["mod_a"]}
+    _modify(env.filepaths["mod_a"])
     reload_obj.reload(tests=[])
-    mock_reload.assert_called_once_with(MOCK_SYSMODULES["mod_a"])
+    mock_reload.assert_called_once_with(env.sys_modules["mod_a"])
 
     # Now modify mod_b instead. Both modules B and A should be reloaded.
-    mock_stat.modified_files = {MOCK_MODULES["mod_b"]}
+    _modify(env.filepaths["mod_b"])
     mock_reload.reset_mock()
     reload_obj.reload(tests=[])
     mock_reload.assert_has_calls(
         [
-            mock.call(MOCK_SYSMODULES["mod_b"]),
-            mock.call(MOCK_SYSMODULES["mod_a"]),
+            mock.call(env.sys_modules["mod_b"]),
+            mock.call(env.sys_modules["mod_a"]),
         ]
     )
 
     # Now modify mod_c. Both C and A should be reloaded.
-    mock_stat.modified_files = {MOCK_MODULES["mod_c"]}
+    _modify(env.filepaths["mod_c"])
     mock_reload.reset_mock()
     reload_obj.reload(tests=[])
     mock_reload.assert_has_calls(
         [
-            mock.call(MOCK_SYSMODULES["mod_c"]),
-            mock.call(MOCK_SYSMODULES["mod_a"]),
+            mock.call(env.sys_modules["mod_c"]),
+            mock.call(env.sys_modules["mod_a"]),
         ]
     )
 
     # Now modify mod_d. We expect to reload module D first, then B, then A.
-    mock_stat.modified_files = {MOCK_MODULES["mod_d"]}
+    _modify(env.filepaths["mod_d"])
     mock_reload.reset_mock()
     reload_obj.reload(tests=[])
     mock_reload.assert_has_calls(
         [
-            mock.call(MOCK_SYSMODULES["mod_d"]),
-            mock.call(MOCK_SYSMODULES["mod_b"]),
-            mock.call(MOCK_SYSMODULES["mod_a"]),
+            mock.call(env.sys_modules["mod_d"]),
+            mock.call(env.sys_modules["mod_b"]),
+            mock.call(env.sys_modules["mod_a"]),
         ]
     )
 
 
 def test_test_refresh(mock_reload_env):
     """Test that tests are correctly refreshed after a module is reloaded."""
-    reload_obj, mock_reload, mock_stat = mock_reload_env
+    reload_obj, env = mock_reload_env
+    mock_reload = env.mock_reload
 
     # Modify mod_a again. This time we specify a MultiTest to refresh
     # suites for.
     mock_reload.reset_mock()
     test = multitest.MultiTest(name="MTest", suites=[Suite()])
     test.cfg.suites[0].__module__ = "mod_a"
-    mock_stat.modified_files = {MOCK_MODULES["mod_a"]}
+    _modify(env.filepaths["mod_a"])
 
     set_testsuite_testcases = (
         "testplan.testing.multitest.suite.set_testsuite_testcases"
     )
     with mock.patch(set_testsuite_testcases) as mock_set_testcases:
         reload_obj.reload(tests=[test])
-        mock_reload.assert_called_once_with(MOCK_SYSMODULES["mod_a"])
+        mock_reload.assert_called_once_with(env.sys_modules["mod_a"])
         mock_set_testcases.assert_called_once_with(test.cfg.suites[0])
 
 
+def test_scan_cache(mock_reload_env):
+    """Only files changed since they were cached are scanned again."""
+    reload_obj, env = mock_reload_env
+    assert os.path.exists(env.cache_path)
+
+    scan_source = mock.patch.object(
+        reloader, "_scan_source", wraps=reloader._scan_source
+    )
+    with scan_source as mock_scan:
+        cached_obj = env.reloader()
+        cached_obj.close()
+        mock_scan.assert_not_called()
+        _check_dep_graph(cached_obj._dep_graph)
+
+        # Now make mod_c import mod_d.
+        with open(env.filepaths["mod_c"], "w") as module_file:
+            module_file.write("import mod_d\n")
+        _modify(env.filepaths["mod_c"])
+        cached_obj = env.reloader()
+        cached_obj.close()
+        mock_scan.assert_called_once_with(env.filepaths["mod_c"])
+
+    mod_c = cached_obj._dep_graph.dependencies[0].dependencies[1]
+    assert mod_c.name == "mod_c"
+    assert mod_c.dependencies == [
+        cached_obj._dep_graph.dependencies[1].dependencies[0]
+    ]
+
+
+def test_change_feed(mock_reload_env):
+    """Only files reported changed are checked, unless changes were lost."""
+    reload_obj, env = mock_reload_env
+    mock_reload = env.mock_reload
+
+    _modify(env.filepaths["mod_c"])
+    with mock.patch.object(reload_obj._watcher, "changes", return_value=set()):
+        reload_obj.reload(tests=[])
+    mock_reload.assert_not_called()
+
+    with mock.patch.object(reload_obj._watcher, "changes", return_value=None):
+        reload_obj.reload(tests=[])
+    assert mock_reload.call_args_list == [
+        mock.call(env.sys_modules["mod_c"]),
+        mock.call(env.sys_modules["mod_a"]),
+    ]
+
+
+def test_failed_reload(mock_reload_env):
+    """A modified module is reloaded again until its reload succeeds."""
+    reload_obj, env = mock_reload_env
+    mock_reload = env.mock_reload
+
+    mock_reload.side_effect = SyntaxError("invalid syntax")
+    _modify(env.filepaths["mod_c"])
+    with pytest.raises(SyntaxError):
+        reload_obj.reload(tests=[])
+
+    mock_reload.side_effect = lambda module: module
+    mock_reload.reset_mock()
+    reload_obj.reload(tests=[])
+    assert mock_reload.call_args_list == [
+        mock.call(env.sys_modules["mod_c"]),
+        mock.call(env.sys_modules["mod_a"]),
+    ]
+
+    mock_reload.reset_mock()
+    reload_obj.reload(tests=[])
+    mock_reload.assert_not_called()
+
+
+def test_scan_source(tmpdir):
+    """Imports are listed in source order with the module level names."""
+    filepath = str(tmpdir.join("module.py"))
+    with open(filepath, "w") as module_file:
+        module_file.write(
+            "import os.path\n"
+            "from . import sibling\n"
+            "try:\n"
+            "    from ..pkg.mod import name as alias, other\n"
+            "except ImportError:\n"
+            "    CONSTANT = None\n\n\n"
+            "class Suite(object):\n"
+            "    attr = 1\n\n"
+            "    def case(self):\n"
+            "        import json\n"
+        )
+
+    imports, names = reloader._scan_source(filepath)
+    assert imports == [
+        [0, "os.path", []],
+        [1, "", ["sibling"]],
+        [2, "pkg.mod", ["name", "other"]],
+        [0, "json", []],
+    ]
+    assert names == ["CONSTANT", "Suite", "alias", "os", "other", "sibling"]
+
+
+def test_resolve_imports():
+    """Imports resolve to the modules they load, relative ones included."""
+    modules = {"pkg", "pkg.sub", "pkg.sub.mod", "pkg.other", "top"}
+    imports = [
+        [1, "", ["mod", "name"]],
+        [2, "other", ["name"]],
+        [0, "top", []],
+        [0, "os.path", []],
+    ]
+    assert reloader._resolve_imports(
+        "pkg.sub.mod", "/src/pkg/sub/mod.py", imports, modules
+    ) == ["pkg.sub", "pkg.other", "top"]
+
+    imports = [[1, "sub", ["mod"]], [0, "pkg.other", []]]
+    assert reloader._resolve_imports(
+        "pkg", "/src/pkg/__init__.py", imports, modules
+    ) == ["pkg.sub", "pkg.sub.mod", "pkg.other"]
+
+
 def _check_dep_graph(dep_graph):
     """
     Check that the dependency graph generated by the reload module is as
-    expected. Since we control the order of import hooks the ordering of the
-    dependencies in the graph should be fully deterministic.
+    expected. Since dependencies are ordered as the import statements of each
+    module, the ordering of the dependencies in the graph should be fully
+    deterministic.
     """
     # Check that the expected graph of modules is produced. Due to
     # limitations in rendering the dependency graph as a string, you will
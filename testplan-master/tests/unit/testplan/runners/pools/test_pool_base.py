@@ -1,16 +1,23 @@
 """TODO."""
 
 import os
+import threading
+import time
+
+import pytest
 
 from testplan.common.utils.path import default_runpath
 from testplan.runners.pools import base as pools_base
 from testplan.runners.pools import communication
+from testplan.runners.pools import connection
+from testplan.runners.pools import scaling
 from testplan import Task
 
 from tests.unit.testplan.runners.pools.tasks.data.sample_tasks import Runnable
 
 
-def test_pool_basic():
+@pytest.mark.parametrize("event_driven", (False, True))
+def test_pool_basic(event_driven):
     dirname = os.path.dirname(os.path.abspath(__file__))
     path = os.path.join(dirname, "tasks", "data", "relative")
 
@@ -26,7 +33,12 @@ def test_pool_basic():
     assert task1.materialize().run() == 10
     assert task2.materialize().run() == 30
 
-    pool = pools_base.Pool(name="MyPool", size=4, runpath=default_runpath)
+    pool = pools_base.Pool(
+        name="MyPool",
+        size=4,
+        runpath=default_runpath,
+        event_driven=event_driven,
+    )
     pool.add(task1, uid=task1.uid())
     pool.add(task2, uid=task2.uid())
     assert pool._input[task1.uid()] is task1
@@ -44,6 +56,63 @@ def test_pool_basic():
     )
 
 
+@pytest.mark.parametrize("event_driven", (False, True))
+def test_pool_prefetch(event_driven):
+    """Workers prefetching several tasks return all results in order."""
+    tasks = [Task(target=Runnable(idx)) for idx in range(20)]
+    pool = pools_base.Pool(
+        name="MyPool",
+        size=2,
+        runpath=default_runpath,
+        event_driven=event_driven,
+        prefetch=3,
+    )
+    for task in tasks:
+        pool.add(task, uid=task.uid())
+
+    with pool:
+        while pool.ongoing:
+            time.sleep(0.01)
+
+    assert [pool.get(task.uid()).result for task in tasks] == [
+        idx * 2 for idx in range(20)
+    ]
+    assert all(worker.cfg.prefetch == 3 for worker in pool._workers)
+
+
+def test_queue_transport_blocking():
+    """
+    A blocking queue client is woken up by the pool response, and a queue
+    server accept with timeout returns None once the timeout expires.
+    """
+    server = connection.QueueServer()
+    server.start()
+    client = connection.QueueClient(recv_sleep=5)
+    client.blocking = True
+    client.connect(server.requests)
+
+    assert server.accept(timeout=0.01) is None
+
+    msg_factory = communication.Message(index=0)
+    client.send(msg_factory.make(msg_factory.TaskPullRequest, data=1))
+    request = server.accept(timeout=1)
+    assert request.cmd == communication.Message.TaskPullRequest
+
+    timer = threading.Timer(
+        0.05,
+        client.respond,
+        args=(msg_factory.make(communication.Message.Ack),),
+    )
+    start = time.time()
+    timer.start()
+    assert client.receive().cmd == communication.Message.Ack
+    assert time.time() - start < 5
+
+    client.disconnect()
+    assert client.receive() is None
+    server.stop()
+
+
 class ControllableWorker(pools_base.Worker):
     """
     Custom worker tweaked to give the testbed fine-grained control of messages
@@ -173,3 +242,164 @@ class TestPoolIsolated:
             worker = pool._workers["0"]
 
         assert worker._restart_count == 0
+
+    def test_recycle_worker_max_tasks(self):
+        """A worker is replaced once it finished its maximum of tasks."""
+        pool = pools_base.Pool(
+            name="MyPool",
+            size=1,
+            worker_type=ControllableWorker,
+            max_tasks_per_worker=2,
+        )
+        pool._start_monitor_thread = False
+        tasks = [Task(target=Runnable(idx)) for idx in range(3)]
+        for task in tasks:
+            pool.add(task, uid=task.uid())
+
+        with pool:
+            worker = pool._workers["0"]
+            msg_factory = communication.Message(**worker.metadata)
+
+            received = worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=3)
+            )
+            assert received.data == tasks[:2]
+            assert worker.retire_reason == "handed out 2 tasks"
+
+            # No more tasks until the worker is replaced.
+            received = worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=3)
+            )
+            assert received.cmd == communication.Message.Ack
+
+            worker.transport.send_and_receive(
+                msg_factory.make(
+                    msg_factory.TaskResults,
+                    data=[worker.execute(task) for task in tasks[:2]],
+                )
+            )
+            assert pool._monitor_wakeup.is_set()
+            pool._recycle_workers()
+
+            assert worker._restart_count == 1
+            assert worker.task_count == 0
+            assert worker.retire_reason is None
+            assert [
+                (recycle.worker, recycle.task_count)
+                for recycle in pool.recycles
+            ] == [("0", 2)]
+
+            received = worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=3)
+            )
+            assert received.data == tasks[2:]
+
+        assert pool.worker_summary() == {
+            "0": {"tasks": 2, "recycles": 1, "peak_rss": None}
+        }
+
+    def test_recycle_worker_max_rss(self):
+        """A worker is replaced once it reports too much memory usage."""
+        pool = pools_base.Pool(
+            name="MyPool",
+            size=1,
+            worker_type=ControllableWorker,
+            max_worker_rss=2 ** 20,
+        )
+        pool._start_monitor_thread = False
+        task = Task(target=Runnable(5))
+        pool.add(task, uid=task.uid())
+
+        with pool:
+            worker = pool._workers["0"]
+            msg_factory = communication.Message(**worker.metadata)
+            received = worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=1)
+            )
+            assert received.data == [task]
+
+            msg_factory.sender_metadata["rss"] = 2 ** 21
+            worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.Heartbeat, data=time.time())
+            )
+            assert worker.retire_reason == (
+                "memory usage 2.0 MB exceeds 1.0 MB"
+            )
+            # Replaced only once the task is finished.
+            pool._recycle_workers()
+            assert worker._restart_count == 0
+
+            worker.transport.send_and_receive(
+                msg_factory.make(
+                    msg_factory.TaskResults, data=[worker.execute(task)]
+                )
+            )
+            pool._recycle_workers()
+            assert worker._restart_count == 1
+            assert pool.recycles[0].rss == 2 ** 21
+            assert worker.rss is None
+            assert worker.peak_rss == 2 ** 21
+
+    def test_scale_workers(self):
+        """Workers are started for pending tasks and stopped when idle."""
+        pool = pools_base.Pool(
+            name="MyPool",
+            size=4,
+            worker_type=ControllableWorker,
+            scaling_policy=scaling.QueueDepthPolicy(
+                min_size=1, idle_timeout=0
+            ),
+        )
+        pool._start_monitor_thread = False
+        tasks = [Task(target=Runnable(idx)) for idx in range(4)]
+        for task in tasks[:2]:
+            pool.add(task, uid=task.uid())
+
+        with pool:
+            assert [worker.uid() for worker in pool._workers] == ["0", "1"]
+            assert list(pool._standby) == ["2", "3"]
+
+            for task in tasks[2:]:
+                pool.add(task, uid=task.uid())
+            assert pool._monitor_wakeup.is_set()
+            pool._scale_workers()
+            assert [worker.uid() for worker in pool._workers] == [
+                "0",
+                "1",
+                "2",
+                "3",
+            ]
+            assert not pool._standby
+
+            worker = pool._workers["0"]
+            msg_factory = communication.Message(**worker.metadata)
+            received = worker.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=4)
+            )
+            assert received.data == tasks
+
+            # Busy workers are needed for the assigned tasks.
+            pool._scale_workers()
+            assert len(pool._workers) == 4
+
+            worker.transport.send_and_receive(
+                msg_factory.make(
+                    msg_factory.TaskResults,
+                    data=[worker.execute(task) for task in tasks],
+                )
+            )
+            time.sleep(0.01)
+            pool._scale_workers()
+            assert [worker.uid() for worker in pool._workers] == ["0"]
+            assert list(pool._standby) == ["1", "2", "3"]
+
+            # Late messages of stopped workers are answered with Stop.
+            stopped = pool._standby["3"]
+            assert stopped.status.tag == stopped.status.STOPPED
+            msg_factory = communication.Message(**stopped.metadata)
+            received = stopped.transport.send_and_receive(
+                msg_factory.make(msg_factory.TaskPullRequest, data=1)
+            )
+            assert received.cmd == communication.Message.Stop
+
+        assert sorted(pool.worker_summary()) == ["0", "1", "2", "3"]
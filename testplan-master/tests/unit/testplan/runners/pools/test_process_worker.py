@@ -75,3 +75,38 @@ class TestProcPool(object):
 
             assert proc_pool.status.tag == proc_pool.status.STOPPED
             assert len(current_proc.children()) == len(start_children)
+
+    def test_zygote(self):
+        """Test that workers are forked by the zygote and run tasks."""
+        if platform.system() == "Windows":
+            pytest.skip("Workers cannot be forked on Windows")
+
+        proc_pool = process.ProcessPool(
+            name="ProcPool", size=2, restart_count=0, zygote=True
+        )
+        example_task = tasks.Task(
+            target="Runnable",
+            module="tests.unit.testplan.runners.pools.tasks.data.sample_tasks",
+            args=(7, 3),
+        )
+        proc_pool.add(example_task, example_task.uid())
+        assert proc_pool._preload_modules() == [
+            ("tests.unit.testplan.runners.pools.tasks.data.sample_tasks", None)
+        ]
+
+        current_proc = psutil.Process()
+        start_children = current_proc.children()
+        with proc_pool:
+            # Only the zygote is a child of the pool process.
+            assert len(current_proc.children()) == len(start_children) + 1
+            zygote = psutil.Process(proc_pool.zygote._handler.pid)
+            assert sorted(proc.pid for proc in zygote.children()) == sorted(
+                worker.handler.pid for worker in proc_pool._workers
+            )
+            while proc_pool.pending_work():
+                assert proc_pool.is_alive
+                time.sleep(0.2)
+
+        assert proc_pool.zygote is None
+        assert len(current_proc.children()) == len(start_children)
+        assert proc_pool.results[example_task.uid()].result == 21
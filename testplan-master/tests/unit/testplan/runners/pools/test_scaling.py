@@ -0,0 +1,79 @@
+"""Unit tests for the pool scaling policies."""
+
+import time
+
+import pytest
+
+from testplan.runners.pools import scaling
+
+
+class FakeWorkerConfig(object):
+    def __init__(self, workers):
+        self.workers = workers
+
+
+class FakeWorker(object):
+    def __init__(self, name, workers=1, assigned=0, idle=0):
+        self.name = name
+        self.cfg = FakeWorkerConfig(workers)
+        self.assigned = set(range(assigned))
+        self.last_active = time.time() - idle
+
+    def __repr__(self):
+        return self.name
+
+
+class FakePool(object):
+    def __init__(self, pending):
+        self.unassigned = list(range(pending))
+
+
+def test_queue_depth_start():
+    """Standby workers are started until every pending task has one."""
+    policy = scaling.QueueDepthPolicy(min_size=2)
+    standby = [FakeWorker(name) for name in "abcd"]
+
+    assert policy.scale(FakePool(0), [], standby) == (standby[:2], [])
+    assert policy.scale(FakePool(3), [], standby) == (standby[:3], [])
+    assert policy.scale(FakePool(9), [], standby) == (standby, [])
+
+    running = [FakeWorker("x", assigned=1), FakeWorker("y")]
+    assert policy.scale(FakePool(2), running, standby) == (standby[:1], [])
+
+
+def test_queue_depth_stop():
+    """Idle workers whose capacity is not needed are stopped."""
+    policy = scaling.QueueDepthPolicy(min_size=1, idle_timeout=10)
+    running = [
+        FakeWorker("a", idle=60),
+        FakeWorker("b", assigned=1, idle=60),
+        FakeWorker("c", idle=60),
+        FakeWorker("d", idle=1),
+    ]
+    assert policy.scale(FakePool(0), running, []) == (
+        [],
+        [running[2], running[0]],
+    )
+    assert policy.scale(FakePool(2), running, []) == ([], [running[2]])
+    assert policy.scale(FakePool(3), running, []) == ([], [])
+
+    idle = [FakeWorker(name, idle=60) for name in "abc"]
+    assert policy.scale(FakePool(0), idle, []) == ([], idle[:0:-1])
+
+
+def test_host_policy():
+    """Hosts are started and stopped by the number of workers they run."""
+    policy = scaling.HostPolicy(min_size=1, idle_timeout=0)
+    hosts = [FakeWorker(name, workers=4) for name in "abc"]
+
+    assert policy.scale(FakePool(6), [], hosts) == (hosts[:2], [])
+
+    running = [FakeWorker("x", workers=4, assigned=3, idle=1)] + [
+        FakeWorker(name, workers=4, idle=1) for name in "yz"
+    ]
+    assert policy.scale(FakePool(2), running, hosts) == ([], [running[2]])
+
+
+def test_invalid_min_size():
+    with pytest.raises(ValueError):
+        scaling.QueueDepthPolicy(min_size=0)
@@ -0,0 +1,182 @@
+"""Unit tests for the pool scheduling policies."""
+
+import os
+
+import pytest
+
+from testplan import Task
+from testplan.common.utils.path import default_runpath
+from testplan.report.testing.history import RuntimeHistory
+from testplan.runners.pools import base as pools_base
+from testplan.runners.pools import communication
+from testplan.runners.pools import scheduling
+
+from tests.unit.testplan.runners.pools.tasks.data.sample_tasks import Runnable
+from tests.unit.testplan.runners.pools.test_pool_base import ControllableWorker
+
+
+def _task(index, uid=None):
+    return Task(
+        target="Runnable",
+        module="sample_tasks",
+        args=(index,),
+        path=".",
+        uid=uid,
+    )
+
+
+def test_task_history_uid():
+    """History uids depend on the task target, not on the random task uid."""
+    assert scheduling.task_history_uid(
+        _task(1)
+    ) == scheduling.task_history_uid(_task(1))
+    assert scheduling.task_history_uid(_task(1)) == (
+        "sample_tasks.Runnable(1)"
+    )
+    assert (
+        scheduling.task_history_uid(
+            Task(target="make_test", module="tasks", kwargs={"b": 2, "a": 1})
+        )
+        == "tasks.make_test(a=1, b=2)"
+    )
+    assert scheduling.task_history_uid(Task(target="make_test")) == (
+        "make_test"
+    )
+
+
+def test_fifo_queue():
+    queue = scheduling.FIFOPolicy().make_queue(pool=None)
+    for uid in "cab":
+        queue.append(uid)
+    assert len(queue) == 3
+    assert list(queue) == ["c", "a", "b"]
+    assert [queue.pop() for _ in range(3)] == ["c", "a", "b"]
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_longest_first_policy(tmpdir):
+    """Unknown tasks are handed out first, then the longest expected ones."""
+    history = RuntimeHistory(str(tmpdir.join("history.txt")))
+    tasks = [_task(index) for index in range(4)]
+    history.record(
+        [
+            (scheduling.task_history_uid(tasks[0]), 1),
+            (scheduling.task_history_uid(tasks[1]), 10),
+            (scheduling.task_history_uid(tasks[3]), 5),
+        ]
+    )
+
+    pool = pools_base.Pool(
+        name="MyPool",
+        runpath=default_runpath,
+        scheduling_policy=scheduling.LongestFirstPolicy(history.path),
+    )
+    for task in tasks:
+        pool.add(task, uid=task.uid())
+
+    expected = [tasks[idx].uid() for idx in (2, 1, 3, 0)]
+    assert list(pool.unassigned) == expected
+    assert [pool.unassigned.pop() for _ in tasks] == expected
+
+
+class RefusingPool(pools_base.Pool):
+    """Pool whose workers cannot execute the task with uid "big"."""
+
+    def _can_assign_task_to_worker(self, task, worker):
+        return task.uid() != "big"
+
+
+def test_refused_task_longest_first(tmpdir):
+    """
+    A task refused by a worker does not hide the other tasks of the
+    request, even if it is the first one in the priority queue.
+    """
+    history = RuntimeHistory(str(tmpdir.join("history.txt")))
+    tasks = {
+        uid: _task(idx, uid=uid)
+        for idx, uid in enumerate(("big", "a", "b", "c"))
+    }
+    history.record(
+        (scheduling.task_history_uid(task), 10 if uid == "big" else 1)
+        for uid, task in tasks.items()
+    )
+
+    pool = RefusingPool(
+        name="MyPool",
+        size=1,
+        runpath=default_runpath,
+        worker_type=ControllableWorker,
+        scheduling_policy=scheduling.LongestFirstPolicy(history),
+    )
+    for uid, task in tasks.items():
+        pool.add(task, uid=uid)
+
+    with pool:
+        worker = pool._workers["0"]
+        msg_factory = communication.Message(**worker.metadata)
+        received = worker.transport.send_and_receive(
+            msg_factory.make(msg_factory.TaskPullRequest, data=4)
+        )
+        assert received.cmd == communication.Message.TaskSending
+        assert sorted(task.uid() for task in received.data) == [
+            "a",
+            "b",
+            "c",
+        ]
+        assert pool._task_retries_cnt["big"] == 1
+        assert list(pool.unassigned) == ["big"]
+
+
+def test_critical_path():
+    timings = {
+        "a": scheduling.TaskTiming("Pool", "0", 0, 5),
+        "b": scheduling.TaskTiming("Pool", "1", 0, 3),
+        "c": scheduling.TaskTiming("Pool", "1", 3, 9),
+        "d": scheduling.TaskTiming("Pool", "0", 5, 8),
+    }
+    assert [uid for uid, _ in scheduling.critical_path(timings)] == [
+        "b",
+        "c",
+    ]
+    assert scheduling.critical_path({}) == []
+
+
+def test_pool_longest_first(tmpdir):
+    """A single worker executes the longest expected tasks first."""
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(dirname, "tasks", "data", "relative")
+    tasks = [
+        Task(target="Runnable", module="sample_tasks", path=path, args=(idx,))
+        for idx in range(5)
+    ]
+    history = RuntimeHistory(str(tmpdir.join("history.txt")))
+    history.record(
+        (scheduling.task_history_uid(task), idx)
+        for idx, task in enumerate(tasks)
+    )
+
+    pool = pools_base.Pool(
+        name="MyPool",
+        size=1,
+        runpath=default_runpath,
+        scheduling_policy=scheduling.LongestFirstPolicy(history),
+    )
+    for task in tasks:
+        pool.add(task, uid=task.uid())
+
+    with pool:
+        while pool.ongoing:
+            pass
+
+    assert [pool.get(task.uid()).result for task in tasks] == [
+        idx * 2 for idx in range(5)
+    ]
+    executed = sorted(
+        pool.task_timings, key=lambda uid: pool.task_timings[uid].start
+    )
+    assert executed == [task.uid() for task in reversed(tasks)]
+    assert all(
+        timing.worker == "0" and timing.end >= timing.start
+        for timing in pool.task_timings.values()
+    )
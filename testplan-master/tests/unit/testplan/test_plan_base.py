@@ -2,8 +2,11 @@
 
 import os
 import uuid
+import threading
 
-from testplan import Testplan, TestplanMock, TestplanResult
+import pytest
+
+from testplan import Testplan, TestplanMock, TestplanResult, Task
 from testplan.common.entity import (
     Resource,
     ResourceStatus,
@@ -17,9 +20,13 @@ from testplan.common.utils.testing import (
     log_propagation_disabled,
 )
 from testplan.common.utils.logger import TESTPLAN_LOGGER
+from testplan.exporters.testing import Exporter
 from testplan.report import TestGroupReport, ReportCategories
+from testplan.report.testing.history import RuntimeHistory
 from testplan.runnable import TestRunnerStatus, TestRunner
 from testplan.runners.local import LocalRunner
+from testplan.runners.pools.base import Pool
+from testplan.testing.multitest import MultiTest, testsuite, testcase
 
 
 class DummyDriver(Resource):
@@ -209,3 +216,114 @@ def test_testplan_runpath():
     assert plan.runpath is None
     plan.run()
     assert plan.runpath == runpath_maker(plan._runnable)
+
+
+@testsuite
+class TimedSuite(object):
+    @testcase
+    def case(self, env, result):
+        result.true(True)
+
+
+def make_timed_multitest(name):
+    return MultiTest(name=name, suites=[TimedSuite()])
+
+
+def test_testplan_runtime_history(tmpdir):
+    """
+    Task and testcase runtimes are recorded into the runtime history, and
+    the tasks that held the run open are added to the report information.
+    """
+    history_path = str(tmpdir.join("history.txt"))
+    plan = TestplanMock(name="MyPlan", runtime_history=history_path)
+    plan.add_resource(Pool(name="MyPool", size=2))
+    tasks = [
+        Task(target=make_timed_multitest(name="MTest{}".format(idx)))
+        for idx in range(3)
+    ]
+    for task in tasks:
+        plan.schedule(task, resource="MyPool")
+
+    assert plan.run().run is True
+
+    runtime_history = RuntimeHistory(history_path)
+    for idx in range(3):
+        assert "MTest{}".format(idx) in runtime_history
+        assert "MTest{}/TimedSuite/case".format(idx) in runtime_history
+
+    information = dict(plan.report.information)
+    assert information["critical_path"].startswith("MyPool[")
+    assert "MTest" in information["critical_path"]
+
+
+@testsuite
+class ShardedSuite(object):
+    @testcase(parameters=range(6))
+    def case(self, env, result, value):
+        result.true(True)
+
+
+def make_part_multitest(part=None):
+    return MultiTest(name="MTest", suites=[ShardedSuite()], part=part)
+
+
+def test_testplan_schedule_shards():
+    """Shards are scheduled with their part and merged back."""
+    plan = TestplanMock(name="MyPlan", merge_scheduled_parts=True)
+    plan.add_resource(Pool(name="MyPool", size=2))
+    uids = plan.schedule(
+        target=make_part_multitest, resource="MyPool", uid="MTest", shards=3
+    )
+    assert uids == ["MTest_0", "MTest_1", "MTest_2"]
+
+    assert plan.run().run is True
+    assert len(plan.report) == 1
+    assert plan.report["MTest"].counter["passed"] == 6
+
+    with pytest.raises(ValueError):
+        plan.schedule(Task(target=make_part_multitest), shards=2)
+    with pytest.raises(ValueError):
+        plan.schedule(target=make_part_multitest, shards=1)
+
+
+class RendezvousExporter(Exporter):
+    """Waits for the other exporter, which only happens if run in parallel."""
+
+    def __init__(self, own_event, other_event, **options):
+        super(RendezvousExporter, self).__init__(**options)
+        self.own_event = own_event
+        self.other_event = other_event
+        self.met = None
+        self.data = None
+
+    def export(self, source):
+        self.data = source.serialize()
+        self.own_event.set()
+        self.met = self.other_event.wait(5)
+
+
+def test_testplan_parallel_exporters():
+    """
+    Exporters run concurrently on a snapshot that is serialized once, their
+    timings are recorded into their results.
+    """
+    events = threading.Event(), threading.Event()
+    exporters = [
+        RendezvousExporter(events[0], events[1]),
+        RendezvousExporter(events[1], events[0]),
+    ]
+    plan = TestplanMock(name="MyPlan", exporters=exporters, exporter_workers=2)
+    plan.add(make_timed_multitest(name="MTest"))
+    result = plan.run()
+
+    assert result.run is True
+    assert all(exporter.met for exporter in exporters)
+    assert exporters[0].data is exporters[1].data
+    assert exporters[0].data["name"] == "MyPlan"
+    assert [
+        exp_result.exporter for exp_result in result.exporter_results
+    ] == exporters
+    assert all(
+        exp_result.success and exp_result.elapsed >= 0
+        for exp_result in result.exporter_results
+    )
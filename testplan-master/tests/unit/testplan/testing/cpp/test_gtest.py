@@ -0,0 +1,77 @@
+"""Unit tests for the GTest runner."""
+
+import socket
+
+import pytest
+
+from testplan.report import TestGroupReport, RuntimeStatus, Status
+from testplan.testing.cpp.gtest import GTest, GTestStreamListener
+
+EVENTS = [
+    "gtest_streaming_protocol_version=1.0",
+    "event=TestProgramStart",
+    "event=TestIterationStart&iteration=0",
+    "event=TestCaseStart&name=SquareRootTest",
+    "event=TestStart&name=PositiveNos",
+    "event=TestEnd&passed=1&elapsed_time=0ms",
+    "event=TestStart&name=NegativeNos",
+    "event=TestPartResult&file=tests.cpp&line=13"
+    "&message=Expected%3A 1%0A  Actual%3A 2",
+    "event=TestEnd&passed=0&elapsed_time=0ms",
+    "event=TestStart&name=ZeroAndNegativeNos",
+]
+
+
+def test_stream_listener():
+    """Streamed events are reported until the binary stops sending."""
+    report = TestGroupReport(name="MyGTest")
+    events = []
+    listener = GTestStreamListener(
+        report=report,
+        on_testcase=lambda suite, testcase: events.append(
+            (suite.name, testcase.name, testcase.runtime_status)
+        ),
+    )
+    listener.start()
+
+    host, port = listener.address.split(":")
+    client = socket.create_connection((host, int(port)))
+    client.sendall("".join(e + "\n" for e in EVENTS).encode("utf-8"))
+    # The binary crashes while running the last testcase.
+    client.close()
+    listener.stop()
+
+    assert report.entry_uids == ["SquareRootTest"]
+    suite = report["SquareRootTest"]
+    assert suite.entry_uids == [
+        "PositiveNos",
+        "NegativeNos",
+        "ZeroAndNegativeNos",
+    ]
+    assert suite["PositiveNos"].status == Status.PASSED
+    assert suite["NegativeNos"].status == Status.FAILED
+    assert suite["NegativeNos"].entries[0]["content"] == (
+        "tests.cpp:13\nExpected: 1\n  Actual: 2"
+    )
+    assert suite["ZeroAndNegativeNos"].status == Status.FAILED
+    assert suite.runtime_status == RuntimeStatus.FINISHED
+
+    assert events == [
+        ("SquareRootTest", "PositiveNos", RuntimeStatus.RUNNING),
+        ("SquareRootTest", "PositiveNos", RuntimeStatus.FINISHED),
+        ("SquareRootTest", "NegativeNos", RuntimeStatus.RUNNING),
+        ("SquareRootTest", "NegativeNos", RuntimeStatus.FINISHED),
+        ("SquareRootTest", "ZeroAndNegativeNos", RuntimeStatus.RUNNING),
+        ("SquareRootTest", "ZeroAndNegativeNos", RuntimeStatus.FINISHED),
+    ]
+
+
+def test_stream_results_conflict():
+    """Results cannot be streamed to Testplan and to another address."""
+    with pytest.raises(ValueError):
+        GTest(
+            name="MyGTest",
+            binary="runTests",
+            stream_results=True,
+            gtest_stream_result_to="localhost:8080",
+        )
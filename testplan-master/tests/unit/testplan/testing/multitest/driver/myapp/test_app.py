@@ -125,6 +125,29 @@ def test_extract_from_logfile(runpath):
         assert app.extracts["b"] == b
 
 
+def test_extract_from_watched_logfile(runpath):
+    """Test extracting values from a logfile written after a delay."""
+    logname = "file.log"
+    log_regexps = [
+        re.compile(r".*a=(?P<a>[a-zA-Z0-9]*) .*"),
+        re.compile(r".*b=(?P<b>[a-zA-Z0-9]*).*"),
+    ]
+
+    app = App(
+        name="App",
+        binary="echo starting > {log}; sleep 0.5;"
+        " echo Value a=1 b=23a >> {log}; sleep 1".format(log=logname),
+        logname=logname,
+        log_regexps=log_regexps,
+        watch_logs=True,
+        shell=True,
+        runpath=runpath,
+    )
+    with app:
+        assert app.extracts["a"] == "1"
+        assert app.extracts["b"] == "23a"
+
+
 def test_extract_from_logfile_with_appdir(runpath):
     """Test extracting values from a logfile within an app sub-directory."""
     app_dir = "AppDir"
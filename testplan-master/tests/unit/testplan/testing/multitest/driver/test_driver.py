@@ -1,5 +1,11 @@
 """Unit tests for the driver base."""
 
+import os
+import time
+
+import pytest
+
+from testplan.common.entity import Environment
 from testplan.testing.multitest.driver import base
 
 
@@ -121,3 +127,143 @@ class TestPrePostCallables(object):
 
         assert driver.pre_stop_fn_called
         assert driver.post_stop_fn_called
+
+
+class EventsDriver(base.Driver):
+    """Driver that records its start and stop events, taking some time."""
+
+    def __init__(self, events, fail=False, **options):
+        super(EventsDriver, self).__init__(**options)
+        self.events = events
+        self.fail = fail
+
+    def starting(self):
+        self.events.append(("starting", self.cfg.name))
+        time.sleep(0.2)
+        if self.fail:
+            raise RuntimeError("Failed to start")
+
+    def post_start(self):
+        self.events.append(("started", self.cfg.name))
+
+    def stopping(self):
+        self.events.append(("stopping", self.cfg.name))
+        time.sleep(0.2)
+
+    def post_stop(self):
+        self.events.append(("stopped", self.cfg.name))
+
+
+class TestEnvironmentDependencies(object):
+    """Test starting and stopping drivers that depend on others."""
+
+    @staticmethod
+    def environment(runpath, events, drivers):
+        env = Environment()
+        for name, depends_on in drivers:
+            env.add(
+                EventsDriver(
+                    events,
+                    name=name,
+                    depends_on=depends_on,
+                    runpath=os.path.join(runpath, name),
+                )
+            )
+        return env
+
+    def test_waves(self, runpath):
+        """Drivers start concurrently after their dependencies."""
+        events = []
+        env = self.environment(
+            runpath,
+            events,
+            [
+                ("server", []),
+                ("other", None),
+                ("client", ["server"]),
+                ("monitor", ["client", "other"]),
+            ],
+        )
+        server, other, client, monitor = list(env)
+        assert env.waves() == [[server, other], [client], [monitor]]
+
+        start = time.time()
+        env.start()
+        assert time.time() - start < 0.7
+        assert not env.start_exceptions
+        assert events.index(("started", "server")) < events.index(
+            ("starting", "client")
+        )
+        assert events.index(("started", "client")) < events.index(
+            ("starting", "monitor")
+        )
+        assert set(env.start_timings) == set(env)
+        assert all(
+            interval.elapsed >= 0.2 for interval in env.start_timings.values()
+        )
+
+        del events[:]
+        env.stop()
+        assert not env.stop_exceptions
+        assert events.index(("stopped", "monitor")) < events.index(
+            ("stopping", "client")
+        )
+        assert events.index(("stopped", "client")) < events.index(
+            ("stopping", "server")
+        )
+        assert set(env.stop_timings) == set(env)
+
+    def test_no_dependencies(self, runpath):
+        """Drivers start one by one if none declares dependencies."""
+        events = []
+        env = self.environment(
+            runpath, events, [("first", None), ("second", None)]
+        )
+        assert env.waves() is None
+        env.start()
+        assert events == [
+            ("starting", "first"),
+            ("started", "first"),
+            ("starting", "second"),
+            ("started", "second"),
+        ]
+        assert set(env.start_timings) == set(env)
+        env.stop()
+
+    def test_start_failure(self, runpath):
+        """Later waves are not started once a driver fails to start."""
+        events = []
+        env = Environment()
+        server = EventsDriver(
+            events,
+            fail=True,
+            name="server",
+            depends_on=[],
+            runpath=os.path.join(runpath, "server"),
+        )
+        client = EventsDriver(
+            events,
+            name="client",
+            depends_on=[server],
+            runpath=os.path.join(runpath, "client"),
+        )
+        env.add(server)
+        env.add(client)
+        env.start()
+
+        assert list(env.start_exceptions) == [server]
+        assert ("starting", "client") not in events
+        env.stop()
+        assert ("stopping", "client") not in events
+
+    @pytest.mark.parametrize(
+        "drivers",
+        (
+            [("first", ["second"]), ("second", ["first"])],
+            [("first", ["missing"])],
+        ),
+    )
+    def test_invalid_dependencies(self, runpath, drivers):
+        env = self.environment(runpath, [], drivers)
+        with pytest.raises(RuntimeError):
+            env.waves()
@@ -1052,6 +1052,16 @@ class TestColumnContains(object):
             expected=False,
         )
 
+    def test_evaluate_unhashable_values(self):
+        values = [[1, 2], 3]
+        assertion = assertions.ColumnContain(
+            table=[["foo"], [[1, 2]], [3], [[3]]], values=values, column="foo"
+        )
+
+        assert assertion.values is values
+        assert bool(assertion) is False
+        assert [item.passed for item in assertion.data] == [True, True, False]
+
 
 GET_COMPARISON_COLUMNS_PARAM_NAMES = (
     "table_1,table_2," "include_columns,exclude_columns,expected"
@@ -1491,6 +1501,71 @@ class TestTableMatch(object):
         assert error_orig == error_expected
         assert row_comparison.extra == {"bar": error_func}
 
+    @pytest.mark.parametrize("use_numpy", (True, False))
+    def test_compare_rows_large_table(self, monkeypatch, use_numpy):
+        """
+            Columns of plain values are compared at once, with or without
+            NumPy, custom comparators cell by cell.
+        """
+        if not use_numpy:
+            monkeypatch.setattr(assertions, "numpy", None)
+
+        num_rows = 500
+        table = [
+            {"num": idx, "price": idx * 0.5, "name": "row{}".format(idx)}
+            for idx in range(num_rows)
+        ]
+        expected_table = [
+            {
+                "num": idx + 1 if idx % 100 == 7 else idx,
+                "price": (lambda value: value >= 0),
+                "name": re.compile(r"row\d+$") if idx % 2 else "row0",
+            }
+            for idx in range(num_rows)
+        ]
+
+        passed, row_comparisons = assertions.compare_rows(
+            table=table,
+            expected_table=expected_table,
+            comparison_columns=["num", "price", "name"],
+            display_columns=["num", "price", "name"],
+            report_fails_only=True,
+        )
+
+        assert passed is False
+        failed = [row.idx for row in row_comparisons]
+        assert failed == sorted(
+            set(range(7, num_rows, 100)) | set(range(2, num_rows, 2))
+        )
+        assert row_comparisons[0].diff == {"name": "row0"}
+        assert row_comparisons[3].idx == 7
+        assert row_comparisons[3].diff == {"num": 8}
+        assert row_comparisons[3].data == [7, 3.5, "row7"]
+        assert row_comparisons[3].extra["price"] is expected_table[7]["price"]
+
+    def test_compare_rows_fail_limit(self):
+        """Custom comparators are not called past the failure limit."""
+        calls = []
+
+        def is_positive(value):
+            calls.append(value)
+            return value > 0
+
+        table = [{"foo": idx} for idx in range(-100, 100)]
+        expected_table = [{"foo": is_positive} for _ in range(200)]
+
+        passed, row_comparisons = assertions.compare_rows(
+            table=table,
+            expected_table=expected_table,
+            comparison_columns=["foo"],
+            display_columns=["foo"],
+            fail_limit=3,
+        )
+
+        assert passed is False
+        assert len(row_comparisons) == 3
+        assert calls == [-100, -99, -98]
+
     def _test_evaluate(
         self,
         table,
@@ -7,10 +7,13 @@ from testplan.common import entity
 from testplan.common.utils import path
 from testplan.common.utils import testing
 from testplan.testing import multitest
+from testplan.testing.multitest.driver.base import Driver
 from testplan.testing import filtering
 from testplan.testing import ordering
 from testplan import defaults
 from testplan import report
+from testplan import TestplanMock
+from testplan.report.testing import history
 
 
 # TODO: shouldn't need to specify these...
@@ -334,3 +337,104 @@ def _check_param_testcase_report(testcase_report, i):
     assert greater_assertion["type"] == "Greater"
     assert greater_assertion["first"] == i + 1
     assert greater_assertion["second"] == 0
+
+
+def test_parts_by_runtime_history(tmpdir):
+    """Parts are balanced on expected runtimes when a history is given."""
+    runtime_history = history.RuntimeHistory(str(tmpdir.join("history.txt")))
+    runtime_history.record(
+        [
+            ("MTest/Suite/case", 10),
+            ("MTest/Suite/parametrized <val=1>", 4),
+            ("MTest/Suite/parametrized <val=2>", 3),
+            ("MTest/Suite/parametrized <val=3>", 3),
+        ]
+    )
+
+    def part_testcases(part, **options):
+        mtest = multitest.MultiTest(
+            name="MTest",
+            suites=[Suite()],
+            part=part,
+            **dict(MTEST_DEFAULT_PARAMS, **options)
+        )
+        return [
+            testcase.__name__
+            for _, testcases in mtest.test_context
+            for testcase in testcases
+        ]
+
+    assert part_testcases((0, 2)) == ["case", "parametrized__val_2"]
+    assert part_testcases((1, 2)) == [
+        "parametrized__val_1",
+        "parametrized__val_3",
+    ]
+
+    assert part_testcases((0, 2), runtime_history=runtime_history) == ["case"]
+    assert part_testcases((1, 2), runtime_history=runtime_history.path) == [
+        "parametrized__val_1",
+        "parametrized__val_2",
+        "parametrized__val_3",
+    ]
+
+
+def test_parts_by_json_report_history(tmpdir):
+    """
+    Runtimes recorded from the JSON report of a plan are found when
+    splitting parts, although report uids are reset.
+    """
+    json_path = str(tmpdir.join("report.json"))
+    plan = TestplanMock(
+        name="Plan",
+        runpath=str(tmpdir.join("runpath")),
+        json_path=json_path,
+        reset_report_uid=True,
+    )
+    plan.add(multitest.MultiTest(name="MTest", suites=[Suite()]))
+    assert plan.run().run is True
+
+    class LookupHistory(history.RuntimeHistory):
+        def __init__(self, path):
+            super(LookupHistory, self).__init__(path)
+            self.missing = []
+
+        def expected(self, uid, default=None):
+            if uid not in self:
+                self.missing.append(uid)
+            return super(LookupHistory, self).expected(uid, default)
+
+    runtime_history = LookupHistory(str(tmpdir.join("history.txt")))
+    runtime_history.record_json_report(json_path)
+    assert len(runtime_history) == 4
+
+    mtest = multitest.MultiTest(
+        name="MTest",
+        suites=[Suite()],
+        part=(0, 2),
+        runtime_history=runtime_history,
+        **MTEST_DEFAULT_PARAMS
+    )
+    assert mtest.test_context
+    assert runtime_history.missing == []
+
+
+def test_resource_timings(tmpdir):
+    """Start and stop durations of the drivers are added to the report."""
+    drivers = [
+        Driver(name="server", depends_on=[]),
+        Driver(name="client", depends_on=["server"]),
+    ]
+    mtest = multitest.MultiTest(
+        name="MTest",
+        suites=[Suite()],
+        environment=drivers,
+        runpath=str(tmpdir),
+        **MTEST_DEFAULT_PARAMS
+    )
+    mtest.run()
+
+    timer = mtest.report.timer
+    for key in ("start:server", "start:client", "stop:client", "stop:server"):
+        assert timer[key].elapsed >= 0
+    assert timer["start:client"].start >= timer["start:server"].end
+    assert timer["stop:server"].start >= timer["stop:client"].end
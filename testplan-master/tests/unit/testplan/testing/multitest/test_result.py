@@ -1,6 +1,7 @@
 """Unit tests for the testplan.testing.multitest.result module."""
 
 import collections
+import inspect
 import six
 
 if six.PY2:
@@ -12,6 +13,8 @@ import os
 
 import pytest
 
+from testplan import defaults
+from testplan.testing import filtering, ordering
 from testplan.testing.multitest import result as result_mod
 from testplan.testing.multitest.suite import testcase, testsuite
 from testplan.testing.multitest import MultiTest
@@ -67,6 +70,60 @@ def test_assertion_orders():
         assert entry["description"] == expected[idx]
 
 
+def test_entry_location():
+    """Entries record the file and line of the assertion call."""
+    result = result_mod.Result()
+    line_no = inspect.currentframe().f_lineno + 1
+    result.equal(1, 1)
+    with result.raises(KeyError):
+        raise KeyError("key")
+
+    equal_entry, raises_entry = result.entries
+    assert equal_entry.line_no == line_no
+    # The line of the ``raises`` entry comes from the frame calling
+    # ``__exit__``, which is either the ``with`` or the ``raise`` statement
+    # depending on the Python version.
+    assert line_no + 1 <= raises_entry.line_no <= line_no + 2
+    assert all(
+        entry.file_path == os.path.abspath(__file__.replace(".pyc", ".py"))
+        for entry in result.entries
+    )
+
+
+@testsuite
+class ManyAssertions(object):
+    @testcase
+    def case(self, env, result):
+        for idx in range(3):
+            result.equal(idx, idx)
+        with result.group() as group:
+            group.true(True)
+
+
+@pytest.mark.parametrize("capture_location", (True, False))
+def test_capture_location(capture_location):
+    """File and line capture can be disabled for a MultiTest."""
+    mtest = MultiTest(
+        name="MTest",
+        suites=[ManyAssertions()],
+        capture_location=capture_location,
+        test_filter=filtering.Filter(),
+        test_sorter=ordering.NoopSorter(),
+        stdout_style=defaults.STDOUT_STYLE,
+    )
+    report = mtest.run_tests()
+
+    entries = [
+        entry
+        for entry in report.flatten()
+        if isinstance(entry, dict) and entry["type"] != "Group"
+    ]
+    assert len(entries) == 4
+    assert all(
+        (entry["line_no"] is not None) == capture_location for entry in entries
+    )
+
+
 @pytest.fixture
 def dict_ns():
     """Dict namespace with a mocked out result object."""
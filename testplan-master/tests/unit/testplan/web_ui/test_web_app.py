@@ -1,4 +1,6 @@
 import os
+import gzip
+import json
 import uuid
 import shutil
 import tempfile
@@ -6,6 +8,13 @@ import tempfile
 import pytest
 
 from testplan import defaults
+from testplan.exporters.testing import JSONExporter
+from testplan.report import (
+    TestReport,
+    TestGroupReport,
+    TestCaseReport,
+    ReportCategories,
+)
 from testplan.web_ui.web_app import app as tp_web_app
 
 STATIC_REPORTS = {
@@ -166,11 +175,11 @@ class TestDataEndpoints(object):
 
     def test_testplan_assertions(self):
         """
-        Does sending anything to /api/v1/reports/<uid>/assertions/<uid> respond with
-        501.
+        Does /api/v1/reports/<uid>/assertions/<uid> respond with 404 for a
+        report that is not split.
         """
         response = self.client.get("api/v1/reports/123/assertions/123")
-        assert response.status_code == 501
+        assert response.status_code == 404
 
     def test_testplan_attachment(self):
         """
@@ -182,3 +191,145 @@ class TestDataEndpoints(object):
         expected_contents = str(DATA_REPORTS["testplan"]["contents"])
         assert response.status_code == 200
         assert expected_contents in str(response.data)
+
+
+def _split_report(data_dir, num_assertions, compress=False):
+    """Export a report with a testcase of ``num_assertions`` assertions."""
+    testcase = TestCaseReport(name="case", uid="case")
+    testcase.entries = [
+        {"type": "Log", "message": "message {}".format(idx)}
+        for idx in range(num_assertions)
+    ]
+    report = TestReport(
+        name="Plan",
+        uid="Plan",
+        entries=[
+            TestGroupReport(
+                name="MTest",
+                uid="MTest",
+                category=ReportCategories.MULTITEST,
+                entries=[
+                    TestGroupReport(
+                        name="Suite",
+                        uid="Suite",
+                        category=ReportCategories.TESTSUITE,
+                        entries=[testcase],
+                    )
+                ],
+            )
+        ],
+    )
+    JSONExporter(
+        json_path=os.path.join(data_dir, "report.json"),
+        split_json_report=True,
+        compress_json_report=compress,
+    ).export(report)
+
+
+class TestAssertionsEndpoint(object):
+    """
+    Test the endpoint returning pages of the assertions of a split report.
+    """
+
+    def setup_method(self, _):
+        """Export a split report and create a test client."""
+        self.data_dir = tempfile.mkdtemp()
+        _split_report(self.data_dir, 250)
+        tp_web_app.config["DATA_PATH"] = self.data_dir
+        tp_web_app.config["TESTPLAN_REPORT_NAME"] = "report.json"
+        tp_web_app.config["TESTING"] = True
+        self.client = tp_web_app.test_client()
+
+    def teardown_method(self, _):
+        """Remove the report."""
+        shutil.rmtree(self.data_dir)
+
+    def _messages(self, response):
+        return [entry["message"] for entry in response.get_json()["entries"]]
+
+    def test_pages(self):
+        """Are assertions paginated with the start and limit parameters."""
+        path = "/api/v1/reports/123/assertions/Plan/MTest/Suite/case"
+        response = self.client.get(path)
+        assert response.status_code == 200
+        assert response.get_json()["total"] == 250
+        assert response.get_json()["start"] == 0
+        assert self._messages(response) == [
+            "message {}".format(idx) for idx in range(100)
+        ]
+
+        response = self.client.get(path + "?start=190&limit=100")
+        assert self._messages(response) == [
+            "message {}".format(idx) for idx in range(190, 250)
+        ]
+
+        response = self.client.get(path + "?start=250")
+        assert response.status_code == 200
+        assert self._messages(response) == []
+
+        for query in ("?start=-1", "?limit=0", "?limit=100000"):
+            response = self.client.get(path + query)
+            assert response.status_code == 400
+
+        response = self.client.get(
+            "/api/v1/reports/123/assertions/Plan/MTest/Suite/other"
+        )
+        assert response.status_code == 404
+
+    def test_gzip(self):
+        """Are large pages gzip encoded for clients that accept it."""
+        path = "/api/v1/reports/123/assertions/Plan/MTest/Suite/case"
+        response = self.client.get(
+            path, headers={"Accept-Encoding": "gzip, deflate"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        data = json.loads(gzip.decompress(response.data).decode("utf-8"))
+        assert len(data["entries"]) == 100
+
+        response = self.client.get(path)
+        assert "Content-Encoding" not in response.headers
+
+    def test_index_of_report(self):
+        """
+        Is the index recorded in the report used, not the index of another
+        report with the same name.
+        """
+        other_dir = os.path.join(self.data_dir, "other")
+        _split_report(other_dir, 10)
+        attachments_dir = os.path.join(self.data_dir, defaults.ATTACHMENTS)
+        for name in os.listdir(os.path.join(other_dir, defaults.ATTACHMENTS)):
+            shutil.copy(
+                os.path.join(other_dir, defaults.ATTACHMENTS, name),
+                attachments_dir,
+            )
+
+        response = self.client.get(
+            "/api/v1/reports/123/assertions/Plan/MTest/Suite/case"
+        )
+        assert response.status_code == 200
+        assert response.get_json()["total"] == 250
+
+    def test_compressed_report(self):
+        """Are compressed reports sent as they are to gzip clients."""
+        shutil.rmtree(self.data_dir)
+        os.makedirs(self.data_dir)
+        _split_report(self.data_dir, 10, compress=True)
+
+        response = self.client.get(
+            "/api/v1/reports/123", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        report = json.loads(gzip.decompress(response.data).decode("utf-8"))
+        assert report["version"] == 2
+
+        response = self.client.get("/api/v1/reports/123")
+        assert response.get_json()["assertions_index"] == (
+            report["assertions_index"]
+        )
+
+        response = self.client.get(
+            "/api/v1/reports/123/assertions/Plan/MTest/Suite/case?limit=5"
+        )
+        assert self._messages(response) == [
+            "message {}".format(idx) for idx in range(5)
+        ]